@@ -1,3 +1,4 @@
+import asyncio
 import json
 from typing import Any
 from uuid import uuid4
@@ -112,6 +113,7 @@ class ACPDeepAgent(ACPAgent):
         self._mode = mode
         self._deepagent = self._create_deepagent(mode)
         self._cancelled = False
+        self._prompt_task: asyncio.Task | None = None
         self._session_plans: dict[str, list[dict[str, Any]]] = {}  # Track current plan per session
         super().__init__()
 
@@ -176,8 +178,15 @@ class ACPDeepAgent(ACPAgent):
         return SetSessionModeResponse()
 
     async def cancel(self, session_id: str, **kwargs: Any) -> None:
-        """Cancel the current execution."""
+        """Cancel the current execution.
+
+        Cancels the running prompt task too, so a tool call in progress (and
+        any shell command or search it started) is stopped immediately rather
+        than at the next streamed chunk.
+        """
         self._cancelled = True
+        if self._prompt_task is not None:
+            self._prompt_task.cancel()
 
     async def _log_text(self, session_id: str, text: str):
         update = update_agent_message(text_block(text))
@@ -447,76 +456,90 @@ class ACPDeepAgent(ACPAgent):
         current_state = None
         user_decisions = []
 
-        while current_state is None or current_state.interrupts:
-            # Check for cancellation
-            if self._cancelled:
-                self._cancelled = False  # Reset for next prompt
-                return PromptResponse(stop_reason="cancelled")
-
-            async for message_chunk, metadata in self._deepagent.astream(
-                Command(resume={"decisions": user_decisions})
-                if user_decisions
-                else {"messages": [{"role": "user", "content": content_blocks}]},
-                config=config,
-                stream_mode="messages",
-            ):
-                # Check for cancellation during streaming
+        self._prompt_task = asyncio.current_task()
+        try:
+            while current_state is None or current_state.interrupts:
+                # Check for cancellation
                 if self._cancelled:
                     self._cancelled = False  # Reset for next prompt
                     return PromptResponse(stop_reason="cancelled")
 
-                # Process tool call chunks
-                await self._process_tool_call_chunks(
-                    session_id,
-                    message_chunk,
-                    active_tool_calls,
-                    tool_call_accumulator,
-                )
+                async for message_chunk, metadata in self._deepagent.astream(
+                    Command(resume={"decisions": user_decisions})
+                    if user_decisions
+                    else {"messages": [{"role": "user", "content": content_blocks}]},
+                    config=config,
+                    stream_mode="messages",
+                ):
+                    # Check for cancellation during streaming
+                    if self._cancelled:
+                        self._cancelled = False  # Reset for next prompt
+                        return PromptResponse(stop_reason="cancelled")
+
+                    # Process tool call chunks
+                    await self._process_tool_call_chunks(
+                        session_id,
+                        message_chunk,
+                        active_tool_calls,
+                        tool_call_accumulator,
+                    )
 
-                if isinstance(message_chunk, str):
-                    await self._log_text(text=message_chunk, session_id=session_id)
-                # Check for tool results (ToolMessage responses)
-                elif hasattr(message_chunk, "type") and message_chunk.type == "tool":
-                    # This is a tool result message
-                    tool_call_id = getattr(message_chunk, "tool_call_id", None)
-                    if tool_call_id and tool_call_id in active_tool_calls:
-                        if active_tool_calls[tool_call_id].get("name") != "edit_file":
-                            # Update the tool call with completion status and result
-                            content = getattr(message_chunk, "content", "")
-                            update = update_tool_call(
-                                tool_call_id=tool_call_id,
-                                status="completed",
-                                content=[tool_content(text_block(str(content)))],
-                            )
-                            await self._conn.session_update(
-                                session_id=session_id, update=update, source="DeepAgent"
-                            )
+                    if isinstance(message_chunk, str):
+                        await self._log_text(text=message_chunk, session_id=session_id)
+                    # Check for tool results (ToolMessage responses)
+                    elif hasattr(message_chunk, "type") and message_chunk.type == "tool":
+                        # This is a tool result message
+                        tool_call_id = getattr(message_chunk, "tool_call_id", None)
+                        if tool_call_id and tool_call_id in active_tool_calls:
+                            if active_tool_calls[tool_call_id].get("name") != "edit_file":
+                                # Update the tool call with completion status and result
+                                content = getattr(message_chunk, "content", "")
+                                update = update_tool_call(
+                                    tool_call_id=tool_call_id,
+                                    status="completed",
+                                    content=[tool_content(text_block(str(content)))],
+                                )
+                                await self._conn.session_update(
+                                    session_id=session_id, update=update, source="DeepAgent"
+                                )
+
+                    elif message_chunk.content:
+                        # content can be a string or a list of content blocks
+                        if isinstance(message_chunk.content, str):
+                            text = message_chunk.content
+                        elif isinstance(message_chunk.content, list):
+                            # Extract text from content blocks
+                            text = ""
+                            for block in message_chunk.content:
+                                if isinstance(block, dict) and block.get("type") == "text":
+                                    text += block.get("text", "")
+                                elif isinstance(block, str):
+                                    text += block
+                        else:
+                            text = str(message_chunk.content)
 
-                elif message_chunk.content:
-                    # content can be a string or a list of content blocks
-                    if isinstance(message_chunk.content, str):
-                        text = message_chunk.content
-                    elif isinstance(message_chunk.content, list):
-                        # Extract text from content blocks
-                        text = ""
-                        for block in message_chunk.content:
-                            if isinstance(block, dict) and block.get("type") == "text":
-                                text += block.get("text", "")
-                            elif isinstance(block, str):
-                                text += block
-                    else:
-                        text = str(message_chunk.content)
+                        if text:
+                            await self._log_text(text=text, session_id=session_id)
 
-                    if text:
-                        await self._log_text(text=text, session_id=session_id)
+                # Check if the agent is interrupted (waiting for HITL approval)
+                current_state = await self._deepagent.aget_state(config)
+                user_decisions = await self._handle_interrupts(
+                    current_state=current_state,
+                    session_id=session_id,
+                    active_tool_calls=active_tool_calls,
+                )
 
-            # Check if the agent is interrupted (waiting for HITL approval)
-            current_state = await self._deepagent.aget_state(config)
-            user_decisions = await self._handle_interrupts(
-                current_state=current_state,
-                session_id=session_id,
-                active_tool_calls=active_tool_calls,
-            )
+        except asyncio.CancelledError:
+            if not self._cancelled:
+                raise
+            # cancel() interrupted a model call or tool mid-flight; report it as a
+            # normal cancelled turn instead of propagating the cancellation.
+            if (task := asyncio.current_task()) is not None:
+                task.uncancel()
+            self._cancelled = False
+            return PromptResponse(stop_reason="cancelled")
+        finally:
+            self._prompt_task = None
 
         return PromptResponse(stop_reason="end_turn")
 
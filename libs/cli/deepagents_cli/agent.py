@@ -351,6 +351,19 @@ def _format_execute_description(
     return f"Execute Command: {command}\nWorking Directory: {Path.cwd()}"
 
 
+def _format_start_job_description(
+    tool_call: ToolCall, _state: AgentState[Any], _runtime: Runtime[Any]
+) -> str:
+    """Format start_job tool call for approval prompt.
+
+    Returns:
+        Formatted description string for the start_job tool call.
+    """
+    args = tool_call["args"]
+    command = args.get("command", "N/A")
+    return f"Start Background Job: {command}\nWorking Directory: {Path.cwd()}"
+
+
 def _add_interrupt_on() -> dict[str, InterruptOnConfig]:
     """Configure human-in-the-loop interrupt_on settings for destructive tools.
 
@@ -362,6 +375,11 @@ def _add_interrupt_on() -> dict[str, InterruptOnConfig]:
         "description": _format_execute_description,  # type: ignore[typeddict-item]
     }
 
+    start_job_interrupt_config: InterruptOnConfig = {
+        "allowed_decisions": ["approve", "reject"],
+        "description": _format_start_job_description,  # type: ignore[typeddict-item]
+    }
+
     write_file_interrupt_config: InterruptOnConfig = {
         "allowed_decisions": ["approve", "reject"],
         "description": _format_write_file_description,  # type: ignore[typeddict-item]
@@ -388,6 +406,7 @@ def _add_interrupt_on() -> dict[str, InterruptOnConfig]:
     }
     return {
         "execute": execute_interrupt_config,
+        "start_job": start_job_interrupt_config,
         "write_file": write_file_interrupt_config,
         "edit_file": edit_file_interrupt_config,
         "web_search": web_search_interrupt_config,
@@ -408,6 +427,7 @@ def create_cli_agent(
     enable_memory: bool = True,
     enable_skills: bool = True,
     enable_shell: bool = True,
+    persistent_shell: bool = False,
     checkpointer: BaseCheckpointSaver | None = None,
 ) -> tuple[Pregel, CompositeBackend]:
     """Create a CLI-configured agent with flexible options.
@@ -437,6 +457,9 @@ def create_cli_agent(
         enable_skills: Enable `SkillsMiddleware` for custom agent skills
         enable_shell: Enable shell execution via `CLIShellBackend`
             (only in local mode). When enabled, the `execute` tool is available.
+        persistent_shell: Run local shell commands in one long-lived bash
+            session so `cd`, exported variables and activated virtualenvs
+            persist between `execute` calls (only in local mode).
         checkpointer: Optional checkpointer for session persistence.
 
             If `None`, uses `InMemorySaver` (no persistence across
@@ -532,6 +555,7 @@ def create_cli_agent(
                 root_dir=Path.cwd(),
                 inherit_env=True,
                 env=shell_env,
+                persistent_session=persistent_shell,
             )
         else:
             # No shell access - use plain FilesystemBackend
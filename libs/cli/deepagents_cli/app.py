@@ -45,6 +45,8 @@ if TYPE_CHECKING:
     from textual.events import Click, MouseUp, Resize
     from textual.worker import Worker
 
+    from deepagents_cli.integrations.sandbox_sync import SandboxSync
+
 # iTerm2 Cursor Guide Workaround
 # ===============================
 # iTerm2's cursor guide (highlight cursor line) causes visual artifacts when
@@ -342,6 +344,7 @@ class DeepAgentsApp(App):
         cwd: str | Path | None = None,
         thread_id: str | None = None,
         initial_prompt: str | None = None,
+        sandbox_sync: SandboxSync | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the Deep Agents application.
@@ -354,6 +357,7 @@ class DeepAgentsApp(App):
             cwd: Current working directory to display
             thread_id: Optional thread ID for session persistence
             initial_prompt: Optional prompt to auto-submit when session starts
+            sandbox_sync: Optional sync engine run after each turn and on /sync
             **kwargs: Additional arguments passed to parent
         """
         super().__init__(**kwargs)
@@ -365,6 +369,7 @@ class DeepAgentsApp(App):
         # Avoid collision with App._thread_id
         self._lc_thread_id = thread_id
         self._initial_prompt = initial_prompt
+        self._sandbox_sync = sandbox_sync
         self._status_bar: StatusBar | None = None
         self._chat_input: ChatInput | None = None
         self._quit_pending = False
@@ -706,7 +711,8 @@ class DeepAgentsApp(App):
         elif cmd == "/help":
             await self._mount_message(UserMessage(command))
             help_text = (
-                "Commands: /quit, /clear, /remember, /tokens, /threads, /help\n\n"
+                "Commands: /quit, /clear, /remember, /tokens, /threads, /sync, "
+                "/help\n\n"
                 "Interactive Features:\n"
                 "  Enter           Submit your message\n"
                 "  Ctrl+J          Insert newline\n"
@@ -761,6 +767,18 @@ class DeepAgentsApp(App):
                 )
             else:
                 await self._mount_message(AppMessage("No token usage yet"))
+        elif cmd == "/sync":
+            await self._mount_message(UserMessage(command))
+            if self._sandbox_sync is None:
+                await self._mount_message(
+                    AppMessage("Sync is only available with --sandbox-sync")
+                )
+            elif self._agent_running:
+                await self._mount_message(
+                    AppMessage("Sync runs automatically when the agent finishes")
+                )
+            else:
+                await self._sync_sandbox(quiet=False)
         elif cmd == "/remember" or cmd.startswith("/remember "):
             # Extract any additional context after /remember
             additional_context = ""
@@ -840,9 +858,27 @@ class DeepAgentsApp(App):
         except Exception as e:
             await self._mount_message(ErrorMessage(f"Agent error: {e}"))
         finally:
+            if self._sandbox_sync is not None:
+                await self._sync_sandbox(quiet=True)
             # Clean up loading widget and agent state
             await self._cleanup_agent_task()
 
+    async def _sync_sandbox(self, *, quiet: bool) -> None:
+        """Sync the local project with the sandbox in a worker thread.
+
+        Args:
+            quiet: Only report when something changed or failed
+        """
+        if self._sandbox_sync is None:
+            return
+        try:
+            result = await asyncio.to_thread(self._sandbox_sync.sync)
+        except Exception as e:
+            await self._mount_message(ErrorMessage(f"Sandbox sync failed: {e}"))
+            return
+        if result.changed or not quiet:
+            await self._mount_message(AppMessage(result.summary()))
+
     async def _cleanup_agent_task(self) -> None:
         """Clean up after agent task completes or is cancelled."""
         self._agent_running = False
@@ -1169,6 +1205,7 @@ async def run_textual_app(
     cwd: str | Path | None = None,
     thread_id: str | None = None,
     initial_prompt: str | None = None,
+    sandbox_sync: SandboxSync | None = None,
 ) -> int:
     """Run the Textual application.
 
@@ -1180,6 +1217,7 @@ async def run_textual_app(
         cwd: Current working directory to display
         thread_id: Optional thread ID for session persistence
         initial_prompt: Optional prompt to auto-submit when session starts
+        sandbox_sync: Optional sync engine run after each turn and on /sync
 
     Returns:
         The app's return code (0 for success, non-zero for error).
@@ -1192,6 +1230,7 @@ async def run_textual_app(
         cwd=cwd,
         thread_id=thread_id,
         initial_prompt=initial_prompt,
+        sandbox_sync=sandbox_sync,
     )
     await app.run_async()
     return app.return_code or 0
@@ -14,16 +14,17 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import subprocess  # noqa: S404
-from typing import Annotated, cast
+from typing import TYPE_CHECKING, Annotated, cast
 
 from deepagents.backends.composite import CompositeBackend
 from deepagents.backends.local_shell import LocalShellBackend
 from deepagents.backends.protocol import (
     BackendProtocol,
+    ExecuteChunk,
     ExecuteResponse,
     SandboxBackendProtocol,
 )
+from deepagents.backends.utils import collect_execute_stream
 from deepagents.middleware.filesystem import (
     EXECUTE_TOOL_DESCRIPTION,
     FilesystemMiddleware,
@@ -32,6 +33,9 @@ from deepagents.middleware.filesystem import (
 from langchain.tools import ToolRuntime  # noqa: TC002
 from langchain_core.tools import BaseTool, StructuredTool
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT_DESC = (
@@ -76,72 +80,50 @@ class CLIShellBackend(LocalShellBackend):
         Raises:
             ValueError: If the effective timeout (per-command or instance
                 default) is not positive.
-        """
-        if not command or not isinstance(command, str):
-            return ExecuteResponse(
-                output="Error: Command must be a non-empty string.",
-                exit_code=1,
-                truncated=False,
-            )
+        """  # noqa: DOC502
+        return collect_execute_stream(self.execute_stream(command, timeout=timeout))
+
+    def execute_stream(
+        self,
+        command: str,
+        *,
+        timeout: int | None = None,
+    ) -> Iterator[ExecuteChunk | ExecuteResponse]:
+        """Stream a shell command's output with optional per-command timeout.
+
+        Args:
+            command: Shell command string to execute.
+            timeout: Maximum time in seconds to wait for this command.
 
+                If `None`, falls back to the instance-level timeout.
+
+        Returns:
+            Iterator of output chunks followed by the final `ExecuteResponse`.
+
+        Raises:
+            ValueError: If the effective timeout (per-command or instance
+                default) is not positive.
+        """
         effective_timeout = timeout if timeout is not None else self._timeout
         if effective_timeout <= 0:
             msg = f"timeout must be positive, got {effective_timeout}"
             raise ValueError(msg)
+        return self._stream_command(command, timeout=effective_timeout)
+
+    def _format_timeout_error(self, timeout: float) -> str:  # noqa: PLR6301
+        return (
+            f"Error: Command timed out after {timeout} seconds."
+            " For long-running commands, re-run using the timeout parameter."
+        )
+
+    def _format_exec_error(self, error: Exception) -> str:  # noqa: PLR6301
+        # Include the exception type so errors that would otherwise crash the
+        # agent loop are easy to diagnose from the tool result alone.
+        return f"Error executing command ({type(error).__name__}): {error}"
 
-        try:
-            result = subprocess.run(  # noqa: S602
-                command,
-                check=False,
-                shell=True,  # Intentional: designed for LLM-controlled shell execution
-                capture_output=True,
-                text=True,
-                timeout=effective_timeout,
-                env=self._env,
-                cwd=str(self.cwd),
-            )
-
-            # Combine stdout and stderr
-            # Prefix each stderr line with [stderr] for clear attribution.
-            output_parts = []
-            if result.stdout:
-                output_parts.append(result.stdout)
-            if result.stderr:
-                stderr_lines = result.stderr.strip().split("\n")
-                output_parts.extend(f"[stderr] {line}" for line in stderr_lines)
-
-            output = "\n".join(output_parts) if output_parts else "<no output>"
-
-            truncated = False
-            if len(output) > self._max_output_bytes:
-                output = output[: self._max_output_bytes]
-                output += f"\n\n... Output truncated at {self._max_output_bytes} bytes."
-                truncated = True
-
-            return ExecuteResponse(
-                output=output,
-                exit_code=result.returncode,
-                truncated=truncated,
-            )
-
-        except subprocess.TimeoutExpired:
-            return ExecuteResponse(
-                output=(
-                    f"Error: Command timed out after {effective_timeout} seconds."
-                    " For long-running commands, re-run using the timeout parameter."
-                ),
-                exit_code=124,  # Standard timeout exit code
-                truncated=False,
-            )
-        except Exception as e:  # noqa: BLE001
-            # Broad exception catch is intentional: we want to catch all
-            # execution errors and return a consistent ExecuteResponse rather
-            # than propagating exceptions that would crash the agent loop.
-            return ExecuteResponse(
-                output=f"Error executing command ({type(e).__name__}): {e}",
-                exit_code=1,
-                truncated=False,
-            )
+    def _format_exit_code(self, output: str, exit_code: int) -> str:  # noqa: ARG002, PLR6301
+        # The execute tool reports the exit code via `_format_execute_result`.
+        return output
 
 
 def _format_execute_result(result: ExecuteResponse) -> str:
@@ -43,6 +43,11 @@ class DaytonaBackend(BaseSandbox):
         """Unique identifier for the sandbox backend."""
         return self._sandbox.id
 
+    @property
+    def image_id(self) -> str | None:
+        """Snapshot the sandbox was created from, part of the setup cache key."""
+        return self._sandbox.snapshot
+
     def execute(
         self,
         command: str,
@@ -35,13 +35,15 @@ class LangSmithBackend(BaseSandbox):
     and only implements the execute() method using LangSmith's API.
     """
 
-    def __init__(self, sandbox: Sandbox) -> None:
+    def __init__(self, sandbox: Sandbox, *, image_id: str | None = None) -> None:
         """Initialize the LangSmithBackend with a sandbox instance.
 
         Args:
             sandbox: LangSmith Sandbox instance
+            image_id: Template the sandbox was created from, if known
         """
         self._sandbox = sandbox
+        self._image_id = image_id
         self._timeout: int = 30 * 60  # 30 mins default
 
     @property
@@ -49,6 +51,11 @@ class LangSmithBackend(BaseSandbox):
         """Unique identifier for the sandbox backend."""
         return self._sandbox.name
 
+    @property
+    def image_id(self) -> str | None:
+        """Template of the sandbox, part of the setup cache key."""
+        return self._image_id
+
     def execute(self, command: str) -> ExecuteResponse:
         """Execute a command in the sandbox and return ExecuteResponse.
 
@@ -193,7 +200,7 @@ class LangSmithProvider(SandboxProvider[dict[str, Any]]):
             return LangSmithBackend(sandbox)
 
         # Create new sandbox - ensure template exists first
-        self._ensure_template()
+        template_image = self._ensure_template()
 
         try:
             sandbox = self._client.create_sandbox(
@@ -222,7 +229,9 @@ class LangSmithProvider(SandboxProvider[dict[str, Any]]):
             msg = f"LangSmith sandbox failed to start within {timeout} seconds"
             raise RuntimeError(msg)
 
-        return LangSmithBackend(sandbox)
+        return LangSmithBackend(
+            sandbox, image_id=f"{DEFAULT_TEMPLATE_NAME}:{template_image}"
+        )
 
     def delete(self, *, sandbox_id: str, **kwargs: Any) -> None:  # noqa: ARG002
         """Delete a LangSmith sandbox.
@@ -233,23 +242,27 @@ class LangSmithProvider(SandboxProvider[dict[str, Any]]):
         """
         self._client.delete_sandbox(sandbox_id)
 
-    def _ensure_template(self) -> None:
+    def _ensure_template(self) -> str:
         """Ensure template exists, creating it if needed.
 
+        Returns:
+            Image of the template, which may differ from `DEFAULT_TEMPLATE_IMAGE`
+            if the template already existed
+
         Raises:
             RuntimeError: If template check or creation fails
         """
         from langsmith.sandbox import ResourceNotFoundError
 
         try:
-            self._client.get_template(DEFAULT_TEMPLATE_NAME)
+            template = self._client.get_template(DEFAULT_TEMPLATE_NAME)
         except ResourceNotFoundError as e:
             if e.resource_type != "template":
                 msg = f"Unexpected resource not found: {e}"
                 raise RuntimeError(msg) from e
             # Template doesn't exist, create it
             try:
-                self._client.create_template(
+                template = self._client.create_template(
                     name=DEFAULT_TEMPLATE_NAME, image=DEFAULT_TEMPLATE_IMAGE
                 )
             except Exception as create_err:
@@ -260,3 +273,4 @@ class LangSmithProvider(SandboxProvider[dict[str, Any]]):
         except Exception as e:
             msg = f"Failed to check template '{DEFAULT_TEMPLATE_NAME}': {e}"
             raise RuntimeError(msg) from e
+        return template.image
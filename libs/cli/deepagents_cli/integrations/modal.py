@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import sys
 import time
 from typing import TYPE_CHECKING, Any
 
 from deepagents.backends.protocol import (
+    ExecuteChunk,
     ExecuteResponse,
     FileDownloadResponse,
     FileUploadResponse,
@@ -16,10 +18,16 @@ from deepagents.backends.sandbox import (
     SandboxListResponse,
     SandboxProvider,
 )
+from deepagents.backends.utils import HeadTailBuffer, collect_execute_stream
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     import modal
 
+_MAX_OUTPUT_BYTES = 100_000
+"""Output retained per stream; anything beyond keeps only the head and tail."""
+
 
 class ModalBackend(BaseSandbox):
     """Modal backend implementation conforming to SandboxBackendProtocol.
@@ -36,6 +44,7 @@ class ModalBackend(BaseSandbox):
         """
         self._sandbox = sandbox
         self._timeout = 30 * 60
+        self._max_output_bytes = _MAX_OUTPUT_BYTES
 
     @property
     def id(self) -> str:
@@ -48,31 +57,74 @@ class ModalBackend(BaseSandbox):
     ) -> ExecuteResponse:
         """Execute a command in the sandbox and return ExecuteResponse.
 
+        The full output is returned: `BaseSandbox` file operations such as
+        `read` and `grep_raw` parse it and must never see a truncated result.
+
         Args:
             command: Full shell command string to execute.
 
         Returns:
-            ExecuteResponse with combined output, exit code, and truncation flag.
+            ExecuteResponse with combined output and exit code.
+        """
+        return collect_execute_stream(self._stream(command, max_output_bytes=None))
+
+    def execute_stream(
+        self,
+        command: str,
+    ) -> Iterator[ExecuteChunk | ExecuteResponse]:
+        """Execute a command, yielding output as Modal streams it back.
+
+        Every chunk is yielded, but the final `ExecuteResponse` keeps only the
+        head and tail of each stream once output exceeds the byte budget, so
+        huge outputs never accumulate in memory.
+
+        Args:
+            command: Full shell command string to execute.
+
+        Yields:
+            Output chunks, then the final `ExecuteResponse`.
+        """
+        yield from self._stream(command, max_output_bytes=self._max_output_bytes)
+
+    def _stream(
+        self,
+        command: str,
+        *,
+        max_output_bytes: int | None,
+    ) -> Iterator[ExecuteChunk | ExecuteResponse]:
+        """Run `command`, retaining at most `max_output_bytes` per stream if set.
+
+        Yields:
+            Output chunks, then the final `ExecuteResponse`.
         """
         # Execute command using Modal's exec API
         process = self._sandbox.exec("bash", "-c", command, timeout=self._timeout)
 
+        # Without a budget the buffers never drop anything
+        budget = sys.maxsize if max_output_bytes is None else max_output_bytes
+        stdout = HeadTailBuffer(budget)
+        stderr = HeadTailBuffer(budget)
+        for chunk in process.stdout:
+            stdout.write(chunk)
+            yield ExecuteChunk(output=chunk, stream="stdout")
+        for chunk in process.stderr:
+            stderr.write(chunk)
+            yield ExecuteChunk(output=chunk, stream="stderr")
+
         # Wait for process to complete
         process.wait()
 
-        # Read stdout and stderr
-        stdout = process.stdout.read()
-        stderr = process.stderr.read()
-
         # Combine stdout and stderr (matching Runloop's approach)
-        output = stdout or ""
-        if stderr:
-            output += "\n" + stderr if output else stderr
+        marker = f"\n\n... Output truncated at {max_output_bytes} bytes ...\n\n"
+        output = stdout.getvalue(marker)
+        if stderr.total_chars:
+            stderr_text = stderr.getvalue(marker)
+            output += "\n" + stderr_text if output else stderr_text
 
-        return ExecuteResponse(
+        yield ExecuteResponse(
             output=output,
             exit_code=process.returncode,
-            truncated=False,  # Modal doesn't provide truncation info
+            truncated=stdout.truncated or stderr.truncated,
         )
 
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
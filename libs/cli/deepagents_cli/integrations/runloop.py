@@ -39,6 +39,7 @@ class RunloopBackend(BaseSandbox):
         devbox_id: str,
         client: Runloop | None = None,
         api_key: str | None = None,
+        image_id: str | None = None,
     ) -> None:
         """Initialize Runloop protocol.
 
@@ -47,6 +48,7 @@ class RunloopBackend(BaseSandbox):
             client: Optional existing Runloop client instance
             api_key: Optional API key for creating a new client
                 (defaults to RUNLOOP_API_KEY environment variable)
+            image_id: Blueprint or snapshot the devbox was created from, if known
 
         Raises:
             ValueError: If both client and api_key are provided, or if neither
@@ -65,6 +67,7 @@ class RunloopBackend(BaseSandbox):
 
         self._client = client
         self._devbox_id = devbox_id
+        self._image_id = image_id
         self._timeout = 30 * 60
 
     @property
@@ -72,6 +75,11 @@ class RunloopBackend(BaseSandbox):
         """Unique identifier for the sandbox backend."""
         return self._devbox_id
 
+    @property
+    def image_id(self) -> str | None:
+        """Blueprint or snapshot of the devbox, part of the setup cache key."""
+        return self._image_id
+
     def execute(
         self,
         command: str,
@@ -218,7 +226,11 @@ class RunloopProvider(SandboxProvider[dict[str, Any]]):
                 msg = f"Devbox failed to start within {timeout} seconds"
                 raise RuntimeError(msg)
 
-        return RunloopBackend(devbox_id=devbox.id, client=self._client)
+        return RunloopBackend(
+            devbox_id=devbox.id,
+            client=self._client,
+            image_id=devbox.blueprint_id or devbox.snapshot_id,
+        )
 
     def delete(self, *, sandbox_id: str, **kwargs: Any) -> None:  # noqa: ARG002
         """Delete a Runloop devbox.
@@ -10,19 +10,47 @@ from pathlib import Path
 from deepagents.backends.protocol import SandboxBackendProtocol
 from deepagents.backends.sandbox import SandboxProvider
 
-from deepagents_cli.config import console, get_glyphs
+from deepagents_cli.config import console, get_glyphs, settings
 from deepagents_cli.integrations.daytona import DaytonaProvider
 from deepagents_cli.integrations.langsmith import LangSmithProvider
 from deepagents_cli.integrations.modal import ModalProvider
 from deepagents_cli.integrations.runloop import RunloopProvider
+from deepagents_cli.integrations.setup_cache import (
+    SetupCache,
+    begin_setup_capture,
+    capture_setup_snapshot,
+    fingerprint_base,
+    restore_setup_snapshot,
+    setup_cache_key,
+)
 
 
-def _run_sandbox_setup(backend: SandboxBackendProtocol, setup_script_path: str) -> None:
+def _default_setup_cache() -> SetupCache:
+    """Return the setup snapshot cache under `~/.deepagents/setup_cache`."""
+    return SetupCache(settings.user_deepagents_dir / "setup_cache")
+
+
+def _run_sandbox_setup(
+    backend: SandboxBackendProtocol,
+    setup_script_path: str,
+    *,
+    provider: str | None = None,
+    cache: SetupCache | None = None,
+    rebuild: bool = False,
+) -> None:
     """Run users setup script in sandbox with env var expansion.
 
+    When a `cache` is given, the result is content-addressed by provider,
+    template/image id, sandbox base image and expanded script: a cached
+    snapshot is restored instead of re-running the script, and a fresh run is
+    captured for next time.
+
     Args:
         backend: Sandbox backend instance
         setup_script_path: Path to setup script file
+        provider: Sandbox provider name, part of the cache key
+        cache: Optional snapshot cache to restore from and store into
+        rebuild: Re-run the script even if a cached snapshot exists
 
     Raises:
         FileNotFoundError: If the setup script does not exist.
@@ -33,8 +61,6 @@ def _run_sandbox_setup(backend: SandboxBackendProtocol, setup_script_path: str)
         msg = f"Setup script not found: {setup_script_path}"
         raise FileNotFoundError(msg)
 
-    console.print(f"[dim]Running setup script: {setup_script_path}...[/dim]")
-
     # Read script content
     script_content = script_path.read_text(encoding="utf-8")
 
@@ -42,6 +68,28 @@ def _run_sandbox_setup(backend: SandboxBackendProtocol, setup_script_path: str)
     template = string.Template(script_content)
     expanded_script = template.safe_substitute(os.environ)
 
+    cache_key = None
+    if cache is not None:
+        # Provider backends that know their template/image expose it as `image_id`.
+        image_id = getattr(backend, "image_id", None)
+        cache_key = setup_cache_key(
+            provider or "",
+            fingerprint_base(backend),
+            expanded_script,
+            image_id=image_id,
+        )
+        if rebuild:
+            cache.invalidate(cache_key)
+        elif restore_setup_snapshot(backend, cache, cache_key):
+            console.print(
+                f"[green]{get_glyphs().checkmark} Setup restored from cache "
+                f"({setup_script_path})[/green]"
+            )
+            return
+        begin_setup_capture(backend)
+
+    console.print(f"[dim]Running setup script: {setup_script_path}...[/dim]")
+
     # Execute in sandbox with 5-minute timeout
     result = backend.execute(f"bash -c {shlex.quote(expanded_script)}")
 
@@ -51,6 +99,16 @@ def _run_sandbox_setup(backend: SandboxBackendProtocol, setup_script_path: str)
         msg = "Setup failed - aborting"
         raise RuntimeError(msg)
 
+    if cache is not None and cache_key is not None:
+        if capture_setup_snapshot(backend, cache, cache_key):
+            console.print("[dim]Saved setup snapshot for future sandboxes[/dim]")
+        else:
+            warning = get_glyphs().warning
+            console.print(
+                f"[yellow]{warning} Could not snapshot setup results; "
+                "the script will run again next time[/yellow]"
+            )
+
     console.print(f"[green]{get_glyphs().checkmark} Setup complete[/green]")
 
 
@@ -68,6 +126,7 @@ def create_sandbox(
     *,
     sandbox_id: str | None = None,
     setup_script_path: str | None = None,
+    rebuild_setup: bool = False,
 ) -> Generator[SandboxBackendProtocol, None, None]:
     """Create or connect to a sandbox of the specified provider.
 
@@ -76,7 +135,11 @@ def create_sandbox(
     Args:
         provider: Sandbox provider ("daytona", "langsmith", "modal", "runloop")
         sandbox_id: Optional existing sandbox ID to reuse
-        setup_script_path: Optional path to setup script to run after sandbox starts
+        setup_script_path: Optional path to setup script to run after sandbox starts.
+            Its results are cached in `~/.deepagents/setup_cache` and restored
+            into later sandboxes instead of re-running the script.
+        rebuild_setup: Ignore any cached setup snapshot, re-run the script and
+            refresh the cache
 
     Yields:
         SandboxBackendProtocol instance
@@ -98,7 +161,13 @@ def create_sandbox(
 
     # Run setup script if provided
     if setup_script_path:
-        _run_sandbox_setup(backend, setup_script_path)
+        _run_sandbox_setup(
+            backend,
+            setup_script_path,
+            provider=provider,
+            cache=_default_setup_cache(),
+            rebuild=rebuild_setup,
+        )
 
     try:
         yield backend
@@ -0,0 +1,484 @@
+"""Two-way content-hash sync between the local project and a sandbox.
+
+Each side is described by a manifest mapping relative paths to SHA-256
+digests. The local manifest reuses cached digests for files whose size and
+mtime are unchanged, and the remote one is computed by a single `sha256sum`
+command, so an up-to-date tree costs one round trip and no transfers. A remote
+listing that is truncated or incomplete aborts the sync, so files are never
+deleted locally because the sandbox failed to report them.
+
+The manifests are diffed against the one recorded at the end of the previous
+sync (persisted across sessions), which tells which side changed each path:
+
+- changed only locally: uploaded (or deleted in the sandbox)
+- changed only in the sandbox: downloaded (or deleted locally)
+- changed differently on both sides: reported as a conflict and left alone
+
+Paths ignored by the project's `.gitignore` are never synced.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess  # noqa: S404
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from deepagents.backends.protocol import SandboxBackendProtocol
+
+# Upload batches are capped by total size, download batches by file count, to
+# keep individual provider requests reasonably small.
+_UPLOAD_BATCH_BYTES = 8 * 1024 * 1024
+_DOWNLOAD_BATCH_FILES = 64
+
+_GIT_TIMEOUT = 30
+
+_MANIFEST_SENTINEL = "deepagents-sync-files"
+
+
+def _get_git_executable() -> str | None:
+    """Get full path to git executable using shutil.which().
+
+    Returns:
+        Full path to git executable, or None if not found.
+    """
+    return shutil.which("git")
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class SyncResult:
+    """Outcome of one sync pass, as relative paths."""
+
+    pushed: list[str] = field(default_factory=list)
+    pulled: list[str] = field(default_factory=list)
+    deleted_remote: list[str] = field(default_factory=list)
+    deleted_local: list[str] = field(default_factory=list)
+    conflicts: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """Whether anything was transferred, deleted or needs attention."""
+        return any(
+            (
+                self.pushed,
+                self.pulled,
+                self.deleted_remote,
+                self.deleted_local,
+                self.conflicts,
+                self.errors,
+            )
+        )
+
+    def summary(self) -> str:
+        """Describe the sync in one line.
+
+        Returns:
+            Human-readable summary, e.g. `Synced: 2 pushed, 1 pulled`.
+        """
+        parts = [
+            f"{len(paths)} {label}"
+            for paths, label in (
+                (self.pushed, "pushed"),
+                (self.pulled, "pulled"),
+                (self.deleted_remote, "deleted in sandbox"),
+                (self.deleted_local, "deleted locally"),
+            )
+            if paths
+        ]
+        text = f"Synced: {', '.join(parts)}" if parts else "Sandbox already in sync"
+        if self.conflicts:
+            text += f"; conflicts (left unchanged): {', '.join(self.conflicts)}"
+        if self.errors:
+            text += f"; errors: {'; '.join(self.errors)}"
+        return text
+
+
+class SandboxSync:
+    """Keep a local directory and a sandbox directory in sync.
+
+    Call `sync()` whenever both sides should converge (session start, end of
+    each turn, `/sync`). Calls are serialized, so it is safe to run from a
+    worker thread.
+    """
+
+    def __init__(
+        self,
+        backend: SandboxBackendProtocol,
+        local_root: Path,
+        remote_root: str,
+        *,
+        state_dir: Path,
+    ) -> None:
+        """Initialize the sync engine.
+
+        Args:
+            backend: Sandbox to sync with.
+            local_root: Local project directory.
+            remote_root: Absolute directory in the sandbox mirroring `local_root`.
+            state_dir: Directory storing the last synced manifest, so a reused
+                sandbox only needs the changes since the previous session.
+        """
+        self.backend = backend
+        self.local_root = local_root.resolve()
+        self.remote_root = remote_root.rstrip("/") or "/"
+        key = _hash_bytes(
+            f"{backend.id}\0{self.local_root}\0{self.remote_root}".encode()
+        )
+        self.state_path = state_dir / f"{key[:16]}.json"
+        self._lock = threading.Lock()
+        self._git = _get_git_executable()
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> tuple[dict[str, str], dict[str, list]]:
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return dict(data.get("base", {})), dict(data.get("stat", {}))
+        except (OSError, ValueError):
+            return {}, {}
+
+    def _save_state(self, base: dict[str, str], stat: dict[str, list]) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"base": base, "stat": stat}), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    # ------------------------------------------------------------------
+    # Local side
+    # ------------------------------------------------------------------
+
+    def _run_git(self, *args: str, stdin: bytes | None = None) -> bytes | None:
+        """Run git in the local root.
+
+        Returns:
+            Stdout of the command, or None if git is unavailable or failed.
+        """
+        if self._git is None:
+            return None
+        try:
+            # S603: git path is validated via shutil.which(), args are internal
+            result = subprocess.run(  # noqa: S603
+                [self._git, "-C", str(self.local_root), *args],
+                input=stdin,
+                capture_output=True,
+                timeout=_GIT_TIMEOUT,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        # check-ignore exits 1 when nothing is ignored
+        if result.returncode not in {0, 1}:
+            return None
+        return result.stdout
+
+    def _list_local(self) -> tuple[list[str], list[str]]:
+        """List syncable local files and ignored directories.
+
+        Returns:
+            Relative file paths and the relative ignored directories (which
+            are also pruned when listing the sandbox).
+        """
+        listed = self._run_git("ls-files", "-co", "--exclude-standard", "-z")
+        if listed is not None:
+            files = [p for p in os.fsdecode(listed).split("\0") if p]
+            ignored = self._run_git(
+                "ls-files", "-oi", "--exclude-standard", "--directory", "-z"
+            )
+            ignored_dirs = [
+                p.rstrip("/")
+                for p in os.fsdecode(ignored or b"").split("\0")
+                if p.endswith("/")
+            ]
+            return files, ignored_dirs
+
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.local_root):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+            rel_dir = Path(dirpath).relative_to(self.local_root)
+            files.extend((rel_dir / name).as_posix() for name in filenames)
+        return files, []
+
+    def _local_manifest(
+        self, stat_cache: dict[str, list]
+    ) -> tuple[dict[str, str], dict[str, list], list[str]]:
+        """Hash local files, reusing digests whose size and mtime are unchanged.
+
+        Returns:
+            The manifest, the refreshed stat cache and the ignored directories.
+        """
+        files, ignored_dirs = self._list_local()
+        manifest: dict[str, str] = {}
+        new_cache: dict[str, list] = {}
+        for rel in files:
+            path = self.local_root / rel
+            try:
+                st = path.stat()
+            except OSError:
+                # Tracked by git but deleted in the working tree
+                continue
+            if not path.is_file():
+                continue
+            cached = stat_cache.get(rel)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                digest = cached[2]
+            else:
+                try:
+                    digest = _hash_file(path)
+                except OSError:
+                    continue
+            manifest[rel] = digest
+            new_cache[rel] = [st.st_size, st.st_mtime_ns, digest]
+        return manifest, new_cache, ignored_dirs
+
+    def _filter_ignored(self, paths: list[str]) -> set[str]:
+        """Return which of `paths` the local .gitignore rules exclude."""
+        if not paths:
+            return set()
+        output = self._run_git(
+            "check-ignore",
+            "--no-index",
+            "--stdin",
+            "-z",
+            stdin=os.fsencode("\0".join(paths)),
+        )
+        if output is None:
+            return set()
+        return {p for p in os.fsdecode(output).split("\0") if p}
+
+    # ------------------------------------------------------------------
+    # Remote side
+    # ------------------------------------------------------------------
+
+    def _remote_path(self, rel: str) -> str:
+        return str(PurePosixPath(self.remote_root) / rel)
+
+    def _remote_manifest(
+        self, ignored_dirs: list[str], local: dict[str, str]
+    ) -> dict[str, str]:
+        """Hash every file under the remote root in a single command.
+
+        Files that only exist in the sandbox are dropped if the local
+        .gitignore rules exclude them (e.g. build outputs).
+
+        Returns:
+            Mapping of relative path to SHA-256 digest.
+
+        Raises:
+            RuntimeError: If the sandbox could not list or hash its files.
+        """
+        prune = " -o ".join(
+            f"-path {shlex.quote('./' + d)}" for d in [".git", *ignored_dirs]
+        )
+        root = shlex.quote(self.remote_root)
+        # `find` writes to a file rather than a pipe so its exit status is not
+        # masked, and the trailing file count proves the listing is complete.
+        command = (
+            f'mkdir -p {root} && cd {root} && _l="$(mktemp)" && '
+            f'{{ find . \\( {prune} \\) -prune -o -type f -print0 > "$_l" && '
+            'xargs -0 -r sha256sum < "$_l"; }; _s=$?; '
+            f"printf '{_MANIFEST_SENTINEL} %d\\n' "
+            '"$(tr -cd \'\\000\' < "$_l" | wc -c)"; '
+            'rm -f "$_l"; exit "$_s"'
+        )
+        result = self.backend.execute(command)
+        if result.exit_code != 0:
+            msg = f"Could not list sandbox files: {result.output.strip()}"
+            raise RuntimeError(msg)
+        lines = result.output.splitlines()
+        marker, _, count = (lines.pop() if lines else "").partition(" ")
+        complete = marker == _MANIFEST_SENTINEL and count == str(len(lines))
+        if result.truncated or not complete:
+            # Never sync against a partial listing: files missing from it
+            # would be deleted locally.
+            msg = "Could not list sandbox files: the file listing is incomplete"
+            raise RuntimeError(msg)
+        manifest = {}
+        for line in lines:
+            # sha256sum escapes names containing newlines or backslashes with a
+            # leading backslash; those are skipped rather than mis-parsed.
+            digest, sep, name = line.partition("  ")
+            if not sep or line.startswith("\\") or not name.startswith("./"):
+                continue
+            manifest[name[2:]] = digest
+        remote_only = [p for p in manifest if p not in local]
+        for rel in self._filter_ignored(remote_only):
+            manifest.pop(rel, None)
+        return manifest
+
+    # ------------------------------------------------------------------
+    # Transfers
+    # ------------------------------------------------------------------
+
+    def _push(self, paths: list[str], result: SyncResult) -> dict[str, str]:
+        """Upload local files in size-bounded batches.
+
+        Returns:
+            Digests of the files that were uploaded successfully.
+        """
+        parents = sorted(
+            {str(PurePosixPath(self._remote_path(p)).parent) for p in paths}
+        )
+        if parents:
+            self.backend.execute(
+                "mkdir -p " + " ".join(shlex.quote(p) for p in parents)
+            )
+
+        uploaded: dict[str, str] = {}
+        batch: list[tuple[str, str, bytes]] = []
+        batch_bytes = 0
+
+        def flush() -> None:
+            nonlocal batch, batch_bytes
+            if not batch:
+                return
+            responses = self.backend.upload_files(
+                [(self._remote_path(rel), data) for rel, _, data in batch]
+            )
+            for (rel, digest, _), response in zip(batch, responses, strict=False):
+                if response.error is None:
+                    uploaded[rel] = digest
+                else:
+                    result.errors.append(f"{rel}: {response.error}")
+            batch, batch_bytes = [], 0
+
+        for rel in paths:
+            try:
+                data = (self.local_root / rel).read_bytes()
+            except OSError as e:
+                result.errors.append(f"{rel}: {e}")
+                continue
+            batch.append((rel, _hash_bytes(data), data))
+            batch_bytes += len(data)
+            if batch_bytes >= _UPLOAD_BATCH_BYTES:
+                flush()
+        flush()
+        result.pushed.extend(uploaded)
+        return uploaded
+
+    def _pull(self, paths: list[str], result: SyncResult) -> dict[str, str]:
+        """Download sandbox files in batches and write them locally.
+
+        Returns:
+            Digests of the files that were written successfully.
+        """
+        pulled: dict[str, str] = {}
+        for start in range(0, len(paths), _DOWNLOAD_BATCH_FILES):
+            batch = paths[start : start + _DOWNLOAD_BATCH_FILES]
+            responses = self.backend.download_files(
+                [self._remote_path(rel) for rel in batch]
+            )
+            for rel, response in zip(batch, responses, strict=False):
+                if response.error is not None or response.content is None:
+                    result.errors.append(f"{rel}: {response.error or 'no content'}")
+                    continue
+                target = self.local_root / rel
+                try:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(response.content)
+                except OSError as e:
+                    result.errors.append(f"{rel}: {e}")
+                    continue
+                pulled[rel] = _hash_bytes(response.content)
+        result.pulled.extend(pulled)
+        return pulled
+
+    def _delete_remote(self, paths: list[str], result: SyncResult) -> list[str]:
+        if not paths:
+            return []
+        quoted = " ".join(shlex.quote(self._remote_path(p)) for p in paths)
+        response = self.backend.execute(f"rm -f -- {quoted}")
+        if response.exit_code != 0:
+            result.errors.append(f"delete in sandbox failed: {response.output.strip()}")
+            return []
+        result.deleted_remote.extend(paths)
+        return paths
+
+    def _delete_local(self, paths: list[str], result: SyncResult) -> list[str]:
+        deleted = []
+        for rel in paths:
+            try:
+                (self.local_root / rel).unlink(missing_ok=True)
+            except OSError as e:
+                result.errors.append(f"{rel}: {e}")
+                continue
+            deleted.append(rel)
+        result.deleted_local.extend(deleted)
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def sync(self) -> SyncResult:
+        """Bring the local directory and the sandbox in line with each other.
+
+        Returns:
+            What was transferred, deleted or left in conflict.
+        """
+        with self._lock:
+            base, stat_cache = self._load_state()
+            local, stat_cache, ignored_dirs = self._local_manifest(stat_cache)
+            remote = self._remote_manifest(ignored_dirs, local)
+
+            result = SyncResult()
+            new_base: dict[str, str] = {}
+            push: list[str] = []
+            pull: list[str] = []
+            delete_remote: list[str] = []
+            delete_local: list[str] = []
+
+            for rel in sorted(local.keys() | remote.keys() | base.keys()):
+                ours, theirs, before = local.get(rel), remote.get(rel), base.get(rel)
+                if ours == theirs:
+                    if ours is not None:
+                        new_base[rel] = ours
+                    continue
+                local_changed = ours != before
+                remote_changed = theirs != before
+                if local_changed and not remote_changed:
+                    (push if ours is not None else delete_remote).append(rel)
+                elif remote_changed and not local_changed:
+                    (pull if theirs is not None else delete_local).append(rel)
+                else:
+                    result.conflicts.append(rel)
+                    if before is not None:
+                        new_base[rel] = before
+
+            new_base.update(self._push(push, result))
+            new_base.update(self._pull(pull, result))
+            deleted = set(self._delete_remote(delete_remote, result))
+            deleted.update(self._delete_local(delete_local, result))
+            for rel in deleted:
+                stat_cache.pop(rel, None)
+            for rel in push + pull + delete_remote + delete_local:
+                # Failed operations keep their previous base so they are retried
+                if rel not in new_base and rel not in deleted and rel in base:
+                    new_base[rel] = base[rel]
+
+            self._save_state(new_base, stat_cache)
+            return result
+
+
+__all__ = ["SandboxSync", "SyncResult"]
@@ -0,0 +1,202 @@
+"""Content-addressed cache of sandbox setup results.
+
+Running a setup script (installing dependencies, cloning repos) in every fresh
+sandbox is slow. Instead, the first run records which files the script created
+or changed, packs them into a tarball and stores it locally, keyed by a hash of
+the provider, the sandbox's template or image id, its base image and the
+script. Later sandboxes with the same key get the tarball uploaded and unpacked
+in one transfer instead of re-running the script.
+
+The snapshot only captures added and modified files (found by ctime, which
+package managers cannot backdate); files the script deletes are not replayed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from deepagents.backends.protocol import SandboxBackendProtocol
+
+# Identifies the base image well enough that a snapshot taken on one base is
+# never replayed onto another.
+_BASE_FINGERPRINT_COMMAND = (
+    "uname -srm; cat /etc/os-release 2>/dev/null; id -un 2>/dev/null; echo $HOME"
+)
+
+_MARKER_PATH = "/tmp/.deepagents_setup_marker"  # noqa: S108
+_ARCHIVE_PATH = "/tmp/.deepagents_setup.tar.gz"  # noqa: S108
+
+# Pseudo and scratch filesystems that never belong in a snapshot.
+_EXCLUDED_PATHS = ("/proc", "/sys", "/dev", "/run", "/tmp", "/var/tmp")  # noqa: S108
+
+_CAPTURE_COMMAND = (
+    "cd / && find / -xdev \\( "
+    + " -o ".join(f"-path {path}" for path in _EXCLUDED_PATHS)
+    + f" \\) -prune -o \\( -type f -o -type l \\) -cnewer {_MARKER_PATH} -print0"
+    f" | tar --null --no-recursion -czpf {_ARCHIVE_PATH} -T -"
+)
+
+_RESTORE_COMMAND = f"tar -xzpf {_ARCHIVE_PATH} -C / && rm -f {_ARCHIVE_PATH}"
+
+_DEFAULT_MAX_ENTRIES = 10
+
+
+def setup_cache_key(
+    provider: str,
+    base_fingerprint: str,
+    script: str,
+    *,
+    image_id: str | None = None,
+) -> str:
+    """Compute the cache key for a setup script run on a given base.
+
+    Args:
+        provider: Sandbox provider name.
+        base_fingerprint: Result of `fingerprint_base()`.
+        script: Setup script after environment variable expansion.
+        image_id: Template, snapshot or image the sandbox was created from.
+
+    Returns:
+        Hex SHA-256 digest identifying the setup result.
+    """
+    digest = hashlib.sha256()
+    for part in (provider, image_id or "", base_fingerprint.strip(), script):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SetupCache:
+    """Directory of setup snapshot tarballs, one file per cache key."""
+
+    def __init__(
+        self, cache_dir: Path, *, max_entries: int = _DEFAULT_MAX_ENTRIES
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the snapshots. Created on first store.
+            max_entries: Number of snapshots to keep; the least recently used
+                ones are removed when a new snapshot is stored.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def path_for(self, key: str) -> Path:
+        """Return the snapshot path for `key`."""
+        return self.cache_dir / f"{key}.tar.gz"
+
+    def load(self, key: str) -> bytes | None:
+        """Return the snapshot for `key`, or None if it isn't cached."""
+        path = self.path_for(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        # Touch so pruning keeps recently used snapshots.
+        path.touch()
+        return data
+
+    def store(self, key: str, data: bytes) -> None:
+        """Atomically write the snapshot for `key` and prune old entries."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            Path(tmp_name).replace(self.path_for(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._prune()
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Remove the snapshot for `key`, or every snapshot if `key` is None."""
+        paths = [self.path_for(key)] if key else self.cache_dir.glob("*.tar.gz")
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _prune(self) -> None:
+        snapshots = sorted(
+            self.cache_dir.glob("*.tar.gz"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for path in snapshots[self.max_entries :]:
+            path.unlink(missing_ok=True)
+
+
+def fingerprint_base(backend: SandboxBackendProtocol) -> str:
+    """Describe the sandbox's base image from inside the sandbox.
+
+    The provider and template/image id are not included; `setup_cache_key`
+    takes them separately.
+
+    Args:
+        backend: Sandbox to fingerprint.
+
+    Returns:
+        Kernel, OS release, user and home directory as reported by the sandbox.
+    """
+    return backend.execute(_BASE_FINGERPRINT_COMMAND).output
+
+
+def restore_setup_snapshot(
+    backend: SandboxBackendProtocol, cache: SetupCache, key: str
+) -> bool:
+    """Upload and unpack a cached snapshot into the sandbox.
+
+    A snapshot that fails to restore is removed from the cache.
+
+    Returns:
+        True if the snapshot was found and restored.
+    """
+    data = cache.load(key)
+    if data is None:
+        return False
+    upload = backend.upload_files([(_ARCHIVE_PATH, data)])
+    if upload[0].error is None and backend.execute(_RESTORE_COMMAND).exit_code == 0:
+        return True
+    cache.invalidate(key)
+    return False
+
+
+def begin_setup_capture(backend: SandboxBackendProtocol) -> None:
+    """Mark the point in time after which changed files belong to the setup."""
+    backend.execute(f"touch {_MARKER_PATH}")
+
+
+def capture_setup_snapshot(
+    backend: SandboxBackendProtocol, cache: SetupCache, key: str
+) -> bool:
+    """Pack files changed since `begin_setup_capture()` and store them in the cache.
+
+    Returns:
+        True if a snapshot was stored.
+    """
+    try:
+        result = backend.execute(_CAPTURE_COMMAND)
+        if result.exit_code != 0:
+            return False
+        download = backend.download_files([_ARCHIVE_PATH])[0]
+        if download.error is not None or not download.content:
+            return False
+        cache.store(key, download.content)
+        return True
+    finally:
+        backend.execute(f"rm -f {_ARCHIVE_PATH} {_MARKER_PATH}")
+
+
+__all__ = [
+    "SetupCache",
+    "begin_setup_capture",
+    "capture_setup_snapshot",
+    "fingerprint_base",
+    "restore_setup_snapshot",
+    "setup_cache_key",
+]
@@ -34,7 +34,12 @@ from deepagents_cli.config import (
     create_model,
     settings,
 )
-from deepagents_cli.integrations.sandbox_factory import create_sandbox
+from deepagents_cli.integrations.sandbox_factory import (
+    create_sandbox,
+    get_default_working_dir,
+)
+from deepagents_cli.integrations.sandbox_sync import SandboxSync
+from deepagents_cli.project_utils import find_project_root
 from deepagents_cli.sessions import (
     delete_thread_command,
     find_similar_threads,
@@ -188,6 +193,23 @@ def parse_args() -> argparse.Namespace:
         "--sandbox-setup",
         help="Path to setup script to run in sandbox after creation",
     )
+    parser.add_argument(
+        "--rebuild-setup",
+        action="store_true",
+        help="Re-run --sandbox-setup instead of restoring its cached snapshot",
+    )
+    parser.add_argument(
+        "--sandbox-sync",
+        action="store_true",
+        help="Two-way sync the local project with the sandbox working directory "
+        "at startup, after each turn and on /sync",
+    )
+    parser.add_argument(
+        "--persistent-shell",
+        action="store_true",
+        help="Keep one shell session for local commands so cd, exports and "
+        "virtualenvs persist between commands",
+    )
     return parser.parse_args()
 
 
@@ -197,10 +219,14 @@ async def run_textual_cli_async(
     auto_approve: bool = False,
     sandbox_type: str = "none",
     sandbox_id: str | None = None,
+    sandbox_setup: str | None = None,
+    rebuild_setup: bool = False,
+    sandbox_sync: bool = False,
     model_name: str | None = None,
     thread_id: str | None = None,
     is_resumed: bool = False,
     initial_prompt: str | None = None,
+    persistent_shell: bool = False,
 ) -> int:
     """Run the Textual CLI interface (async version).
 
@@ -210,10 +236,15 @@ async def run_textual_cli_async(
         sandbox_type: Type of sandbox
             ("none", "modal", "runloop", "daytona", "langsmith")
         sandbox_id: Optional existing sandbox ID to reuse
+        sandbox_setup: Optional path to a setup script to run in the sandbox
+        rebuild_setup: Whether to re-run the setup script instead of restoring
+            its cached snapshot
+        sandbox_sync: Whether to sync the local project with the sandbox
         model_name: Optional model name to use
         thread_id: Thread ID to use (new or resumed)
         is_resumed: Whether this is a resumed session
         initial_prompt: Optional prompt to auto-submit when session starts
+        persistent_shell: Whether local shell commands share one bash session
 
     Returns:
         The app's return code (0 for success, non-zero for error).
@@ -242,7 +273,12 @@ async def run_textual_cli_async(
         if sandbox_type != "none":
             try:
                 # Create sandbox context manager but keep it open
-                sandbox_cm = create_sandbox(sandbox_type, sandbox_id=sandbox_id)
+                sandbox_cm = create_sandbox(
+                    sandbox_type,
+                    sandbox_id=sandbox_id,
+                    setup_script_path=sandbox_setup,
+                    rebuild_setup=rebuild_setup,
+                )
                 sandbox_backend = sandbox_cm.__enter__()  # noqa: PLC2801
             except (ImportError, ValueError, RuntimeError, NotImplementedError) as e:
                 console.print()
@@ -250,6 +286,20 @@ async def run_textual_cli_async(
                 console.print(Text(str(e), style="dim"))
                 sys.exit(1)
 
+        sync_engine = None
+        if sandbox_backend is not None and sandbox_sync:
+            sync_engine = SandboxSync(
+                sandbox_backend,
+                local_root=find_project_root() or Path.cwd(),
+                remote_root=get_default_working_dir(sandbox_type),
+                state_dir=settings.user_deepagents_dir / "sync",
+            )
+            console.print("[dim]Syncing project with sandbox...[/dim]")
+            try:
+                console.print(f"[dim]{sync_engine.sync().summary()}[/dim]")
+            except RuntimeError as e:
+                console.print(f"[yellow]Sandbox sync failed: {e}[/yellow]")
+
         try:
             agent, composite_backend = create_cli_agent(
                 model=model,
@@ -258,6 +308,7 @@ async def run_textual_cli_async(
                 sandbox=sandbox_backend,
                 sandbox_type=sandbox_type if sandbox_type != "none" else None,
                 auto_approve=auto_approve,
+                persistent_shell=persistent_shell,
                 checkpointer=checkpointer,
             )
         except Exception as e:
@@ -277,6 +328,7 @@ async def run_textual_cli_async(
                 cwd=Path.cwd(),
                 thread_id=thread_id,
                 initial_prompt=initial_prompt,
+                sandbox_sync=sync_engine,
             )
         finally:
             # Clean up sandbox after app exits (success or error)
@@ -403,10 +455,14 @@ def cli_main() -> None:
                         auto_approve=args.auto_approve,
                         sandbox_type=args.sandbox,
                         sandbox_id=args.sandbox_id,
+                        sandbox_setup=getattr(args, "sandbox_setup", None),
+                        rebuild_setup=getattr(args, "rebuild_setup", False),
+                        sandbox_sync=getattr(args, "sandbox_sync", False),
                         model_name=getattr(args, "model", None),
                         thread_id=thread_id,
                         is_resumed=is_resumed,
                         initial_prompt=getattr(args, "initial_prompt", None),
+                        persistent_shell=getattr(args, "persistent_shell", False),
                     )
                 )
             except Exception as e:
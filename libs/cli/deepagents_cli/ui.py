@@ -133,6 +133,12 @@ def format_tool_display(tool_name: str, tool_args: dict) -> str:
                 return f'{prefix} {tool_name}("{command}", timeout={timeout_str})'
             return f'{prefix} {tool_name}("{command}")'
 
+    elif tool_name == "start_job":
+        # Background job: show the command like execute
+        if "command" in tool_args:
+            command = truncate_value(str(tool_args["command"]), 120)
+            return f'{prefix} {tool_name}("{command}")'
+
     elif tool_name == "ls":
         # ls: show directory, or empty if current directory
         if tool_args.get("path"):
@@ -19,7 +19,7 @@ from deepagents_cli.config import CharsetMode, _detect_charset_mode, get_glyphs
 from deepagents_cli.widgets.tool_renderers import get_renderer
 
 # Tools that support expandable command display (must be subset of _SHELL_TOOLS)
-_SHELL_TOOLS: set[str] = {"bash", "shell", "execute"}
+_SHELL_TOOLS: set[str] = {"bash", "shell", "execute", "start_job"}
 
 # Max length for truncated shell command display
 _SHELL_COMMAND_TRUNCATE_LENGTH: int = 120
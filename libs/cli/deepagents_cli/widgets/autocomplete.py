@@ -99,6 +99,7 @@ SLASH_COMMANDS: list[tuple[str, str]] = [
     ("/quit", "Exit app"),
     ("/tokens", "Token usage"),
     ("/threads", "Show thread info"),
+    ("/sync", "Sync project files with the sandbox"),
     ("/version", "Show version"),
 ]
 """Built-in slash commands with descriptions."""
@@ -58,6 +58,7 @@ _TOOLS_WITH_HEADER_INFO: set[str] = {
     "glob",
     "grep",
     "execute",  # sandbox shell
+    "start_job",  # background sandbox shell
     # Shell tools
     "shell",  # local shell
     # Web tools
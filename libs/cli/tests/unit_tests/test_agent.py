@@ -13,6 +13,7 @@ from deepagents_cli.agent import (
     _format_edit_file_description,
     _format_execute_description,
     _format_fetch_url_description,
+    _format_start_job_description,
     _format_task_description,
     _format_web_search_description,
     _format_write_file_description,
@@ -282,6 +283,27 @@ def test_format_execute_description():
     assert "Working Directory:" in description
 
 
+def test_format_start_job_description():
+    """Test start_job command description formatting."""
+    tool_call = cast(
+        "ToolCall",
+        {
+            "name": "start_job",
+            "args": {
+                "command": "npm run dev",
+            },
+            "id": "call-13",
+        },
+    )
+
+    description = _format_start_job_description(
+        tool_call, cast("AgentState[Any]", None), cast("Runtime[Any]", None)
+    )
+
+    assert "Start Background Job: npm run dev" in description
+    assert "Working Directory:" in description
+
+
 class TestGetSystemPromptModelIdentity:
     """Tests for model identity section in get_system_prompt."""
 
@@ -93,3 +93,58 @@ class TestResumeArg:
             args = parse_args()
         assert args.resume_thread == "thread456"
         assert args.initial_prompt == "continue work"
+
+
+class TestPersistentShellArg:
+    """Tests for --persistent-shell argument."""
+
+    def test_flag(self) -> None:
+        """Verify --persistent-shell enables the shell session."""
+        with patch.object(sys, "argv", ["deepagents", "--persistent-shell"]):
+            args = parse_args()
+        assert args.persistent_shell is True
+
+    def test_no_flag(self) -> None:
+        """Verify the shell session is off by default."""
+        with patch.object(sys, "argv", ["deepagents"]):
+            args = parse_args()
+        assert args.persistent_shell is False
+
+
+class TestRebuildSetupArg:
+    """Tests for --rebuild-setup argument."""
+
+    def test_flag(self) -> None:
+        """Verify --rebuild-setup is parsed alongside --sandbox-setup."""
+        with patch.object(
+            sys,
+            "argv",
+            ["deepagents", "--sandbox-setup", "setup.sh", "--rebuild-setup"],
+        ):
+            args = parse_args()
+        assert args.sandbox_setup == "setup.sh"
+        assert args.rebuild_setup is True
+
+    def test_no_flag(self) -> None:
+        """Verify cached setup snapshots are used by default."""
+        with patch.object(sys, "argv", ["deepagents"]):
+            args = parse_args()
+        assert args.rebuild_setup is False
+
+
+class TestSandboxSyncArg:
+    """Tests for --sandbox-sync argument."""
+
+    def test_flag(self) -> None:
+        """Verify --sandbox-sync enables project sync."""
+        with patch.object(
+            sys, "argv", ["deepagents", "--sandbox", "modal", "--sandbox-sync"]
+        ):
+            args = parse_args()
+        assert args.sandbox_sync is True
+
+    def test_no_flag(self) -> None:
+        """Verify sync is off by default."""
+        with patch.object(sys, "argv", ["deepagents"]):
+            args = parse_args()
+        assert args.sandbox_sync is False
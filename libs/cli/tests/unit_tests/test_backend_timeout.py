@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import subprocess
 from unittest.mock import patch
 
 import pytest
+from deepagents.backends.protocol import ExecuteChunk, ExecuteResponse
 
 from deepagents_cli.backends import DEFAULT_EXECUTE_TIMEOUT, CLIShellBackend
 
@@ -25,13 +25,11 @@ class TestPerCommandTimeout:
     def test_per_command_timeout_used(self) -> None:
         """When timeout is passed to execute(), it should override the default."""
         backend = CLIShellBackend(timeout=10, inherit_env=True)
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = subprocess.CompletedProcess(
-                args="echo hello",
-                returncode=0,
-                stdout="hello\n",
-                stderr="",
-            )
+        with patch.object(
+            CLIShellBackend,
+            "_stream_command",
+            return_value=iter([ExecuteResponse(output="hello\n", exit_code=0)]),
+        ) as mock_run:
             backend.execute("echo hello", timeout=300)
             _, kwargs = mock_run.call_args
             assert kwargs["timeout"] == 300
@@ -39,13 +37,11 @@ class TestPerCommandTimeout:
     def test_default_timeout_when_not_specified(self) -> None:
         """When no per-command timeout, the default should be used."""
         backend = CLIShellBackend(timeout=60, inherit_env=True)
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = subprocess.CompletedProcess(
-                args="echo hello",
-                returncode=0,
-                stdout="hello\n",
-                stderr="",
-            )
+        with patch.object(
+            CLIShellBackend,
+            "_stream_command",
+            return_value=iter([ExecuteResponse(output="hello\n", exit_code=0)]),
+        ) as mock_run:
             backend.execute("echo hello")
             _, kwargs = mock_run.call_args
             assert kwargs["timeout"] == 60
@@ -69,16 +65,36 @@ class TestTimeoutErrorMessage:
     def test_timeout_error_includes_retry_guidance(self) -> None:
         """Timeout error message should include guidance to use timeout parameter."""
         backend = CLIShellBackend(timeout=1, inherit_env=True)
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 1)):
-            result = backend.execute("sleep 10")
-            assert "timed out" in result.output.lower()
-            assert "timeout parameter" in result.output.lower()
-            assert result.exit_code == 124
+        result = backend.execute("sleep 10")
+        assert "timed out" in result.output.lower()
+        assert "timeout parameter" in result.output.lower()
+        assert result.exit_code == 124
 
     def test_timeout_error_shows_effective_timeout(self) -> None:
         """Timeout error should show the effective timeout value used."""
         backend = CLIShellBackend(timeout=60, inherit_env=True)
-        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("cmd", 5)):
-            result = backend.execute("sleep 10", timeout=5)
-            assert "5" in result.output
-            assert "timeout parameter" in result.output.lower()
+        result = backend.execute("sleep 10", timeout=1)
+        assert "after 1 seconds" in result.output
+        assert "timeout parameter" in result.output.lower()
+
+
+class TestExecuteStream:
+    """Tests for streaming execution with per-command timeout."""
+
+    def test_stream_yields_chunks_then_response(self) -> None:
+        """Chunks should arrive before the final response."""
+        backend = CLIShellBackend(inherit_env=True)
+        items = list(backend.execute_stream("echo one; echo two >&2; exit 2"))
+        assert isinstance(items[-1], ExecuteResponse)
+        assert all(isinstance(item, ExecuteChunk) for item in items[:-1])
+        streams = {item.stream for item in items[:-1]}
+        assert streams == {"stdout", "stderr"}
+        assert items[-1].exit_code == 2
+        # Exit code is reported by the execute tool, not appended to output
+        assert "Exit code:" not in items[-1].output
+
+    def test_stream_rejects_non_positive_timeout_eagerly(self) -> None:
+        """Invalid timeouts should raise before any iteration happens."""
+        backend = CLIShellBackend(inherit_env=True)
+        with pytest.raises(ValueError, match="timeout must be positive"):
+            backend.execute_stream("echo hello", timeout=0)
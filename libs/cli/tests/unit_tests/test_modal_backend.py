@@ -0,0 +1,48 @@
+"""Tests for the Modal sandbox backend's output handling."""
+
+from types import SimpleNamespace
+
+from deepagents.backends.protocol import ExecuteResponse
+
+from deepagents_cli.integrations.modal import ModalBackend
+
+
+class FakeModalSandbox:
+    """Stands in for `modal.Sandbox`, streaming fixed stdout chunks."""
+
+    object_id = "sb-fake"
+
+    def __init__(self, chunks: list[str]) -> None:
+        self.chunks = chunks
+
+    def exec(self, *_args: str, timeout: int) -> SimpleNamespace:  # noqa: ARG002
+        return SimpleNamespace(
+            stdout=iter(self.chunks),
+            stderr=iter([]),
+            wait=lambda: None,
+            returncode=0,
+        )
+
+
+def _big_output() -> list[str]:
+    return [f"{i:6d}\t{'x' * 100}\n" for i in range(2000)]
+
+
+def test_execute_returns_full_output() -> None:
+    """Verify file operations built on execute() see every line."""
+    chunks = _big_output()
+    result = ModalBackend(FakeModalSandbox(chunks)).execute("cat big")
+
+    assert result == ExecuteResponse(output="".join(chunks), exit_code=0)
+
+
+def test_execute_stream_bounds_final_response() -> None:
+    """Verify the streaming API keeps only the head and tail in its result."""
+    chunks = _big_output()
+    items = list(ModalBackend(FakeModalSandbox(chunks)).execute_stream("cat big"))
+
+    final = items[-1]
+    assert isinstance(final, ExecuteResponse)
+    assert final.truncated
+    assert "Output truncated" in final.output
+    assert "".join(item.output for item in items[:-1]) == "".join(chunks)
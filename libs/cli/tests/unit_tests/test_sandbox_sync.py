@@ -0,0 +1,237 @@
+"""Tests for two-way sync between a local directory and a sandbox."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from deepagents.backends.protocol import (
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+)
+
+from deepagents_cli.integrations.sandbox_sync import SandboxSync, SyncResult
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("sha256sum") is None, reason="requires sha256sum"
+)
+
+
+class DirectorySandbox:
+    """Sandbox stand-in whose filesystem is the local machine's."""
+
+    def __init__(self) -> None:
+        self.id = "sb-1"
+        self.uploaded: list[str] = []
+        self.downloaded: list[str] = []
+
+    def execute(self, command: str) -> ExecuteResponse:
+        result = subprocess.run(
+            ["sh", "-c", command], capture_output=True, text=True, check=False
+        )
+        return ExecuteResponse(
+            output=result.stdout + result.stderr, exit_code=result.returncode
+        )
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        for path, content in files:
+            Path(path).write_bytes(content)
+            self.uploaded.append(path)
+        return [FileUploadResponse(path=path) for path, _ in files]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        self.downloaded.extend(paths)
+        return [
+            FileDownloadResponse(path=path, content=Path(path).read_bytes())
+            for path in paths
+        ]
+
+
+@pytest.fixture
+def roots(tmp_path: Path) -> tuple[Path, Path]:
+    local = tmp_path / "local"
+    remote = tmp_path / "remote"
+    local.mkdir()
+    (local / "src").mkdir()
+    (local / "src" / "app.py").write_text("print('hi')\n")
+    (local / "README.md").write_text("readme\n")
+    return local, remote
+
+
+def _make_sync(
+    tmp_path: Path, roots: tuple[Path, Path], sandbox: DirectorySandbox
+) -> SandboxSync:
+    local, remote = roots
+    return SandboxSync(sandbox, local, str(remote), state_dir=tmp_path / "state")
+
+
+def test_first_sync_pushes_then_is_a_no_op(
+    tmp_path: Path, roots: tuple[Path, Path]
+) -> None:
+    _, remote = roots
+    sandbox = DirectorySandbox()
+    engine = _make_sync(tmp_path, roots, sandbox)
+
+    result = engine.sync()
+
+    assert sorted(result.pushed) == ["README.md", "src/app.py"]
+    assert (remote / "src" / "app.py").read_text() == "print('hi')\n"
+
+    sandbox.uploaded.clear()
+    again = engine.sync()
+    assert not again.changed
+    assert again.summary() == "Sandbox already in sync"
+    assert sandbox.uploaded == []
+
+
+def test_transfers_only_changed_files_in_both_directions(
+    tmp_path: Path, roots: tuple[Path, Path]
+) -> None:
+    local, remote = roots
+    sandbox = DirectorySandbox()
+    engine = _make_sync(tmp_path, roots, sandbox)
+    engine.sync()
+    sandbox.uploaded.clear()
+
+    (local / "README.md").write_text("edited locally\n")
+    (remote / "src" / "generated.py").write_text("x = 1\n")
+
+    result = engine.sync()
+
+    assert result.pushed == ["README.md"]
+    assert result.pulled == ["src/generated.py"]
+    assert sandbox.uploaded == [str(remote / "README.md")]
+    assert (local / "src" / "generated.py").read_text() == "x = 1\n"
+    assert (remote / "README.md").read_text() == "edited locally\n"
+
+
+def test_deletions_propagate(tmp_path: Path, roots: tuple[Path, Path]) -> None:
+    local, remote = roots
+    engine = _make_sync(tmp_path, roots, DirectorySandbox())
+    engine.sync()
+
+    (local / "README.md").unlink()
+    (remote / "src" / "app.py").unlink()
+
+    result = engine.sync()
+
+    assert result.deleted_remote == ["README.md"]
+    assert result.deleted_local == ["src/app.py"]
+    assert not (remote / "README.md").exists()
+    assert not (local / "src" / "app.py").exists()
+
+
+def test_conflicting_edits_are_left_alone(
+    tmp_path: Path, roots: tuple[Path, Path]
+) -> None:
+    local, remote = roots
+    engine = _make_sync(tmp_path, roots, DirectorySandbox())
+    engine.sync()
+
+    (local / "README.md").write_text("local\n")
+    (remote / "README.md").write_text("remote\n")
+
+    result = engine.sync()
+
+    assert result.conflicts == ["README.md"]
+    assert (local / "README.md").read_text() == "local\n"
+    assert (remote / "README.md").read_text() == "remote\n"
+    assert "conflicts" in result.summary()
+
+
+def test_state_persists_across_sessions(
+    tmp_path: Path, roots: tuple[Path, Path]
+) -> None:
+    _make_sync(tmp_path, roots, DirectorySandbox()).sync()
+
+    sandbox = DirectorySandbox()
+    result = _make_sync(tmp_path, roots, sandbox).sync()
+
+    assert result == SyncResult()
+    assert sandbox.uploaded == []
+    assert sandbox.downloaded == []
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="requires git")
+def test_gitignored_paths_are_not_synced(
+    tmp_path: Path, roots: tuple[Path, Path]
+) -> None:
+    local, remote = roots
+    subprocess.run(["git", "init", "-q", str(local)], check=True)
+    (local / ".gitignore").write_text("build/\n*.log\n")
+    (local / "build").mkdir()
+    (local / "build" / "out.bin").write_bytes(b"\0")
+    (local / "debug.log").write_text("noise\n")
+    engine = _make_sync(tmp_path, roots, DirectorySandbox())
+
+    result = engine.sync()
+
+    assert sorted(result.pushed) == [".gitignore", "README.md", "src/app.py"]
+    assert not (remote / "build").exists()
+
+    (remote / "build").mkdir()
+    (remote / "build" / "remote.bin").write_bytes(b"\1")
+    (remote / "server.log").write_text("remote noise\n")
+    (remote / "notes.txt").write_text("keep\n")
+
+    result = engine.sync()
+
+    assert result.pulled == ["notes.txt"]
+    assert not (local / "server.log").exists()
+
+
+class TruncatingSandbox(DirectorySandbox):
+    """Sandbox whose command output loses its middle lines."""
+
+    def __init__(self, *, flag: bool) -> None:
+        super().__init__()
+        self.flag = flag
+
+    def execute(self, command: str) -> ExecuteResponse:
+        response = super().execute(command)
+        lines = response.output.splitlines(keepends=True)
+        return ExecuteResponse(
+            output="".join(lines[:1] + lines[-1:]),
+            exit_code=response.exit_code,
+            truncated=self.flag,
+        )
+
+
+@pytest.mark.parametrize("flag", [True, False])
+def test_partial_remote_listing_never_deletes_local_files(
+    tmp_path: Path, roots: tuple[Path, Path], flag: bool
+) -> None:
+    local, _ = roots
+    _make_sync(tmp_path, roots, DirectorySandbox()).sync()
+    (local / "docs").mkdir()
+    (local / "docs" / "guide.md").write_text("guide\n")
+    _make_sync(tmp_path, roots, DirectorySandbox()).sync()
+
+    with pytest.raises(RuntimeError, match="incomplete"):
+        _make_sync(tmp_path, roots, TruncatingSandbox(flag=flag)).sync()
+
+    assert sorted(p.name for p in local.rglob("*") if p.is_file()) == [
+        "README.md",
+        "app.py",
+        "guide.md",
+    ]
+
+
+class BrokenFindSandbox(DirectorySandbox):
+    """Sandbox whose `find` fails without listing anything."""
+
+    def execute(self, command: str) -> ExecuteResponse:
+        return super().execute(command.replace("find .", "false", 1))
+
+
+def test_failing_find_never_deletes_local_files(
+    tmp_path: Path, roots: tuple[Path, Path]
+) -> None:
+    local, _ = roots
+    _make_sync(tmp_path, roots, DirectorySandbox()).sync()
+
+    with pytest.raises(RuntimeError, match="Could not list sandbox files"):
+        _make_sync(tmp_path, roots, BrokenFindSandbox()).sync()
+
+    assert (local / "README.md").exists()
@@ -0,0 +1,212 @@
+"""Tests for the sandbox setup snapshot cache."""
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from deepagents.backends.protocol import (
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+)
+
+from deepagents_cli.integrations.langsmith import (
+    DEFAULT_TEMPLATE_NAME,
+    LangSmithProvider,
+)
+from deepagents_cli.integrations.sandbox_factory import _run_sandbox_setup
+from deepagents_cli.integrations.setup_cache import (
+    _ARCHIVE_PATH,
+    SetupCache,
+    setup_cache_key,
+)
+
+
+class FakeSandbox:
+    """Records commands and serves a fixed snapshot archive."""
+
+    def __init__(
+        self, *, fingerprint: str = "Linux 6.1 x86_64", image_id: str | None = None
+    ) -> None:
+        self.fingerprint = fingerprint
+        self.image_id = image_id
+        self.commands: list[str] = []
+        self.uploads: list[tuple[str, bytes]] = []
+
+    def execute(self, command: str) -> ExecuteResponse:
+        self.commands.append(command)
+        if command.startswith("uname"):
+            return ExecuteResponse(output=self.fingerprint, exit_code=0)
+        return ExecuteResponse(output="", exit_code=0)
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        self.uploads.extend(files)
+        return [FileUploadResponse(path=path) for path, _ in files]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        return [FileDownloadResponse(path=path, content=b"archive") for path in paths]
+
+    def ran_script(self) -> bool:
+        return any(command.startswith("bash -c") for command in self.commands)
+
+
+def _write_script(tmp_path: Path) -> str:
+    script = tmp_path / "setup.sh"
+    script.write_text("pip install requests\n", encoding="utf-8")
+    return str(script)
+
+
+class TestSetupCacheKey:
+    """Tests for setup_cache_key."""
+
+    def test_stable_for_same_inputs(self) -> None:
+        """Verify the key only depends on its inputs."""
+        assert setup_cache_key("modal", "base\n", "x") == setup_cache_key(
+            "modal", "base", "x"
+        )
+
+    def test_changes_with_any_input(self) -> None:
+        """Verify provider, image, base and script each affect the key."""
+        key = setup_cache_key("modal", "base", "x")
+        assert key != setup_cache_key("daytona", "base", "x")
+        assert key != setup_cache_key("modal", "other", "x")
+        assert key != setup_cache_key("modal", "base", "y")
+        assert key != setup_cache_key("modal", "base", "x", image_id="python:3")
+
+
+class TestSetupCache:
+    """Tests for the on-disk SetupCache."""
+
+    def test_store_and_load(self, tmp_path: Path) -> None:
+        """Verify stored snapshots round-trip and missing keys return None."""
+        cache = SetupCache(tmp_path / "cache")
+        assert cache.load("a") is None
+        cache.store("a", b"data")
+        assert cache.load("a") == b"data"
+
+    def test_prunes_least_recently_used(self, tmp_path: Path) -> None:
+        """Verify only max_entries snapshots are kept."""
+        cache = SetupCache(tmp_path, max_entries=2)
+        for i, key in enumerate(("a", "b", "c")):
+            cache.store(key, b"x")
+            # Make modification times strictly increasing.
+            path = cache.path_for(key)
+            stamp = 1_000_000 + i
+            os.utime(path, (stamp, stamp))
+        cache.store("d", b"x")
+        assert cache.load("a") is None
+        assert cache.load("b") is None
+        assert cache.load("c") == b"x"
+        assert cache.load("d") == b"x"
+
+    def test_invalidate(self, tmp_path: Path) -> None:
+        """Verify invalidate removes one key or every key."""
+        cache = SetupCache(tmp_path)
+        cache.store("a", b"x")
+        cache.store("b", b"x")
+        cache.invalidate("a")
+        assert cache.load("a") is None
+        assert cache.load("b") == b"x"
+        cache.invalidate()
+        assert cache.load("b") is None
+
+
+class TestRunSandboxSetup:
+    """Tests for cached setup in _run_sandbox_setup."""
+
+    def test_first_run_captures_then_restores(self, tmp_path: Path) -> None:
+        """Verify the script runs once and later sandboxes restore the snapshot."""
+        script = _write_script(tmp_path)
+        cache = SetupCache(tmp_path / "cache")
+
+        first = FakeSandbox()
+        _run_sandbox_setup(first, script, provider="modal", cache=cache)
+        assert first.ran_script()
+        assert len(list(cache.cache_dir.glob("*.tar.gz"))) == 1
+
+        second = FakeSandbox()
+        _run_sandbox_setup(second, script, provider="modal", cache=cache)
+        assert not second.ran_script()
+        assert second.uploads == [(_ARCHIVE_PATH, b"archive")]
+        assert any(command.startswith("tar -xzpf") for command in second.commands)
+
+    def test_different_base_misses_cache(self, tmp_path: Path) -> None:
+        """Verify a snapshot is never restored onto a different base image."""
+        script = _write_script(tmp_path)
+        cache = SetupCache(tmp_path / "cache")
+        _run_sandbox_setup(FakeSandbox(), script, provider="modal", cache=cache)
+
+        other = FakeSandbox(fingerprint="Linux 6.1 aarch64")
+        _run_sandbox_setup(other, script, provider="modal", cache=cache)
+        assert other.ran_script()
+        assert not other.uploads
+
+    def test_different_image_or_provider_misses_cache(self, tmp_path: Path) -> None:
+        """Verify the provider and image id are part of the cache key."""
+        script = _write_script(tmp_path)
+        cache = SetupCache(tmp_path / "cache")
+        first = FakeSandbox(image_id="snapshot-a")
+        _run_sandbox_setup(first, script, provider="daytona", cache=cache)
+
+        other_image = FakeSandbox(image_id="snapshot-b")
+        _run_sandbox_setup(other_image, script, provider="daytona", cache=cache)
+        assert other_image.ran_script()
+
+        other_provider = FakeSandbox(image_id="snapshot-a")
+        _run_sandbox_setup(other_provider, script, provider="runloop", cache=cache)
+        assert other_provider.ran_script()
+
+        same = FakeSandbox(image_id="snapshot-a")
+        _run_sandbox_setup(same, script, provider="daytona", cache=cache)
+        assert not same.ran_script()
+
+    def test_key_hashes_provider_and_image_once(self, tmp_path: Path) -> None:
+        """Verify the snapshot is keyed by provider, image, base and script."""
+        script = _write_script(tmp_path)
+        cache = SetupCache(tmp_path / "cache")
+        sandbox = FakeSandbox(image_id="snapshot-a")
+        _run_sandbox_setup(sandbox, script, provider="daytona", cache=cache)
+
+        key = setup_cache_key(
+            "daytona",
+            "Linux 6.1 x86_64",
+            "pip install requests\n",
+            image_id="snapshot-a",
+        )
+        assert [path.name for path in cache.cache_dir.iterdir()] == [f"{key}.tar.gz"]
+
+    def test_rebuild_reruns_script(self, tmp_path: Path) -> None:
+        """Verify rebuild ignores the cached snapshot and re-captures."""
+        script = _write_script(tmp_path)
+        cache = SetupCache(tmp_path / "cache")
+        _run_sandbox_setup(FakeSandbox(), script, provider="modal", cache=cache)
+
+        rebuilt = FakeSandbox()
+        _run_sandbox_setup(rebuilt, script, provider="modal", cache=cache, rebuild=True)
+        assert rebuilt.ran_script()
+        assert not rebuilt.uploads
+        assert len(list(cache.cache_dir.glob("*.tar.gz"))) == 1
+
+    def test_without_cache_just_runs_script(self, tmp_path: Path) -> None:
+        """Verify the uncached path runs the script and nothing else."""
+        sandbox = FakeSandbox()
+        _run_sandbox_setup(sandbox, _write_script(tmp_path))
+        assert sandbox.commands == ["bash -c 'pip install requests\n'"]
+
+
+class TestLangSmithImageId:
+    """Tests for the image id LangSmith sandboxes report."""
+
+    def test_image_id_is_the_existing_templates_image(self) -> None:
+        """Verify an existing template's image is used, not the default one."""
+        with patch("langsmith.sandbox.SandboxClient") as client_cls:
+            client = client_cls.return_value
+            client.get_template.return_value = SimpleNamespace(image="python:3.12")
+            client.create_sandbox.return_value.run.return_value = SimpleNamespace(
+                exit_code=0
+            )
+            backend = LangSmithProvider(api_key="test").get_or_create()
+
+        client.create_template.assert_not_called()
+        assert backend.image_id == f"{DEFAULT_TEMPLATE_NAME}:python:3.12"
@@ -1,9 +1,14 @@
 """Memory backends for pluggable file storage."""
 
+from deepagents.backends.archive import ArchiveBackend
 from deepagents.backends.composite import CompositeBackend
+from deepagents.backends.executor import BackendExecutor, ExecutorStats
 from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.git import GitBackend
 from deepagents.backends.local_shell import LocalShellBackend
+from deepagents.backends.overlay import OverlayBackend
 from deepagents.backends.protocol import BackendProtocol
+from deepagents.backends.sqlite import SqliteBackend
 from deepagents.backends.state import StateBackend
 from deepagents.backends.store import (
     BackendContext,
@@ -12,12 +17,18 @@ from deepagents.backends.store import (
 )
 
 __all__ = [
+    "ArchiveBackend",
     "BackendContext",
+    "BackendExecutor",
     "BackendProtocol",
     "CompositeBackend",
+    "ExecutorStats",
     "FilesystemBackend",
+    "GitBackend",
     "LocalShellBackend",
     "NamespaceFactory",
+    "OverlayBackend",
+    "SqliteBackend",
     "StateBackend",
     "StoreBackend",
 ]
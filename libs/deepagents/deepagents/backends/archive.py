@@ -0,0 +1,353 @@
+"""`ArchiveBackend`: read-only access to the files in a zip or tar archive.
+
+Files are served straight from the archive, without extracting it:
+
+- For zip files the central directory is the index; members are read (and
+  inflated if compressed) individually through `zipfile`.
+- For uncompressed tar files the member headers are scanned once to record
+  where each file's data starts, and the archive is memory-mapped so reading a
+  member is a slice of the map.
+
+Creating the backend only checks the archive's format. The index is built on
+first use and shared by all threads, so the backend can be created per agent
+(or composed under `CompositeBackend`, or used as the lower layer of an
+`OverlayBackend`) regardless of the archive's size.
+
+Examples:
+    ```python
+    from deepagents.backends.archive import ArchiveBackend
+    from deepagents.backends.overlay import OverlayBackend
+    from deepagents.backends.state import StateBackend
+
+    dataset = ArchiveBackend("/data/repo-snapshot.tar", strip_components=1)
+    backend = lambda rt: OverlayBackend(lower=dataset, upper=StateBackend(rt))
+    ```
+"""
+
+from __future__ import annotations
+
+import mmap
+import tarfile
+import threading
+import zipfile
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path, PurePosixPath
+
+import wcmatch.glob as wcglob
+
+from deepagents.backends.cancellation import current_cancel_token
+from deepagents.backends.protocol import (
+    BackendProtocol,
+    EditResult,
+    FileDownloadResponse,
+    FileInfo,
+    FileUploadResponse,
+    GrepMatch,
+    WriteResult,
+)
+from deepagents.backends.utils import (
+    _filter_files_by_path,
+    _glob_search_files,
+    _normalize_path,
+    check_empty_content,
+    format_content_with_line_numbers,
+)
+
+_COMPRESSED_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bzip2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+
+@dataclass(frozen=True)
+class _Member:
+    name: str
+    """Member name inside the archive."""
+
+    offset: int
+    """Start of the file data inside a tar archive (unused for zip)."""
+
+    size: int
+    modified_at: str
+
+
+class ArchiveBackend(BackendProtocol):
+    """Read-only backend serving files from a zip or uncompressed tar archive.
+
+    Members appear as absolute paths (`dir/file.txt` becomes `/dir/file.txt`).
+    Directories are derived from member paths. Only regular files are served;
+    links and special members are skipped.
+
+    All write operations fail with an error result.
+    """
+
+    def __init__(
+        self,
+        archive_path: str | Path,
+        *,
+        strip_components: int = 0,
+        max_file_size_mb: int = 10,
+    ) -> None:
+        """Open an archive without indexing it.
+
+        Args:
+            archive_path: Path to a `.zip` file or an uncompressed `.tar` file.
+            strip_components: Number of leading path components to drop from
+                member names, like `tar --strip-components`. Useful for
+                archives that wrap everything in a single top-level directory.
+            max_file_size_mb: Members larger than this are skipped by
+                `grep_raw`. Defaults to 10 MB.
+
+        Raises:
+            ValueError: If the file is a compressed tar or not an archive.
+                Compressed tars cannot be read at random offsets; decompress
+                them once (or repack as zip) before serving them.
+        """
+        self.archive_path = Path(archive_path).resolve()
+        self.strip_components = strip_components
+        self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+
+        if zipfile.is_zipfile(self.archive_path):
+            self._kind = "zip"
+        else:
+            with self.archive_path.open("rb") as f:
+                head = f.read(512)
+            for magic, codec in _COMPRESSED_MAGIC.items():
+                if head.startswith(magic):
+                    msg = f"{self.archive_path} is {codec}-compressed; ArchiveBackend needs a zip or an uncompressed tar"
+                    raise ValueError(msg)
+            if head[257:262] != b"ustar":
+                msg = f"{self.archive_path} is not a zip or tar archive"
+                raise ValueError(msg)
+            self._kind = "tar"
+
+        self._lock = threading.Lock()
+        self._members: dict[str, _Member] | None = None
+        self._dirs: dict[str, set[str]] = {}
+        self._zip: zipfile.ZipFile | None = None
+        self._map: mmap.mmap | None = None
+
+    def close(self) -> None:
+        """Release the archive's file handle and memory map."""
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+            if self._map is not None:
+                self._map.close()
+            self._zip = self._map = None
+            self._members = None
+
+    def _virtual_path(self, name: str) -> str | None:
+        parts = [p for p in PurePosixPath(name).parts if p not in ("", ".", "/")]
+        if ".." in parts or len(parts) <= self.strip_components:
+            return None
+        return "/" + "/".join(parts[self.strip_components :])
+
+    def _index(self) -> dict[str, _Member]:
+        """Build the member index on first use."""
+        members = self._members
+        if members is not None:
+            return members
+        with self._lock:
+            if self._members is not None:
+                return self._members
+            members = {}
+            if self._kind == "zip":
+                self._zip = zipfile.ZipFile(self.archive_path)
+                for info in self._zip.infolist():
+                    path = self._virtual_path(info.filename)
+                    if path is None or info.is_dir():
+                        continue
+                    modified = datetime(*info.date_time, tzinfo=UTC).isoformat()
+                    members[path] = _Member(info.filename, 0, info.file_size, modified)
+            else:
+                with tarfile.open(self.archive_path, mode="r:") as tar:
+                    for info in tar:
+                        path = self._virtual_path(info.name)
+                        if path is None or not info.isfile():
+                            continue
+                        modified = datetime.fromtimestamp(info.mtime, tz=UTC).isoformat()
+                        members[path] = _Member(info.name, info.offset_data, info.size, modified)
+                with self.archive_path.open("rb") as f:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            dirs: dict[str, set[str]] = {"/": set()}
+            for path in members:
+                child, parent = path, str(PurePosixPath(path).parent)
+                while True:
+                    # Once a known directory is reached, its ancestors are too.
+                    known = parent in dirs
+                    dirs.setdefault(parent, set()).add(child)
+                    if known:
+                        break
+                    child, parent = parent, str(PurePosixPath(parent).parent)
+            self._dirs = dirs
+            self._members = members
+            return members
+
+    def _read_bytes(self, member: _Member) -> bytes:
+        if self._kind == "zip":
+            assert self._zip is not None  # noqa: S101  # set by _index()
+            return self._zip.read(member.name)
+        assert self._map is not None  # noqa: S101  # set by _index()
+        return self._map[member.offset : member.offset + member.size]
+
+    def _read_text(self, path: str) -> str | None:
+        member = self._index().get(path)
+        if member is None:
+            return None
+        try:
+            return self._read_bytes(member).decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+    def ls_info(self, path: str) -> list[FileInfo]:
+        """List the files and directories directly inside `path`.
+
+        Args:
+            path: Absolute directory path.
+
+        Returns:
+            `FileInfo` dicts sorted by path. Directories have a trailing `/`.
+        """
+        members = self._index()
+        try:
+            directory = _normalize_path(path)
+        except ValueError:
+            return []
+        infos: list[FileInfo] = []
+        for child in self._dirs.get(directory, ()):
+            member = members.get(child)
+            if member is None:
+                infos.append({"path": child + "/", "is_dir": True, "size": 0, "modified_at": ""})
+            else:
+                infos.append({"path": child, "is_dir": False, "size": member.size, "modified_at": member.modified_at})
+        infos.sort(key=lambda fi: fi["path"])
+        return infos
+
+    def read(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = 2000,
+    ) -> str:
+        """Read a member with line numbers.
+
+        Args:
+            file_path: Absolute path of the member.
+            offset: Line offset to start reading from (0-indexed).
+            limit: Maximum number of lines to read.
+
+        Returns:
+            Formatted content with line numbers, or an error message.
+        """
+        if file_path not in self._index():
+            return f"Error: File '{file_path}' not found"
+        content = self._read_text(file_path)
+        if content is None:
+            return f"Error reading file '{file_path}': not a UTF-8 text file"
+
+        empty_msg = check_empty_content(content)
+        if empty_msg:
+            return empty_msg
+
+        lines = content.splitlines()
+        if offset >= len(lines):
+            return f"Error: Line offset {offset} exceeds file length ({len(lines)} lines)"
+        return format_content_with_line_numbers(lines[offset : offset + limit], start_line=offset + 1)
+
+    def grep_raw(
+        self,
+        pattern: str,
+        path: str | None = None,
+        glob: str | None = None,
+    ) -> list[GrepMatch] | str:
+        """Search members for a literal text pattern.
+
+        Args:
+            pattern: Literal string to search for (not a regex).
+            path: Directory or member to search. Defaults to the archive root.
+            glob: Optional glob matched against member file names.
+
+        Returns:
+            Matches sorted by path and line number. Binary members and members
+            over the size limit are skipped.
+        """
+        try:
+            candidates = _filter_files_by_path(self._index(), _normalize_path(path))
+        except ValueError:
+            return []
+        token = current_cancel_token()
+        matches: list[GrepMatch] = []
+        for member_path in sorted(candidates):
+            if token is not None and token.cancelled:
+                break
+            if glob and not wcglob.globmatch(PurePosixPath(member_path).name, glob, flags=wcglob.BRACE):
+                continue
+            if candidates[member_path].size > self.max_file_size_bytes:
+                continue
+            content = self._read_text(member_path)
+            if content is None:
+                continue
+            matches.extend(
+                {"path": member_path, "line": line_num, "text": line} for line_num, line in enumerate(content.splitlines(), 1) if pattern in line
+            )
+        return matches
+
+    def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
+        """Find members matching a glob pattern relative to `path`.
+
+        Returns:
+            `FileInfo` dicts for matching members, most recently modified first.
+        """
+        members = self._index()
+        found = _glob_search_files({p: {"modified_at": m.modified_at} for p, m in members.items()}, pattern, path)
+        if found == "No files found":
+            return []
+        return [{"path": p, "is_dir": False, "size": members[p].size, "modified_at": members[p].modified_at} for p in found.split("\n")]
+
+    def write(self, file_path: str, content: str) -> WriteResult:  # noqa: ARG002
+        """Refuse to write: archives are read-only."""
+        return WriteResult(error=f"Cannot write to {file_path}: the archive backend is read-only")
+
+    def edit(
+        self,
+        file_path: str,
+        old_string: str,  # noqa: ARG002
+        new_string: str,  # noqa: ARG002
+        replace_all: bool = False,  # noqa: ARG002, FBT001, FBT002
+    ) -> EditResult:
+        """Refuse to edit: archives are read-only."""
+        return EditResult(error=f"Cannot edit {file_path}: the archive backend is read-only")
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Refuse uploads: archives are read-only.
+
+        Returns:
+            A `permission_denied` response for every file.
+        """
+        return [FileUploadResponse(path=path, error="permission_denied") for path, _ in files]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Return the raw bytes of archive members.
+
+        Returns:
+            One `FileDownloadResponse` per input path, in order.
+        """
+        members = self._index()
+        responses: list[FileDownloadResponse] = []
+        for path in paths:
+            member = members.get(path)
+            if member is not None:
+                responses.append(FileDownloadResponse(path=path, content=self._read_bytes(member), error=None))
+            elif path.rstrip("/") in self._dirs:
+                responses.append(FileDownloadResponse(path=path, content=None, error="is_directory"))
+            else:
+                responses.append(FileDownloadResponse(path=path, content=None, error="file_not_found"))
+        return responses
+
+
+__all__ = ["ArchiveBackend"]
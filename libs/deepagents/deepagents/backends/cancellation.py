@@ -0,0 +1,169 @@
+"""Cooperative cancellation for blocking backend work.
+
+Async backend methods mostly run their synchronous counterparts in a worker
+thread. Cancelling the awaiting task does not stop that thread, so a shell
+command or `rg` process would keep running until it finished on its own.
+
+`run_cancellable()` runs the blocking call in a worker thread with a
+`CancellationToken` bound to a context variable. Code that starts processes or loops over many files looks the token up with
+`current_cancel_token()` and registers a callback that stops the work, e.g.
+by killing a process group. When the awaiting task is cancelled the token
+fires, so the work stops within milliseconds instead of at its next timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterator
+    from concurrent.futures import Executor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CancellationToken:
+    """Thread-safe flag plus callbacks run once when it is set."""
+
+    def __init__(self) -> None:
+        """Create a token that has not been cancelled."""
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether `cancel()` has been called."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Set the token and run the registered callbacks (once)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # noqa: BLE001
+                logger.warning("Cancellation callback failed", exc_info=True)
+
+    def register(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run `callback` when the token is cancelled.
+
+        If the token is already cancelled, `callback` runs immediately.
+
+        Args:
+            callback: Function that stops the work in progress. It runs in
+                the thread that calls `cancel()`, so it must not block.
+
+        Returns:
+            A function that unregisters `callback`; call it once the work has
+            finished so the token does not act on a stale process.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def _unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+_current_token: contextvars.ContextVar[CancellationToken | None] = contextvars.ContextVar("deepagents_cancel_token", default=None)
+
+
+def current_cancel_token() -> CancellationToken | None:
+    """Return the token of the enclosing `run_cancellable()` call, if any."""
+    return _current_token.get()
+
+
+def _context_with_token(token: CancellationToken) -> contextvars.Context:
+    """Copy the current context with `token` bound, without touching the caller's."""
+    context = contextvars.copy_context()
+    context.run(_current_token.set, token)
+    return context
+
+
+async def run_cancellable(
+    func: Callable[..., T],
+    /,
+    *args: Any,
+    on_cancel: Callable[[], None] | None = None,
+    executor: Executor | None = None,
+) -> T:
+    """Run a blocking function in a worker thread, stopping it on cancellation.
+
+    Like `asyncio.to_thread()`, except that `func` sees a `CancellationToken`
+    via `current_cancel_token()` which fires if the awaiting task is cancelled.
+
+    Args:
+        func: Blocking function to run.
+        *args: Positional arguments for `func`.
+        on_cancel: Optional extra callback run when the awaiting task is
+            cancelled, in addition to those registered by `func` itself.
+        executor: Executor to run `func` on. Defaults to the event loop's
+            default executor.
+
+    Returns:
+        The return value of `func`.
+    """
+    token = CancellationToken()
+    if on_cancel is not None:
+        token.register(on_cancel)
+    context = _context_with_token(token)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, context.run, func, *args)
+    except asyncio.CancelledError:
+        token.cancel()
+        raise
+
+
+async def iterate_cancellable(iterator: Iterator[T], *, executor: Executor | None = None) -> AsyncIterator[T]:
+    """Drive a blocking iterator from worker threads, stopping it on cancellation.
+
+    Items are produced one at a time in worker threads that all share one
+    `CancellationToken`, so a generator that registers a callback on its first
+    step is stopped when the consuming task is cancelled at any later step.
+
+    Args:
+        iterator: Blocking iterator, typically a generator that has not
+            started yet.
+        executor: Executor to run each step on. Defaults to the event loop's
+            default executor.
+
+    Yields:
+        The iterator's items.
+    """
+    token = CancellationToken()
+    context = _context_with_token(token)
+    loop = asyncio.get_running_loop()
+    done = object()
+    while True:
+        try:
+            item = await loop.run_in_executor(executor, context.run, next, iterator, done)
+        except asyncio.CancelledError:
+            token.cancel()
+            raise
+        if item is done:
+            return
+        yield item  # type: ignore[misc]
+
+
+__all__ = [
+    "CancellationToken",
+    "current_cancel_token",
+    "iterate_cancellable",
+    "run_cancellable",
+]
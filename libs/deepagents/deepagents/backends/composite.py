@@ -19,15 +19,18 @@ Examples:
 """
 
 from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator
 
 from deepagents.backends.protocol import (
     BackendProtocol,
     EditResult,
+    ExecuteChunk,
     ExecuteResponse,
     FileDownloadResponse,
     FileInfo,
     FileUploadResponse,
     GrepMatch,
+    JobStatus,
     SandboxBackendProtocol,
     WriteResult,
 )
@@ -461,6 +464,54 @@ class CompositeBackend(BackendProtocol):
                 pass
         return res
 
+    def append(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Append to a file, routing to appropriate backend.
+
+        Args:
+            file_path: Absolute file path.
+            content: Content to append.
+
+        Returns:
+            Success message or Command object, or error message on failure.
+        """
+        backend, stripped_key = self._get_backend_and_key(file_path)
+        res = backend.append(stripped_key, content)
+        if res.files_update:
+            try:
+                runtime = getattr(self.default, "runtime", None)
+                if runtime is not None:
+                    state = runtime.state
+                    files = state.get("files", {})
+                    files.update(res.files_update)
+                    state["files"] = files
+            except Exception:
+                pass
+        return res
+
+    async def aappend(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Async version of append."""
+        backend, stripped_key = self._get_backend_and_key(file_path)
+        res = await backend.aappend(stripped_key, content)
+        if res.files_update:
+            try:
+                runtime = getattr(self.default, "runtime", None)
+                if runtime is not None:
+                    state = runtime.state
+                    files = state.get("files", {})
+                    files.update(res.files_update)
+                    state["files"] = files
+            except Exception:
+                pass
+        return res
+
     def execute(
         self,
         command: str,
@@ -508,6 +559,82 @@ class CompositeBackend(BackendProtocol):
             "To enable execution, provide a default backend that implements SandboxBackendProtocol."
         )
 
+    def execute_stream(
+        self,
+        command: str,
+    ) -> Iterator[ExecuteChunk | ExecuteResponse]:
+        """Stream shell command output via default backend.
+
+        Raises:
+            NotImplementedError: If default backend doesn't implement SandboxBackendProtocol.
+        """
+        if isinstance(self.default, SandboxBackendProtocol):
+            return self.default.execute_stream(command)
+
+        raise NotImplementedError(
+            "Default backend doesn't support command execution (SandboxBackendProtocol). "
+            "To enable execution, provide a default backend that implements SandboxBackendProtocol."
+        )
+
+    def aexecute_stream(
+        self,
+        command: str,
+    ) -> AsyncIterator[ExecuteChunk | ExecuteResponse]:
+        """Async version of execute_stream."""
+        if isinstance(self.default, SandboxBackendProtocol):
+            return self.default.aexecute_stream(command)
+
+        raise NotImplementedError(
+            "Default backend doesn't support command execution (SandboxBackendProtocol). "
+            "To enable execution, provide a default backend that implements SandboxBackendProtocol."
+        )
+
+    def _job_backend(self) -> SandboxBackendProtocol:
+        """Return the default backend for background job calls.
+
+        Raises:
+            NotImplementedError: If default backend doesn't implement SandboxBackendProtocol.
+        """
+        if isinstance(self.default, SandboxBackendProtocol):
+            return self.default
+
+        raise NotImplementedError(
+            "Default backend doesn't support command execution (SandboxBackendProtocol). "
+            "To enable execution, provide a default backend that implements SandboxBackendProtocol."
+        )
+
+    def start_job(self, command: str) -> JobStatus:
+        """Start a background job via default backend."""
+        return self._job_backend().start_job(command)
+
+    async def astart_job(self, command: str) -> JobStatus:
+        """Async version of start_job."""
+        return await self._job_backend().astart_job(command)
+
+    def poll_job(self, job_id: str) -> JobStatus:
+        """Check a background job via default backend."""
+        return self._job_backend().poll_job(job_id)
+
+    async def apoll_job(self, job_id: str) -> JobStatus:
+        """Async version of poll_job."""
+        return await self._job_backend().apoll_job(job_id)
+
+    def tail_job(self, job_id: str, lines: int = 50) -> JobStatus:
+        """Read a background job's output via default backend."""
+        return self._job_backend().tail_job(job_id, lines)
+
+    async def atail_job(self, job_id: str, lines: int = 50) -> JobStatus:
+        """Async version of tail_job."""
+        return await self._job_backend().atail_job(job_id, lines)
+
+    def kill_job(self, job_id: str) -> JobStatus:
+        """Kill a background job via default backend."""
+        return self._job_backend().kill_job(job_id)
+
+    async def akill_job(self, job_id: str) -> JobStatus:
+        """Async version of kill_job."""
+        return await self._job_backend().akill_job(job_id)
+
     def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Upload multiple files, batching by backend for efficiency.
 
@@ -649,3 +776,36 @@ class CompositeBackend(BackendProtocol):
                 )
 
         return results  # type: ignore[return-value]
+
+    def _etag_batches(self, paths: list[str]) -> dict[BackendProtocol, list[tuple[int, str]]]:
+        """Group paths by their target backend as `(index, stripped_path)` pairs."""
+        backend_batches: dict[BackendProtocol, list[tuple[int, str]]] = defaultdict(list)
+        for idx, path in enumerate(paths):
+            backend, stripped_path = self._get_backend_and_key(path)
+            backend_batches[backend].append((idx, stripped_path))
+        return backend_batches
+
+    def file_etags(self, paths: list[str]) -> list[str | None]:
+        """Return version tags, asking each backend once for all of its paths.
+
+        Args:
+            paths: List of file paths.
+
+        Returns:
+            One tag per input path, in order.
+        """
+        results: list[str | None] = [None] * len(paths)
+        for backend, batch in self._etag_batches(paths).items():
+            indices, stripped_paths = zip(*batch, strict=True)
+            for orig_idx, etag in zip(indices, backend.file_etags(list(stripped_paths)), strict=False):
+                results[orig_idx] = etag
+        return results
+
+    async def afile_etags(self, paths: list[str]) -> list[str | None]:
+        """Async version of file_etags."""
+        results: list[str | None] = [None] * len(paths)
+        for backend, batch in self._etag_batches(paths).items():
+            indices, stripped_paths = zip(*batch, strict=True)
+            for orig_idx, etag in zip(indices, await backend.afile_etags(list(stripped_paths)), strict=False):
+                results[orig_idx] = etag
+        return results
@@ -0,0 +1,146 @@
+"""`BackendExecutor`: a bounded thread pool for one backend's blocking calls.
+
+By default the async methods of `BackendProtocol` and `SandboxProvider` run
+their blocking counterparts on the event loop's default executor, which they
+share with everything else in the process (LangGraph checkpoint I/O, other
+tools, ...). A burst of slow sandbox calls can occupy every worker and stall
+that unrelated work.
+
+Passing an executor as the `executor=` keyword (accepted by
+`FilesystemBackend`, `LocalShellBackend` and `BaseSandbox`), or assigning it to
+any backend's (or provider's) `executor` attribute, moves its blocking calls
+onto that pool instead:
+
+```python
+backend = LocalShellBackend(root_dir=".", executor=BackendExecutor(max_workers=4, name="shell"))
+sandbox = MySandbox(...)
+sandbox.executor = BackendExecutor(max_workers=4, name="sandbox")
+```
+
+`BackendExecutor` also records how long calls waited for a free worker, so a
+pool that is too small for its workload is visible in `stats()`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutorStats:
+    """Snapshot of a `BackendExecutor`'s load."""
+
+    max_workers: int
+    """Maximum number of calls that run at the same time."""
+
+    running: int
+    """Calls currently running on a worker thread."""
+
+    queued: int
+    """Calls submitted but still waiting for a free worker."""
+
+    completed: int
+    """Calls that have finished (successfully or not)."""
+
+    total_wait_time: float
+    """Seconds all started calls spent waiting in the queue, summed."""
+
+    max_wait_time: float
+    """Longest time a single call waited in the queue, in seconds."""
+
+    @property
+    def mean_wait_time(self) -> float:
+        """Average queue wait of the calls that have started, in seconds."""
+        started = self.running + self.completed
+        return self.total_wait_time / started if started else 0.0
+
+
+class BackendExecutor(ThreadPoolExecutor):
+    """Thread pool with a fixed concurrency limit and queue metrics.
+
+    A drop-in `concurrent.futures.Executor`: anything beyond `max_workers`
+    concurrent calls waits in a FIFO queue instead of spawning more threads.
+    """
+
+    def __init__(self, max_workers: int = 8, *, name: str = "deepagents-backend") -> None:
+        """Create the pool.
+
+        Args:
+            max_workers: Maximum number of blocking calls that run at once.
+            name: Prefix for the worker thread names.
+
+        Raises:
+            ValueError: If `max_workers` is not positive.
+        """
+        if max_workers <= 0:
+            msg = f"max_workers must be positive, got {max_workers}"
+            raise ValueError(msg)
+        super().__init__(max_workers=max_workers, thread_name_prefix=name)
+        self._limit = max_workers
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        """Schedule `fn(*args, **kwargs)`, recording its queue wait and completion.
+
+        Returns:
+            Future for the call's result.
+        """
+        submitted = time.monotonic()
+        with self._stats_lock:
+            self._queued += 1
+
+        def run() -> T:
+            waited = time.monotonic() - submitted
+            with self._stats_lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._stats_lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        try:
+            future = super().submit(run)
+        except BaseException:
+            self._forget_queued()
+            raise
+        # A future can only be cancelled while it is still queued.
+        future.add_done_callback(lambda f: self._forget_queued() if f.cancelled() else None)
+        return future
+
+    def _forget_queued(self) -> None:
+        with self._stats_lock:
+            self._queued -= 1
+
+    def stats(self) -> ExecutorStats:
+        """Return a consistent snapshot of the pool's load."""
+        with self._stats_lock:
+            return ExecutorStats(
+                max_workers=self._limit,
+                running=self._running,
+                queued=self._queued,
+                completed=self._completed,
+                total_wait_time=self._total_wait,
+                max_wait_time=self._max_wait,
+            )
+
+
+__all__ = ["BackendExecutor", "ExecutorStats"]
@@ -1,14 +1,19 @@
 """`FilesystemBackend`: Read and write files directly from the filesystem."""
 
+import contextlib
 import json
 import os
 import re
+import signal
+import stat
 import subprocess
+from concurrent.futures import Executor
 from datetime import datetime
 from pathlib import Path
 
 import wcmatch.glob as wcglob
 
+from deepagents.backends.cancellation import current_cancel_token
 from deepagents.backends.protocol import (
     BackendProtocol,
     EditResult,
@@ -18,6 +23,7 @@ from deepagents.backends.protocol import (
     GrepMatch,
     WriteResult,
 )
+from deepagents.backends.snapshot import WorkspaceSnapshots
 from deepagents.backends.utils import (
     check_empty_content,
     format_content_with_line_numbers,
@@ -25,6 +31,17 @@ from deepagents.backends.utils import (
 )
 
 
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    """SIGKILL a helper process started with `start_new_session=True`."""
+    if proc.returncode is not None:
+        return
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+
+
 class FilesystemBackend(BackendProtocol):
     """Backend that reads and writes files directly from the filesystem.
 
@@ -71,6 +88,9 @@ class FilesystemBackend(BackendProtocol):
         root_dir: str | Path | None = None,
         virtual_mode: bool = False,
         max_file_size_mb: int = 10,
+        snapshot_dir: str | Path | None = None,
+        *,
+        executor: Executor | None = None,
     ) -> None:
         """Initialize filesystem backend.
 
@@ -104,10 +124,24 @@ class FilesystemBackend(BackendProtocol):
                 grep's Python fallback search.
 
                 Files exceeding this limit are skipped during search. Defaults to 10 MB.
+            snapshot_dir: Directory for `snapshot()` data. Defaults to
+                `.deepagents/snapshots` under the root directory, which is left
+                out of listings and searches. Keep it on the same filesystem as
+                the root so snapshots can use reflinks instead of copies.
+            executor: Executor the async methods run their blocking
+                counterparts on, e.g. a `BackendExecutor`. Defaults to the event
+                loop's default executor.
         """
+        self.executor = executor
         self.cwd = Path(root_dir).resolve() if root_dir else Path.cwd()
         self.virtual_mode = virtual_mode
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        store = Path(snapshot_dir).resolve() if snapshot_dir else self.cwd / ".deepagents" / "snapshots"
+        self._snapshots = WorkspaceSnapshots(self.cwd, store)
+
+    def _in_snapshot_store(self, path: Path) -> bool:
+        """Return whether `path` is the snapshot store or inside it."""
+        return path.is_relative_to(self._snapshots.store)
 
     def _resolve_path(self, key: str) -> Path:
         """Resolve a file path with security checks.
@@ -157,7 +191,7 @@ class FilesystemBackend(BackendProtocol):
                 `is_dir=True`.
         """
         dir_path = self._resolve_path(path)
-        if not dir_path.exists() or not dir_path.is_dir():
+        if not dir_path.exists() or not dir_path.is_dir() or self._in_snapshot_store(dir_path):
             return []
 
         results: list[FileInfo] = []
@@ -169,7 +203,7 @@ class FilesystemBackend(BackendProtocol):
 
         # List only direct children (non-recursive)
         try:
-            for child_path in dir_path.iterdir():
+            for child_path in (child for child in dir_path.iterdir() if child != self._snapshots.store):
                 try:
                     is_file = child_path.is_file()
                     is_dir = child_path.is_dir()
@@ -382,6 +416,41 @@ class FilesystemBackend(BackendProtocol):
         except (OSError, UnicodeDecodeError, UnicodeEncodeError) as e:
             return EditResult(error=f"Error editing file '{file_path}': {e}")
 
+    def append(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Append content to a file, creating it if needed.
+
+        The file is opened with `O_APPEND`, so only the new content is written
+        and the existing content is never read.
+
+        Args:
+            file_path: Path of the file to append to.
+            content: Text content to append.
+
+        Returns:
+            `WriteResult` with path on success, or error message if the append
+                fails. External storage sets `files_update=None`.
+        """
+        resolved_path = self._resolve_path(file_path)
+
+        try:
+            resolved_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Write securely
+            flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+            if hasattr(os, "O_NOFOLLOW"):
+                flags |= os.O_NOFOLLOW
+            fd = os.open(resolved_path, flags, 0o644)
+            with os.fdopen(fd, "a", encoding="utf-8") as f:
+                f.write(content)
+
+            return WriteResult(path=file_path, files_update=None)
+        except (OSError, UnicodeEncodeError) as e:
+            return WriteResult(error=f"Error appending to file '{file_path}': {e}")
+
     def grep_raw(
         self,
         pattern: str,
@@ -431,7 +500,7 @@ class FilesystemBackend(BackendProtocol):
 
         Returns:
             Dict mapping file paths to list of `(line_number, line_text)` tuples.
-                Returns `None` if ripgrep is unavailable or times out.
+                Returns `None` if ripgrep is unavailable, times out or is cancelled.
         """
         cmd = ["rg", "--json", "-F"]  # -F enables fixed-string (literal) mode
         if include_glob:
@@ -439,18 +508,32 @@ class FilesystemBackend(BackendProtocol):
         cmd.extend(["--", pattern, str(base_full)])
 
         try:
-            proc = subprocess.run(  # noqa: S603
+            proc = subprocess.Popen(  # noqa: S603
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=30,
-                check=False,
+                # Own process group, so a timeout or cancellation can SIGKILL it
+                start_new_session=os.name == "posix",
             )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        except FileNotFoundError:
+            return None
+        token = current_cancel_token()
+        unregister = token.register(lambda: _kill_process_group(proc)) if token is not None else None
+        try:
+            stdout, _ = proc.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(proc)
+            proc.wait()
+            return None
+        finally:
+            if unregister is not None:
+                unregister()
+        if token is not None and token.cancelled:
             return None
 
         results: dict[str, list[tuple[int, str]]] = {}
-        for line in proc.stdout.splitlines():
+        for line in stdout.splitlines():
             try:
                 data = json.loads(line)
             except json.JSONDecodeError:
@@ -462,6 +545,8 @@ class FilesystemBackend(BackendProtocol):
             if not ftext:
                 continue
             p = Path(ftext)
+            if self._in_snapshot_store(p):
+                continue
             if self.virtual_mode:
                 try:
                     virt = "/" + str(p.resolve().relative_to(self.cwd))
@@ -495,8 +580,13 @@ class FilesystemBackend(BackendProtocol):
 
         results: dict[str, list[tuple[int, str]]] = {}
         root = base_full if base_full.is_dir() else base_full.parent
+        token = current_cancel_token()
 
         for fp in root.rglob("*"):
+            if token is not None and token.cancelled:
+                break
+            if self._in_snapshot_store(fp):
+                continue
             try:
                 if not fp.is_file():
                     continue
@@ -545,9 +635,14 @@ class FilesystemBackend(BackendProtocol):
             return []
 
         results: list[FileInfo] = []
+        token = current_cancel_token()
         try:
             # Use recursive globbing to match files in subdirectories as tests expect
             for matched_path in search_path.rglob(pattern):
+                if token is not None and token.cancelled:
+                    break
+                if self._in_snapshot_store(matched_path):
+                    continue
                 try:
                     is_file = matched_path.is_file()
                 except (PermissionError, OSError):
@@ -637,6 +732,44 @@ class FilesystemBackend(BackendProtocol):
 
         return responses
 
+    def snapshot(self, snapshot_id: str | None = None) -> str:
+        """Record the current state of the root directory.
+
+        Files unchanged since the previous snapshot are shared with it, and
+        the rest are cloned with reflinks where the filesystem supports them
+        and copied otherwise. The snapshot store is hidden from `ls_info`,
+        `glob_info` and `grep_raw`.
+
+        Args:
+            snapshot_id: Name for the snapshot, e.g. the LangGraph checkpoint id
+                it belongs to. A random id is generated if omitted.
+
+        Returns:
+            The snapshot id to pass to `restore()`.
+        """
+        return self._snapshots.create(snapshot_id)
+
+    def restore(self, snapshot_id: str) -> None:
+        """Roll the root directory back to a snapshot.
+
+        Files changed since the snapshot are restored, files created since are
+        deleted, and unchanged files are left untouched. Only files whose size,
+        timestamps or inode changed are read. The snapshot is kept, so it can
+        be restored again.
+
+        Args:
+            snapshot_id: Id returned by `snapshot()`.
+        """
+        self._snapshots.restore(snapshot_id)
+
+    def delete_snapshot(self, snapshot_id: str) -> None:
+        """Delete a snapshot created by `snapshot()`."""
+        self._snapshots.delete(snapshot_id)
+
+    def list_snapshots(self) -> list[str]:
+        """Return the ids of existing snapshots, oldest first."""
+        return self._snapshots.list()
+
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Download multiple files from the filesystem.
 
@@ -666,3 +799,23 @@ class FilesystemBackend(BackendProtocol):
                 responses.append(FileDownloadResponse(path=path, content=None, error="invalid_path"))
             # Let other errors propagate
         return responses
+
+    def file_etags(self, paths: list[str]) -> list[str | None]:
+        """Return a tag per file built from its size, mtime and inode, without reading it.
+
+        Args:
+            paths: List of file paths.
+
+        Returns:
+            One tag per input path; `None` for missing files, directories and
+            symlinks (which `download_files` refuses to follow).
+        """
+        etags: list[str | None] = []
+        for path in paths:
+            try:
+                st = self._resolve_path(path).lstat()
+            except (OSError, ValueError):
+                etags.append(None)
+                continue
+            etags.append(f"{st.st_size}:{st.st_mtime_ns}:{st.st_ino}" if stat.S_ISREG(st.st_mode) else None)
+        return etags
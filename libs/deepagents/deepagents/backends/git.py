@@ -0,0 +1,413 @@
+"""`GitBackend`: read-only access to a repository at a fixed commit, without a checkout.
+
+Paths are resolved through the commit's tree objects and blobs are read from the
+object database by a long-lived `git cat-file --batch` process, so git itself
+handles loose objects and memory-mapped packfiles. Decoded trees are cached;
+they are immutable, so the cache never needs invalidating. `grep_raw` runs
+`git grep` against the commit.
+
+Examples:
+    ```python
+    from deepagents.backends.git import GitBackend
+
+    backend = GitBackend("/srv/repos/project", ref="origin/main")
+    backend.read("/README.md")
+    ```
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import threading
+import weakref
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, NamedTuple, Self
+
+from deepagents.backends.cancellation import current_cancel_token
+from deepagents.backends.protocol import (
+    BackendProtocol,
+    EditResult,
+    FileDownloadResponse,
+    FileInfo,
+    FileUploadResponse,
+    GrepMatch,
+    WriteResult,
+)
+from deepagents.backends.utils import (
+    _glob_search_files,
+    _normalize_path,
+    check_empty_content,
+    format_content_with_line_numbers,
+)
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+_TREE_MODE = "40000"
+_GREP_TIMEOUT = 60
+_BLOB_MODES = frozenset({"100644", "100755"})
+
+
+class _TreeEntry(NamedTuple):
+    mode: str
+    sha: str
+
+
+def _stop_process(proc: subprocess.Popen[bytes]) -> None:
+    """Kill a helper process, reap it and close its pipes."""
+    proc.kill()
+    proc.wait()
+    for stream in (proc.stdin, proc.stdout):
+        if stream is not None:
+            stream.close()
+
+
+class _CatFile:
+    """A `git cat-file --batch` or `--batch-check` process shared by all threads.
+
+    The process is also stopped when the `_CatFile` is garbage collected, so a
+    backend that is never closed does not leave it running.
+    """
+
+    def __init__(self, repo: Path, option: str) -> None:
+        self._args = ["git", "-C", str(repo), "cat-file", option]
+        self._lock = threading.Lock()
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._finalizer: weakref.finalize | None = None
+
+    def _stdio(self) -> tuple[IO[bytes], IO[bytes]]:
+        if self._proc is None or self._proc.poll() is not None:
+            if self._finalizer is not None:
+                self._finalizer()
+            self._proc = subprocess.Popen(self._args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)  # noqa: S603
+            self._finalizer = weakref.finalize(self, _stop_process, self._proc)
+        assert self._proc.stdin is not None  # noqa: S101
+        assert self._proc.stdout is not None  # noqa: S101
+        return self._proc.stdin, self._proc.stdout
+
+    def query(self, spec: str) -> tuple[str, int, bytes | None] | None:
+        """Return `(type, size, content)` for `spec`, or `None` if it does not exist.
+
+        `content` is `None` for `--batch-check` processes.
+        """
+        with self._lock:
+            stdin, stdout = self._stdio()
+            stdin.write(spec.encode() + b"\n")
+            stdin.flush()
+            header = stdout.readline().decode().split()
+            if len(header) != 3:  # noqa: PLR2004  # "<spec> missing"
+                return None
+            _, kind, size_text = header
+            size = int(size_text)
+            if self._args[-1] != "--batch":
+                return kind, size, None
+            content = stdout.read(size)
+            stdout.read(1)  # trailing newline
+            return kind, size, content
+
+    def close(self) -> None:
+        with self._lock:
+            if self._finalizer is not None:
+                self._finalizer()
+            self._proc = None
+            self._finalizer = None
+
+
+def _git(repo: Path, *args: str) -> str:
+    cmd = ["git", "-C", str(repo), *args]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False)  # noqa: S603
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+class GitBackend(BackendProtocol):
+    """Read-only backend serving a git repository's files at one commit.
+
+    The ref is resolved to a commit once, when the backend is created, so later
+    ref updates do not change what the backend serves. Only regular files and
+    directories are exposed; symlinks and submodules are skipped. Every file
+    reports the commit's timestamp as `modified_at`.
+
+    All write operations fail with an error result. Use the backend as a context
+    manager, or call `close`, to stop its helper processes; they are otherwise
+    stopped when the backend is garbage collected.
+    """
+
+    def __init__(self, repo_path: str | Path, ref: str = "HEAD") -> None:
+        """Resolve `ref` in the repository at `repo_path`.
+
+        Args:
+            repo_path: Path to a repository (worktree or bare).
+            ref: Branch, tag, commit or any other revision git understands.
+
+        Raises:
+            ValueError: If `git` is unavailable or `ref` does not name a commit.
+        """
+        if shutil.which("git") is None:
+            msg = "GitBackend requires the git executable"
+            raise ValueError(msg)
+        self.repo_path = Path(repo_path).resolve()
+        self.commit = _git(self.repo_path, "rev-parse", "--verify", "--end-of-options", f"{ref}^{{commit}}").strip()
+        self._objects = _CatFile(self.repo_path, "--batch")
+        self._sizes = _CatFile(self.repo_path, "--batch-check")
+        self._trees: dict[str, dict[str, _TreeEntry]] = {}
+        self._file_sizes: dict[str, int] | None = None
+        self._modified_at: str | None = None
+
+    def close(self) -> None:
+        """Stop the helper `git cat-file` processes."""
+        self._objects.close()
+        self._sizes.close()
+
+    def __enter__(self) -> Self:
+        """Return the backend for use in a `with` block."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the backend on exit."""
+        self.close()
+
+    @property
+    def modified_at(self) -> str:
+        """Committer timestamp of the commit, in ISO format."""
+        if self._modified_at is None:
+            found = self._objects.query(self.commit)
+            timestamp = 0
+            if found is not None and found[2] is not None:
+                for line in found[2].decode(errors="replace").splitlines():
+                    if line.startswith("committer "):
+                        timestamp = int(line.rsplit(" ", 2)[1])
+                        break
+            self._modified_at = datetime.fromtimestamp(timestamp, tz=UTC).isoformat()
+        return self._modified_at
+
+    def _tree(self, sha: str) -> dict[str, _TreeEntry]:
+        """Decode (and cache) a tree object."""
+        cached = self._trees.get(sha)
+        if cached is not None:
+            return cached
+        found = self._objects.query(sha)
+        data = found[2] if found is not None and found[0] == "tree" else None
+        entries: dict[str, _TreeEntry] = {}
+        pos = 0
+        while data is not None and pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            mode = data[pos:space].decode()
+            name = data[space + 1 : nul].decode(errors="surrogateescape")
+            entries[name] = _TreeEntry(mode, data[nul + 1 : nul + 21].hex())
+            pos = nul + 21
+        self._trees[sha] = entries
+        return entries
+
+    def _lookup(self, path: str) -> _TreeEntry | None:
+        """Resolve a virtual path to its tree entry, walking from the commit's root tree."""
+        try:
+            normalized = _normalize_path(path)
+        except ValueError:
+            return None
+        entry = _TreeEntry(_TREE_MODE, f"{self.commit}^{{tree}}")
+        for part in normalized.strip("/").split("/"):
+            if not part:
+                continue
+            if entry.mode != _TREE_MODE:
+                return None
+            found = self._tree(entry.sha).get(part)
+            if found is None:
+                return None
+            entry = found
+        return entry
+
+    def _blob(self, path: str) -> bytes | None:
+        entry = self._lookup(path)
+        if entry is None or entry.mode not in _BLOB_MODES:
+            return None
+        found = self._objects.query(entry.sha)
+        return found[2] if found is not None else None
+
+    def ls_info(self, path: str) -> list[FileInfo]:
+        """List the files and directories directly inside `path`.
+
+        Args:
+            path: Absolute directory path.
+
+        Returns:
+            `FileInfo` dicts sorted by path. Directories have a trailing `/`.
+        """
+        entry = self._lookup(path)
+        if entry is None or entry.mode != _TREE_MODE:
+            return []
+        prefix = _normalize_path(path).rstrip("/") + "/"
+        infos: list[FileInfo] = []
+        for name, child in self._tree(entry.sha).items():
+            if child.mode == _TREE_MODE:
+                infos.append({"path": f"{prefix}{name}/", "is_dir": True, "size": 0, "modified_at": self.modified_at})
+            elif child.mode in _BLOB_MODES:
+                found = self._sizes.query(child.sha)
+                size = found[1] if found is not None else 0
+                infos.append({"path": f"{prefix}{name}", "is_dir": False, "size": size, "modified_at": self.modified_at})
+        infos.sort(key=lambda fi: fi["path"])
+        return infos
+
+    def read(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = 2000,
+    ) -> str:
+        """Read a file at the commit with line numbers.
+
+        Args:
+            file_path: Absolute file path.
+            offset: Line offset to start reading from (0-indexed).
+            limit: Maximum number of lines to read.
+
+        Returns:
+            Formatted content with line numbers, or an error message.
+        """
+        data = self._blob(file_path)
+        if data is None:
+            return f"Error: File '{file_path}' not found"
+        try:
+            content = data.decode("utf-8")
+        except UnicodeDecodeError:
+            return f"Error reading file '{file_path}': not a UTF-8 text file"
+
+        empty_msg = check_empty_content(content)
+        if empty_msg:
+            return empty_msg
+
+        lines = content.splitlines()
+        if offset >= len(lines):
+            return f"Error: Line offset {offset} exceeds file length ({len(lines)} lines)"
+        return format_content_with_line_numbers(lines[offset : offset + limit], start_line=offset + 1)
+
+    def grep_raw(
+        self,
+        pattern: str,
+        path: str | None = None,
+        glob: str | None = None,
+    ) -> list[GrepMatch] | str:
+        """Search the commit's text files for a literal pattern with `git grep`.
+
+        Args:
+            pattern: Literal string to search for (not a regex).
+            path: Directory or file to search. Defaults to the repository root.
+            glob: Optional glob matched against file names.
+
+        Returns:
+            Matches sorted by path and line number, or an error string if the
+            search takes longer than `_GREP_TIMEOUT` seconds.
+        """
+        try:
+            scope = _normalize_path(path).strip("/")
+        except ValueError:
+            return []
+        pathspecs: list[str] = []
+        if glob:
+            pathspecs.append(f":(glob){scope + '/' if scope else ''}**/{glob}")
+        elif scope:
+            pathspecs.append(f":(literal){scope}")
+
+        args = ["git", "-C", str(self.repo_path), "grep", "-n", "-I", "-F", "--null", "--full-name", "-e", pattern, self.commit, "--", *pathspecs]
+        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)  # noqa: S603
+        token = current_cancel_token()
+        unregister = token.register(proc.kill) if token is not None else None
+        try:
+            output, _ = proc.communicate(timeout=_GREP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            return f"Error: Search timed out after {_GREP_TIMEOUT} seconds. Narrow the search with a more specific path or glob."
+        finally:
+            if unregister is not None:
+                unregister()
+
+        prefix = f"{self.commit}:"
+        matches: list[GrepMatch] = []
+        for line in output.decode("utf-8", errors="replace").splitlines():
+            parts = line.split("\0", 2)
+            if len(parts) != 3 or not parts[0].startswith(prefix):  # noqa: PLR2004
+                continue
+            file_part, line_num, text = parts
+            matches.append({"path": "/" + file_part[len(prefix) :], "line": int(line_num), "text": text})
+        matches.sort(key=lambda m: (m["path"], m["line"]))
+        return matches
+
+    def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
+        """Find files at the commit matching a glob pattern relative to `path`.
+
+        The first call lists the whole commit once with `git ls-tree`.
+
+        Returns:
+            `FileInfo` dicts for matching files.
+        """
+        if self._file_sizes is None:
+            listing = _git(self.repo_path, "ls-tree", "-r", "-l", "-z", "--full-tree", self.commit)
+            sizes: dict[str, int] = {}
+            for record in listing.split("\0"):
+                meta, _, name = record.partition("\t")
+                fields = meta.split()
+                if len(fields) == 4 and fields[0] in _BLOB_MODES:  # noqa: PLR2004
+                    sizes["/" + name] = int(fields[3])
+            self._file_sizes = sizes
+        files = {p: {"modified_at": self.modified_at} for p in self._file_sizes}
+        found = _glob_search_files(files, pattern, path)
+        if found == "No files found":
+            return []
+        return sorted(
+            ({"path": p, "is_dir": False, "size": self._file_sizes[p], "modified_at": self.modified_at} for p in found.split("\n")),
+            key=lambda fi: fi["path"],
+        )
+
+    def write(self, file_path: str, content: str) -> WriteResult:  # noqa: ARG002
+        """Refuse to write: the backend serves a fixed commit."""
+        return WriteResult(error=f"Cannot write to {file_path}: the git backend is read-only")
+
+    def edit(
+        self,
+        file_path: str,
+        old_string: str,  # noqa: ARG002
+        new_string: str,  # noqa: ARG002
+        replace_all: bool = False,  # noqa: ARG002, FBT001, FBT002
+    ) -> EditResult:
+        """Refuse to edit: the backend serves a fixed commit."""
+        return EditResult(error=f"Cannot edit {file_path}: the git backend is read-only")
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Refuse uploads: the backend serves a fixed commit.
+
+        Returns:
+            A `permission_denied` response for every file.
+        """
+        return [FileUploadResponse(path=path, error="permission_denied") for path, _ in files]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Return the raw bytes of files at the commit.
+
+        Returns:
+            One `FileDownloadResponse` per input path, in order.
+        """
+        responses: list[FileDownloadResponse] = []
+        for path in paths:
+            entry = self._lookup(path)
+            if entry is not None and entry.mode == _TREE_MODE:
+                responses.append(FileDownloadResponse(path=path, content=None, error="is_directory"))
+                continue
+            content = self._blob(path)
+            if content is None:
+                responses.append(FileDownloadResponse(path=path, content=None, error="file_not_found"))
+            else:
+                responses.append(FileDownloadResponse(path=path, content=content, error=None))
+        return responses
+
+
+__all__ = ["GitBackend"]
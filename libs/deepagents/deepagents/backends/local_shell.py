@@ -7,16 +7,354 @@ on the host machine with full system access.
 
 from __future__ import annotations
 
+import codecs
+import contextlib
 import os
+import queue
+import shlex
+import shutil
+import signal
 import subprocess
+import sys
+import tempfile
+import threading
+import time
 import uuid
-from typing import TYPE_CHECKING
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Literal
 
+from deepagents.backends.cancellation import current_cancel_token
 from deepagents.backends.filesystem import FilesystemBackend
-from deepagents.backends.protocol import ExecuteResponse, SandboxBackendProtocol
+from deepagents.backends.protocol import ExecuteChunk, ExecuteMetrics, ExecuteResponse, JobStatus, SandboxBackendProtocol
+from deepagents.backends.utils import HeadTailBuffer, collect_execute_stream
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Callable, Generator, Iterator
+    from concurrent.futures import Executor
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Commands run through a function so an interrupt can `return` from the whole
+# command (not just kill its current child) while the shell, along with its
+# working directory and environment, survives.
+_SESSION_PRELUDE = "__deepagents_run() { eval -- \"$1\"; }\ntrap 'return 130 2>/dev/null' INT\n"
+
+# How long an interrupted command gets to unwind before the session is killed.
+_INTERRUPT_GRACE_SECONDS = 2.0
+
+# Finished background jobs whose status and log are kept for `poll_job()` and
+# `tail_job()`; older ones are dropped, with their logs, as new jobs start.
+_MAX_FINISHED_JOBS = 32
+
+_SESSION_RESTART_NOTE = "\n\n[Shell session restarted: working directory and environment variables were reset.]"
+
+
+def _kill_process_tree(process: subprocess.Popen[bytes]) -> None:
+    """Kill a command started in its own session, including its children."""
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        process.kill()
+    process.wait()
+
+
+def _signal_process_tree(process: subprocess.Popen[bytes]) -> None:
+    """SIGKILL a command's process group without reaping it.
+
+    Safe to call from another thread while the owner is waiting on `process`:
+    the owner sees EOF on the pipes and reaps the exit status as usual.
+    """
+    if process.returncode is not None:
+        return
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+
+
+def _on_cancel(callback: Callable[[], None]) -> Callable[[], None]:
+    """Register `callback` with the current cancellation token, if there is one.
+
+    Returns:
+        A function that unregisters the callback.
+    """
+    token = current_cancel_token()
+    return token.register(callback) if token is not None else lambda: None
+
+
+def _pump_stream(
+    pipe: IO[bytes],
+    name: Literal["stdout", "stderr"],
+    events: queue.Queue[tuple[Literal["stdout", "stderr"], bytes | None]],
+) -> None:
+    """Forward raw reads from a pipe to `events`, then signal EOF with `None`."""
+    try:
+        while data := pipe.read1(_READ_CHUNK_SIZE):  # type: ignore[attr-defined]
+            events.put((name, data))
+    except (OSError, ValueError):
+        pass
+    finally:
+        events.put((name, None))
+
+
+def _pump_output(process: subprocess.Popen[bytes]) -> queue.Queue[tuple[Literal["stdout", "stderr"], bytes | None]]:
+    """Start reader threads forwarding `process`'s stdout and stderr to one queue.
+
+    Returns:
+        Queue of `(stream, data)` events; `data` is `None` once a stream hits EOF.
+    """
+    events: queue.Queue[tuple[Literal["stdout", "stderr"], bytes | None]] = queue.Queue()
+    for pipe, name in ((process.stdout, "stdout"), (process.stderr, "stderr")):
+        threading.Thread(target=_pump_stream, args=(pipe, name, events), daemon=True).start()
+    return events
+
+
+def _split_at_marker(text: str, marker: str) -> tuple[str, str, str | None]:
+    """Split session output at the end-of-command marker.
+
+    Returns:
+        Tuple of `(output, pending, status)`. `output` can be emitted now,
+        `pending` must be kept until more data arrives, and `status` is the
+        rest of the marker line (`None` until the full line has been read).
+    """
+    done_at = text.find(marker)
+    line_end = text.find("\n", done_at) if done_at != -1 else -1
+    if line_end != -1:
+        # Drop the newline the sentinel printf adds before the marker.
+        return text[:done_at].removesuffix("\n"), "", text[done_at + len(marker) : line_end].strip()
+    # Hold back enough to recognize a marker split across reads.
+    hold_from = max(done_at - 1, 0) if done_at != -1 else max(len(text) - len(marker) - 1, 0)
+    return text[:hold_from], text[hold_from:], None
+
+
+def _ulimit_prefix(cpu_time_limit: int | None, memory_limit_bytes: int | None) -> str:
+    """Build a `ulimit` line that applies CPU and address-space limits to a shell command.
+
+    The limits are set by the spawned shell itself rather than in a `preexec_fn`,
+    which is not safe to run in a child forked from a multi-threaded process.
+    """
+    limits: list[str] = []
+    if cpu_time_limit is not None:
+        # The kernel sends SIGXCPU at the soft limit and SIGKILL at the hard one.
+        limits += [f"ulimit -S -t {cpu_time_limit}", f"ulimit -H -t {cpu_time_limit + 1}"]
+    if memory_limit_bytes is not None:
+        limits.append(f"ulimit -v {max(memory_limit_bytes // 1024, 1)}")
+    return " && ".join(limits) + " || exit 126\n"
+
+
+def _wait_with_rusage(process: subprocess.Popen[bytes], deadline: float) -> tuple[int, object | None]:
+    """Reap `process` with `os.wait4()` so its resource usage can be reported.
+
+    Falls back to `Popen.wait()` (and no usage) where `wait4` is unavailable.
+
+    Raises:
+        subprocess.TimeoutExpired: If the process is still running at `deadline`.
+    """
+    if not hasattr(os, "wait4") or process.returncode is not None:
+        # No per-process rusage without wait4, or once Popen has already reaped
+        # the child (e.g. after killing it for exceeding the output limit).
+        return process.wait(timeout=max(deadline - time.monotonic(), 0)), None
+    delay = 0.001
+    while True:
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid:
+            # Tell Popen the child is gone so it never tries to reap it again.
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return process.returncode, rusage
+        if time.monotonic() >= deadline:
+            raise subprocess.TimeoutExpired(process.args, 0)
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+def _build_metrics(*, started: float, rusage: object | None, output_bytes: int, output: str) -> ExecuteMetrics:
+    """Assemble `ExecuteMetrics` from a `wait4` rusage (if any) and output counters."""
+    metrics = ExecuteMetrics(
+        wall_time=time.monotonic() - started,
+        output_bytes=output_bytes,
+        returned_bytes=len(output.encode("utf-8")),
+    )
+    if rusage is not None:
+        metrics.user_time = rusage.ru_utime  # type: ignore[attr-defined]
+        metrics.system_time = rusage.ru_stime  # type: ignore[attr-defined]
+        # ru_maxrss is in kilobytes on Linux but in bytes on macOS.
+        scale = 1 if sys.platform == "darwin" else 1024
+        metrics.max_rss_bytes = rusage.ru_maxrss * scale  # type: ignore[attr-defined]
+    return metrics
+
+
+@dataclass
+class _Job:
+    """A background command started by `LocalShellBackend.start_job()`."""
+
+    process: subprocess.Popen[bytes]
+    log_path: Path
+    finalizer: weakref.finalize
+    """Kills the job if the backend is garbage collected first."""
+
+
+def _read_log_tail(path: Path, lines: int, max_bytes: int) -> str:
+    """Return at most the last `lines` lines and `max_bytes` bytes of a log file."""
+    try:
+        with path.open("rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - max_bytes, 0))
+            data = f.read()
+    except OSError:
+        return ""
+    text = data.decode("utf-8", errors="replace")
+    if size > max_bytes:
+        # Drop the partial first line left by seeking into the middle of the file.
+        text = text.partition("\n")[2]
+    return "\n".join(text.splitlines()[-lines:]) if lines > 0 else ""
+
+
+class _ShellSession:
+    """Long-lived bash process that runs one command at a time.
+
+    Each command is followed by a unique sentinel on stdout (carrying the exit
+    code) and on stderr, which marks where the command's output ends. If the
+    shell dies, the next command transparently starts a new one.
+    """
+
+    def __init__(self, *, cwd: str, env: dict[str, str]) -> None:
+        self._cwd = cwd
+        self._env = env
+        self._process: subprocess.Popen[bytes] | None = None
+        self._events: queue.Queue[tuple[Literal["stdout", "stderr"], bytes | None]] = queue.Queue()
+        self.lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the shell process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self) -> subprocess.Popen[bytes]:
+        process = subprocess.Popen(  # noqa: S603
+            [shutil.which("bash") or "/bin/bash", "--noprofile", "--norc"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=self._env,
+            cwd=self._cwd,
+            start_new_session=True,
+        )
+        events = _pump_output(process)
+        weakref.finalize(self, _kill_process_tree, process)
+        self._process, self._events = process, events
+        self._send(_SESSION_PRELUDE)
+        return process
+
+    def _send(self, script: str) -> None:
+        stdin = self._process.stdin  # type: ignore[union-attr]
+        stdin.write(script.encode("utf-8"))  # type: ignore[union-attr]
+        stdin.flush()  # type: ignore[union-attr]
+
+    def _submit(self, script: str) -> None:
+        """Send a command script, (re)starting the shell if needed."""
+        if not self.alive:
+            self.close()
+            self._start()
+        else:
+            # Drop anything background jobs printed since the previous command.
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    self._events.get_nowait()
+        try:
+            self._send(script)
+        except OSError:
+            # The shell died between commands; start over once.
+            self.close()
+            self._start()
+            self._send(script)
+
+    def close(self) -> None:
+        """Kill the shell and everything it started."""
+        if self._process is not None:
+            _kill_process_tree(self._process)
+            self._process = None
+
+    def interrupt(self) -> None:
+        """Send SIGINT to the running command without killing the shell."""
+        if self._process is not None and self.alive:
+            with contextlib.suppress(ProcessLookupError, PermissionError):
+                os.killpg(self._process.pid, signal.SIGINT)
+
+    def run(
+        self,
+        command: str,
+        *,
+        timeout: float,
+    ) -> Generator[tuple[Literal["stdout", "stderr"], str], None, tuple[int | None, bool, bool]]:
+        """Run `command` in the session, yielding `(stream, text)` as output arrives.
+
+        Must be called with `lock` held. Closing the generator before it
+        finishes kills the session.
+
+        Returns:
+            Tuple of `(exit_code, timed_out, restarted)`. `exit_code` is `None`
+            when the command had to be killed along with the shell.
+        """
+        marker = f"__DEEPAGENTS_DONE_{uuid.uuid4().hex}__"
+        self._submit(f"__deepagents_run {shlex.quote(command)} </dev/null\nprintf '\\n%s %s\\n' {marker} \"$?\"\nprintf '\\n%s\\n' {marker} >&2\n")
+        process = self._process
+        decoders = {name: codecs.getincrementaldecoder("utf-8")(errors="replace") for name in ("stdout", "stderr")}
+        pending = {"stdout": "", "stderr": ""}
+        finished: set[str] = set()
+        exit_code: int | None = None
+        timed_out = shell_exited = completed = False
+        deadline = time.monotonic() + timeout
+        try:
+            while len(finished) < len(pending):
+                try:
+                    name, data = self._events.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    if timed_out:
+                        # The command ignored SIGINT; only a new shell gets us out.
+                        self.close()
+                        completed = True
+                        return None, True, True
+                    timed_out = True
+                    self.interrupt()
+                    deadline = time.monotonic() + _INTERRUPT_GRACE_SECONDS
+                    continue
+                if data is None:
+                    # The shell itself exited, e.g. because the command ran `exit`.
+                    shell_exited = True
+                    finished.add(name)
+                    if pending[name]:
+                        yield name, pending[name]
+                    continue
+                text = pending[name] + decoders[name].decode(data)
+                emit, pending[name], status = _split_at_marker(text, marker)
+                if emit:
+                    yield name, emit
+                if status is None:
+                    continue
+                finished.add(name)
+                if name == "stdout":
+                    exit_code = int(status) if status.lstrip("-").isdigit() else 1
+            if shell_exited:
+                exit_code = process.wait() if exit_code is None else exit_code  # type: ignore[union-attr]
+                self.close()
+            completed = True
+            return exit_code, timed_out, shell_exited
+        finally:
+            if not completed:
+                self.close()
 
 
 class LocalShellBackend(FilesystemBackend, SandboxBackendProtocol):
@@ -105,6 +443,12 @@ class LocalShellBackend(FilesystemBackend, SandboxBackendProtocol):
         max_output_bytes: int = 100_000,
         env: dict[str, str] | None = None,
         inherit_env: bool = False,
+        kill_on_output_limit: bool = False,
+        persistent_session: bool = False,
+        cpu_time_limit: int | None = None,
+        memory_limit_bytes: int | None = None,
+        metrics_callback: Callable[[str, ExecuteMetrics], None] | None = None,
+        executor: Executor | None = None,
     ) -> None:
         """Initialize local shell backend with filesystem access.
 
@@ -139,7 +483,9 @@ class LocalShellBackend(FilesystemBackend, SandboxBackendProtocol):
                 Commands exceeding this timeout will be terminated. Defaults to 120 seconds.
 
             max_output_bytes: Maximum number of bytes to capture from command output.
-                Output exceeding this limit will be truncated. Defaults to 100,000 bytes.
+                Output exceeding this limit will be truncated, keeping the beginning
+                and the end. Only this much output is ever held in memory, regardless
+                of how much the command writes. Defaults to 100,000 bytes.
 
             env: Environment variables for shell commands. If None, starts with an empty
                 environment (unless `inherit_env=True`).
@@ -147,17 +493,50 @@ class LocalShellBackend(FilesystemBackend, SandboxBackendProtocol):
             inherit_env: Whether to inherit the parent process's environment variables.
                 When False (default), only variables in `env` dict are available.
                 When True, inherits all `os.environ` variables and applies `env` overrides.
+
+            kill_on_output_limit: Whether to kill a command as soon as its output
+                exceeds `max_output_bytes`. When False (default), the command runs to
+                completion and excess output is discarded as it arrives.
+
+            persistent_session: Whether to run all commands in one long-lived bash
+                process instead of a fresh `/bin/sh` per call, so `cd`, exported
+                variables and activated virtualenvs carry over between commands.
+                A timed out command is interrupted with SIGINT without ending the
+                session; if the shell dies (or ignores the interrupt), a new session
+                is started for the next command. Requires a POSIX system with bash.
+
+            cpu_time_limit: Maximum CPU seconds each command may use (`RLIMIT_CPU`).
+                A command that exceeds it is killed. Defaults to no limit.
+
+            memory_limit_bytes: Maximum virtual memory each command's processes
+                may map (`RLIMIT_AS`). Allocations beyond it fail. Defaults to no limit.
+
+            metrics_callback: Called with the command and its `ExecuteMetrics`
+                after every command, in addition to the metrics attached to the
+                returned `ExecuteResponse`. Useful for exporting per-command CPU,
+                memory and output usage.
+
+            executor: Executor the async methods (including `aexecute()`) run
+                their blocking counterparts on, e.g. a `BackendExecutor`.
+                Defaults to the event loop's default executor.
+
+        Raises:
+            ValueError: If `persistent_session=True` on a non-POSIX platform, or
+                if resource limits are combined with `persistent_session` or
+                requested on a platform without `resource`.
         """
         # Initialize parent FilesystemBackend
         super().__init__(
             root_dir=root_dir,
             virtual_mode=virtual_mode,
             max_file_size_mb=10,
+            executor=executor,
         )
 
         # Store execution parameters
         self._timeout = timeout
         self._max_output_bytes = max_output_bytes
+        self._kill_on_output_limit = kill_on_output_limit
 
         # Build environment based on inherit_env setting
         if inherit_env:
@@ -167,6 +546,26 @@ class LocalShellBackend(FilesystemBackend, SandboxBackendProtocol):
         else:
             self._env = env if env is not None else {}
 
+        self._cpu_time_limit = cpu_time_limit
+        self._memory_limit_bytes = memory_limit_bytes
+        self._metrics_callback = metrics_callback
+        has_limits = cpu_time_limit is not None or memory_limit_bytes is not None
+        if has_limits and (resource is None or persistent_session):
+            msg = "cpu_time_limit and memory_limit_bytes require a POSIX system and cannot be combined with persistent_session"
+            raise ValueError(msg)
+
+        self._session: _ShellSession | None = None
+        if persistent_session:
+            if os.name != "posix":
+                msg = "persistent_session requires a POSIX system with bash"
+                raise ValueError(msg)
+            self._session = _ShellSession(cwd=str(self.cwd), env=self._env)
+
+        self._jobs: dict[str, _Job] = {}
+        self._jobs_lock = threading.Lock()
+        self._jobs_dir: Path | None = None
+        self._jobs_dir_finalizer: weakref.finalize | None = None
+
         # Generate unique sandbox ID
         self._sandbox_id = f"local-{uuid.uuid4().hex[:8]}"
 
@@ -186,7 +585,7 @@ class LocalShellBackend(FilesystemBackend, SandboxBackendProtocol):
         r"""Execute a shell command directly on the host system.
 
         !!! danger "Unrestricted Execution"
-            Commands are executed directly on your host system using `subprocess.run()`
+            Commands are executed directly on your host system using `subprocess.Popen()`
             with `shell=True`. There is **no sandboxing, isolation, or security
             restrictions**. The command runs with your user's full permissions and can:
 
@@ -203,6 +602,8 @@ class LocalShellBackend(FilesystemBackend, SandboxBackendProtocol):
         the working directory set to the backend's `root_dir`. Stdout and stderr are
         combined into a single output stream.
 
+        This is a thin wrapper that drains `execute_stream()`.
+
         Args:
             command: Shell command string to execute.
                 Examples: "python script.py", "ls -la", "grep pattern file.txt"
@@ -238,68 +639,384 @@ class LocalShellBackend(FilesystemBackend, SandboxBackendProtocol):
             result = backend.execute("cat /etc/passwd")  # Can read system files!
             ```
         """
+        return collect_execute_stream(self.execute_stream(command))
+
+    def execute_stream(
+        self,
+        command: str,
+    ) -> Iterator[ExecuteChunk | ExecuteResponse]:
+        """Execute a shell command, yielding output chunks as they are produced.
+
+        Stdout and stderr are read concurrently while the command runs. Each
+        decoded chunk is yielded immediately, while at most `max_output_bytes`
+        of each stream is retained for the final `ExecuteResponse`.
+
+        Closing the iterator early kills the command.
+
+        Args:
+            command: Shell command string to execute.
+
+        Yields:
+            `ExecuteChunk` objects, then one `ExecuteResponse` formatted exactly
+            as `execute()` returns it.
+        """
+        return self._stream_command(command, timeout=self._timeout)
+
+    def start_job(
+        self,
+        command: str,
+    ) -> JobStatus:
+        """Start a shell command in the background on the host system.
+
+        The command runs with `/bin/sh` in `root_dir` (not in the persistent
+        session's working directory) and in its own process group, so
+        `kill_job()` also stops everything it spawns. Combined stdout/stderr is
+        written to a log file in a private temporary directory. Only the 32 most
+        recently finished jobs are kept; older ones, and their logs, are
+        dropped when new jobs start.
+
+        Args:
+            command: Shell command string to run.
+
+        Returns:
+            JobStatus with the new `job_id`, or `error` if the command could not be started.
+        """
         if not command or not isinstance(command, str):
-            return ExecuteResponse(
-                output="Error: Command must be a non-empty string.",
-                exit_code=1,
-                truncated=False,
-            )
+            return JobStatus(job_id="", error="Error: Command must be a non-empty string.")
+
+        job_id = f"job-{uuid.uuid4().hex[:8]}"
+        with self._jobs_lock:
+            if self._jobs_dir is None:
+                self._jobs_dir = Path(tempfile.mkdtemp(prefix="deepagents_jobs_"))
+                self._jobs_dir_finalizer = weakref.finalize(self, shutil.rmtree, self._jobs_dir, ignore_errors=True)
+            self._prune_finished_jobs()
+            log_path = self._jobs_dir / f"{job_id}.log"
+            try:
+                with log_path.open("wb") as log:
+                    process = subprocess.Popen(  # noqa: S602
+                        command,
+                        shell=True,  # Intentional: designed for LLM-controlled shell execution
+                        stdin=subprocess.DEVNULL,
+                        stdout=log,
+                        stderr=subprocess.STDOUT,
+                        env=self._env,
+                        cwd=str(self.cwd),
+                        start_new_session=os.name == "posix",
+                    )
+            except Exception as e:  # noqa: BLE001
+                return JobStatus(job_id=job_id, error=self._format_exec_error(e))
+            # Jobs must not outlive the backend that started them.
+            self._jobs[job_id] = _Job(process=process, log_path=log_path, finalizer=weakref.finalize(self, _kill_process_tree, process))
+        return JobStatus(job_id=job_id, running=True)
+
+    def _prune_finished_jobs(self) -> None:
+        """Forget the oldest finished jobs, and delete their logs, beyond `_MAX_FINISHED_JOBS`.
+
+        Must be called with `_jobs_lock` held.
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if job.process.poll() is not None]
+        for job_id in finished[: max(len(finished) - _MAX_FINISHED_JOBS + 1, 0)]:
+            job = self._jobs.pop(job_id)
+            job.finalizer.detach()
+            job.log_path.unlink(missing_ok=True)
 
-        try:
-            result = subprocess.run(  # noqa: S602
-                command,
-                check=False,
-                shell=True,  # Intentional: designed for LLM-controlled shell execution
-                capture_output=True,
-                text=True,
-                timeout=self._timeout,
-                env=self._env,
-                cwd=str(self.cwd),  # Use the root_dir from FilesystemBackend
-            )
+    def poll_job(
+        self,
+        job_id: str,
+    ) -> JobStatus:
+        """Check whether a background job is still running.
 
-            # Combine stdout and stderr
-            # Prefix each stderr line with [stderr] for clear attribution.
-            # Example: "hello\n[stderr] error: file not found"  # noqa: ERA001
-            output_parts = []
-            if result.stdout:
-                output_parts.append(result.stdout)
-            if result.stderr:
-                stderr_lines = result.stderr.strip().split("\n")
-                output_parts.extend(f"[stderr] {line}" for line in stderr_lines)
+        Args:
+            job_id: Identifier returned by `start_job()`.
 
-            output = "\n".join(output_parts) if output_parts else "<no output>"
+        Returns:
+            JobStatus with `running` and, once finished, `exit_code` set.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return JobStatus(job_id=job_id, error=f"Error: Job '{job_id}' not found")
+        exit_code = job.process.poll()
+        return JobStatus(job_id=job_id, running=exit_code is None, exit_code=exit_code)
 
-            # Check for truncation
-            truncated = False
-            if len(output) > self._max_output_bytes:
-                output = output[: self._max_output_bytes]
-                output += f"\n\n... Output truncated at {self._max_output_bytes} bytes."
-                truncated = True
-
-            # Add exit code info if non-zero
-            if result.returncode != 0:
-                output = f"{output.rstrip()}\n\nExit code: {result.returncode}"
-
-            return ExecuteResponse(
-                output=output,
-                exit_code=result.returncode,
-                truncated=truncated,
-            )
+    def tail_job(
+        self,
+        job_id: str,
+        lines: int = 50,
+    ) -> JobStatus:
+        """Read the last lines of a background job's combined output.
+
+        At most `max_output_bytes` of the log are read, however large it grows.
+
+        Args:
+            job_id: Identifier returned by `start_job()`.
+            lines: Maximum number of trailing lines to return.
+
+        Returns:
+            JobStatus like `poll_job()`, with `output` holding the tail of the log.
+        """
+        status = self.poll_job(job_id)
+        job = self._jobs.get(job_id)
+        if status.error is None and job is not None:
+            status.output = _read_log_tail(job.log_path, lines, self._max_output_bytes)
+        return status
+
+    def kill_job(
+        self,
+        job_id: str,
+    ) -> JobStatus:
+        """Kill a background job's whole process group.
+
+        Args:
+            job_id: Identifier returned by `start_job()`.
 
-        except subprocess.TimeoutExpired:
-            return ExecuteResponse(
-                output=f"Error: Command timed out after {self._timeout:.1f} seconds.",
-                exit_code=124,  # Standard timeout exit code
+        Returns:
+            JobStatus reflecting the job's final state.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return JobStatus(job_id=job_id, error=f"Error: Job '{job_id}' not found")
+        _kill_process_tree(job.process)
+        return JobStatus(job_id=job_id, running=False, exit_code=job.process.returncode)
+
+    def close(self) -> None:
+        """Terminate the persistent shell session and all background jobs.
+
+        The next command starts a fresh session. The jobs are forgotten and
+        their logs deleted.
+        """
+        if self._session is not None:
+            with self._session.lock:
+                self._session.close()
+        with self._jobs_lock:
+            for job in self._jobs.values():
+                _kill_process_tree(job.process)
+                job.finalizer.detach()
+            self._jobs.clear()
+            if self._jobs_dir_finalizer is not None:
+                self._jobs_dir_finalizer()
+            self._jobs_dir = self._jobs_dir_finalizer = None
+
+    def _format_timeout_error(self, timeout: float) -> str:
+        """Message returned when a command exceeds its timeout."""
+        return f"Error: Command timed out after {timeout:.1f} seconds."
+
+    def _format_exec_error(self, error: Exception) -> str:
+        """Message returned when a command cannot be started."""
+        return f"Error executing command: {error}"
+
+    def _format_exit_code(self, output: str, exit_code: int) -> str:
+        """Append non-zero exit codes to the output."""
+        if exit_code != 0:
+            return f"{output.rstrip()}\n\nExit code: {exit_code}"
+        return output
+
+    def _combine_output(self, stdout_buffer: HeadTailBuffer, stderr_buffer: HeadTailBuffer) -> tuple[str, bool]:
+        """Merge the retained stdout and stderr into the final output string.
+
+        Returns:
+            Tuple of the combined output and whether anything was truncated.
+        """
+        # Combine stdout and stderr
+        # Prefix each stderr line with [stderr] for clear attribution.
+        # Example: "hello\n[stderr] error: file not found"  # noqa: ERA001
+        stdout = stdout_buffer.getvalue()
+        stderr = stderr_buffer.getvalue()
+        output_parts = []
+        if stdout:
+            output_parts.append(stdout)
+        if stderr:
+            stderr_lines = stderr.strip().split("\n")
+            output_parts.extend(f"[stderr] {line}" for line in stderr_lines)
+
+        output = "\n".join(output_parts) if output_parts else "<no output>"
+
+        # Check for truncation, keeping both the beginning and the end of the output
+        truncated = stdout_buffer.truncated or stderr_buffer.truncated or len(output) > self._max_output_bytes
+        if truncated:
+            head = self._max_output_bytes // 2
+            tail_start = max(head, len(output) - (self._max_output_bytes - head))
+            output = f"{output[:head]}\n\n... Output truncated at {self._max_output_bytes} bytes ...\n\n{output[tail_start:]}"
+        return output, truncated
+
+    def _stream_command(
+        self,
+        command: str,
+        *,
+        timeout: float,
+    ) -> Iterator[ExecuteChunk | ExecuteResponse]:
+        """Run `command` and stream its output; shared by `execute_stream()` overrides."""
+        if not command or not isinstance(command, str):
+            yield ExecuteResponse(
+                output="Error: Command must be a non-empty string.",
+                exit_code=1,
                 truncated=False,
             )
+            return
+
+        if self._session is not None:
+            yield from self._stream_session_command(command, timeout=timeout)
+            return
+
+        started = time.monotonic()
+        try:
+            process = self._spawn(command)
         except Exception as e:  # noqa: BLE001
             # Broad exception catch is intentional: we want to catch all execution errors
             # and return a consistent ExecuteResponse rather than propagating exceptions
-            return ExecuteResponse(
-                output=f"Error executing command: {e}",
-                exit_code=1,
-                truncated=False,
-            )
+            yield ExecuteResponse(output=self._format_exec_error(e), exit_code=1, truncated=False)
+            return
+
+        # Pipes are drained by reader threads so neither stream can block the
+        # other and the timeout can be enforced while waiting for output.
+        events = _pump_output(process)
+
+        buffers = {"stdout": HeadTailBuffer(self._max_output_bytes), "stderr": HeadTailBuffer(self._max_output_bytes)}
+        decoders = {name: codecs.getincrementaldecoder("utf-8")(errors="replace") for name in buffers}
+        deadline = time.monotonic() + timeout
+        # Cancelling the awaiting task (e.g. the user pressing Esc) kills the tree.
+        unregister = _on_cancel(lambda: _signal_process_tree(process))
+        open_streams, output_bytes, killed_for_output = 2, 0, False
+
+        try:
+            while open_streams:
+                try:
+                    name, data = events.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    _kill_process_tree(process)
+                    yield self._timeout_response(command, timeout, started=started, output_bytes=output_bytes)
+                    return
+                if data is None:
+                    open_streams -= 1
+                output_bytes += len(data or b"")
+                text = decoders[name].decode(data or b"", final=data is None)
+                if not text:
+                    continue
+                buffers[name].write(text)
+                yield ExecuteChunk(output=text, stream=name)
+                produced = buffers["stdout"].total_chars + buffers["stderr"].total_chars
+                if self._kill_on_output_limit and not killed_for_output and produced > self._max_output_bytes:
+                    _kill_process_tree(process)
+                    killed_for_output = True
+
+            try:
+                returncode, rusage = _wait_with_rusage(process, deadline)
+            except subprocess.TimeoutExpired:
+                _kill_process_tree(process)
+                yield self._timeout_response(command, timeout, started=started, output_bytes=output_bytes)
+                return
+        finally:
+            unregister()
+            # Runs on normal completion and when the consumer closes the iterator early.
+            _kill_process_tree(process)
+
+        output, truncated = self._combine_output(buffers["stdout"], buffers["stderr"])
+        output = self._format_exit_code(output + self._limit_note(returncode, killed_for_output=killed_for_output), returncode)
+        metrics = _build_metrics(started=started, rusage=rusage, output_bytes=output_bytes, output=output)
+        self._report_metrics(command, metrics)
+        yield ExecuteResponse(
+            output=output,
+            exit_code=returncode,
+            truncated=truncated,
+            metrics=metrics,
+        )
+
+    def _spawn(self, command: str) -> subprocess.Popen[bytes]:
+        """Start `command` under `/bin/sh` with piped output and the configured limits."""
+        if self._cpu_time_limit is not None or self._memory_limit_bytes is not None:
+            command = _ulimit_prefix(self._cpu_time_limit, self._memory_limit_bytes) + command
+        return subprocess.Popen(  # noqa: S602
+            command,
+            shell=True,  # Intentional: designed for LLM-controlled shell execution
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=self._env,
+            cwd=str(self.cwd),  # Use the root_dir from FilesystemBackend
+            # Own process group, so timeouts and output limits kill the whole tree
+            start_new_session=os.name == "posix",
+        )
+
+    def _limit_note(self, returncode: int, *, killed_for_output: bool) -> str:
+        """Explain why a command was killed by an output or CPU limit, if it was."""
+        if killed_for_output:
+            return f"\n\n... Command killed after exceeding the {self._max_output_bytes} byte output limit."
+        # A killed shell reports -SIGXCPU; a shell whose child was killed reports 128 + SIGXCPU.
+        if self._cpu_time_limit is not None and returncode in {-signal.SIGXCPU, 128 + signal.SIGXCPU}:
+            return f"\n\n... Command killed after exceeding the {self._cpu_time_limit} second CPU time limit."
+        return ""
+
+    def _report_metrics(self, command: str, metrics: ExecuteMetrics) -> None:
+        """Pass a finished command's metrics to `metrics_callback`, if one is set."""
+        if self._metrics_callback is not None:
+            self._metrics_callback(command, metrics)
+
+    def _timeout_response(self, command: str, timeout: float, *, started: float, output_bytes: int, note: str = "") -> ExecuteResponse:
+        """Build (and report metrics for) the response to a timed out command, ending with `note`."""
+        output = self._format_timeout_error(timeout) + note
+        metrics = _build_metrics(started=started, rusage=None, output_bytes=output_bytes, output=output)
+        self._report_metrics(command, metrics)
+        return ExecuteResponse(output=output, exit_code=124, truncated=False, metrics=metrics)
+
+    def _stream_session_command(
+        self,
+        command: str,
+        *,
+        timeout: float,
+    ) -> Iterator[ExecuteChunk | ExecuteResponse]:
+        """Run `command` in the persistent shell session and stream its output."""
+        session = self._session
+        if session is None:
+            msg = "persistent session is not enabled"
+            raise RuntimeError(msg)
+        buffers = {"stdout": HeadTailBuffer(self._max_output_bytes), "stderr": HeadTailBuffer(self._max_output_bytes)}
+        killed_for_output = False
+        output_bytes = 0
+        started = time.monotonic()
+
+        with session.lock:
+            run = session.run(command, timeout=timeout)
+            # Cancellation interrupts the command like Ctrl+C but keeps the session.
+            unregister = _on_cancel(session.interrupt)
+            try:
+                while True:
+                    try:
+                        name, text = next(run)
+                    except StopIteration as stop:
+                        exit_code, timed_out, restarted = stop.value
+                        break
+                    buffers[name].write(text)
+                    output_bytes += len(text.encode("utf-8"))
+                    yield ExecuteChunk(output=text, stream=name)
+                    produced = buffers["stdout"].total_chars + buffers["stderr"].total_chars
+                    if self._kill_on_output_limit and not killed_for_output and produced > self._max_output_bytes:
+                        session.interrupt()
+                        killed_for_output = True
+            except OSError as e:
+                yield ExecuteResponse(output=self._format_exec_error(e), exit_code=1, truncated=False)
+                return
+            finally:
+                unregister()
+                run.close()
+
+        note = _SESSION_RESTART_NOTE if restarted else ""
+        if timed_out:
+            yield self._timeout_response(command, timeout, started=started, output_bytes=output_bytes, note=note)
+            return
+
+        output, truncated = self._combine_output(buffers["stdout"], buffers["stderr"])
+        if killed_for_output:
+            output += f"\n\n... Command interrupted after exceeding the {self._max_output_bytes} byte output limit."
+        exit_code = 1 if exit_code is None else exit_code
+        output = self._format_exit_code(output + note, exit_code)
+        # The session shell never exits between commands, so there is no per-command rusage.
+        metrics = _build_metrics(started=started, rusage=None, output_bytes=output_bytes, output=output)
+        self._report_metrics(command, metrics)
+        yield ExecuteResponse(
+            output=output,
+            exit_code=exit_code,
+            truncated=truncated,
+            metrics=metrics,
+        )
 
 
 __all__ = ["LocalShellBackend"]
@@ -0,0 +1,305 @@
+"""`OverlayBackend`: copy-on-write view of a shared, read-only base workspace.
+
+Many agents can work against one large checkout without copying it. Reads fall
+through to a read-only lower backend (typically a `FilesystemBackend`), while
+writes and edits land in a per-thread upper backend (`StateBackend` or
+`StoreBackend`). Creating an overlay does no I/O, so startup cost does not
+depend on the size of the base workspace.
+
+Examples:
+    ```python
+    from deepagents import create_deep_agent
+    from deepagents.backends import FilesystemBackend, StateBackend
+    from deepagents.backends.overlay import OverlayBackend
+
+    base = FilesystemBackend(root_dir="/srv/checkout", virtual_mode=True)
+    agent = create_deep_agent(backend=lambda rt: OverlayBackend(lower=base, upper=StateBackend(rt)))
+    ```
+"""
+
+from __future__ import annotations
+
+import difflib
+from typing import TYPE_CHECKING
+
+from deepagents.backends.cancellation import run_cancellable
+from deepagents.backends.protocol import (
+    BackendProtocol,
+    EditResult,
+    FileDownloadResponse,
+    FileInfo,
+    FileUploadResponse,
+    GrepMatch,
+    WriteResult,
+)
+from deepagents.backends.utils import create_file_data, format_read_response, perform_string_replacement
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_WHITEOUT = "\x00deepagents-overlay-whiteout\x00"
+"""Content of an upper-layer file that hides the lower file at the same path."""
+
+
+def _read_text(backend: BackendProtocol, path: str) -> str | None:
+    """Return the raw content of `path` in `backend`, or `None` if it is missing."""
+    response = backend.download_files([path])[0]
+    if response.error is not None or response.content is None:
+        return None
+    return response.content.decode("utf-8", errors="replace")
+
+
+class OverlayBackend(BackendProtocol):
+    """Merges a read-only lower backend with a writable upper backend.
+
+    - Reads prefer the upper layer and fall back to the lower one.
+    - Writes and edits only touch the upper layer. Editing a lower-only file
+      copies it up first.
+    - `delete()` records a whiteout in the upper layer, so the lower file is
+      hidden without being modified.
+    - `ls_info`, `glob_info` and `grep_raw` merge both layers, with upper
+      files shadowing lower ones and whiteouts removing them.
+
+    Both layers must use the same path namespace (e.g. a `FilesystemBackend`
+    in `virtual_mode`). `export_diff()` renders the upper layer as a unified
+    diff against the lower one.
+
+    Attributes:
+        lower: Read-only base layer, usually shared between many overlays.
+        upper: Writable layer holding this overlay's changes.
+    """
+
+    def __init__(self, lower: BackendProtocol, upper: BackendProtocol) -> None:
+        """Initialize the overlay.
+
+        Args:
+            lower: Backend serving the base workspace. It is never written to.
+            upper: Backend recording writes, edits and deletions.
+        """
+        self.lower = lower
+        self.upper = upper
+
+    def _whiteouts(self, infos: Iterable[FileInfo]) -> set[str]:
+        """Return the paths among upper-layer `infos` that are whiteouts."""
+        # Only files exactly as long as the marker need to be downloaded.
+        candidates = [fi["path"] for fi in infos if not fi.get("is_dir") and fi.get("size") == len(_WHITEOUT)]
+        if not candidates:
+            return set()
+        marker = _WHITEOUT.encode()
+        return {r.path for r in self.upper.download_files(candidates) if r.content == marker}
+
+    def _upper_files(self) -> tuple[set[str], set[str]]:
+        """Return all upper-layer file paths and the subset that are whiteouts."""
+        infos = [fi for fi in self.upper.glob_info("**", "/") if not fi.get("is_dir")]
+        return {fi["path"] for fi in infos}, self._whiteouts(infos)
+
+    def _merge_infos(self, lower_infos: list[FileInfo], upper_infos: list[FileInfo]) -> list[FileInfo]:
+        """Overlay upper-layer listing entries on lower-layer ones, applying whiteouts."""
+        merged = {fi["path"]: fi for fi in lower_infos}
+        whiteouts = self._whiteouts(upper_infos)
+        for fi in upper_infos:
+            if fi["path"] in whiteouts:
+                merged.pop(fi["path"], None)
+            else:
+                merged[fi["path"]] = fi
+        return sorted(merged.values(), key=lambda fi: fi.get("path", ""))
+
+    def ls_info(self, path: str) -> list[FileInfo]:
+        """List directory contents from both layers (non-recursive).
+
+        Args:
+            path: Absolute directory path.
+
+        Returns:
+            Merged `FileInfo` dicts sorted by path. Upper entries replace lower
+            entries with the same path; whited-out files are omitted.
+        """
+        return self._merge_infos(self.lower.ls_info(path), self.upper.ls_info(path))
+
+    def read(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = 2000,
+    ) -> str:
+        """Read a file from the upper layer, falling back to the lower one.
+
+        Args:
+            file_path: Absolute file path.
+            offset: Line offset to start reading from (0-indexed).
+            limit: Maximum number of lines to read.
+
+        Returns:
+            Formatted file content with line numbers, or an error message.
+        """
+        upper_text = _read_text(self.upper, file_path)
+        if upper_text == _WHITEOUT:
+            return f"Error: File '{file_path}' not found"
+        if upper_text is not None:
+            # Format the text already downloaded instead of reading it again.
+            return format_read_response(create_file_data(upper_text), offset, limit)
+        return self.lower.read(file_path, offset, limit)
+
+    def grep_raw(
+        self,
+        pattern: str,
+        path: str = "/",
+        glob: str | None = None,
+    ) -> list[GrepMatch] | str:
+        """Search both layers, keeping lower matches only for unshadowed files.
+
+        Returns:
+            Matches sorted by path and line, or an error string from either layer.
+        """
+        lower_matches = self.lower.grep_raw(pattern, path, glob)
+        if isinstance(lower_matches, str):
+            return lower_matches
+        upper_matches = self.upper.grep_raw(pattern, path, glob)
+        if isinstance(upper_matches, str):
+            return upper_matches
+        shadowed, whiteouts = self._upper_files()
+        matches = [m for m in lower_matches if m["path"] not in shadowed]
+        matches.extend(m for m in upper_matches if m["path"] not in whiteouts)
+        matches.sort(key=lambda m: (m["path"], m["line"]))
+        return matches
+
+    def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
+        """Find files matching `pattern` in either layer.
+
+        Returns:
+            Merged `FileInfo` dicts sorted by path, without whited-out files.
+        """
+        return self._merge_infos(self.lower.glob_info(pattern, path), self.upper.glob_info(pattern, path))
+
+    def write(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Create a new file in the upper layer.
+
+        Fails if the file exists in either layer, unless it has been deleted.
+
+        Returns:
+            `WriteResult` from the upper layer.
+        """
+        upper_text = _read_text(self.upper, file_path)
+        if upper_text == _WHITEOUT:
+            result = self.upper.edit(file_path, _WHITEOUT, content)
+            if result.error:
+                return WriteResult(error=result.error)
+            return WriteResult(path=file_path, files_update=result.files_update)
+        if upper_text is not None or _read_text(self.lower, file_path) is not None:
+            return WriteResult(error=f"Cannot write to {file_path} because it already exists. Read and then make an edit, or write to a new path.")
+        return self.upper.write(file_path, content)
+
+    def edit(
+        self,
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool = False,
+    ) -> EditResult:
+        """Edit a file, copying it up from the lower layer on first change.
+
+        Returns:
+            `EditResult` with the upper layer's update and the occurrence count.
+        """
+        upper_text = _read_text(self.upper, file_path)
+        if upper_text == _WHITEOUT:
+            return EditResult(error=f"Error: File '{file_path}' not found")
+        if upper_text is not None:
+            return self.upper.edit(file_path, old_string, new_string, replace_all)
+
+        lower_text = _read_text(self.lower, file_path)
+        if lower_text is None:
+            return EditResult(error=f"Error: File '{file_path}' not found")
+        replaced = perform_string_replacement(lower_text, old_string, new_string, replace_all)
+        if isinstance(replaced, str):
+            return EditResult(error=replaced)
+        new_content, occurrences = replaced
+        result = self.upper.write(file_path, new_content)
+        if result.error:
+            return EditResult(error=result.error)
+        return EditResult(path=file_path, files_update=result.files_update, occurrences=int(occurrences))
+
+    def delete(self, file_path: str) -> WriteResult:
+        """Delete a file by writing a whiteout to the upper layer.
+
+        The lower layer is never modified; the whiteout hides its file from
+        every read, listing and search made through this overlay.
+
+        Args:
+            file_path: Absolute file path.
+
+        Returns:
+            `WriteResult` carrying the upper layer's update, or an error if the
+            file does not exist.
+        """
+        upper_text = _read_text(self.upper, file_path)
+        if upper_text == _WHITEOUT:
+            return WriteResult(error=f"Error: File '{file_path}' not found")
+        if upper_text is not None:
+            # The whole content occurs exactly once (even when empty), so this
+            # swaps it for the marker in any upper backend.
+            result = self.upper.edit(file_path, upper_text, _WHITEOUT)
+            if result.error:
+                return WriteResult(error=result.error)
+            return WriteResult(path=file_path, files_update=result.files_update)
+        if _read_text(self.lower, file_path) is None:
+            return WriteResult(error=f"Error: File '{file_path}' not found")
+        return self.upper.write(file_path, _WHITEOUT)
+
+    async def adelete(self, file_path: str) -> WriteResult:
+        """Async version of delete."""
+        return await run_cancellable(self.delete, file_path, executor=self.executor)
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Upload files into the upper layer.
+
+        Returns:
+            List of `FileUploadResponse` objects from the upper layer.
+        """
+        return self.upper.upload_files(files)
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Download files, preferring the upper layer.
+
+        Returns:
+            List of `FileDownloadResponse` objects, one per input path.
+        """
+        marker = _WHITEOUT.encode()
+        responses = {r.path: r for r in self.upper.download_files(paths) if r.error is None}
+        missing = [path for path in paths if path not in responses]
+        if missing:
+            responses.update((r.path, r) for r in self.lower.download_files(missing))
+        return [
+            FileDownloadResponse(path=path, content=None, error="file_not_found") if responses[path].content == marker else responses[path]
+            for path in paths
+        ]
+
+    def export_diff(self) -> str:
+        """Render this overlay's changes as a unified diff against the lower layer.
+
+        Returns:
+            Unified diff text using `a/` and `b/` path prefixes, with
+            `/dev/null` for created and deleted files. Empty if nothing changed.
+        """
+        upper_paths, whiteouts = self._upper_files()
+        chunks: list[str] = []
+        for path in sorted(upper_paths):
+            old = _read_text(self.lower, path)
+            new = None if path in whiteouts else _read_text(self.upper, path)
+            if old == new:
+                continue
+            diff = difflib.unified_diff(
+                (old or "").splitlines(keepends=True),
+                (new or "").splitlines(keepends=True),
+                fromfile=f"a{path}" if old is not None else "/dev/null",
+                tofile=f"b{path}" if new is not None else "/dev/null",
+            )
+            chunks.extend(line if line.endswith("\n") else f"{line}\n\\ No newline at end of file\n" for line in diff)
+        return "".join(chunks)
+
+
+__all__ = ["OverlayBackend"]
@@ -6,14 +6,17 @@ database, etc.) and provide a uniform interface for file operations.
 """
 
 import abc
-import asyncio
-from collections.abc import Callable
+import contextlib
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from typing import Any, Literal, NotRequired, TypeAlias
 
 from langchain.tools import ToolRuntime
 from typing_extensions import TypedDict
 
+from deepagents.backends.cancellation import iterate_cancellable, run_cancellable
+
 FileOperationError = Literal[
     "file_not_found",  # Download: file doesn't exist
     "permission_denied",  # Both: access denied
@@ -172,6 +175,14 @@ class BackendProtocol(abc.ABC):
     }
     """
 
+    executor: Executor | None = None
+    """Executor the default async methods run their blocking counterparts on.
+
+    `None` uses the event loop's default executor, which is shared with the rest
+    of the process. Assign a `BackendExecutor` to give this backend its own
+    bounded pool, so a burst of slow calls cannot starve unrelated work.
+    """
+
     def ls_info(self, path: str) -> list["FileInfo"]:
         """List all files in a directory with metadata.
 
@@ -190,7 +201,7 @@ class BackendProtocol(abc.ABC):
 
     async def als_info(self, path: str) -> list["FileInfo"]:
         """Async version of ls_info."""
-        return await asyncio.to_thread(self.ls_info, path)
+        return await run_cancellable(self.ls_info, path, executor=self.executor)
 
     def read(
         self,
@@ -227,7 +238,7 @@ class BackendProtocol(abc.ABC):
         limit: int = 2000,
     ) -> str:
         """Async version of read."""
-        return await asyncio.to_thread(self.read, file_path, offset, limit)
+        return await run_cancellable(self.read, file_path, offset, limit, executor=self.executor)
 
     def grep_raw(
         self,
@@ -277,7 +288,7 @@ class BackendProtocol(abc.ABC):
         glob: str | None = None,
     ) -> list["GrepMatch"] | str:
         """Async version of grep_raw."""
-        return await asyncio.to_thread(self.grep_raw, pattern, path, glob)
+        return await run_cancellable(self.grep_raw, pattern, path, glob, executor=self.executor)
 
     def glob_info(self, pattern: str, path: str = "/") -> list["FileInfo"]:
         """Find files matching a glob pattern.
@@ -300,7 +311,7 @@ class BackendProtocol(abc.ABC):
 
     async def aglob_info(self, pattern: str, path: str = "/") -> list["FileInfo"]:
         """Async version of glob_info."""
-        return await asyncio.to_thread(self.glob_info, pattern, path)
+        return await run_cancellable(self.glob_info, pattern, path, executor=self.executor)
 
     def write(
         self,
@@ -325,7 +336,7 @@ class BackendProtocol(abc.ABC):
         content: str,
     ) -> WriteResult:
         """Async version of write."""
-        return await asyncio.to_thread(self.write, file_path, content)
+        return await run_cancellable(self.write, file_path, content, executor=self.executor)
 
     def edit(
         self,
@@ -358,7 +369,61 @@ class BackendProtocol(abc.ABC):
         replace_all: bool = False,
     ) -> EditResult:
         """Async version of edit."""
-        return await asyncio.to_thread(self.edit, file_path, old_string, new_string, replace_all)
+        return await run_cancellable(self.edit, file_path, old_string, new_string, replace_all, executor=self.executor)
+
+    def append(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Append content to the end of a file, creating it if it does not exist.
+
+        The default implementation downloads the file and rewrites it with
+        `edit` (or creates it with `write`), so each call transfers the whole
+        file. Backends override this to skip the download and rewrite; how much
+        work an append still does depends on the backend (see its `append`).
+
+        Args:
+            file_path: Absolute path of the file. Must start with '/'.
+            content: String content to append.
+
+        Returns:
+            WriteResult
+        """
+        existing = ""
+        with contextlib.suppress(Exception):
+            # A failed download is treated as a missing file; `write` refuses
+            # to clobber it if it does exist.
+            responses = self.download_files([file_path])
+            if responses and responses[0].content is not None and responses[0].error is None:
+                existing = responses[0].content.decode("utf-8")
+        if not existing:
+            return self.write(file_path, content)
+        result = self.edit(file_path, existing, existing + content)
+        return WriteResult(error=result.error, path=result.path, files_update=result.files_update)
+
+    async def aappend(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Async version of append.
+
+        Runs a backend's own `append` override in the executor. Otherwise it
+        composes `adownload_files`, `aedit` and `awrite`, so backends with
+        native async methods are not routed through a thread.
+        """
+        if type(self).append is not BackendProtocol.append:
+            return await run_cancellable(self.append, file_path, content, executor=self.executor)
+        existing = ""
+        with contextlib.suppress(Exception):
+            responses = await self.adownload_files([file_path])
+            if responses and responses[0].content is not None and responses[0].error is None:
+                existing = responses[0].content.decode("utf-8")
+        if not existing:
+            return await self.awrite(file_path, content)
+        result = await self.aedit(file_path, existing, existing + content)
+        return WriteResult(error=result.error, path=result.path, files_update=result.files_update)
 
     def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Upload multiple files to the sandbox.
@@ -388,7 +453,7 @@ class BackendProtocol(abc.ABC):
 
     async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
         """Async version of upload_files."""
-        return await asyncio.to_thread(self.upload_files, files)
+        return await run_cancellable(self.upload_files, files, executor=self.executor)
 
     def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Download multiple files from the sandbox.
@@ -408,7 +473,54 @@ class BackendProtocol(abc.ABC):
 
     async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
         """Async version of download_files."""
-        return await asyncio.to_thread(self.download_files, paths)
+        return await run_cancellable(self.download_files, paths, executor=self.executor)
+
+    def file_etags(self, paths: list[str]) -> list[str | None]:
+        """Return a version tag per file that changes whenever the file's content does.
+
+        Callers that cache file contents compare tags instead of downloading the
+        files again. The default implementation knows no tags; backends that can
+        read a file's size and mtime (or a store timestamp) without its content
+        override this.
+
+        Args:
+            paths: List of file paths.
+
+        Returns:
+            One tag per input path, in order. `None` if the tag is unknown or the
+            file does not exist, in which case the caller must download it.
+        """
+        return [None] * len(paths)
+
+    async def afile_etags(self, paths: list[str]) -> list[str | None]:
+        """Async version of file_etags."""
+        return await run_cancellable(self.file_etags, paths, executor=self.executor)
+
+
+@dataclass
+class ExecuteMetrics:
+    """Resource usage of a single executed command.
+
+    Fields a backend cannot measure are left as `None`.
+    """
+
+    wall_time: float
+    """Elapsed time in seconds from starting the command until it exited."""
+
+    user_time: float | None = None
+    """CPU time in seconds spent in user mode by the command and its waited-for children."""
+
+    system_time: float | None = None
+    """CPU time in seconds spent in kernel mode by the command and its waited-for children."""
+
+    max_rss_bytes: int | None = None
+    """Peak resident set size in bytes of the largest process in the command."""
+
+    output_bytes: int | None = None
+    """Bytes of output the command wrote to stdout and stderr."""
+
+    returned_bytes: int | None = None
+    """Bytes of output returned in `ExecuteResponse.output` after truncation."""
 
 
 @dataclass
@@ -427,6 +539,44 @@ class ExecuteResponse:
     truncated: bool = False
     """Whether the output was truncated due to backend limitations."""
 
+    metrics: ExecuteMetrics | None = None
+    """Resource usage of the command, if the backend measures it."""
+
+
+@dataclass
+class ExecuteChunk:
+    """A piece of command output yielded by `execute_stream()` as it arrives."""
+
+    output: str
+    """Text emitted by the command since the previous chunk."""
+
+    stream: Literal["stdout", "stderr"] = "stdout"
+    """Which output stream the text was read from."""
+
+
+@dataclass
+class JobStatus:
+    """State of a background job started with `start_job()`.
+
+    Returned by every job method so callers can branch on `error` the same way
+    they do for file operations.
+    """
+
+    job_id: str
+    """Identifier to pass to `poll_job()`, `tail_job()` and `kill_job()`."""
+
+    running: bool = False
+    """Whether the job's process is still alive."""
+
+    exit_code: int | None = None
+    """Exit code once the job has finished, `None` while running or if unknown."""
+
+    output: str | None = None
+    """Tail of the job's combined stdout/stderr (only set by `tail_job()`)."""
+
+    error: str | None = None
+    """Error message on failure (e.g. unknown job id), `None` on success."""
+
 
 class SandboxBackendProtocol(BackendProtocol):
     """Extension of `BackendProtocol` that adds shell command execution.
@@ -435,6 +585,9 @@ class SandboxBackendProtocol(BackendProtocol):
     remote hosts).
 
     Adds `execute()`/`aexecute()` for shell commands and an `id` property.
+    Backends that can keep processes alive between calls may also implement
+    the background job methods (`start_job()`, `poll_job()`, `tail_job()`,
+    `kill_job()`).
 
     See `BaseSandbox` for a base class that implements all inherited file
     operations by delegating to `execute()`.
@@ -465,8 +618,145 @@ class SandboxBackendProtocol(BackendProtocol):
         self,
         command: str,
     ) -> ExecuteResponse:
-        """Async version of execute."""
-        return await asyncio.to_thread(self.execute, command)
+        """Async version of execute.
+
+        Cancelling the awaiting task fires the `CancellationToken` that
+        `execute()` sees via `current_cancel_token()`, so backends that
+        register a callback stop the command instead of letting it run on.
+        """
+        return await run_cancellable(self.execute, command, executor=self.executor)
+
+    def execute_stream(
+        self,
+        command: str,
+    ) -> Iterator[ExecuteChunk | ExecuteResponse]:
+        """Execute a command and yield its output incrementally.
+
+        Yields `ExecuteChunk` objects as output becomes available, followed by
+        exactly one final `ExecuteResponse` holding the exit code and the same
+        (bounded) output that `execute()` would have returned.
+
+        The default implementation runs `execute()` and yields its output as a
+        single chunk. Backends that can read output while the command runs
+        should override this so callers see progress and so the backend never
+        has to hold more than its output budget in memory.
+
+        Args:
+            command: Full shell command string to execute.
+
+        Yields:
+            Output chunks, then the final `ExecuteResponse`.
+        """
+        result = self.execute(command)
+        if result.output:
+            yield ExecuteChunk(output=result.output)
+        yield result
+
+    async def aexecute_stream(
+        self,
+        command: str,
+    ) -> AsyncIterator[ExecuteChunk | ExecuteResponse]:
+        """Async version of execute_stream.
+
+        By default, drives the synchronous `execute_stream()` generator from a
+        worker thread, one item at a time, with a `CancellationToken` that
+        fires if the consuming task is cancelled.
+        """
+        async for item in iterate_cancellable(self.execute_stream(command), executor=self.executor):
+            yield item
+
+    def start_job(
+        self,
+        command: str,
+    ) -> JobStatus:
+        """Start a command in the background and return immediately.
+
+        The command's combined stdout/stderr is captured to a log that can be
+        read with `tail_job()` while it runs and after it exits.
+
+        Args:
+            command: Full shell command string to run.
+
+        Returns:
+            JobStatus with the new `job_id`, or `error` if the job could not
+            be started.
+        """
+        raise NotImplementedError
+
+    async def astart_job(
+        self,
+        command: str,
+    ) -> JobStatus:
+        """Async version of start_job."""
+        return await run_cancellable(self.start_job, command, executor=self.executor)
+
+    def poll_job(
+        self,
+        job_id: str,
+    ) -> JobStatus:
+        """Check whether a background job is still running.
+
+        Args:
+            job_id: Identifier returned by `start_job()`.
+
+        Returns:
+            JobStatus with `running` and, once finished, `exit_code` set.
+        """
+        raise NotImplementedError
+
+    async def apoll_job(
+        self,
+        job_id: str,
+    ) -> JobStatus:
+        """Async version of poll_job."""
+        return await run_cancellable(self.poll_job, job_id, executor=self.executor)
+
+    def tail_job(
+        self,
+        job_id: str,
+        lines: int = 50,
+    ) -> JobStatus:
+        """Read the last lines of a background job's output.
+
+        Args:
+            job_id: Identifier returned by `start_job()`.
+            lines: Maximum number of trailing lines to return.
+
+        Returns:
+            JobStatus like `poll_job()`, with `output` holding the tail of the log.
+        """
+        raise NotImplementedError
+
+    async def atail_job(
+        self,
+        job_id: str,
+        lines: int = 50,
+    ) -> JobStatus:
+        """Async version of tail_job."""
+        return await run_cancellable(self.tail_job, job_id, lines, executor=self.executor)
+
+    def kill_job(
+        self,
+        job_id: str,
+    ) -> JobStatus:
+        """Terminate a background job and every process it spawned.
+
+        Killing a job that has already exited is not an error.
+
+        Args:
+            job_id: Identifier returned by `start_job()`.
+
+        Returns:
+            JobStatus reflecting the job's final state.
+        """
+        raise NotImplementedError
+
+    async def akill_job(
+        self,
+        job_id: str,
+    ) -> JobStatus:
+        """Async version of kill_job."""
+        return await run_cancellable(self.kill_job, job_id, executor=self.executor)
 
 
 BackendFactory: TypeAlias = Callable[[ToolRuntime], BackendProtocol]
@@ -10,26 +10,36 @@ implementations to manage sandbox lifecycle (list, create, delete).
 
 from __future__ import annotations
 
-import asyncio
 import base64
+import functools
 import json
+import posixpath
+import re
 import shlex
+import threading
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Generic, NotRequired, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, NotRequired, TypeVar
 
 from typing_extensions import TypedDict
 
+from deepagents.backends.cancellation import run_cancellable
 from deepagents.backends.protocol import (
     EditResult,
+    ExecuteMetrics,
     ExecuteResponse,
     FileDownloadResponse,
     FileInfo,
     FileUploadResponse,
     GrepMatch,
+    JobStatus,
     SandboxBackendProtocol,
     WriteResult,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 class SandboxError(Exception):
     """Base exception for sandbox provider operations.
@@ -212,6 +222,12 @@ class SandboxProvider(ABC, Generic[MetadataT]):
         ```
     """
 
+    executor: Executor | None = None
+    """Executor the default async methods run their blocking counterparts on.
+
+    `None` uses the event loop's default executor; see `BackendExecutor`.
+    """
+
     @abstractmethod
     def list(
         self,
@@ -366,7 +382,7 @@ class SandboxProvider(ABC, Generic[MetadataT]):
         Returns:
             SandboxListResponse containing items and cursor for pagination.
         """
-        return await asyncio.to_thread(self.list, cursor=cursor, **kwargs)
+        return await run_cancellable(functools.partial(self.list, cursor=cursor, **kwargs), executor=self.executor)
 
     async def aget_or_create(
         self,
@@ -392,7 +408,7 @@ class SandboxProvider(ABC, Generic[MetadataT]):
         Returns:
             An object implementing SandboxBackendProtocol.
         """
-        return await asyncio.to_thread(self.get_or_create, sandbox_id=sandbox_id, **kwargs)
+        return await run_cancellable(functools.partial(self.get_or_create, sandbox_id=sandbox_id, **kwargs), executor=self.executor)
 
     async def adelete(
         self,
@@ -409,7 +425,7 @@ class SandboxProvider(ABC, Generic[MetadataT]):
             sandbox_id: Unique identifier of the sandbox to delete.
             **kwargs: Provider-specific deletion options.
         """
-        await asyncio.to_thread(self.delete, sandbox_id=sandbox_id, **kwargs)
+        await run_cancellable(functools.partial(self.delete, sandbox_id=sandbox_id, **kwargs), executor=self.executor)
 
 
 _GLOB_COMMAND_TEMPLATE = """python3 -c "
@@ -435,6 +451,24 @@ for m in matches:
     print(json.dumps(result))
 " 2>/dev/null"""
 
+_ETAGS_COMMAND_TEMPLATE = """python3 -c "
+import os
+import stat
+import json
+import base64
+
+paths = json.loads(base64.b64decode('{paths_b64}').decode('utf-8'))
+etags = []
+for p in paths:
+    try:
+        st = os.lstat(p)
+    except (OSError, ValueError):
+        etags.append(None)
+        continue
+    etags.append(f'{{st.st_size}}:{{st.st_mtime_ns}}:{{st.st_ino}}' if stat.S_ISREG(st.st_mode) else None)
+print(json.dumps(etags))
+" 2>/dev/null"""
+
 # Use heredoc to pass content via stdin to avoid ARG_MAX limits on large files.
 # ARG_MAX limits the total size of command-line arguments.
 # Previously, base64-encoded content was interpolated directly into the command
@@ -535,6 +569,12 @@ print(count)
 {payload_b64}
 __DEEPAGENTS_EOF__"""
 
+# Append with a shell redirect so the existing file is never read or rewritten.
+# The content travels base64-encoded in a heredoc, like the templates above.
+_APPEND_COMMAND_TEMPLATE = """mkdir -p -- {parent} && base64 -d >> {path} <<'__DEEPAGENTS_EOF__'
+{content_b64}
+__DEEPAGENTS_EOF__"""
+
 _READ_COMMAND_TEMPLATE = """python3 -c "
 import os
 import sys
@@ -571,6 +611,136 @@ for i, line in enumerate(selected_lines):
 " 2>&1"""
 
 
+_METRICS_MARKER = "__DEEPAGENTS_METRICS__"
+
+# Runs a command like `/usr/bin/time` would, using python3 (already required by
+# the other templates): applies optional rlimits, forwards the merged output
+# while counting it, then reports wait4() rusage on a trailing marker line.
+_METRICS_COMMAND_TEMPLATE = """python3 -c "
+import base64, json, os, subprocess, sys, time
+import resource
+
+command = base64.b64decode('{command_b64}').decode('utf-8')
+cpu_limit = {cpu_time_limit}
+memory_limit = {memory_limit_bytes}
+
+def apply_limits():
+    if cpu_limit is not None:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+    if memory_limit is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+start = time.monotonic()
+proc = subprocess.Popen(
+    command, shell=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, preexec_fn=apply_limits
+)
+produced = 0
+for chunk in iter(lambda: proc.stdout.read1(65536), b''):
+    produced += len(chunk)
+    sys.stdout.buffer.write(chunk)
+_, status, usage = os.wait4(proc.pid, 0)
+code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else 128 + os.WTERMSIG(status)
+scale = 1 if sys.platform == 'darwin' else 1024
+metrics = dict(
+    wall_time=time.monotonic() - start,
+    user_time=usage.ru_utime,
+    system_time=usage.ru_stime,
+    max_rss_bytes=usage.ru_maxrss * scale,
+    output_bytes=produced,
+)
+sys.stdout.buffer.write(('\\n{marker} ' + json.dumps(metrics) + '\\n').encode('utf-8'))
+sys.stdout.flush()
+sys.exit(code)
+" 2>&1"""
+
+
+_RG_PROBE_MARKER = "__DEEPAGENTS_RG__"
+_RG_PROBE_COMMAND = f"command -v rg >/dev/null 2>&1 && echo {_RG_PROBE_MARKER}"
+
+# Cap on matches returned by grep_raw so a broad search can't flood the context
+# window (or the transport between the sandbox and the host).
+_GREP_MAX_RESULTS = 1000
+
+# Expands to `-Z` only when the sandbox's grep accepts it (a non-matching search
+# exits 1; an unknown option exits 2), so builds without it, like older BusyBox,
+# still run the search and print `path:line_number:text` instead.
+_GREP_NUL_FLAG = "$(grep -qZ x /dev/null 2>/dev/null; [ $? -eq 1 ] && echo -Z)"
+
+_GREP_TRUNCATED_ERROR = "Error: The sandbox truncated the search results. Narrow the search with a more specific path or glob."
+
+# rg --json writes compact JSON, one event per line
+_RG_MATCH_PREFIX = '{"type":"match"'
+
+# Directories that almost never hold files the agent is looking for but can
+# dominate search time.
+_GREP_EXCLUDED_DIRS = (".git", "node_modules", "__pycache__", ".venv", "venv", ".tox", ".mypy_cache", ".pytest_cache", ".ruff_cache")
+
+
+# Background jobs keep their command, pid, exit code and output log here so any
+# later `execute()` call (each possibly in a fresh shell) can find them.
+_JOB_ROOT = "/tmp/.deepagents_jobs"  # noqa: S108
+
+_JOB_ID_PATTERN = re.compile(r"^job-[0-9a-f]{8}$")
+
+# Upper bound on the log bytes `tail_job` returns, whatever `lines` asks for.
+_JOB_TAIL_MAX_BYTES = 50_000
+
+# Prints one status line for the job directory in $d: `running`, `exit <code>`,
+# `exit` (process gone without recording a code) or `missing`.
+_JOB_STATUS_SCRIPT = (
+    'if [ ! -d "$d" ]; then echo missing; '
+    'elif [ -s "$d/exit" ]; then echo "exit $(cat "$d/exit")"; '
+    'elif kill -0 "$(cat "$d/pid" 2>/dev/null)" 2>/dev/null; then echo running; '
+    "else echo exit; fi"
+)
+
+
+# Commands run through `aexecute()` record their shell's pid here so a
+# cancelled call can kill them from a second `execute()`.
+_EXEC_ROOT = "/tmp/.deepagents_exec"  # noqa: S108
+
+# Runs the command verbatim in the foreground, in a child of the same shell
+# (bash if `execute()` runs bash, else sh) that records its pid and then execs
+# the command in place, so the command keeps that pid, inherits stdin and
+# default signal handling, and its exit status is passed through.
+_TRACKED_COMMAND_TEMPLATE = (
+    "mkdir -p {exec_root} 2>/dev/null\n"
+    '_sh="${{BASH:-/bin/sh}}"\n'
+    """"$_sh" -c 'echo $$ > "$1" 2>/dev/null; exec "$2" -c "$0"' {command} {pid_file} "$_sh"\n"""
+    '_s=$?; rm -f {pid_file}; exit "$_s"'
+)
+
+# Defines `_k PID`, which kills a process and all its descendants. Each process
+# is stopped before its children are listed so it cannot fork new ones.
+_KILL_TREE_SCRIPT = (
+    '_k() { kill -STOP "$1" 2>/dev/null; '
+    'for c in $(cat /proc/"$1"/task/*/children 2>/dev/null || pgrep -P "$1" 2>/dev/null); do _k "$c"; done; '
+    'kill -9 "$1" 2>/dev/null; }'
+)
+
+
+def _parse_job_status(job_id: str, line: str) -> JobStatus:
+    """Turn a `_JOB_STATUS_SCRIPT` status line into a `JobStatus`."""
+    line = line.strip()
+    if line == "running":
+        return JobStatus(job_id=job_id, running=True)
+    if line.startswith("exit"):
+        code = line.removeprefix("exit").strip()
+        return JobStatus(job_id=job_id, exit_code=int(code) if code.lstrip("-").isdigit() else None)
+    return JobStatus(job_id=job_id, error=f"Error: Job '{job_id}' not found")
+
+
+def _rg_text(value: object) -> str | None:
+    """Extract text from an `rg --json` string field (`{"text": ...}` or `{"bytes": ...}`)."""
+    if not isinstance(value, dict):
+        return None
+    if "text" in value:
+        return value["text"]
+    if "bytes" in value:
+        return base64.b64decode(value["bytes"]).decode("utf-8", errors="replace")
+    return None
+
+
 class BaseSandbox(SandboxBackendProtocol, ABC):
     """Base sandbox implementation with execute() as abstract method.
 
@@ -578,6 +748,19 @@ class BaseSandbox(SandboxBackendProtocol, ABC):
     using shell commands. Subclasses only need to implement execute().
     """
 
+    def __init__(self, *, executor: Executor | None = None) -> None:
+        """Initialize the sandbox.
+
+        Subclasses that define their own `__init__` can forward `executor` here
+        or leave it unset; the `executor` class attribute defaults to `None`.
+
+        Args:
+            executor: Executor the async methods (including `aexecute()`) run
+                their blocking counterparts on, e.g. a `BackendExecutor`.
+                Defaults to the event loop's default executor.
+        """
+        self.executor = executor
+
     @abstractmethod
     def execute(
         self,
@@ -593,6 +776,75 @@ class BaseSandbox(SandboxBackendProtocol, ABC):
         """
         ...
 
+    async def aexecute(
+        self,
+        command: str,
+    ) -> ExecuteResponse:
+        """Async version of execute() that kills the remote command when cancelled.
+
+        The command runs unchanged, in the foreground, in a child shell whose
+        pid is recorded under `/tmp/.deepagents_exec/` and removed once it
+        exits. If the awaiting task is cancelled, a second `execute()` (sent
+        from a background thread) kills that shell and every process it
+        started, so the sandbox does not keep running work nobody is waiting
+        for.
+        """
+        if not command or not isinstance(command, str):
+            return await run_cancellable(self.execute, command, executor=self.executor)
+        pid_file = f"{_EXEC_ROOT}/{uuid.uuid4().hex[:12]}.pid"
+        tracked = _TRACKED_COMMAND_TEMPLATE.format(exec_root=_EXEC_ROOT, pid_file=pid_file, command=shlex.quote(command))
+        return await run_cancellable(self.execute, tracked, on_cancel=lambda: self._kill_remote_command(pid_file), executor=self.executor)
+
+    def _kill_remote_command(self, pid_file: str) -> None:
+        """Kill the process tree whose root pid is in `pid_file`, without blocking the caller."""
+        kill = f'p=$(cat {pid_file} 2>/dev/null); if [ -n "$p" ]; then {_KILL_TREE_SCRIPT}; _k "$p"; fi; rm -f {pid_file}'
+        threading.Thread(target=self.execute, args=(kill,), daemon=True, name="deepagents-sandbox-cancel").start()
+
+    def execute_with_metrics(
+        self,
+        command: str,
+        *,
+        cpu_time_limit: int | None = None,
+        memory_limit_bytes: int | None = None,
+    ) -> ExecuteResponse:
+        """Execute a command and measure its resource usage inside the sandbox.
+
+        Wraps the command in a small `python3` runner (similar to `/usr/bin/time`)
+        that reports wall time, CPU time, peak RSS and output size, and can apply
+        `RLIMIT_CPU`/`RLIMIT_AS` caps. Falls back to a plain `execute()` without
+        metrics when `python3` is not available in the sandbox. Stdout and stderr
+        are merged into one stream.
+
+        This is an opt-in API: `execute()`, and therefore the agent's `execute`
+        tool, does not go through it.
+
+        Args:
+            command: Full shell command string to execute.
+            cpu_time_limit: Maximum CPU seconds per process before it is killed.
+            memory_limit_bytes: Maximum virtual memory per process.
+
+        Returns:
+            ExecuteResponse with `metrics` set when the runner's report was
+            received (it is lost if the backend truncates the end of the output).
+        """
+        runner = _METRICS_COMMAND_TEMPLATE.format(
+            command_b64=base64.b64encode(command.encode("utf-8")).decode("ascii"),
+            cpu_time_limit=None if cpu_time_limit is None else int(cpu_time_limit),
+            memory_limit_bytes=None if memory_limit_bytes is None else int(memory_limit_bytes),
+            marker=_METRICS_MARKER,
+        )
+        result = self.execute(f"if command -v python3 >/dev/null 2>&1; then {runner}; else sh -c {shlex.quote(command)}; fi")
+
+        output, marker, report = result.output.rpartition(f"\n{_METRICS_MARKER} ")
+        if not marker:
+            return result
+        try:
+            metrics = ExecuteMetrics(**json.loads(report))
+        except (json.JSONDecodeError, TypeError):
+            return result
+        metrics.returned_bytes = len(output.encode("utf-8"))
+        return ExecuteResponse(output=output, exit_code=result.exit_code, truncated=result.truncated, metrics=metrics)
+
     def ls_info(self, path: str) -> list[FileInfo]:
         """Structured listing with file metadata using os.scandir."""
         cmd = f"""python3 -c "
@@ -645,6 +897,8 @@ except PermissionError:
 
         if exit_code != 0 or "Error: File not found" in output:
             return f"Error: File '{file_path}' not found"
+        if result.truncated:
+            return f"Error: The sandbox truncated the content of '{file_path}'. Read it in smaller ranges with offset and limit."
 
         return output
 
@@ -708,47 +962,121 @@ except PermissionError:
         # External storage - no files_update needed
         return EditResult(path=file_path, files_update=None, occurrences=count)
 
+    def append(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Append to a file with `>>`, creating it if needed. Returns WriteResult."""
+        content_b64 = base64.b64encode(content.encode("utf-8")).decode("ascii")
+        parent = posixpath.dirname(file_path) or "."
+        cmd = _APPEND_COMMAND_TEMPLATE.format(parent=shlex.quote(parent), path=shlex.quote(file_path), content_b64=content_b64)
+        result = self.execute(cmd)
+
+        if result.exit_code != 0:
+            error_msg = result.output.strip() or f"Failed to append to file '{file_path}'"
+            return WriteResult(error=error_msg)
+
+        # External storage - no files_update needed
+        return WriteResult(path=file_path, files_update=None)
+
+    def _has_ripgrep(self) -> bool:
+        """Whether `rg` is available in the sandbox.
+
+        The probe runs once per sandbox instance and the result is cached, so
+        repeated searches don't pay for an extra round trip.
+        """
+        cached = getattr(self, "_rg_available", None)
+        if cached is None:
+            result = self.execute(_RG_PROBE_COMMAND)
+            cached = _RG_PROBE_MARKER in result.output
+            self._rg_available = cached
+        return cached
+
     def grep_raw(
         self,
         pattern: str,
         path: str | None = None,
         glob: str | None = None,
     ) -> list[GrepMatch] | str:
-        """Structured search results or error string for invalid input."""
-        search_path = shlex.quote(path or ".")
-
-        # Build grep command to get structured output
-        grep_opts = "-rHnF"  # recursive, with filename, with line number, fixed-strings (literal)
+        """Structured search results or error string for invalid input.
 
-        # Add glob pattern if specified
-        glob_pattern = ""
+        Uses `rg --json` when ripgrep is installed in the sandbox and falls back
+        to NUL-separated `grep -Z` output otherwise, so paths containing `:` are
+        parsed correctly (grep builds without `-Z` fall back to `path:line:text`). Binary files and vendored directories are skipped and
+        the number of returned matches is capped at `_GREP_MAX_RESULTS`.
+        """
+        if self._has_ripgrep():
+            return self._ripgrep_raw(pattern, path, glob)
+        return self._grep_fallback_raw(pattern, path, glob)
+
+    def _ripgrep_raw(self, pattern: str, path: str | None, glob: str | None) -> list[GrepMatch] | str:
+        """Search with `rg --json` and parse the match events."""
+        # --no-ignore/--hidden keep results consistent with the grep fallback;
+        # vendored directories are excluded explicitly instead.
+        opts = ["--json", "-F", "--hidden", "--no-ignore"]
+        opts.extend(f"--glob {shlex.quote('!' + name)}" for name in _GREP_EXCLUDED_DIRS)
         if glob:
-            glob_pattern = f"--include='{glob}'"
+            opts.append(f"--glob {shlex.quote(glob)}")
+        # Keep only match events and cap them in the sandbox, like the `head` of the
+        # grep fallback, so the total (not per-file) result size is bounded
+        cmd = (
+            f"rg {' '.join(opts)} -e {shlex.quote(pattern)} -- {shlex.quote(path or '.')} 2>/dev/null"
+            f" | grep -F {shlex.quote(_RG_MATCH_PREFIX)} | head -n {_GREP_MAX_RESULTS} || true"
+        )
+        result = self.execute(cmd)
+        if result.truncated:
+            return _GREP_TRUNCATED_ERROR
 
-        # Escape pattern for shell
-        pattern_escaped = shlex.quote(pattern)
+        matches: list[GrepMatch] = []
+        for line in result.output.splitlines():
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(event, dict) or event.get("type") != "match":
+                continue
+            data = event.get("data", {})
+            file_path = _rg_text(data.get("path"))
+            line_number = data.get("line_number")
+            if file_path is None or line_number is None:
+                continue
+            text = _rg_text(data.get("lines")) or ""
+            matches.append({"path": file_path, "line": int(line_number), "text": text.rstrip("\r\n")})
+            if len(matches) >= _GREP_MAX_RESULTS:
+                break
+        return matches
 
-        cmd = f"grep {grep_opts} {glob_pattern} -e {pattern_escaped} {search_path} 2>/dev/null || true"
+    def _grep_fallback_raw(self, pattern: str, path: str | None, glob: str | None) -> list[GrepMatch] | str:
+        """Search with POSIX-ish `grep`, using NUL separators after file names."""
+        # recursive, with filename, with line number, fixed-strings (literal),
+        # skip binary files, NUL byte after the file name where supported
+        opts = ["-rHnFI", _GREP_NUL_FLAG]
+        opts.extend(f"--exclude-dir={shlex.quote(name)}" for name in _GREP_EXCLUDED_DIRS)
+        if glob:
+            opts.append(f"--include={shlex.quote(glob)}")
+        cmd = f"grep {' '.join(opts)} -e {shlex.quote(pattern)} -- {shlex.quote(path or '.')} 2>/dev/null | head -n {_GREP_MAX_RESULTS} || true"
         result = self.execute(cmd)
+        if result.truncated:
+            return _GREP_TRUNCATED_ERROR
 
-        output = result.output.rstrip()
+        output = result.output.rstrip("\n")
         if not output:
             return []
 
-        # Parse grep output into GrepMatch objects
         matches: list[GrepMatch] = []
         for line in output.split("\n"):
-            # Format is: path:line_number:text
-            parts = line.split(":", 2)
-            if len(parts) >= 3:
-                matches.append(
-                    {
-                        "path": parts[0],
-                        "line": int(parts[1]),
-                        "text": parts[2],
-                    }
-                )
-
+            # Format is: path\0line_number:text
+            if "\0" in line:
+                file_path, _, rest = line.partition("\0")
+                line_number, sep, text = rest.partition(":")
+            else:
+                # _GREP_NUL_FLAG left out -Z, so the path ends at the first colon
+                file_path, _, rest = line.partition(":")
+                line_number, sep, text = rest.partition(":")
+            if not sep or not line_number.isdigit():
+                continue
+            matches.append({"path": file_path, "line": int(line_number), "text": text})
         return matches
 
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
@@ -780,6 +1108,78 @@ except PermissionError:
 
         return file_infos
 
+    def file_etags(self, paths: list[str]) -> list[str | None]:
+        """Return a tag per file built from its size, mtime and inode, with one `execute` call."""
+        if not paths:
+            return []
+        paths_b64 = base64.b64encode(json.dumps(paths).encode("utf-8")).decode("ascii")
+        result = self.execute(_ETAGS_COMMAND_TEMPLATE.format(paths_b64=paths_b64))
+        try:
+            etags = json.loads(result.output.strip())
+        except json.JSONDecodeError:
+            return [None] * len(paths)
+        if not isinstance(etags, list) or len(etags) != len(paths):
+            return [None] * len(paths)
+        return [etag if isinstance(etag, str) else None for etag in etags]
+
+    def start_job(self, command: str) -> JobStatus:
+        """Start a command in the background with `nohup`, detached from `execute()`.
+
+        The command, its pid, exit code and combined output are kept under
+        `/tmp/.deepagents_jobs/<job_id>/`. When `setsid` is available the job
+        gets its own process group so `kill_job()` also stops its children.
+        """
+        if not command or not isinstance(command, str):
+            return JobStatus(job_id="", error="Error: Command must be a non-empty string.")
+        job_id = f"job-{uuid.uuid4().hex[:8]}"
+        job_dir = shlex.quote(f"{_JOB_ROOT}/{job_id}")
+        runner = 'sh "$1/cmd" > "$1/log" 2>&1; echo $? > "$1/exit"'
+        cmd = (
+            f'd={job_dir}; mkdir -p "$d" && printf \'%s\' {shlex.quote(command)} > "$d/cmd" && '
+            "{ command -v setsid >/dev/null 2>&1 && s=setsid || s=; "
+            f'$s nohup sh -c {shlex.quote(runner)} _ "$d" >/dev/null 2>&1 < /dev/null & echo $! > "$d/pid"; }} && echo started'
+        )
+        result = self.execute(cmd)
+        if result.exit_code != 0 or "started" not in result.output:
+            return JobStatus(job_id=job_id, error=f"Error starting job: {result.output.strip()}")
+        return JobStatus(job_id=job_id, running=True)
+
+    def poll_job(self, job_id: str) -> JobStatus:
+        """Check a background job's status from its pid and exit files."""
+        if not _JOB_ID_PATTERN.match(job_id):
+            return JobStatus(job_id=job_id, error=f"Error: Job '{job_id}' not found")
+        result = self.execute(f"d={shlex.quote(f'{_JOB_ROOT}/{job_id}')}; {_JOB_STATUS_SCRIPT}")
+        return _parse_job_status(job_id, result.output)
+
+    def tail_job(self, job_id: str, lines: int = 50) -> JobStatus:
+        """Read the job's status and the last `lines` lines of its log in one command."""
+        if not _JOB_ID_PATTERN.match(job_id):
+            return JobStatus(job_id=job_id, error=f"Error: Job '{job_id}' not found")
+        cmd = (
+            f"d={shlex.quote(f'{_JOB_ROOT}/{job_id}')}; {_JOB_STATUS_SCRIPT}; "
+            f'tail -n {max(int(lines), 0)} "$d/log" 2>/dev/null | tail -c {_JOB_TAIL_MAX_BYTES}'
+        )
+        result = self.execute(cmd)
+        status_line, _, output = result.output.partition("\n")
+        status = _parse_job_status(job_id, status_line)
+        if status.error is None:
+            status.output = output.rstrip("\n")
+        return status
+
+    def kill_job(self, job_id: str) -> JobStatus:
+        """Kill a background job's process group (or just its pid without `setsid`)."""
+        if not _JOB_ID_PATTERN.match(job_id):
+            return JobStatus(job_id=job_id, error=f"Error: Job '{job_id}' not found")
+        cmd = (
+            f"d={shlex.quote(f'{_JOB_ROOT}/{job_id}')}; "
+            'if [ -d "$d" ] && [ ! -s "$d/exit" ]; then p=$(cat "$d/pid" 2>/dev/null); '
+            'if [ -n "$p" ]; then kill -9 "-$p" 2>/dev/null || kill -9 "$p" 2>/dev/null; fi; '
+            'echo 137 > "$d/exit"; fi; '
+            f"{_JOB_STATUS_SCRIPT}"
+        )
+        result = self.execute(cmd)
+        return _parse_job_status(job_id, result.output)
+
     @property
     @abstractmethod
     def id(self) -> str:
@@ -0,0 +1,399 @@
+"""`PooledSandboxProvider`: keeps ready-to-use sandboxes warm for any `SandboxProvider`.
+
+Creating a sandbox (and running its setup) can take tens of seconds. The pool
+creates sandboxes ahead of time in background threads so `get_or_create()` can
+hand one out immediately and then top the pool back up. Expired and unhealthy
+sandboxes are deleted in background threads too, never on the caller's thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generic
+
+from deepagents.backends.sandbox import MetadataT, SandboxListResponse, SandboxProvider
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+    from deepagents.backends.protocol import SandboxBackendProtocol
+
+logger = logging.getLogger(__name__)
+
+
+def _default_health_check(sandbox: SandboxBackendProtocol) -> bool:
+    """Consider a sandbox healthy if it can run a trivial command."""
+    try:
+        return sandbox.execute("true").exit_code == 0
+    except Exception:  # noqa: BLE001
+        return False
+
+
+@dataclass(eq=False)
+class _WarmSandbox:
+    sandbox: SandboxBackendProtocol
+    ready_at: float
+    expiry: threading.Timer | None = None
+    """Deletes the sandbox once it has been idle for `max_idle_seconds`."""
+
+
+class PooledSandboxProvider(SandboxProvider[MetadataT], Generic[MetadataT]):
+    """Wrap a `SandboxProvider` with a pool of pre-created, pre-set-up sandboxes.
+
+    Calls to `get_or_create()` without a `sandbox_id` (and without per-call
+    creation kwargs) are served from the pool when possible. Each handed-out
+    sandbox is health-checked first, sandboxes idle for longer than
+    `max_idle_seconds` are deleted in the background whether or not anyone
+    asks for one, and every take triggers a background refill back up to `size`. When the pool is empty the call
+    falls back to creating a sandbox directly, so it is never slower than the
+    wrapped provider.
+
+    All other calls (reconnecting by id, `list()`, `delete()`) go straight to
+    the wrapped provider. Call `close()` (or use the pool as a context manager)
+    to delete the sandboxes still waiting in the pool.
+
+    Example:
+        ```python
+        pool = PooledSandboxProvider(
+            ModalProvider(),
+            size=2,
+            setup=lambda sandbox: sandbox.execute("pip install -r requirements.txt"),
+        )
+        backend = pool.get_or_create()  # returns immediately once the pool is warm
+        ...
+        pool.delete(sandbox_id=backend.id)
+        pool.close()
+        ```
+    """
+
+    def __init__(
+        self,
+        provider: SandboxProvider[MetadataT],
+        *,
+        size: int = 1,
+        max_idle_seconds: float | None = 600.0,
+        create_kwargs: dict[str, Any] | None = None,
+        setup: Callable[[SandboxBackendProtocol], None] | None = None,
+        health_check: Callable[[SandboxBackendProtocol], bool] | None = _default_health_check,
+        prewarm: bool = True,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            provider: Provider that actually creates and deletes sandboxes.
+            size: Number of ready sandboxes to keep in the pool.
+            max_idle_seconds: Sandboxes that waited in the pool for longer than
+                this are deleted by a background timer. `None` disables the limit.
+            create_kwargs: Provider-specific kwargs passed to every
+                `provider.get_or_create()` call made by the pool.
+            setup: Optional callable run on each new sandbox before it enters
+                the pool (e.g. installing dependencies). If it raises, the
+                sandbox is deleted.
+            health_check: Callable that returns whether a pooled sandbox is still
+                usable; checked right before handing it out. Defaults to
+                running `true`. Pass `None` to skip the check.
+            prewarm: Whether to start filling the pool immediately.
+
+        Raises:
+            ValueError: If `size` is negative.
+        """
+        if size < 0:
+            msg = f"size must be non-negative, got {size}"
+            raise ValueError(msg)
+        self._provider = provider
+        self._size = size
+        self._max_idle_seconds = max_idle_seconds
+        self._create_kwargs = create_kwargs or {}
+        self._setup = setup
+        self._health_check = health_check
+        self._idle: deque[_WarmSandbox] = deque()
+        self._pending = 0
+        self._deleting = 0
+        self._closed = False
+        self._lock = threading.Condition()
+        self._last_error: BaseException | None = None
+        if prewarm:
+            self._refill()
+
+    @property
+    def provider(self) -> SandboxProvider[MetadataT]:
+        """The wrapped provider."""
+        return self._provider
+
+    @property
+    def idle_count(self) -> int:
+        """Number of ready sandboxes currently waiting in the pool."""
+        with self._lock:
+            return len(self._idle)
+
+    @property
+    def last_error(self) -> BaseException | None:
+        """Most recent error raised while creating a sandbox in the background."""
+        return self._last_error
+
+    def wait_for_refill(self, timeout: float | None = None) -> bool:
+        """Block until no background creations or deletions are in flight.
+
+        Args:
+            timeout: Maximum seconds to wait, or `None` to wait indefinitely.
+
+        Returns:
+            True if all in-flight creations and deletions finished (successfully
+            or not) within `timeout`, False otherwise.
+        """
+        with self._lock:
+            return self._lock.wait_for(lambda: self._pending == 0 and self._deleting == 0, timeout)
+
+    def _create(self) -> SandboxBackendProtocol:
+        """Create and set up a new sandbox with the pool's configuration."""
+        sandbox = self._provider.get_or_create(sandbox_id=None, **self._create_kwargs)
+        if self._setup is not None:
+            try:
+                self._setup(sandbox)
+            except BaseException:
+                self._discard(sandbox)
+                raise
+        return sandbox
+
+    def _discard(self, sandbox: SandboxBackendProtocol) -> None:
+        """Delete a sandbox the pool will not hand out, logging failures."""
+        try:
+            self._provider.delete(sandbox_id=sandbox.id)
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to delete pooled sandbox %s", sandbox.id, exc_info=True)
+
+    def _discard_in_background(self, sandboxes: list[SandboxBackendProtocol]) -> None:
+        """Delete sandboxes on a background thread so the caller does not wait for the provider."""
+        if not sandboxes:
+            return
+        with self._lock:
+            self._deleting += len(sandboxes)
+
+        def run() -> None:
+            for sandbox in sandboxes:
+                try:
+                    self._discard(sandbox)
+                finally:
+                    with self._lock:
+                        self._deleting -= 1
+                        self._lock.notify_all()
+
+        threading.Thread(target=run, daemon=True, name="deepagents-sandbox-pool-delete").start()
+
+    def _expire(self, warm: _WarmSandbox) -> None:
+        """Delete a sandbox that sat in the pool for `max_idle_seconds` (runs on its timer thread)."""
+        with self._lock:
+            if warm not in self._idle:
+                # Handed out, forgotten or cleared by `close()` in the meantime.
+                return
+            self._idle.remove(warm)
+            self._deleting += 1
+        logger.debug("Deleting pooled sandbox %s after %ss idle", warm.sandbox.id, self._max_idle_seconds)
+        try:
+            self._discard(warm.sandbox)
+        finally:
+            with self._lock:
+                self._deleting -= 1
+                self._lock.notify_all()
+
+    def _refill(self) -> None:
+        """Start background creations until idle plus in-flight sandboxes reach `size`."""
+        with self._lock:
+            if self._closed:
+                return
+            missing = self._size - len(self._idle) - self._pending
+            self._pending += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            threading.Thread(target=self._fill_one, daemon=True, name="deepagents-sandbox-pool").start()
+
+    def _fill_one(self) -> None:
+        """Create one sandbox and add it to the pool (runs in a background thread)."""
+        try:
+            sandbox = self._create()
+        except Exception as e:  # noqa: BLE001
+            # Background thread: record the failure instead of raising. Don't retry
+            # in a loop: the next take triggers another refill.
+            logger.warning("Failed to create pooled sandbox", exc_info=True)
+            self._last_error = e
+            with self._lock:
+                self._pending -= 1
+                self._lock.notify_all()
+            return
+        with self._lock:
+            self._pending -= 1
+            self._lock.notify_all()
+            if not self._closed:
+                warm = _WarmSandbox(sandbox=sandbox, ready_at=time.monotonic())
+                if self._max_idle_seconds is not None:
+                    warm.expiry = threading.Timer(self._max_idle_seconds, self._expire, args=(warm,))
+                    warm.expiry.daemon = True
+                    warm.expiry.start()
+                self._idle.append(warm)
+                return
+        # The pool was closed while this sandbox was being created.
+        self._discard(sandbox)
+
+    def _take_warm(self) -> SandboxBackendProtocol | None:
+        """Pop the oldest usable sandbox from the pool, discarding stale or unhealthy ones.
+
+        Discarded sandboxes are deleted in the background, so only the health
+        check runs on the caller's thread.
+        """
+        discarded: list[SandboxBackendProtocol] = []
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        return None
+                    warm = self._idle.popleft()
+                if warm.expiry is not None:
+                    warm.expiry.cancel()
+                # The expiry timer may not have fired yet
+                idle_for = time.monotonic() - warm.ready_at
+                if self._max_idle_seconds is not None and idle_for > self._max_idle_seconds:
+                    discarded.append(warm.sandbox)
+                    continue
+                if self._health_check is not None and not self._health_check(warm.sandbox):
+                    logger.info("Discarding unhealthy pooled sandbox %s", warm.sandbox.id)
+                    discarded.append(warm.sandbox)
+                    continue
+                return warm.sandbox
+        finally:
+            self._discard_in_background(discarded)
+
+    def get_or_create(
+        self,
+        *,
+        sandbox_id: str | None = None,
+        **kwargs: Any,
+    ) -> SandboxBackendProtocol:
+        """Hand out a warm sandbox, or defer to the wrapped provider.
+
+        Args:
+            sandbox_id: Existing sandbox to reconnect to. Always handled by the
+                wrapped provider.
+            **kwargs: Provider-specific creation parameters. Requests with
+                kwargs are not served from the pool, since pooled sandboxes were
+                created with `create_kwargs`.
+
+        Returns:
+            A ready sandbox.
+        """
+        if sandbox_id is not None or kwargs:
+            return self._provider.get_or_create(sandbox_id=sandbox_id, **kwargs)
+        try:
+            sandbox = self._take_warm()
+            return sandbox if sandbox is not None else self._create()
+        finally:
+            self._refill()
+
+    async def aget_or_create(
+        self,
+        *,
+        sandbox_id: str | None = None,
+        **kwargs: Any,
+    ) -> SandboxBackendProtocol:
+        """Async version of get_or_create().
+
+        Pool hits only wait for the health check. Misses use the wrapped
+        provider's `aget_or_create()`, so native async providers stay async.
+        """
+        if sandbox_id is not None or kwargs:
+            return await self._provider.aget_or_create(sandbox_id=sandbox_id, **kwargs)
+        try:
+            sandbox = await asyncio.to_thread(self._take_warm)
+            if sandbox is not None:
+                return sandbox
+            sandbox = await self._provider.aget_or_create(sandbox_id=None, **self._create_kwargs)
+            if self._setup is not None:
+                try:
+                    await asyncio.to_thread(self._setup, sandbox)
+                except BaseException:
+                    await asyncio.to_thread(self._discard, sandbox)
+                    raise
+            return sandbox
+        finally:
+            self._refill()
+
+    def list(
+        self,
+        *,
+        cursor: str | None = None,
+        **kwargs: Any,
+    ) -> SandboxListResponse[MetadataT]:
+        """List sandboxes via the wrapped provider (pooled sandboxes included)."""
+        return self._provider.list(cursor=cursor, **kwargs)
+
+    async def alist(
+        self,
+        *,
+        cursor: str | None = None,
+        **kwargs: Any,
+    ) -> SandboxListResponse[MetadataT]:
+        """Async version of list()."""
+        return await self._provider.alist(cursor=cursor, **kwargs)
+
+    def delete(
+        self,
+        *,
+        sandbox_id: str,
+        **kwargs: Any,
+    ) -> None:
+        """Delete a sandbox, removing it from the pool if it is still waiting there."""
+        self._forget(sandbox_id)
+        self._provider.delete(sandbox_id=sandbox_id, **kwargs)
+
+    async def adelete(
+        self,
+        *,
+        sandbox_id: str,
+        **kwargs: Any,
+    ) -> None:
+        """Async version of delete()."""
+        self._forget(sandbox_id)
+        await self._provider.adelete(sandbox_id=sandbox_id, **kwargs)
+
+    def _forget(self, sandbox_id: str) -> None:
+        with self._lock:
+            forgotten = [warm for warm in self._idle if warm.sandbox.id == sandbox_id]
+            self._idle = deque(warm for warm in self._idle if warm.sandbox.id != sandbox_id)
+        for warm in forgotten:
+            if warm.expiry is not None:
+                warm.expiry.cancel()
+
+    def close(self) -> None:
+        """Stop refilling and delete every sandbox still waiting in the pool.
+
+        Sandboxes already handed out are left alone. Sandboxes whose creation
+        is still in flight are deleted as soon as they are ready.
+        """
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for warm in idle:
+            if warm.expiry is not None:
+                warm.expiry.cancel()
+            self._discard(warm.sandbox)
+
+    def __enter__(self) -> PooledSandboxProvider[MetadataT]:
+        """Return the pool for use in a `with` block."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the pool on exit."""
+        self.close()
+
+
+__all__ = ["PooledSandboxProvider"]
@@ -0,0 +1,329 @@
+"""Cheap point-in-time snapshots of a directory tree, used by `FilesystemBackend`.
+
+A snapshot mirrors the workspace under a snapshot directory:
+
+- A file that has not changed since the previous snapshot is hard-linked to
+  that snapshot's copy. Snapshot copies are never modified in place, so the
+  snapshots can safely share them.
+- Other files are cloned with the Linux `FICLONE` ioctl on filesystems with
+  reflink support (btrfs, XFS, bcachefs), and copied elsewhere. Files are never
+  hard-linked to the workspace: a hard link shares the inode, so anything that
+  modifies a file in place outside the backend (e.g. `echo >> file` run through
+  `execute`) would silently change the snapshot too.
+
+Next to each snapshot a manifest records every file's stat fingerprint (size,
+mtime, ctime and inode) at snapshot time. A live file whose fingerprint still
+matches is unchanged, since writers can preserve size and mtime but not ctime,
+so neither the next snapshot nor a restore has to read it. Only files whose
+fingerprint differs are compared byte by byte; restoring re-materializes the
+ones that differ and removes files the snapshot does not contain.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import errno
+import json
+import os
+import shutil
+import stat
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_FICLONE = 0x40049409
+"""Linux `ioctl` request that clones one file's extents into another."""
+
+_REFLINK_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+
+_COMPARE_CHUNK_SIZE = 1024 * 1024
+
+_RACY_WINDOW_NS = 2_000_000_000
+"""Fingerprints taken this close to a file's last change are not trusted.
+
+A write in the same timestamp tick as the `stat` call would not change the
+fingerprint, so such files are compared by content instead.
+"""
+
+Fingerprint = tuple[int, int, int, int]
+"""`(size, mtime_ns, ctime_ns, inode)` of a regular file."""
+
+
+def _fingerprint(path: Path) -> Fingerprint | None:
+    """Return the fingerprint of a regular file, or `None` for anything else."""
+    try:
+        st = path.stat(follow_symlinks=False)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
+
+
+class _Manifest:
+    """Fingerprints of a snapshot's files, stored next to the snapshot."""
+
+    def __init__(self, taken_ns: int, files: dict[str, Fingerprint]) -> None:
+        self.taken_ns = taken_ns
+        self.files = files
+
+    @classmethod
+    def load(cls, path: Path) -> _Manifest | None:
+        try:
+            data = json.loads(path.read_text())
+            return cls(int(data["taken_ns"]), {rel: tuple(fp) for rel, fp in data["files"].items()})
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_text(json.dumps({"taken_ns": self.taken_ns, "files": self.files}))
+        tmp.replace(path)
+
+    def unchanged(self, rel: Path, live: Path) -> bool:
+        """Return whether `live` still has the fingerprint recorded for `rel`."""
+        recorded = self.files.get(rel.as_posix())
+        # ctime_ns is the last change to the file, so it must predate the stat call by the racy window.
+        return recorded is not None and recorded[2] < self.taken_ns - _RACY_WINDOW_NS and _fingerprint(live) == recorded
+
+
+def _same_content(saved: Path, live: Path) -> bool:
+    """Return whether `live` holds exactly what `saved` holds (bytes or symlink target)."""
+    try:
+        if saved.is_symlink() or live.is_symlink():
+            return saved.is_symlink() and live.is_symlink() and saved.readlink() == live.readlink()
+        if not live.is_file() or saved.stat().st_size != live.stat().st_size:
+            return False
+        with saved.open("rb") as fsaved, live.open("rb") as flive:
+            while True:
+                chunk = fsaved.read(_COMPARE_CHUNK_SIZE)
+                if chunk != flive.read(_COMPARE_CHUNK_SIZE):
+                    return False
+                if not chunk:
+                    return True
+    except OSError:
+        return False
+
+
+class WorkspaceSnapshots:
+    """Creates, restores and deletes snapshots of one directory tree.
+
+    Attributes:
+        root: Directory being snapshotted.
+        store: Directory holding one subdirectory per snapshot. It may live
+            inside `root`; it is then left out of snapshots and restores.
+    """
+
+    def __init__(self, root: Path, store: Path) -> None:
+        """Initialize the snapshot manager. No I/O happens until first use.
+
+        Args:
+            root: Directory to snapshot.
+            store: Directory to keep snapshots in. Keep it on the same
+                filesystem as `root` so files can be cloned instead of copied.
+        """
+        self.root = root
+        self.store = store
+        self._reflink: bool | None = None if os.name == "posix" else False
+
+    def create(self, snapshot_id: str | None = None) -> str:
+        """Snapshot the current state of `root`.
+
+        Args:
+            snapshot_id: Name for the snapshot, e.g. a LangGraph checkpoint id.
+                A random id is generated if omitted.
+
+        Returns:
+            The snapshot id, to pass to `restore()`.
+
+        Raises:
+            ValueError: If the id is not a plain name or is already taken.
+        """
+        snapshot_id = snapshot_id or uuid.uuid4().hex[:12]
+        target = self._path(snapshot_id)
+        if target.exists():
+            msg = f"Snapshot '{snapshot_id}' already exists"
+            raise ValueError(msg)
+        self.store.mkdir(parents=True, exist_ok=True)
+        ignore = self.store / ".gitignore"
+        if not ignore.exists():
+            ignore.write_text("*\n")
+
+        previous = self.list()[-1:]
+        base = self._path(previous[0]) if previous else None
+        base_manifest = _Manifest.load(self._manifest_path(previous[0])) if previous else None
+        manifest = _Manifest(time.time_ns(), {})
+
+        partial = self.store / f".{snapshot_id}.partial"
+        shutil.rmtree(partial, ignore_errors=True)
+        partial.mkdir()
+        for rel_dir, dirs, files in self._walk(self.root):
+            for name in dirs:
+                (partial / rel_dir / name).mkdir()
+            for name in files:
+                rel = rel_dir / name
+                live = self.root / rel
+                # Fingerprint before copying, so a write during the copy shows up as a change.
+                fingerprint = _fingerprint(live)
+                if fingerprint is not None:
+                    manifest.files[rel.as_posix()] = fingerprint
+                if not (
+                    base is not None
+                    and base_manifest is not None
+                    and base_manifest.unchanged(rel, live)
+                    and self._try_link(base / rel, partial / rel)
+                ):
+                    self._materialize(live, partial / rel)
+        manifest.save(self._manifest_path(snapshot_id))
+        partial.rename(target)
+        return snapshot_id
+
+    def restore(self, snapshot_id: str) -> None:
+        """Make `root` match the snapshot again.
+
+        Args:
+            snapshot_id: Id returned by `create()`.
+
+        Raises:
+            ValueError: If the snapshot does not exist.
+        """
+        source = self._path(snapshot_id)
+        if not source.is_dir():
+            msg = f"Snapshot '{snapshot_id}' not found"
+            raise ValueError(msg)
+
+        manifest = _Manifest.load(self._manifest_path(snapshot_id))
+        refreshed = _Manifest(time.time_ns(), {})
+        keep: set[Path] = set()
+        for rel_dir, dirs, files in self._walk(source):
+            for name in dirs:
+                rel = rel_dir / name
+                keep.add(rel)
+                live = self.root / rel
+                if live.is_symlink() or (live.exists() and not live.is_dir()):
+                    live.unlink()
+                live.mkdir(exist_ok=True)
+            for name in files:
+                rel = rel_dir / name
+                keep.add(rel)
+                live = self.root / rel
+                if manifest is None or not manifest.unchanged(rel, live):
+                    self._restore_file(source / rel, live)
+                # Record the live file as it is now, so the next restore can skip it without reading it.
+                fingerprint = _fingerprint(live)
+                if fingerprint is not None:
+                    refreshed.files[rel.as_posix()] = fingerprint
+        refreshed.save(self._manifest_path(snapshot_id))
+
+        # Never delete the directories leading to the snapshot store.
+        if self.store.is_relative_to(self.root):
+            keep.update(self.store.relative_to(self.root).parents)
+        for rel_dir, dirs, files in self._walk(self.root):
+            for name in files:
+                if rel_dir / name not in keep:
+                    (self.root / rel_dir / name).unlink()
+            for name in [d for d in dirs if rel_dir / d not in keep]:
+                shutil.rmtree(self.root / rel_dir / name)
+                dirs.remove(name)
+
+    def delete(self, snapshot_id: str) -> None:
+        """Delete a snapshot. Deleting an unknown snapshot is a no-op."""
+        shutil.rmtree(self._path(snapshot_id), ignore_errors=True)
+        with contextlib.suppress(FileNotFoundError):
+            self._manifest_path(snapshot_id).unlink()
+
+    def list(self) -> list[str]:
+        """Return the ids of all complete snapshots, oldest first."""
+        if not self.store.is_dir():
+            return []
+        entries = [p for p in self.store.iterdir() if p.is_dir() and not p.name.startswith(".")]
+        return [p.name for p in sorted(entries, key=lambda p: p.stat().st_mtime_ns)]
+
+    def _path(self, snapshot_id: str) -> Path:
+        if not snapshot_id or "/" in snapshot_id or "\\" in snapshot_id or snapshot_id.startswith("."):
+            msg = f"Invalid snapshot id: '{snapshot_id}'"
+            raise ValueError(msg)
+        return self.store / snapshot_id
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        # Dot-prefixed and not a directory, so `list()` never reports it as a snapshot.
+        return self.store / f".{snapshot_id}.manifest.json"
+
+    def _walk(self, top: Path) -> Iterator[tuple[Path, list[str], list[str]]]:
+        """Yield `(relative_dir, dirs, files)` top-down, skipping the snapshot store.
+
+        Symlinks are reported as files and never followed. Removing names from
+        `dirs` prunes them from the walk.
+        """
+        for dirpath, dirnames, filenames in os.walk(top):
+            current = Path(dirpath)
+            rel_dir = current.relative_to(top)
+            dirs = []
+            files = list(filenames)
+            for name in dirnames:
+                if current / name == self.store:
+                    continue
+                if (current / name).is_symlink():
+                    files.append(name)
+                else:
+                    dirs.append(name)
+            yield rel_dir, dirs, files
+            dirnames[:] = dirs
+
+    def _materialize(self, src: Path, dst: Path) -> None:
+        """Create `dst` as a clone or, without reflink support, a copy of `src`."""
+        if src.is_symlink():
+            dst.symlink_to(src.readlink())
+            return
+        if not self._try_reflink(src, dst):
+            shutil.copy2(src, dst)
+
+    @staticmethod
+    def _try_link(saved: Path, dst: Path) -> bool:
+        """Hard-link `dst` to another snapshot's copy of an unchanged file."""
+        if saved.is_symlink() or not saved.is_file():
+            return False
+        try:
+            os.link(saved, dst)
+        except OSError:
+            return False
+        return True
+
+    def _try_reflink(self, src: Path, dst: Path) -> bool:
+        if self._reflink is False:
+            return False
+        import fcntl  # POSIX-only
+
+        with src.open("rb") as fsrc, dst.open("xb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            except OSError as e:
+                if e.errno in _REFLINK_UNSUPPORTED:
+                    self._reflink = False
+                failed = True
+            else:
+                failed = False
+        if failed:
+            dst.unlink()
+            return False
+        self._reflink = True
+        shutil.copystat(src, dst)
+        return True
+
+    def _restore_file(self, saved: Path, live: Path) -> None:
+        if _same_content(saved, live):
+            return
+        if live.is_dir() and not live.is_symlink():
+            shutil.rmtree(live)
+        tmp = live.with_name(f".{live.name}.deepagents-restore")
+        with contextlib.suppress(FileNotFoundError):
+            tmp.unlink()
+        self._materialize(saved, tmp)
+        tmp.replace(live)
+
+
+__all__ = ["WorkspaceSnapshots"]
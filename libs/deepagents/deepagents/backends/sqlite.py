@@ -0,0 +1,446 @@
+"""`SqliteBackend`: persistent, searchable file storage in a single SQLite database.
+
+For single-node deployments that want files to outlive a thread without running a
+LangGraph store. Files live in one table whose unique `path` index serves
+prefix queries for `ls_info` and `glob_info`; an FTS5 trigram index over file
+contents narrows `grep_raw` to candidate files before the exact line match.
+
+The database runs in WAL mode, so readers never block the writer. Each thread
+gets its own connection, and the async write methods run on a single dedicated
+writer thread so concurrent agents never contend for SQLite's write lock.
+
+Examples:
+    ```python
+    from deepagents import create_deep_agent
+    from deepagents.backends.sqlite import SqliteBackend
+
+    agent = create_deep_agent(backend=SqliteBackend("~/.deepagents/files.db"))
+    ```
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+import threading
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
+
+import wcmatch.glob as wcglob
+
+from deepagents.backends.cancellation import current_cancel_token, run_cancellable
+from deepagents.backends.executor import BackendExecutor
+from deepagents.backends.protocol import (
+    BackendProtocol,
+    EditResult,
+    FileDownloadResponse,
+    FileInfo,
+    FileUploadResponse,
+    GrepMatch,
+    WriteResult,
+)
+from deepagents.backends.utils import (
+    _glob_search_files,
+    _normalize_path,
+    check_empty_content,
+    format_content_with_line_numbers,
+    perform_string_replacement,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    content TEXT,
+    data BLOB,
+    size INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    modified_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    content, content='files', content_rowid='id', tokenize='trigram case_sensitive 1'
+);
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE OF content ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO files_fts(rowid, content) VALUES (new.id, new.content);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO files (path, content, data, size, created_at, modified_at) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(path) DO UPDATE SET
+    content = excluded.content, data = excluded.data, size = excluded.size, modified_at = excluded.modified_at
+"""
+
+_APPEND = """
+INSERT INTO files (path, content, data, size, created_at, modified_at) VALUES (?, ?, NULL, ?, ?, ?)
+ON CONFLICT(path) DO UPDATE SET
+    content = content || excluded.content, size = size + excluded.size, modified_at = excluded.modified_at
+WHERE data IS NULL
+"""
+
+_MIN_FTS_PATTERN = 3
+"""Trigram queries need at least three characters; shorter patterns scan contents."""
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def _prefix_range(directory: str) -> tuple[str, str]:
+    """Return `[lo, hi)` bounds selecting every path below `directory`."""
+    prefix = directory if directory.endswith("/") else directory + "/"
+    return prefix, prefix[:-1] + chr(ord("/") + 1)
+
+
+def _split_bytes(content: bytes) -> tuple[str | None, bytes | None]:
+    """Store UTF-8 content as searchable text and anything else as a blob."""
+    try:
+        return content.decode("utf-8"), None
+    except UnicodeDecodeError:
+        return None, content
+
+
+class SqliteBackend(BackendProtocol):
+    """Backend storing files in a SQLite database with a full-text grep index.
+
+    Paths are absolute (`/dir/file.txt`). Text files are indexed for
+    `grep_raw`; binary uploads are stored as-is and skipped by search.
+
+    Attributes:
+        db_path: Database file, or `None` for a private in-memory database.
+    """
+
+    def __init__(self, db_path: str | Path | None = None) -> None:
+        """Open (and if needed create) the database.
+
+        Args:
+            db_path: Path of the database file. `None` keeps the files in
+                memory for the lifetime of this backend, e.g. for tests.
+        """
+        if db_path is None:
+            self.db_path = None
+            self._uri = f"file:deepagents-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        else:
+            self.db_path = Path(db_path).expanduser().resolve()
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._uri = self.db_path.as_uri()
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._writer = BackendExecutor(max_workers=1, name="deepagents-sqlite-writer")
+
+        conn = self._conn()
+        if self.db_path is not None:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._uri, uri=True, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close every connection and stop the writer thread."""
+        self._writer.shutdown()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def ls_info(self, path: str) -> list[FileInfo]:
+        """List files and directories directly inside `path`.
+
+        Args:
+            path: Absolute directory path.
+
+        Returns:
+            `FileInfo` dicts sorted by path. Directories have a trailing `/`.
+        """
+        try:
+            lo, hi = _prefix_range(_normalize_path(path))
+        except ValueError:
+            return []
+        start = len(lo) + 1
+        conn = self._conn()
+        infos: list[FileInfo] = [
+            {"path": p, "is_dir": False, "size": size, "modified_at": modified_at}
+            for p, size, modified_at in conn.execute(
+                "SELECT path, size, modified_at FROM files WHERE path >= ? AND path < ? AND instr(substr(path, ?), '/') = 0",
+                (lo, hi, start),
+            )
+        ]
+        infos.extend(
+            {"path": d, "is_dir": True, "size": 0, "modified_at": ""}
+            for (d,) in conn.execute(
+                "SELECT DISTINCT substr(path, 1, ? + instr(substr(path, ?), '/')) FROM files "
+                "WHERE path >= ? AND path < ? AND instr(substr(path, ?), '/') > 0",
+                (len(lo), start, lo, hi, start),
+            )
+        )
+        infos.sort(key=lambda fi: fi["path"])
+        return infos
+
+    def read(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = 2000,
+    ) -> str:
+        """Read a file with line numbers.
+
+        Args:
+            file_path: Absolute file path.
+            offset: Line offset to start reading from (0-indexed).
+            limit: Maximum number of lines to read.
+
+        Returns:
+            Formatted content with line numbers, or an error message.
+        """
+        row = self._conn().execute("SELECT content, data FROM files WHERE path = ?", (file_path,)).fetchone()
+        if row is None:
+            return f"Error: File '{file_path}' not found"
+        content = row[0]
+        if content is None:
+            return f"Error reading file '{file_path}': not a UTF-8 text file"
+
+        empty_msg = check_empty_content(content)
+        if empty_msg:
+            return empty_msg
+
+        lines = content.splitlines()
+        if offset >= len(lines):
+            return f"Error: Line offset {offset} exceeds file length ({len(lines)} lines)"
+        return format_content_with_line_numbers(lines[offset : offset + limit], start_line=offset + 1)
+
+    def grep_raw(
+        self,
+        pattern: str,
+        path: str | None = None,
+        glob: str | None = None,
+    ) -> list[GrepMatch] | str:
+        """Search text files for a literal pattern.
+
+        Patterns of three or more characters are looked up in the trigram
+        index first, so only files containing the pattern are read.
+
+        Args:
+            pattern: Literal string to search for (not a regex).
+            path: Directory or file to search. Defaults to `/`.
+            glob: Optional glob matched against file names.
+
+        Returns:
+            Matches sorted by path and line number.
+        """
+        try:
+            scope = _normalize_path(path)
+        except ValueError:
+            return []
+        lo, hi = _prefix_range(scope)
+        where = "(f.path = ? OR (f.path >= ? AND f.path < ?))"
+        if len(pattern) >= _MIN_FTS_PATTERN:
+            query = f"SELECT f.path, f.content FROM files_fts JOIN files f ON f.id = files_fts.rowid WHERE files_fts MATCH ? AND {where}"  # noqa: S608
+            params: tuple[str, ...] = ('"' + pattern.replace('"', '""') + '"', scope, lo, hi)
+        else:
+            query = f"SELECT f.path, f.content FROM files f WHERE instr(f.content, ?) > 0 AND {where}"  # noqa: S608
+            params = (pattern, scope, lo, hi)
+
+        token = current_cancel_token()
+        matches: list[GrepMatch] = []
+        for file_path, content in self._conn().execute(query, params):
+            if token is not None and token.cancelled:
+                break
+            if content is None or (glob and not wcglob.globmatch(PurePosixPath(file_path).name, glob, flags=wcglob.BRACE)):
+                continue
+            matches.extend(
+                {"path": file_path, "line": line_num, "text": line} for line_num, line in enumerate(content.splitlines(), 1) if pattern in line
+            )
+        matches.sort(key=lambda m: (m["path"], m["line"]))
+        return matches
+
+    def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
+        """Find files matching a glob pattern relative to `path`.
+
+        Returns:
+            `FileInfo` dicts for matching files, most recently modified first.
+        """
+        try:
+            scope = _normalize_path(path)
+        except ValueError:
+            return []
+        lo, hi = _prefix_range(scope)
+        rows = self._conn().execute(
+            "SELECT path, size, modified_at FROM files WHERE path = ? OR (path >= ? AND path < ?)",
+            (scope, lo, hi),
+        )
+        meta = {p: {"size": size, "modified_at": modified_at} for p, size, modified_at in rows}
+        found = _glob_search_files(meta, pattern, path)
+        if found == "No files found":
+            return []
+        return [{"path": p, "is_dir": False, **meta[p]} for p in found.split("\n")]  # type: ignore[typeddict-item]
+
+    def write(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Create a new file.
+
+        Returns:
+            `WriteResult` with the path, or an error if the file already exists.
+            External storage sets `files_update=None`.
+        """
+        now = _now()
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT INTO files (path, content, data, size, created_at, modified_at) VALUES (?, ?, NULL, ?, ?, ?)",
+                    (file_path, content, len(content.encode()), now, now),
+                )
+        except sqlite3.IntegrityError:
+            return WriteResult(error=f"Cannot write to {file_path} because it already exists. Read and then make an edit, or write to a new path.")
+        return WriteResult(path=file_path, files_update=None)
+
+    def edit(
+        self,
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool = False,
+    ) -> EditResult:
+        """Edit a file by replacing string occurrences.
+
+        Returns:
+            `EditResult` with the path and occurrence count, or an error message.
+            External storage sets `files_update=None`.
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT content FROM files WHERE path = ?", (file_path,)).fetchone()
+            if row is None or row[0] is None:
+                return EditResult(error=f"Error: File '{file_path}' not found")
+            result = perform_string_replacement(row[0], old_string, new_string, replace_all)
+            if isinstance(result, str):
+                return EditResult(error=result)
+            new_content, occurrences = result
+            conn.execute(
+                "UPDATE files SET content = ?, size = ?, modified_at = ? WHERE path = ?",
+                (new_content, len(new_content.encode()), _now(), file_path),
+            )
+        return EditResult(path=file_path, files_update=None, occurrences=int(occurrences))
+
+    def append(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Append content to a file, creating it if needed.
+
+        The new text is concatenated in SQL, so nothing is read back into
+        Python. SQLite still rewrites the whole row, and the full-text index
+        re-tokenizes the whole file (the `files_au` trigger), so each append
+        costs O(file size) inside the database.
+
+        Returns:
+            `WriteResult` with the path, or an error for binary files.
+            External storage sets `files_update=None`.
+        """
+        now = _now()
+        with self._transaction() as conn:
+            cursor = conn.execute(_APPEND, (file_path, content, len(content.encode()), now, now))
+        if cursor.rowcount == 0:
+            return WriteResult(error=f"Error appending to file '{file_path}': not a UTF-8 text file")
+        return WriteResult(path=file_path, files_update=None)
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Create or overwrite files in one transaction.
+
+        Returns:
+            One `FileUploadResponse` per input file, in order.
+        """
+        now = _now()
+        rows = []
+        responses: list[FileUploadResponse] = []
+        for path, content in files:
+            if not path.startswith("/") or ".." in PurePosixPath(path).parts:
+                responses.append(FileUploadResponse(path=path, error="invalid_path"))
+                continue
+            text, blob = _split_bytes(content)
+            rows.append((path, text, blob, len(content), now, now))
+            responses.append(FileUploadResponse(path=path, error=None))
+        if rows:
+            with self._transaction() as conn:
+                conn.executemany(_UPSERT, rows)
+        return responses
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        """Return the raw bytes of files.
+
+        Returns:
+            One `FileDownloadResponse` per input path, in order.
+        """
+        conn = self._conn()
+        responses: list[FileDownloadResponse] = []
+        for path in paths:
+            row = conn.execute("SELECT content, data FROM files WHERE path = ?", (path,)).fetchone()
+            if row is not None:
+                content = row[0].encode("utf-8") if row[0] is not None else row[1]
+                responses.append(FileDownloadResponse(path=path, content=content, error=None))
+                continue
+            lo, hi = _prefix_range(path.rstrip("/") or "/")
+            is_dir = conn.execute("SELECT 1 FROM files WHERE path >= ? AND path < ? LIMIT 1", (lo, hi)).fetchone()
+            responses.append(FileDownloadResponse(path=path, content=None, error="is_directory" if is_dir else "file_not_found"))
+        return responses
+
+    async def awrite(self, file_path: str, content: str) -> WriteResult:
+        """Async version of write, run on the writer thread."""
+        return await run_cancellable(self.write, file_path, content, executor=self._writer)
+
+    async def aedit(
+        self,
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool = False,
+    ) -> EditResult:
+        """Async version of edit, run on the writer thread."""
+        return await run_cancellable(self.edit, file_path, old_string, new_string, replace_all, executor=self._writer)
+
+    async def aappend(self, file_path: str, content: str) -> WriteResult:
+        """Async version of append, run on the writer thread."""
+        return await run_cancellable(self.append, file_path, content, executor=self._writer)
+
+    async def aupload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        """Async version of upload_files, run on the writer thread."""
+        return await run_cancellable(self.upload_files, files, executor=self._writer)
+
+
+__all__ = ["SqliteBackend"]
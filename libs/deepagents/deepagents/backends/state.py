@@ -13,6 +13,7 @@ from deepagents.backends.protocol import (
 )
 from deepagents.backends.utils import (
     _glob_search_files,
+    append_file_data,
     create_file_data,
     file_data_to_string,
     format_read_response,
@@ -164,6 +165,22 @@ class StateBackend(BackendProtocol):
         new_file_data = update_file_data(file_data, new_content)
         return EditResult(path=file_path, files_update={file_path: new_file_data}, occurrences=int(occurrences))
 
+    def append(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Append content to a file, creating it if needed.
+        Returns WriteResult with files_update to update LangGraph state.
+        """
+        files = self.runtime.state.get("files", {})
+        file_data = files.get(file_path)
+
+        if file_data is None:
+            return WriteResult(path=file_path, files_update={file_path: create_file_data(content)})
+
+        return WriteResult(path=file_path, files_update={file_path: append_file_data(file_data, content)})
+
     def grep_raw(
         self,
         pattern: str,
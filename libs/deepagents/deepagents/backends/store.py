@@ -4,10 +4,11 @@ import re
 import warnings
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, Generic
 
 from langgraph.config import get_config
-from langgraph.store.base import BaseStore, Item
+from langgraph.store.base import BaseStore, GetOp, Item, PutOp
 from langgraph.typing import ContextT, StateT
 
 from deepagents.backends.protocol import (
@@ -21,6 +22,7 @@ from deepagents.backends.protocol import (
 )
 from deepagents.backends.utils import (
     _glob_search_files,
+    append_file_data,
     create_file_data,
     file_data_to_string,
     format_read_response,
@@ -49,6 +51,14 @@ NamespaceFactory = Callable[[BackendContext[Any, Any]], tuple[str, ...]]
 # common in user IDs (hyphen, underscore, dot, @, +, colon, tilde).
 _NAMESPACE_COMPONENT_RE = re.compile(r"^[A-Za-z0-9\-_.@+:~]+$")
 
+# Sub-namespace holding what `append` writes, so appends never re-put the file
+# item itself. Chunk `i` of `path` has key `path#i`; the counter item
+# `path#count` records how many chunks there are and when the last one was
+# added. The file item only carries an `appended` flag, set by the first append
+# after the file was (re)written, so files that were never appended to are read
+# without touching this namespace.
+_CHUNK_NAMESPACE = "__append_chunks__"
+
 
 def _validate_namespace(namespace: tuple[str, ...]) -> tuple[str, ...]:
     """Validate a namespace tuple returned by a NamespaceFactory.
@@ -237,6 +247,98 @@ class StoreBackend(BackendProtocol):
             "modified_at": file_data["modified_at"],
         }
 
+    @staticmethod
+    def _counter_op(namespace: tuple[str, ...], path: str) -> GetOp:
+        """Return the op fetching the append counter of `path`."""
+        return GetOp((*namespace, _CHUNK_NAMESPACE), f"{path}#count")
+
+    @staticmethod
+    def _chunk_count(item: Item, counter: Item | None) -> int:
+        """Return how many appended chunks belong to the current version of `item`."""
+        if counter is None or not item.value.get("appended"):
+            return 0
+        return counter.value.get("chunks", 0)
+
+    @staticmethod
+    def _fold_chunks(file_data: dict[str, Any], counter: Item, chunks: list[Item | None]) -> dict[str, Any]:
+        text = "".join(chunk.value["content"] for chunk in chunks if chunk is not None)
+        return append_file_data(file_data, text, modified_at=counter.value.get("modified_at", file_data["modified_at"]))
+
+    def _load_file_data(self, store: BaseStore, namespace: tuple[str, ...], item: Item) -> dict[str, Any]:
+        """Convert a store Item to FileData, folding in any appended chunks.
+
+        Raises:
+            ValueError: If required fields are missing or have incorrect types.
+        """
+        file_data = self._convert_store_item_to_file_data(item)
+        if not item.value.get("appended"):
+            return file_data
+        [counter] = store.batch([self._counter_op(namespace, item.key)])
+        count = self._chunk_count(item, counter)
+        if not count:
+            return file_data
+        chunks = store.batch([GetOp((*namespace, _CHUNK_NAMESPACE), f"{item.key}#{i}") for i in range(count)])
+        return self._fold_chunks(file_data, counter, chunks)
+
+    async def _aload_file_data(self, store: BaseStore, namespace: tuple[str, ...], item: Item) -> dict[str, Any]:
+        """Async version of _load_file_data."""
+        file_data = self._convert_store_item_to_file_data(item)
+        if not item.value.get("appended"):
+            return file_data
+        [counter] = await store.abatch([self._counter_op(namespace, item.key)])
+        count = self._chunk_count(item, counter)
+        if not count:
+            return file_data
+        chunks = await store.abatch([GetOp((*namespace, _CHUNK_NAMESPACE), f"{item.key}#{i}") for i in range(count)])
+        return self._fold_chunks(file_data, counter, chunks)
+
+    def _files_from_items(self, items: list[Item]) -> dict[str, dict[str, Any]]:
+        """Build a path -> FileData mapping from searched items, folding in appended chunks."""
+        files: dict[str, dict[str, Any]] = {}
+        headers: dict[str, Item] = {}
+        counters: dict[str, Item] = {}
+        chunks: dict[str, dict[int, Item]] = {}
+        for item in items:
+            if item.namespace[-1] == _CHUNK_NAMESPACE:
+                if "index" in item.value:
+                    chunks.setdefault(item.value["path"], {})[item.value["index"]] = item
+                else:
+                    counters[item.value["path"]] = item
+                continue
+            try:
+                files[item.key] = self._convert_store_item_to_file_data(item)
+            except ValueError:
+                continue
+            headers[item.key] = item
+        for path, item in headers.items():
+            counter = counters.get(path)
+            count = self._chunk_count(item, counter)
+            if counter is not None and count:
+                found = chunks.get(path, {})
+                files[path] = self._fold_chunks(files[path], counter, [found.get(i) for i in range(count)])
+        return files
+
+    def _chunk_deletes(self, store: BaseStore, namespace: tuple[str, ...], item: Item) -> list[PutOp]:
+        """Return ops deleting the chunks appended to `item`, for when it is rewritten."""
+        if not item.value.get("appended"):
+            return []
+        [counter] = store.batch([self._counter_op(namespace, item.key)])
+        return self._chunk_delete_ops(namespace, item, counter)
+
+    async def _achunk_deletes(self, store: BaseStore, namespace: tuple[str, ...], item: Item) -> list[PutOp]:
+        """Async version of _chunk_deletes."""
+        if not item.value.get("appended"):
+            return []
+        [counter] = await store.abatch([self._counter_op(namespace, item.key)])
+        return self._chunk_delete_ops(namespace, item, counter)
+
+    def _chunk_delete_ops(self, namespace: tuple[str, ...], item: Item, counter: Item | None) -> list[PutOp]:
+        chunk_namespace = (*namespace, _CHUNK_NAMESPACE)
+        ops = [PutOp(chunk_namespace, f"{item.key}#{i}", None) for i in range(self._chunk_count(item, counter))]
+        if counter is not None:
+            ops.append(PutOp(chunk_namespace, counter.key, None))
+        return ops
+
     def _search_store_paginated(
         self,
         store: BaseStore,
@@ -306,13 +408,13 @@ class StoreBackend(BackendProtocol):
         # Normalize path to have trailing slash for proper prefix matching
         normalized_path = path if path.endswith("/") else path + "/"
 
-        for item in items:
+        for key, fd in self._files_from_items(items).items():
             # Check if file is in the specified directory or a subdirectory
-            if not str(item.key).startswith(normalized_path):
+            if not key.startswith(normalized_path):
                 continue
 
             # Get the relative path after the directory
-            relative = str(item.key)[len(normalized_path) :]
+            relative = key[len(normalized_path) :]
 
             # If relative path contains '/', it's in a subdirectory
             if "/" in relative:
@@ -322,14 +424,10 @@ class StoreBackend(BackendProtocol):
                 continue
 
             # This is a file directly in the current directory
-            try:
-                fd = self._convert_store_item_to_file_data(item)
-            except ValueError:
-                continue
             size = len("\n".join(fd.get("content", [])))
             infos.append(
                 {
-                    "path": item.key,
+                    "path": key,
                     "is_dir": False,
                     "size": int(size),
                     "modified_at": fd.get("modified_at", ""),
@@ -374,7 +472,7 @@ class StoreBackend(BackendProtocol):
             return f"Error: File '{file_path}' not found"
 
         try:
-            file_data = self._convert_store_item_to_file_data(item)
+            file_data = self._load_file_data(store, namespace, item)
         except ValueError as e:
             return f"Error: {e}"
 
@@ -398,7 +496,7 @@ class StoreBackend(BackendProtocol):
             return f"Error: File '{file_path}' not found"
 
         try:
-            file_data = self._convert_store_item_to_file_data(item)
+            file_data = await self._aload_file_data(store, namespace, item)
         except ValueError as e:
             return f"Error: {e}"
 
@@ -468,7 +566,7 @@ class StoreBackend(BackendProtocol):
             return EditResult(error=f"Error: File '{file_path}' not found")
 
         try:
-            file_data = self._convert_store_item_to_file_data(item)
+            file_data = self._load_file_data(store, namespace, item)
         except ValueError as e:
             return EditResult(error=f"Error: {e}")
 
@@ -481,9 +579,9 @@ class StoreBackend(BackendProtocol):
         new_content, occurrences = result
         new_file_data = update_file_data(file_data, new_content)
 
-        # Update file in store
+        # Update file in store, compacting any appended chunks into it
         store_value = self._convert_file_data_to_store_value(new_file_data)
-        store.put(namespace, file_path, store_value)
+        store.batch([PutOp(namespace, file_path, store_value), *self._chunk_deletes(store, namespace, item)])
         return EditResult(path=file_path, files_update=None, occurrences=int(occurrences))
 
     async def aedit(
@@ -506,7 +604,7 @@ class StoreBackend(BackendProtocol):
             return EditResult(error=f"Error: File '{file_path}' not found")
 
         try:
-            file_data = self._convert_store_item_to_file_data(item)
+            file_data = await self._aload_file_data(store, namespace, item)
         except ValueError as e:
             return EditResult(error=f"Error: {e}")
 
@@ -519,11 +617,73 @@ class StoreBackend(BackendProtocol):
         new_content, occurrences = result
         new_file_data = update_file_data(file_data, new_content)
 
-        # Update file in store using async method
+        # Update file in store using async method, compacting any appended chunks into it
         store_value = self._convert_file_data_to_store_value(new_file_data)
-        await store.aput(namespace, file_path, store_value)
+        await store.abatch([PutOp(namespace, file_path, store_value), *await self._achunk_deletes(store, namespace, item)])
         return EditResult(path=file_path, files_update=None, occurrences=int(occurrences))
 
+    def append(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Append content to a file, creating it if needed.
+
+        The appended text is stored as its own chunk item next to the file,
+        together with a small counter item, so the file's content and earlier
+        appends are never rewritten. Only the first append after the file was
+        written re-puts the file item, to flag it as having chunks. Reads fold
+        the chunks back in, and the next edit compacts them into the file.
+
+        The store has no compare-and-set, so two processes appending to the
+        same file at the same moment can both claim the same chunk index and
+        one append is lost. Callers such as `SummarizationMiddleware` append to
+        a per-thread file one turn at a time.
+
+        Returns WriteResult. External storage sets files_update=None.
+        """
+        store = self._get_store()
+        namespace = self._get_namespace()
+
+        item, counter = store.batch([GetOp(namespace, file_path), self._counter_op(namespace, file_path)])
+        if item is None:
+            store_value = self._convert_file_data_to_store_value(create_file_data(content))
+            store.put(namespace, file_path, store_value)
+            return WriteResult(path=file_path, files_update=None)
+
+        store.batch(self._append_ops(namespace, item, counter, content))
+        return WriteResult(path=file_path, files_update=None)
+
+    async def aappend(
+        self,
+        file_path: str,
+        content: str,
+    ) -> WriteResult:
+        """Async version of append using native store async methods."""
+        store = self._get_store()
+        namespace = self._get_namespace()
+
+        item, counter = await store.abatch([GetOp(namespace, file_path), self._counter_op(namespace, file_path)])
+        if item is None:
+            store_value = self._convert_file_data_to_store_value(create_file_data(content))
+            await store.aput(namespace, file_path, store_value)
+            return WriteResult(path=file_path, files_update=None)
+
+        await store.abatch(self._append_ops(namespace, item, counter, content))
+        return WriteResult(path=file_path, files_update=None)
+
+    def _append_ops(self, namespace: tuple[str, ...], item: Item, counter: Item | None, content: str) -> list[PutOp]:
+        """Return ops storing `content` as the next chunk of `item` and bumping its counter."""
+        chunk_namespace = (*namespace, _CHUNK_NAMESPACE)
+        index = self._chunk_count(item, counter)
+        ops = [
+            PutOp(chunk_namespace, f"{item.key}#{index}", {"path": item.key, "index": index, "content": content}),
+            PutOp(chunk_namespace, f"{item.key}#count", {"path": item.key, "chunks": index + 1, "modified_at": datetime.now(UTC).isoformat()}),
+        ]
+        if not item.value.get("appended"):
+            ops.append(PutOp(namespace, item.key, {**item.value, "appended": True}))
+        return ops
+
     # Removed legacy grep() convenience to keep lean surface
 
     def grep_raw(
@@ -534,25 +694,13 @@ class StoreBackend(BackendProtocol):
     ) -> list[GrepMatch] | str:
         store = self._get_store()
         namespace = self._get_namespace()
-        items = self._search_store_paginated(store, namespace)
-        files: dict[str, Any] = {}
-        for item in items:
-            try:
-                files[item.key] = self._convert_store_item_to_file_data(item)
-            except ValueError:
-                continue
+        files = self._files_from_items(self._search_store_paginated(store, namespace))
         return grep_matches_from_files(files, pattern, path, glob)
 
     def glob_info(self, pattern: str, path: str = "/") -> list[FileInfo]:
         store = self._get_store()
         namespace = self._get_namespace()
-        items = self._search_store_paginated(store, namespace)
-        files: dict[str, Any] = {}
-        for item in items:
-            try:
-                files[item.key] = self._convert_store_item_to_file_data(item)
-            except ValueError:
-                continue
+        files = self._files_from_items(self._search_store_paginated(store, namespace))
         result = _glob_search_files(files, pattern, path)
         if result == "No files found":
             return []
@@ -618,7 +766,7 @@ class StoreBackend(BackendProtocol):
                 responses.append(FileDownloadResponse(path=path, content=None, error="file_not_found"))
                 continue
 
-            file_data = self._convert_store_item_to_file_data(item)
+            file_data = self._load_file_data(store, namespace, item)
             # Convert file data to bytes
             content_str = file_data_to_string(file_data)
             content_bytes = content_str.encode("utf-8")
@@ -626,3 +774,32 @@ class StoreBackend(BackendProtocol):
             responses.append(FileDownloadResponse(path=path, content=content_bytes, error=None))
 
         return responses
+
+    def _item_etags(self, results: list[Item | None]) -> list[str | None]:
+        """Turn batched `(file item, counter)` results into version tags; appends bump the chunk count."""
+        tags: list[str | None] = []
+        for item, counter in zip(results[::2], results[1::2], strict=True):
+            tags.append(None if item is None else f"{item.updated_at.isoformat()}#{self._chunk_count(item, counter)}")
+        return tags
+
+    def _etag_ops(self, namespace: tuple[str, ...], paths: list[str]) -> list[GetOp]:
+        return [op for path in paths for op in (GetOp(namespace, path), self._counter_op(namespace, path))]
+
+    def file_etags(self, paths: list[str]) -> list[str | None]:
+        """Return a tag per file from its store timestamp, fetching all items in one batch.
+
+        Args:
+            paths: List of file paths.
+
+        Returns:
+            One tag per input path; `None` for missing files.
+        """
+        store = self._get_store()
+        namespace = self._get_namespace()
+        return self._item_etags(store.batch(self._etag_ops(namespace, paths)))
+
+    async def afile_etags(self, paths: list[str]) -> list[str | None]:
+        """Async version of file_etags using native store async methods."""
+        store = self._get_store()
+        namespace = self._get_namespace()
+        return self._item_etags(await store.abatch(self._etag_ops(namespace, paths)))
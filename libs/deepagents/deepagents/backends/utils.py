@@ -6,13 +6,15 @@ enable composition without fragile string parsing.
 """
 
 import re
+from collections import deque
+from collections.abc import Iterable
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Literal
 
 import wcmatch.glob as wcglob
 
-from deepagents.backends.protocol import FileInfo as _FileInfo, GrepMatch as _GrepMatch
+from deepagents.backends.protocol import ExecuteChunk, ExecuteResponse, FileInfo as _FileInfo, GrepMatch as _GrepMatch
 
 EMPTY_CONTENT_WARNING = "System reminder: File exists but has empty contents"
 MAX_LINE_LENGTH = 5000
@@ -146,6 +148,29 @@ def update_file_data(file_data: dict[str, Any], content: str) -> dict[str, Any]:
     }
 
 
+def append_file_data(file_data: dict[str, Any], content: str, modified_at: str | None = None) -> dict[str, Any]:
+    """Append text to FileData without re-joining its existing lines.
+
+    Args:
+        file_data: Existing FileData dict
+        content: Text to append; it continues the file's last line
+        modified_at: Optional modification timestamp (defaults to now)
+
+    Returns:
+        Updated FileData dict
+    """
+    first, *rest = content.split("\n")
+    lines = list(file_data["content"]) or [""]
+    lines[-1] += first
+    lines.extend(rest)
+
+    return {
+        "content": lines,
+        "created_at": file_data["created_at"],
+        "modified_at": modified_at or datetime.now(UTC).isoformat(),
+    }
+
+
 def format_read_response(
     file_data: dict[str, Any],
     offset: int,
@@ -219,6 +244,82 @@ def truncate_if_too_long(result: list[str] | str) -> list[str] | str:
     return result
 
 
+class HeadTailBuffer:
+    """Bounded text buffer that keeps the beginning and end of a stream.
+
+    Everything is kept until more than `max_chars` characters have been written.
+    From then on only the first half and the most recent half are retained, so
+    memory stays bounded no matter how much output a command produces.
+    """
+
+    def __init__(self, max_chars: int) -> None:
+        """Initialize an empty buffer.
+
+        Args:
+            max_chars: Maximum number of characters to retain.
+        """
+        self.max_chars = max_chars
+        self.total_chars = 0
+        self._head_limit = max_chars // 2
+        self._tail_limit = max_chars - self._head_limit
+        self._head = ""
+        self._tail: deque[str] = deque()
+        self._tail_len = 0
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any written text has been dropped."""
+        return self.total_chars > self.max_chars
+
+    def write(self, text: str) -> None:
+        """Append text, discarding from the middle once over budget."""
+        if not text:
+            return
+        was_truncated = self.truncated
+        self.total_chars += len(text)
+        if not self.truncated:
+            self._head += text
+            return
+        if not was_truncated:
+            # First overflow: split what we have into head and tail.
+            text = self._head + text
+            self._head = text[: self._head_limit]
+            text = text[self._head_limit :]
+        self._tail.append(text)
+        self._tail_len += len(text)
+        while self._tail_len > self._tail_limit:
+            excess = self._tail_len - self._tail_limit
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                self._tail_len -= len(first)
+            else:
+                self._tail[0] = first[excess:]
+                self._tail_len -= excess
+
+    def getvalue(self, marker: str = "") -> str:
+        """Return the retained text, with `marker` between head and tail if truncated."""
+        if not self.truncated:
+            return self._head
+        return self._head + marker + "".join(self._tail)
+
+
+def collect_execute_stream(stream: Iterable[ExecuteChunk | ExecuteResponse]) -> ExecuteResponse:
+    """Drain an `execute_stream()` iterator and return its final `ExecuteResponse`.
+
+    Raises:
+        RuntimeError: If the stream ends without yielding an `ExecuteResponse`.
+    """
+    result: ExecuteResponse | None = None
+    for item in stream:
+        if isinstance(item, ExecuteResponse):
+            result = item
+    if result is None:
+        msg = "execute_stream() finished without yielding an ExecuteResponse"
+        raise RuntimeError(msg)
+    return result
+
+
 def _normalize_path(path: str | None) -> str:
     """Normalize a path to canonical form.
 
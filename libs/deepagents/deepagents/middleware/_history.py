@@ -0,0 +1,381 @@
+"""JSONL storage for offloaded conversation history.
+
+Each offloaded message is one JSON record per line of `{thread_id}.jsonl`, so a
+message's index in the history is its line number and a range of messages is a
+single `read(offset, limit)` on the backend. A sidecar `{thread_id}.index.jsonl`
+holds one compact entry per offload (first index, count, timestamp, and the
+tool call ids it contains), which resolves tool call ids and time windows to
+line ranges without touching the history itself. The index entry is written
+last and records the history file's etag at that point, so the next offload
+can tell from the etag alone that nothing was appended behind the index and
+append without reading the history back. Only when the etag differs (or the
+backend has none) are records left past the last entry by an interrupted
+offload read and indexed first, so indexes and line numbers never drift apart.
+
+Record and index timestamps are the time of the offload, not of the message:
+messages carry no timestamp of their own, so time windows select whole
+offloads.
+
+`{thread_id}.search.jsonl` holds each message's term frequencies, one line per
+message. It is append-only like the history, so a `HistorySearchIndex` kept in
+memory only has to read the lines added since it was last used to answer BM25
+queries over everything offloaded so far. Search hits are then fetched from the
+history with a few range reads (`history_read_ranges`) rather than one read per hit.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+from collections import Counter
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, NotRequired
+
+from langchain_core.messages import AIMessage, ToolMessage
+from typing_extensions import TypedDict
+
+if TYPE_CHECKING:
+    from langchain_core.messages import AnyMessage
+
+_ROLE_NAMES = {"human": "Human", "ai": "AI", "tool": "Tool", "system": "System"}
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+class HistoryRecord(TypedDict):
+    """One offloaded message. `timestamp` is when it was offloaded."""
+
+    index: int
+    role: str
+    content: str
+    timestamp: str
+    tool_calls: NotRequired[list[dict[str, Any]]]
+    tool_call_id: NotRequired[str]
+    tool_name: NotRequired[str]
+
+
+class HistoryIndexEntry(TypedDict):
+    """The messages written by one offload."""
+
+    start: int
+    count: int
+    timestamp: str
+    tool_call_ids: dict[str, list[int]]
+    history_etag: NotRequired[str]
+
+
+def history_index_path(history_path: str) -> str:
+    """Return the index file that belongs to a JSONL history file."""
+    return history_path.removesuffix(".jsonl") + ".index.jsonl"
+
+
+def history_search_path(history_path: str) -> str:
+    """Return the search postings file that belongs to a JSONL history file."""
+    return history_path.removesuffix(".jsonl") + ".search.jsonl"
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens for search."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _searchable_text(record: HistoryRecord) -> str:
+    """Return the text of a record that search matches against."""
+    parts = [record["content"], record.get("tool_name", "")]
+    parts.extend(f"{tc['name']} {json.dumps(tc['args'], default=str)}" for tc in record.get("tool_calls", []))
+    return "\n".join(parts)
+
+
+def parse_history_index(content: bytes | None) -> list[HistoryIndexEntry]:
+    """Parse an index file, skipping lines that are not valid entries."""
+    entries: list[HistoryIndexEntry] = []
+    for line in (content or b"").decode("utf-8", errors="replace").splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(entry, dict) and isinstance(entry.get("start"), int) and isinstance(entry.get("count"), int):
+            entries.append(entry)
+    return entries
+
+
+def encode_history(messages: list[AnyMessage], start: int, timestamp: str) -> tuple[str, str, HistoryIndexEntry]:
+    """Serialize messages as JSONL records numbered from `start`.
+
+    Returns:
+        The records to append to the history file, the postings to append to its
+        search file, and the entry to append to its index.
+    """
+    records: list[HistoryRecord] = []
+    for index, msg in enumerate(messages, start):
+        record: HistoryRecord = {"index": index, "role": msg.type, "content": msg.text, "timestamp": timestamp}
+        if isinstance(msg, AIMessage) and msg.tool_calls:
+            record["tool_calls"] = [{"id": tc.get("id"), "name": tc["name"], "args": tc["args"]} for tc in msg.tool_calls]
+        if isinstance(msg, ToolMessage):
+            record["tool_call_id"] = msg.tool_call_id
+            if msg.name:
+                record["tool_name"] = msg.name
+        records.append(record)
+    # ASCII-only JSON never contains characters that some backends treat as line breaks
+    lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+    return lines, *index_history_records(records, start, len(messages), timestamp)
+
+
+def index_history_records(records: list[HistoryRecord], start: int, count: int, timestamp: str) -> tuple[str, HistoryIndexEntry]:
+    """Return the search postings and the index entry for `count` history lines starting at `start`.
+
+    Also used to index records that an interrupted offload appended to the
+    history file without writing their index entry.
+    """
+    postings: list[str] = []
+    tool_call_ids: dict[str, list[int]] = {}
+    for record in records:
+        index = record["index"]
+        for tc in record.get("tool_calls", []):
+            if tc.get("id"):
+                tool_call_ids.setdefault(tc["id"], []).append(index)
+        if record.get("tool_call_id"):
+            tool_call_ids.setdefault(record["tool_call_id"], []).append(index)
+        postings.append(json.dumps({"index": index, "terms": Counter(tokenize(_searchable_text(record)))}) + "\n")
+    entry: HistoryIndexEntry = {"start": start, "count": count, "timestamp": timestamp, "tool_call_ids": tool_call_ids}
+    return "".join(postings), entry
+
+
+def encode_index_entry(entry: HistoryIndexEntry) -> str:
+    """Serialize an index entry as one line of the index file."""
+    return json.dumps(entry) + "\n"
+
+
+def history_unchanged_since(entries: list[HistoryIndexEntry], etag: str | None) -> bool:
+    """Return whether the history file still has the etag the last index entry recorded.
+
+    If so, nothing was appended after the indexed records and the next offload
+    can append without reading the history back.
+    """
+    return etag is not None and bool(entries) and entries[-1].get("history_etag") == etag
+
+
+def next_history_index(entries: list[HistoryIndexEntry]) -> int:
+    """Return the index the next offloaded message gets."""
+    return max((entry["start"] + entry["count"] for entry in entries), default=0)
+
+
+def _parse_time(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, treating naive ones as UTC like the offload timestamps."""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=UTC)
+
+
+def select_history_ranges(
+    entries: list[HistoryIndexEntry],
+    *,
+    start: int | None = None,
+    end: int | None = None,
+    tool_call_id: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+) -> list[tuple[int, int]]:
+    """Resolve a `read_history` query to `(first_index, count)` line ranges.
+
+    Raises:
+        ValueError: If `since` or `until` is not an ISO 8601 timestamp.
+    """
+    total = next_history_index(entries)
+    if tool_call_id is not None:
+        indexes = sorted({i for entry in entries for i in entry.get("tool_call_ids", {}).get(tool_call_id, [])})
+        return [(i, 1) for i in indexes]
+
+    if since is not None or until is not None:
+        lower = _parse_time(since) if since is not None else None
+        upper = _parse_time(until) if until is not None else None
+        ranges = []
+        for entry in entries:
+            written = _parse_time(entry["timestamp"])
+            if (lower is None or written >= lower) and (upper is None or written <= upper):
+                ranges.append((entry["start"], entry["count"]))
+        return ranges
+
+    first = max(0, start or 0)
+    last = total if end is None else min(end, total)
+    return [(first, last - first)] if last > first else []
+
+
+def parse_numbered_lines(output: str) -> dict[int, str]:
+    """Recover raw lines from `read()` output in `cat -n` format.
+
+    Long lines are split by the backends into continuation chunks numbered `N.1`,
+    `N.2`, ...; these are joined back onto line `N`. Line numbers are 1-based.
+    """
+    lines: dict[int, str] = {}
+    for row in output.split("\n"):
+        marker, sep, text = row.partition("\t")
+        if not sep:
+            continue
+        number, _, chunk = marker.strip().partition(".")
+        if not number.isdigit():
+            continue
+        line_number = int(number)
+        if chunk:
+            lines[line_number] = lines.get(line_number, "") + text
+        else:
+            lines[line_number] = text
+    return lines
+
+
+def render_history(records: list[HistoryRecord]) -> str:
+    """Render records as the markdown transcript used for offloaded history."""
+    blocks = []
+    for record in records:
+        role = _ROLE_NAMES.get(record["role"], record["role"])
+        if record.get("tool_name"):
+            role = f"{role} ({record['tool_name']}, {record.get('tool_call_id')})"
+        block = f"[{record['index']}] {role} @ {record['timestamp']}:\n{record['content']}"
+        for tc in record.get("tool_calls", []):
+            block += f"\n-> {tc['name']} ({tc['id']}): {json.dumps(tc['args'], default=str)}"
+        blocks.append(block)
+    return "\n\n".join(blocks)
+
+
+def parse_history_records(output: str) -> list[HistoryRecord]:
+    """Parse the records in `read()` output of a JSONL history file, skipping malformed lines."""
+    records: list[HistoryRecord] = []
+    for _, line in sorted(parse_numbered_lines(output).items()):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and "index" in record:
+            records.append(record)
+    return records
+
+
+def bm25_search(
+    query: str,
+    postings: dict[str, dict[int, int]],
+    doc_lengths: dict[int, int],
+    total_length: int,
+    k: int,
+) -> list[tuple[int, float]]:
+    """Rank documents against a query with BM25.
+
+    Args:
+        query: Free-text query, tokenized like the documents.
+        postings: Term to `{document: term count}`.
+        doc_lengths: Token count of every document.
+        total_length: Sum of `doc_lengths`.
+        k: Maximum number of results.
+
+    Returns:
+        The `k` best `(document, score)` pairs, best first; ties go to the lower document.
+    """
+    doc_count = len(doc_lengths)
+    if not doc_count:
+        return []
+    avg_length = total_length / doc_count or 1.0
+    scores: dict[int, float] = {}
+    for term in set(tokenize(query)):
+        term_postings = postings.get(term)
+        if not term_postings:
+            continue
+        idf = math.log(1 + (doc_count - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+        for doc, count in term_postings.items():
+            norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * doc_lengths[doc] / avg_length)
+            scores[doc] = scores.get(doc, 0.0) + idf * count * (_BM25_K1 + 1) / (count + norm)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+class HistorySearchIndex:
+    """In-memory BM25 inverted index over a history's search postings file.
+
+    The postings file is append-only, so the index remembers how many of its
+    lines it has consumed and is brought up to date by feeding it `read()`
+    output starting at `lines_read`. One index is shared by every thread that
+    searches the same history, so updates and searches hold a lock.
+    """
+
+    def __init__(self) -> None:
+        self.lines_read = 0
+        self._doc_lengths: dict[int, int] = {}
+        self._postings: dict[str, dict[int, int]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def update(self, output: str) -> tuple[int, bool]:
+        """Add the postings in `read()` output of the search file.
+
+        Only lines that directly follow `lines_read` are consumed, up to the last
+        one that parses. A backend that cut the output short (dropping lines from
+        the middle, or ending in a partial line) therefore never makes the index
+        skip postings; the missing lines are read again next time.
+
+        Returns:
+            How many lines were consumed, and whether the output held lines past a gap.
+        """
+        parsed = sorted(parse_numbered_lines(output).items())
+        with self._lock:
+            # Lines another thread consumed since this read started are skipped
+            lines = [(number, line) for number, line in parsed if number > self.lines_read]
+            run = 0
+            while run < len(lines) and lines[run][0] == self.lines_read + 1 + run:
+                run += 1
+            docs: list[tuple[int, dict[str, int]]] = []
+            consumed = 0
+            for position, (_, line) in enumerate(lines[:run], 1):
+                try:
+                    doc = json.loads(line)
+                    docs.append((doc["index"], doc["terms"]))
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+                consumed = position
+            for index, terms in docs:
+                if index in self._doc_lengths:
+                    continue
+                length = sum(terms.values())
+                self._doc_lengths[index] = length
+                self._total_length += length
+                for term, count in terms.items():
+                    self._postings.setdefault(term, {})[index] = count
+            self.lines_read += consumed
+        return consumed, run < len(lines)
+
+    def search(self, query: str, k: int) -> list[tuple[int, float]]:
+        """Return the `k` best-matching message indexes and their BM25 scores."""
+        with self._lock:
+            return bm25_search(query, self._postings, self._doc_lengths, self._total_length, k)
+
+
+def history_read_ranges(indexes: list[int], max_gap: int) -> list[tuple[int, int]]:
+    """Group message indexes into `(offset, count)` line ranges to read.
+
+    Indexes at most `max_gap` lines apart share a range, so a handful of range
+    reads fetch all of them.
+    """
+    ranges: list[tuple[int, int]] = []
+    for index in sorted(set(indexes)):
+        if ranges and index - (ranges[-1][0] + ranges[-1][1]) <= max_gap:
+            ranges[-1] = (ranges[-1][0], index - ranges[-1][0] + 1)
+        else:
+            ranges.append((index, 1))
+    return ranges
+
+
+def render_search_hits(records: list[HistoryRecord], scores: dict[int, float], query: str, width: int = 240) -> str:
+    """Render search hits as short snippets centred on the first matching term."""
+    terms = sorted(set(tokenize(query)))
+    pattern = re.compile("|".join(rf"\b{re.escape(term)}\b" for term in terms)) if terms else None
+    blocks = []
+    for record in records:
+        text = _searchable_text(record)
+        match = pattern.search(text.lower()) if pattern else None
+        begin = max(0, match.start() - width // 3) if match else 0
+        snippet = " ".join(text[begin : begin + width].split())
+        prefix = "..." if begin else ""
+        suffix = "..." if begin + width < len(text) else ""
+        role = _ROLE_NAMES.get(record["role"], record["role"])
+        blocks.append(f"[{record['index']}] {role} (score {scores[record['index']]:.2f}): {prefix}{snippet}{suffix}")
+    return "\n".join(blocks)
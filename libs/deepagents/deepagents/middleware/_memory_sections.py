@@ -0,0 +1,159 @@
+"""Markdown sections of memory files and a lexical index over them.
+
+`MemoryMiddleware` uses these when `max_memory_tokens` is set: each source is
+split at its markdown headings (or, if it has none, into paragraphs and list
+items), the sections are indexed with BM25, and only the pinned sections plus
+the ones most relevant to the latest user message are put in the system prompt,
+all within the same character budget. The rest stay reachable through the
+`recall_memory` tool.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from deepagents.middleware._history import bm25_search, tokenize
+
+_HEADING_PATTERN = re.compile(r"^ {0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+_FENCE_PATTERN = re.compile(r"^ {0,3}(```|~~~)")
+_LIST_ITEM_PATTERN = re.compile(r"^([-*+]|\d+[.)])\s")
+
+
+@dataclass(frozen=True)
+class MemorySection:
+    """One heading of a memory file and the text under it."""
+
+    source: str
+    """Path of the memory file."""
+
+    title: str
+    """Heading text, or `""` for text that is not under a heading."""
+
+    text: str
+    """The section, including its heading line."""
+
+
+def split_memory_sections(source: str, content: str) -> list[MemorySection]:
+    """Split a markdown file at its headings, ignoring `#` lines inside code fences.
+
+    A file without headings is split into paragraphs and top-level list items
+    instead, so that it can still be ranked piece by piece.
+
+    Args:
+        source: Path of the memory file.
+        content: The file's content.
+
+    Returns:
+        The non-empty sections in file order.
+    """
+    sections: list[MemorySection] = []
+    title = ""
+    lines: list[str] = []
+    in_fence = False
+
+    def flush() -> None:
+        text = "\n".join(lines).strip("\n")
+        if text.strip():
+            sections.append(MemorySection(source=source, title=title, text=text))
+
+    for line in content.splitlines():
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        heading = None if in_fence else _HEADING_PATTERN.match(line)
+        if heading:
+            flush()
+            title, lines = heading.group(1), []
+        lines.append(line)
+    flush()
+    if len(sections) == 1 and not sections[0].title:
+        return [MemorySection(source=source, title="", text=chunk) for chunk in _split_paragraphs(sections[0].text)]
+    return sections
+
+
+def _split_paragraphs(text: str) -> list[str]:
+    """Split text at blank lines and top-level list items, keeping code fences whole."""
+    chunks: list[list[str]] = [[]]
+    in_fence = False
+    for line in text.splitlines():
+        if not in_fence and (not line.strip() or _LIST_ITEM_PATTERN.match(line)):
+            chunks.append([])
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        if line.strip() or in_fence:
+            chunks[-1].append(line)
+    return [joined for chunk in chunks if (joined := "\n".join(chunk).strip("\n"))]
+
+
+class MemorySectionIndex:
+    """BM25 index over the sections of all memory sources."""
+
+    def __init__(self, contents: dict[str, str], sources: list[str]) -> None:
+        """Split and index the memory files.
+
+        Args:
+            contents: Dict mapping source paths to content.
+            sources: Source paths in prompt order.
+        """
+        self.sections = [section for path in sources if contents.get(path) for section in split_memory_sections(path, contents[path])]
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_lengths: dict[int, int] = {}
+        for i, section in enumerate(self.sections):
+            terms = Counter(tokenize(section.text))
+            self._doc_lengths[i] = sum(terms.values())
+            for term, count in terms.items():
+                self._postings.setdefault(term, {})[i] = count
+        self._total_length = sum(self._doc_lengths.values())
+        headed = {section.source for section in self.sections if section.title}
+        self._preambles = [i for i, section in enumerate(self.sections) if not section.title and section.source in headed]
+
+    def search(self, query: str, k: int) -> list[int]:
+        """Return the positions of the `k` sections that best match `query`, best first."""
+        return [i for i, _ in bm25_search(query, self._postings, self._doc_lengths, self._total_length, k)]
+
+    def select(self, query: str, *, pinned: set[str], max_chars: int, k: int) -> list[int]:
+        """Choose the sections to inject for a query.
+
+        Pinned sections (headings listed in `pinned`, then the text before
+        the first heading of files that have headings) are chosen first, and
+        the `k` best matches for `query` are added in rank order. Every
+        section, pinned or not, is only chosen if it still fits in `max_chars`.
+
+        Args:
+            query: Usually the latest user message.
+            pinned: Lowercased headings that are always injected.
+            max_chars: Character budget shared by all chosen sections.
+            k: Maximum number of ranked sections.
+
+        Returns:
+            Positions of the chosen sections, in file order.
+        """
+        chosen: set[int] = set()
+        used = 0
+
+        def admit(i: int) -> bool:
+            nonlocal used
+            size = len(self.sections[i].text)
+            if i in chosen or used + size > max_chars:
+                return False
+            chosen.add(i)
+            used += size
+            return True
+
+        for i in [i for i, section in enumerate(self.sections) if section.title and section.title.lower() in pinned] + self._preambles:
+            admit(i)
+        for i in self.search(query, len(self.sections)):
+            if k <= 0:
+                break
+            if admit(i):
+                k -= 1
+        return sorted(chosen)
+
+
+def render_memory_sections(sections: list[MemorySection]) -> str:
+    """Render sections grouped under the path of the file they come from."""
+    groups: dict[str, list[str]] = {}
+    for section in sections:
+        groups.setdefault(section.source, []).append(section.text)
+    return "\n\n".join(f"{source}\n" + "\n\n".join(texts) for source, texts in groups.items())
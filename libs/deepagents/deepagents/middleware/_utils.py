@@ -1,23 +0,0 @@
-"""Utility functions for middleware."""
-
-from langchain_core.messages import SystemMessage
-
-
-def append_to_system_message(
-    system_message: SystemMessage | None,
-    text: str,
-) -> SystemMessage:
-    """Append text to a system message.
-
-    Args:
-        system_message: Existing system message or None.
-        text: Text to add to the system message.
-
-    Returns:
-        New SystemMessage with the text appended.
-    """
-    new_content: list[str | dict[str, str]] = list(system_message.content_blocks) if system_message else []
-    if new_content:
-        text = f"\n\n{text}"
-    new_content.append({"type": "text", "text": text})
-    return SystemMessage(content=new_content)
@@ -25,6 +25,7 @@ from deepagents.backends.protocol import (
     BACKEND_TYPES as BACKEND_TYPES,  # Re-export type here for backwards compatibility
     BackendProtocol,
     EditResult,
+    JobStatus,
     SandboxBackendProtocol,
     WriteResult,
 )
@@ -34,7 +35,7 @@ from deepagents.backends.utils import (
     sanitize_tool_call_id,
     truncate_if_too_long,
 )
-from deepagents.middleware._utils import append_to_system_message
+from deepagents.middleware.prompt_fragments import PROMPT_FRAGMENTS
 
 EMPTY_CONTENT_WARNING = "System reminder: File exists but has empty contents"
 LINE_NUMBER_WIDTH = 6
@@ -271,6 +272,37 @@ Examples:
 Note: This tool is only available if the backend supports execution (SandboxBackendProtocol).
 If execution is not supported, the tool will return an error message."""
 
+START_JOB_TOOL_DESCRIPTION = """Starts a shell command in the background and returns a job id immediately.
+
+Use this instead of `execute` for commands that take a long time or never exit on their own, such as dev servers, file watchers, long builds or large test suites.
+The command's combined stdout/stderr is captured and can be read later with `tail_job`.
+
+Usage notes:
+  - The command runs in the same environment as `execute`
+  - Check on the job with `poll_job`, read its output with `tail_job`, and stop it with `kill_job`
+  - Do not start a job and then immediately wait on it with `execute(command="sleep ...")`; do other work and poll later
+
+Examples:
+  - start_job(command="npm run dev")
+  - start_job(command="pytest /project/tests")"""
+
+POLL_JOB_TOOL_DESCRIPTION = """Checks whether a background job started with `start_job` is still running, and its exit code once it has finished."""
+
+TAIL_JOB_TOOL_DESCRIPTION = """Reads the last lines of a background job's combined stdout/stderr, along with its status.
+
+Use `lines` to control how much output is returned (default 50)."""
+
+KILL_JOB_TOOL_DESCRIPTION = """Stops a background job started with `start_job`, including any processes it spawned.
+
+Killing a job that has already finished is not an error."""
+
+JOB_TOOL_NAMES = ("start_job", "poll_job", "tail_job", "kill_job")
+
+JOBS_UNAVAILABLE_MSG = (
+    "Error: Background jobs not available. This agent's backend does not support "
+    "background jobs (SandboxBackendProtocol with start_job/poll_job/tail_job/kill_job)."
+)
+
 FILESYSTEM_SYSTEM_PROMPT = """## Filesystem Tools `ls`, `read_file`, `write_file`, `edit_file`, `glob`, `grep`
 
 You have access to a filesystem which you can interact with using these tools.
@@ -290,6 +322,17 @@ Use this tool to run commands, scripts, tests, builds, and other shell operation
 
 - execute: run a shell command in the sandbox (returns output and exit code)"""
 
+JOBS_SYSTEM_PROMPT = """## Background Job Tools `start_job`, `poll_job`, `tail_job`, `kill_job`
+
+For commands that run for a long time or never exit (servers, watchers, long builds or test runs), start them in the background instead of blocking on `execute`.
+
+- start_job: start a command in the background and get a job id
+- poll_job: check whether a job is still running and its exit code
+- tail_job: read the last lines of a job's output
+- kill_job: stop a job and everything it started
+
+Kill jobs you no longer need before finishing your task."""
+
 
 def _supports_execution(backend: BackendProtocol) -> bool:
     """Check if a backend supports command execution.
@@ -311,6 +354,39 @@ def _supports_execution(backend: BackendProtocol) -> bool:
     return isinstance(backend, SandboxBackendProtocol)
 
 
+def _supports_jobs(backend: BackendProtocol) -> bool:
+    """Check if a backend supports background jobs.
+
+    A backend supports jobs when it implements `SandboxBackendProtocol` and
+    overrides `start_job()` (the protocol default raises `NotImplementedError`).
+    For CompositeBackend, checks the default backend.
+
+    Args:
+        backend: The backend to check.
+
+    Returns:
+        True if the backend supports background jobs, False otherwise.
+    """
+    if isinstance(backend, CompositeBackend):
+        backend = backend.default
+    return isinstance(backend, SandboxBackendProtocol) and type(backend).start_job is not SandboxBackendProtocol.start_job
+
+
+def _format_job_status(status: JobStatus) -> str:
+    """Format a `JobStatus` for LLM consumption."""
+    if status.error:
+        return status.error
+    if status.running:
+        text = f"Job {status.job_id} is running."
+    elif status.exit_code is None:
+        text = f"Job {status.job_id} has finished (exit code unknown)."
+    else:
+        text = f"Job {status.job_id} has finished with exit code {status.exit_code}."
+    if status.output is not None:
+        text += f"\n\n{status.output or '<no output yet>'}"
+    return text
+
+
 # Tools that should be excluded from the large result eviction logic.
 #
 # This tuple contains tools that should NOT have their results evicted to the filesystem
@@ -469,6 +545,10 @@ class FilesystemMiddleware(AgentMiddleware):
             self._create_glob_tool(),
             self._create_grep_tool(),
             self._create_execute_tool(),
+            self._create_start_job_tool(),
+            self._create_poll_job_tool(),
+            self._create_tail_job_tool(),
+            self._create_kill_job_tool(),
         ]
 
     def _get_backend(self, runtime: ToolRuntime) -> BackendProtocol:
@@ -896,6 +976,188 @@ class FilesystemMiddleware(AgentMiddleware):
             coroutine=async_execute,
         )
 
+    def _get_job_backend(self, runtime: ToolRuntime) -> SandboxBackendProtocol | None:
+        """Resolve the backend for a job tool call, or `None` if it can't run jobs."""
+        backend = self._get_backend(runtime)
+        if not _supports_jobs(backend):
+            return None
+        return backend  # type: ignore[return-value]
+
+    def _create_start_job_tool(self) -> BaseTool:
+        """Create the start_job tool for background command execution."""
+        tool_description = self._custom_tool_descriptions.get("start_job") or START_JOB_TOOL_DESCRIPTION
+
+        def format_started(status: JobStatus) -> str:
+            if status.error:
+                return status.error
+            return f"Started background job {status.job_id}. Use poll_job or tail_job to check on it and kill_job to stop it."
+
+        def sync_start_job(
+            command: Annotated[str, "Shell command to run in the background."],
+            runtime: ToolRuntime[None, FilesystemState],
+        ) -> str:
+            """Synchronous wrapper for start_job tool."""
+            backend = self._get_job_backend(runtime)
+            if backend is None:
+                return JOBS_UNAVAILABLE_MSG
+            return format_started(backend.start_job(command))
+
+        async def async_start_job(
+            command: Annotated[str, "Shell command to run in the background."],
+            runtime: ToolRuntime[None, FilesystemState],
+        ) -> str:
+            """Asynchronous wrapper for start_job tool."""
+            backend = self._get_job_backend(runtime)
+            if backend is None:
+                return JOBS_UNAVAILABLE_MSG
+            return format_started(await backend.astart_job(command))
+
+        return StructuredTool.from_function(
+            name="start_job",
+            description=tool_description,
+            func=sync_start_job,
+            coroutine=async_start_job,
+        )
+
+    def _create_poll_job_tool(self) -> BaseTool:
+        """Create the poll_job tool."""
+        tool_description = self._custom_tool_descriptions.get("poll_job") or POLL_JOB_TOOL_DESCRIPTION
+
+        def sync_poll_job(
+            job_id: Annotated[str, "Job id returned by start_job."],
+            runtime: ToolRuntime[None, FilesystemState],
+        ) -> str:
+            """Synchronous wrapper for poll_job tool."""
+            backend = self._get_job_backend(runtime)
+            if backend is None:
+                return JOBS_UNAVAILABLE_MSG
+            return _format_job_status(backend.poll_job(job_id))
+
+        async def async_poll_job(
+            job_id: Annotated[str, "Job id returned by start_job."],
+            runtime: ToolRuntime[None, FilesystemState],
+        ) -> str:
+            """Asynchronous wrapper for poll_job tool."""
+            backend = self._get_job_backend(runtime)
+            if backend is None:
+                return JOBS_UNAVAILABLE_MSG
+            return _format_job_status(await backend.apoll_job(job_id))
+
+        return StructuredTool.from_function(
+            name="poll_job",
+            description=tool_description,
+            func=sync_poll_job,
+            coroutine=async_poll_job,
+        )
+
+    def _create_tail_job_tool(self) -> BaseTool:
+        """Create the tail_job tool."""
+        tool_description = self._custom_tool_descriptions.get("tail_job") or TAIL_JOB_TOOL_DESCRIPTION
+
+        def sync_tail_job(
+            job_id: Annotated[str, "Job id returned by start_job."],
+            runtime: ToolRuntime[None, FilesystemState],
+            lines: Annotated[int, "Number of trailing output lines to return."] = 50,
+        ) -> str:
+            """Synchronous wrapper for tail_job tool."""
+            backend = self._get_job_backend(runtime)
+            if backend is None:
+                return JOBS_UNAVAILABLE_MSG
+            return _format_job_status(backend.tail_job(job_id, lines))
+
+        async def async_tail_job(
+            job_id: Annotated[str, "Job id returned by start_job."],
+            runtime: ToolRuntime[None, FilesystemState],
+            lines: Annotated[int, "Number of trailing output lines to return."] = 50,
+        ) -> str:
+            """Asynchronous wrapper for tail_job tool."""
+            backend = self._get_job_backend(runtime)
+            if backend is None:
+                return JOBS_UNAVAILABLE_MSG
+            return _format_job_status(await backend.atail_job(job_id, lines))
+
+        return StructuredTool.from_function(
+            name="tail_job",
+            description=tool_description,
+            func=sync_tail_job,
+            coroutine=async_tail_job,
+        )
+
+    def _create_kill_job_tool(self) -> BaseTool:
+        """Create the kill_job tool."""
+        tool_description = self._custom_tool_descriptions.get("kill_job") or KILL_JOB_TOOL_DESCRIPTION
+
+        def sync_kill_job(
+            job_id: Annotated[str, "Job id returned by start_job."],
+            runtime: ToolRuntime[None, FilesystemState],
+        ) -> str:
+            """Synchronous wrapper for kill_job tool."""
+            backend = self._get_job_backend(runtime)
+            if backend is None:
+                return JOBS_UNAVAILABLE_MSG
+            return _format_job_status(backend.kill_job(job_id))
+
+        async def async_kill_job(
+            job_id: Annotated[str, "Job id returned by start_job."],
+            runtime: ToolRuntime[None, FilesystemState],
+        ) -> str:
+            """Asynchronous wrapper for kill_job tool."""
+            backend = self._get_job_backend(runtime)
+            if backend is None:
+                return JOBS_UNAVAILABLE_MSG
+            return _format_job_status(await backend.akill_job(job_id))
+
+        return StructuredTool.from_function(
+            name="kill_job",
+            description=tool_description,
+            func=sync_kill_job,
+            coroutine=async_kill_job,
+        )
+
+    def _filter_unsupported_tools(self, request: ModelRequest) -> tuple[ModelRequest, bool, bool]:
+        """Drop execution and job tools the resolved backend can't serve.
+
+        Returns:
+            Tuple of the (possibly overridden) request and whether the execute
+            and job tools remain available.
+        """
+        tool_names = {tool.name if hasattr(tool, "name") else tool.get("name") for tool in request.tools}
+        has_execute_tool = "execute" in tool_names
+        has_job_tools = any(name in tool_names for name in JOB_TOOL_NAMES)
+        if not has_execute_tool and not has_job_tools:
+            return request, False, False
+
+        # Resolve backend to check execution and job support
+        backend = self._get_backend(request.runtime)
+        removed: set[str] = set()
+        if has_execute_tool and not _supports_execution(backend):
+            removed.add("execute")
+            has_execute_tool = False
+        if has_job_tools and not _supports_jobs(backend):
+            removed.update(JOB_TOOL_NAMES)
+            has_job_tools = False
+        if removed:
+            filtered_tools = [tool for tool in request.tools if (tool.name if hasattr(tool, "name") else tool.get("name")) not in removed]
+            request = request.override(tools=filtered_tools)
+        return request, has_execute_tool, has_job_tools
+
+    def _build_system_prompt(self, *, has_execute_tool: bool, has_job_tools: bool) -> str:
+        """Build the system prompt section for the tools that remain available."""
+        # Use custom system prompt if provided, otherwise generate dynamically
+        if self._custom_system_prompt is not None:
+            return self._custom_system_prompt
+
+        # Build dynamic system prompt based on available tools
+        prompt_parts = [FILESYSTEM_SYSTEM_PROMPT]
+
+        # Add execution instructions if execute tool is available
+        if has_execute_tool:
+            prompt_parts.append(EXECUTION_SYSTEM_PROMPT)
+        if has_job_tools:
+            prompt_parts.append(JOBS_SYSTEM_PROMPT)
+
+        return "\n\n".join(prompt_parts)
+
     def wrap_model_call(
         self,
         request: ModelRequest,
@@ -910,36 +1172,15 @@ class FilesystemMiddleware(AgentMiddleware):
         Returns:
             The model response from the handler.
         """
-        # Check if execute tool is present and if backend supports it
-        has_execute_tool = any((tool.name if hasattr(tool, "name") else tool.get("name")) == "execute" for tool in request.tools)
-
-        backend_supports_execution = False
-        if has_execute_tool:
-            # Resolve backend to check execution support
-            backend = self._get_backend(request.runtime)
-            backend_supports_execution = _supports_execution(backend)
-
-            # If execute tool exists but backend doesn't support it, filter it out
-            if not backend_supports_execution:
-                filtered_tools = [tool for tool in request.tools if (tool.name if hasattr(tool, "name") else tool.get("name")) != "execute"]
-                request = request.override(tools=filtered_tools)
-                has_execute_tool = False
-
-        # Use custom system prompt if provided, otherwise generate dynamically
-        if self._custom_system_prompt is not None:
-            system_prompt = self._custom_system_prompt
-        else:
-            # Build dynamic system prompt based on available tools
-            prompt_parts = [FILESYSTEM_SYSTEM_PROMPT]
-
-            # Add execution instructions if execute tool is available
-            if has_execute_tool and backend_supports_execution:
-                prompt_parts.append(EXECUTION_SYSTEM_PROMPT)
-
-            system_prompt = "\n\n".join(prompt_parts)
+        request, has_execute_tool, has_job_tools = self._filter_unsupported_tools(request)
+        system_prompt = PROMPT_FRAGMENTS.render(
+            "filesystem",
+            (self._custom_system_prompt, has_execute_tool, has_job_tools),
+            lambda: self._build_system_prompt(has_execute_tool=has_execute_tool, has_job_tools=has_job_tools),
+        )
 
         if system_prompt:
-            new_system_message = append_to_system_message(request.system_message, system_prompt)
+            new_system_message = PROMPT_FRAGMENTS.append(request.system_message, system_prompt)
             request = request.override(system_message=new_system_message)
 
         return handler(request)
@@ -958,36 +1199,15 @@ class FilesystemMiddleware(AgentMiddleware):
         Returns:
             The model response from the handler.
         """
-        # Check if execute tool is present and if backend supports it
-        has_execute_tool = any((tool.name if hasattr(tool, "name") else tool.get("name")) == "execute" for tool in request.tools)
-
-        backend_supports_execution = False
-        if has_execute_tool:
-            # Resolve backend to check execution support
-            backend = self._get_backend(request.runtime)
-            backend_supports_execution = _supports_execution(backend)
-
-            # If execute tool exists but backend doesn't support it, filter it out
-            if not backend_supports_execution:
-                filtered_tools = [tool for tool in request.tools if (tool.name if hasattr(tool, "name") else tool.get("name")) != "execute"]
-                request = request.override(tools=filtered_tools)
-                has_execute_tool = False
-
-        # Use custom system prompt if provided, otherwise generate dynamically
-        if self._custom_system_prompt is not None:
-            system_prompt = self._custom_system_prompt
-        else:
-            # Build dynamic system prompt based on available tools
-            prompt_parts = [FILESYSTEM_SYSTEM_PROMPT]
-
-            # Add execution instructions if execute tool is available
-            if has_execute_tool and backend_supports_execution:
-                prompt_parts.append(EXECUTION_SYSTEM_PROMPT)
-
-            system_prompt = "\n\n".join(prompt_parts)
+        request, has_execute_tool, has_job_tools = self._filter_unsupported_tools(request)
+        system_prompt = PROMPT_FRAGMENTS.render(
+            "filesystem",
+            (self._custom_system_prompt, has_execute_tool, has_job_tools),
+            lambda: self._build_system_prompt(has_execute_tool=has_execute_tool, has_job_tools=has_job_tools),
+        )
 
         if system_prompt:
-            new_system_message = append_to_system_message(request.system_message, system_prompt)
+            new_system_message = PROMPT_FRAGMENTS.append(request.system_message, system_prompt)
             request = request.override(system_message=new_system_message)
 
         return await handler(request)
@@ -37,6 +37,25 @@ Sources are simply paths to AGENTS.md files that are loaded in order and combine
 Multiple sources are concatenated in order, with all content included.
 Later sources appear after earlier ones in the combined prompt.
 
+## Caching
+
+All sources are fetched with one batched `download_files` call, and the contents
+are kept in a process-wide cache keyed by backend and path. Before every agent run
+the cache is validated against the backend's `file_etags` (size and mtime for
+`FilesystemBackend`, the item timestamp for `StoreBackend`), so new threads reuse
+the downloaded files and running threads pick up edits on their next turn.
+`edit_file` / `write_file` calls on a memory path drop its cache entry right away.
+
+## Bounding Memory Size
+
+Memory files only grow, so `max_memory_tokens` caps what is injected. Once the
+memory is larger than that, it is split at its markdown headings (files without
+headings are split into paragraphs and list items) and only the `pinned_sections`,
+the text before each file's first heading, and the sections most relevant to the
+latest user message (ranked with BM25) are put in the system prompt. Pinned text
+counts against the same budget. The agent gets a `recall_memory` tool to search
+the rest.
+
 ## File Format
 
 AGENTS.md files are standard Markdown with no required structure.
@@ -50,13 +69,21 @@ Common sections include:
 from __future__ import annotations
 
 import logging
-from collections.abc import Awaitable, Callable
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
 from typing import TYPE_CHECKING, Annotated, NotRequired, TypedDict
 
 from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool, StructuredTool
 
 if TYPE_CHECKING:
-    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol
+    from langchain.agents.middleware.types import ToolCallRequest
+    from langchain_core.messages import ToolMessage
+    from langgraph.types import Command
+
+    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol, FileDownloadResponse
 
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -68,10 +95,24 @@ from langchain.agents.middleware.types import (
 from langchain.tools import ToolRuntime
 from langgraph.runtime import Runtime
 
-from deepagents.middleware._utils import append_to_system_message
+from deepagents.backends.composite import CompositeBackend
+from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.state import StateBackend
+from deepagents.backends.store import StoreBackend
+from deepagents.middleware._memory_sections import MemorySectionIndex, render_memory_sections
+from deepagents.middleware.filesystem import NUM_CHARS_PER_TOKEN
+from deepagents.middleware.prompt_fragments import PROMPT_FRAGMENTS
 
 logger = logging.getLogger(__name__)
 
+_MAX_CACHED_MEMORY_FILES = 256
+
+_MEMORY_WRITE_TOOLS = frozenset({"write_file", "edit_file"})
+
+_MAX_SECTION_INDEXES = 16
+
+_RECALL_MEMORY_MAX_K = 20
+
 
 class MemoryState(AgentState):
     """State schema for `MemoryMiddleware`.
@@ -152,6 +193,78 @@ MEMORY_SYSTEM_PROMPT = """<agent_memory>
 """
 
 
+class _MemoryFileCache:
+    """Process-wide LRU cache of memory file contents, validated by backend etags."""
+
+    def __init__(self, max_entries: int = _MAX_CACHED_MEMORY_FILES) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Hashable, str], tuple[str, str]] = OrderedDict()
+
+    def get(self, backend_key: Hashable | None, path: str, etag: str | None) -> str | None:
+        """Return the cached content of `path` if it was cached at `etag`."""
+        if backend_key is None or etag is None:
+            return None
+        with self._lock:
+            entry = self._entries.get((backend_key, path))
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end((backend_key, path))
+            return entry[1]
+
+    def put(self, backend_key: Hashable | None, path: str, etag: str | None, content: str) -> None:
+        """Cache the content of `path` as of `etag`; files without a backend key or etag are not cached."""
+        if backend_key is None or etag is None:
+            return
+        with self._lock:
+            self._entries[backend_key, path] = (etag, content)
+            self._entries.move_to_end((backend_key, path))
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        """Drop `path` from the cache for every backend."""
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == path]:
+                del self._entries[key]
+
+
+_MEMORY_CACHE = _MemoryFileCache()
+
+
+def _backend_cache_key(backend: BackendProtocol, path: str) -> Hashable | None:
+    """Return what identifies the file `path` resolves to, or `None` if it must not be cached.
+
+    Backend factories build new backends on every call, so keys never hold a
+    backend (or the runtime it carries): a `CompositeBackend` is keyed by the
+    backend the path routes to, a `StoreBackend` by its store and namespace and a
+    `FilesystemBackend` by its root directory. Other backends are keyed by a weak
+    reference, which only matches while that same instance is alive.
+    """
+    if isinstance(backend, CompositeBackend):
+        routed, routed_path = backend._get_backend_and_key(path)
+        key = _backend_cache_key(routed, routed_path)
+        return None if key is None else (key, routed_path)
+    if isinstance(backend, StoreBackend):
+        return (backend._get_store(), backend._get_namespace())
+    if isinstance(backend, FilesystemBackend):
+        return (FilesystemBackend, backend.cwd, backend.virtual_mode)
+    if isinstance(backend, StateBackend):
+        # Files in state belong to one thread and are already in memory
+        return None
+    try:
+        return weakref.ref(backend)
+    except TypeError:
+        return None
+
+
+RECALL_MEMORY_TOOL_DESCRIPTION = """Searches your memory files for sections relevant to a query.
+
+Only part of your memory is shown in the system prompt. Use this tool to look up
+preferences, instructions, or facts you may have saved that are not shown there.
+Returns the best-matching sections in full, with the file each one comes from."""
+
+
 class MemoryMiddleware(AgentMiddleware):
     """Middleware for loading agent memory from `AGENTS.md` files.
 
@@ -171,6 +284,9 @@ class MemoryMiddleware(AgentMiddleware):
         *,
         backend: BACKEND_TYPES,
         sources: list[str],
+        max_memory_tokens: int | None = None,
+        pinned_sections: list[str] | None = None,
+        max_relevant_sections: int = 8,
     ) -> None:
         """Initialize the memory middleware.
 
@@ -183,9 +299,26 @@ class MemoryMiddleware(AgentMiddleware):
                      Display names are automatically derived from the paths.
 
                      Sources are loaded in order.
+            max_memory_tokens: Approximate token budget for injected memory. When the
+                     memory is larger, only pinned sections and the sections most relevant
+                     to the latest user message are injected, and a `recall_memory` tool is
+                     added. `None` (the default) always injects all memory.
+            pinned_sections: Headings (case-insensitive) whose sections are injected
+                     before any ranked section, followed by the text before a file's
+                     first heading. Both still count against `max_memory_tokens`.
+            max_relevant_sections: Maximum number of ranked sections to inject.
         """
+        if max_memory_tokens is not None and max_memory_tokens <= 0:
+            msg = f"max_memory_tokens must be positive, got {max_memory_tokens}"
+            raise ValueError(msg)
         self._backend = backend
         self.sources = sources
+        self._max_memory_tokens = max_memory_tokens
+        self._pinned_sections = {title.lower() for title in pinned_sections or []}
+        self._max_relevant_sections = max_relevant_sections
+        self._section_indexes: OrderedDict[tuple[tuple[str, str], ...], MemorySectionIndex] = OrderedDict()
+        self._section_indexes_lock = threading.Lock()
+        self.tools = [self._create_recall_memory_tool()] if max_memory_tokens is not None else []
 
     def _get_backend(self, state: MemoryState, runtime: Runtime, config: RunnableConfig) -> BackendProtocol:
         """Resolve backend from instance or factory.
@@ -234,77 +367,164 @@ class MemoryMiddleware(AgentMiddleware):
         memory_body = "\n\n".join(sections)
         return MEMORY_SYSTEM_PROMPT.format(agent_memory=memory_body)
 
-    async def _load_memory_from_backend(
-        self,
-        backend: BackendProtocol,
-        path: str,
-    ) -> str | None:
-        """Load memory content from a backend path.
+    def _get_section_index(self, contents: dict[str, str]) -> MemorySectionIndex:
+        """Return the section index for `contents`, building it on first use."""
+        key = tuple(contents.items())
+        with self._section_indexes_lock:
+            index = self._section_indexes.get(key)
+            if index is not None:
+                self._section_indexes.move_to_end(key)
+                return index
+        index = MemorySectionIndex(contents, self.sources)
+        with self._section_indexes_lock:
+            self._section_indexes[key] = index
+            if len(self._section_indexes) > _MAX_SECTION_INDEXES:
+                self._section_indexes.popitem(last=False)
+        return index
+
+    def _select_sections(self, contents: dict[str, str], query: str) -> tuple[int, ...] | None:
+        """Pick the memory sections to inject for `query`.
+
+        Returns:
+            Positions in the section index, or `None` if all memory fits the budget.
+        """
+        if self._max_memory_tokens is None:
+            return None
+        max_chars = self._max_memory_tokens * NUM_CHARS_PER_TOKEN
+        if sum(len(contents.get(path, "")) for path in self.sources) <= max_chars:
+            return None
+        index = self._get_section_index(contents)
+        return tuple(index.select(query, pinned=self._pinned_sections, max_chars=max_chars, k=self._max_relevant_sections))
+
+    def _format_selected_memory(self, contents: dict[str, str], selected: tuple[int, ...]) -> str:
+        """Format the chosen sections, noting how many more `recall_memory` can find."""
+        index = self._get_section_index(contents)
+        body = render_memory_sections([index.sections[i] for i in selected]) or "(No memory sections selected)"
+        hidden = len(index.sections) - len(selected)
+        body += f"\n\n({hidden} more memory sections are not shown. Use the `recall_memory` tool to search them.)"
+        return MEMORY_SYSTEM_PROMPT.format(agent_memory=body)
+
+    def _create_recall_memory_tool(self) -> BaseTool:
+        """Create the recall_memory tool that searches all memory sections."""
+
+        def recall_memory(
+            runtime: ToolRuntime,
+            query: Annotated[str, "Words to look for in your memory."],
+            k: Annotated[int, "Maximum number of sections to return."] = 5,
+        ) -> str:
+            """Search memory sections."""
+            contents = runtime.state.get("memory_contents") or {}
+            index = self._get_section_index(contents)
+            hits = index.search(query, max(1, min(k, _RECALL_MEMORY_MAX_K)))
+            if not hits:
+                return f"No memory sections match {query!r}."
+            return render_memory_sections([index.sections[i] for i in hits])
+
+        return StructuredTool.from_function(
+            name="recall_memory",
+            description=RECALL_MEMORY_TOOL_DESCRIPTION,
+            func=recall_memory,
+        )
+
+    def _read_response(self, response: FileDownloadResponse) -> str | None:
+        """Decode one downloaded memory file.
 
         Args:
-            backend: Backend to load from.
-            path: Path to the AGENTS.md file.
+            response: Download response for a memory source.
 
         Returns:
             File content if found, None otherwise.
         """
-        results = await backend.adownload_files([path])
-        # Should get exactly one response for one path
-        if len(results) != 1:
-            raise AssertionError(f"Expected 1 response for path {path}, got {len(results)}")
-        response = results[0]
-
         if response.error is not None:
             # For now, memory files are treated as optional. file_not_found is expected
             # and we skip silently to allow graceful degradation.
             if response.error == "file_not_found":
                 return None
             # Other errors should be raised
-            raise ValueError(f"Failed to download {path}: {response.error}")
+            raise ValueError(f"Failed to download {response.path}: {response.error}")
 
         if response.content is not None:
             return response.content.decode("utf-8")
 
         return None
 
-    def _load_memory_from_backend_sync(
+    def _cached_contents(
+        self, backend: BackendProtocol, etags: list[str | None]
+    ) -> tuple[dict[str, str], list[tuple[str, Hashable | None, str | None]]]:
+        """Split the sources into cache hits and the `(path, backend key, etag)` triples to download."""
+        if len(etags) != len(self.sources):
+            raise AssertionError(f"Expected {len(self.sources)} etags, got {len(etags)}")
+        contents: dict[str, str] = {}
+        stale: list[tuple[str, Hashable | None, str | None]] = []
+        for path, etag in zip(self.sources, etags, strict=True):
+            backend_key = _backend_cache_key(backend, path)
+            cached = _MEMORY_CACHE.get(backend_key, path, etag)
+            if cached is None:
+                stale.append((path, backend_key, etag))
+            elif cached:
+                contents[path] = cached
+        return contents, stale
+
+    def _merge_downloads(
         self,
-        backend: BackendProtocol,
-        path: str,
-    ) -> str | None:
-        """Load memory content from a backend path synchronously.
+        contents: dict[str, str],
+        stale: list[tuple[str, Hashable | None, str | None]],
+        responses: list[FileDownloadResponse],
+    ) -> dict[str, str]:
+        """Cache the downloaded files and return all contents in source order."""
+        if len(responses) != len(stale):
+            raise AssertionError(f"Expected {len(stale)} responses, got {len(responses)}")
+        for (path, backend_key, etag), response in zip(stale, responses, strict=True):
+            content = self._read_response(response)
+            if content is None:
+                continue
+            # The etag was read before the download, so a concurrent edit only makes the entry stale
+            _MEMORY_CACHE.put(backend_key, path, etag, content)
+            if content:
+                contents[path] = content
+                logger.debug(f"Loaded memory from: {path}")
+        return {path: contents[path] for path in self.sources if path in contents}
+
+    def _load_contents(self, backend: BackendProtocol) -> dict[str, str]:
+        """Load all sources, downloading only those that changed since they were cached.
 
         Args:
             backend: Backend to load from.
-            path: Path to the AGENTS.md file.
 
         Returns:
-            File content if found, None otherwise.
+            Dict mapping source paths to their non-empty content.
         """
-        results = backend.download_files([path])
-        # Should get exactly one response for one path
-        if len(results) != 1:
-            raise AssertionError(f"Expected 1 response for path {path}, got {len(results)}")
-        response = results[0]
+        if not self.sources:
+            return {}
+        contents, stale = self._cached_contents(backend, backend.file_etags(self.sources))
+        if not stale:
+            return contents
+        responses = backend.download_files([path for path, _, _ in stale])
+        return self._merge_downloads(contents, stale, responses)
 
-        if response.error is not None:
-            # For now, memory files are treated as optional. file_not_found is expected
-            # and we skip silently to allow graceful degradation.
-            if response.error == "file_not_found":
-                return None
-            # Other errors should be raised
-            raise ValueError(f"Failed to download {path}: {response.error}")
+    async def _aload_contents(self, backend: BackendProtocol) -> dict[str, str]:
+        """Async version of `_load_contents`.
 
-        if response.content is not None:
-            return response.content.decode("utf-8")
+        Args:
+            backend: Backend to load from.
 
-        return None
+        Returns:
+            Dict mapping source paths to their non-empty content.
+        """
+        if not self.sources:
+            return {}
+        contents, stale = self._cached_contents(backend, await backend.afile_etags(self.sources))
+        if not stale:
+            return contents
+        responses = await backend.adownload_files([path for path, _, _ in stale])
+        return self._merge_downloads(contents, stale, responses)
 
     def before_agent(self, state: MemoryState, runtime: Runtime, config: RunnableConfig) -> MemoryStateUpdate | None:
         """Load memory content before agent execution (synchronous).
 
-        Loads memory from all configured sources and stores in state.
-        Only loads if not already present in state.
+        Loads memory from all configured sources and stores in state. Runs on
+        every turn, so edits made since the last turn reach the thread; unchanged
+        files are served from the cache without downloading them.
 
         Args:
             state: Current agent state.
@@ -312,28 +532,20 @@ class MemoryMiddleware(AgentMiddleware):
             config: Runnable config.
 
         Returns:
-            State update with memory_contents populated.
+            State update with memory_contents populated, or None if it is unchanged.
         """
-        # Skip if already loaded
-        if "memory_contents" in state:
-            return None
-
         backend = self._get_backend(state, runtime, config)
-        contents: dict[str, str] = {}
-
-        for path in self.sources:
-            content = self._load_memory_from_backend_sync(backend, path)
-            if content:
-                contents[path] = content
-                logger.debug(f"Loaded memory from: {path}")
-
+        contents = self._load_contents(backend)
+        if state.get("memory_contents") == contents:
+            return None
         return MemoryStateUpdate(memory_contents=contents)
 
     async def abefore_agent(self, state: MemoryState, runtime: Runtime, config: RunnableConfig) -> MemoryStateUpdate | None:
         """Load memory content before agent execution.
 
-        Loads memory from all configured sources and stores in state.
-        Only loads if not already present in state.
+        Loads memory from all configured sources and stores in state. Runs on
+        every turn, so edits made since the last turn reach the thread; unchanged
+        files are served from the cache without downloading them.
 
         Args:
             state: Current agent state.
@@ -341,21 +553,12 @@ class MemoryMiddleware(AgentMiddleware):
             config: Runnable config.
 
         Returns:
-            State update with memory_contents populated.
+            State update with memory_contents populated, or None if it is unchanged.
         """
-        # Skip if already loaded
-        if "memory_contents" in state:
-            return None
-
         backend = self._get_backend(state, runtime, config)
-        contents: dict[str, str] = {}
-
-        for path in self.sources:
-            content = await self._load_memory_from_backend(backend, path)
-            if content:
-                contents[path] = content
-                logger.debug(f"Loaded memory from: {path}")
-
+        contents = await self._aload_contents(backend)
+        if state.get("memory_contents") == contents:
+            return None
         return MemoryStateUpdate(memory_contents=contents)
 
     def modify_request(self, request: ModelRequest) -> ModelRequest:
@@ -368,9 +571,16 @@ class MemoryMiddleware(AgentMiddleware):
             Modified request with memory injected into system message.
         """
         contents = request.state.get("memory_contents", {})
-        agent_memory = self._format_agent_memory(contents)
+        query = next((message.text for message in reversed(request.messages) if message.type == "human"), "")
+        selected = self._select_sections(contents, query)
+        agent_memory = PROMPT_FRAGMENTS.render(
+            "memory",
+            (tuple(self.sources), tuple(contents.items()), selected),
+            lambda: self._format_agent_memory(contents) if selected is None else self._format_selected_memory(contents, selected),
+        )
 
-        new_system_message = append_to_system_message(request.system_message, agent_memory)
+        # Memory files can be edited mid-conversation, so the section goes after stable ones
+        new_system_message = PROMPT_FRAGMENTS.append(request.system_message, agent_memory, volatile=True)
 
         return request.override(system_message=new_system_message)
 
@@ -407,3 +617,49 @@ class MemoryMiddleware(AgentMiddleware):
         """
         modified_request = self.modify_request(request)
         return await handler(modified_request)
+
+    def _invalidate_written_memory(self, request: ToolCallRequest) -> None:
+        """Drop the cache entry of a memory file the tool call wrote to."""
+        tool_call = request.tool_call
+        if tool_call["name"] in _MEMORY_WRITE_TOOLS:
+            path = tool_call["args"].get("file_path")
+            if path in self.sources:
+                _MEMORY_CACHE.invalidate(path)
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Invalidate cached memory files written by `write_file` or `edit_file`.
+
+        Args:
+            request: The tool call request being processed.
+            handler: The handler function to call with the request.
+
+        Returns:
+            The tool result from the handler.
+        """
+        try:
+            return handler(request)
+        finally:
+            self._invalidate_written_memory(request)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """(async)Invalidate cached memory files written by `write_file` or `edit_file`.
+
+        Args:
+            request: The tool call request being processed.
+            handler: The handler function to call with the request.
+
+        Returns:
+            The tool result from the handler.
+        """
+        try:
+            return await handler(request)
+        finally:
+            self._invalidate_written_memory(request)
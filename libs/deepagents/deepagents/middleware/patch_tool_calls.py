@@ -4,41 +4,57 @@ from typing import Any
 
 from langchain.agents.middleware import AgentMiddleware, AgentState
 from langchain_core.messages import ToolMessage
+from langchain_core.messages.tool import ToolCall
 from langgraph.runtime import Runtime
 from langgraph.types import Overwrite
 
 
+def _cancelled_tool_message(tool_call: ToolCall) -> ToolMessage:
+    """Build the `ToolMessage` that answers a tool call which never completed."""
+    return ToolMessage(
+        content=f"Tool call {tool_call['name']} with id {tool_call['id']} was cancelled - another message came in before it could be completed.",
+        name=tool_call["name"],
+        tool_call_id=tool_call["id"],
+    )
+
+
 class PatchToolCallsMiddleware(AgentMiddleware):
     """Middleware to patch dangling tool calls in the messages history."""
 
     def before_agent(self, state: AgentState, runtime: Runtime[Any]) -> dict[str, Any] | None:  # noqa: ARG002
-        """Before the agent runs, handle dangling tool calls from any AIMessage."""
+        """Before the agent runs, handle dangling tool calls from any AIMessage.
+
+        Returns `None` when every tool call has a `ToolMessage` after it, so the
+        messages channel is left untouched.
+        """
         messages = state["messages"]
-        if not messages or len(messages) == 0:
+        if not messages:
+            return None
+
+        # Walk backwards so `answered` holds the tool calls answered after each message
+        answered: set[str | None] = set()
+        dangling: dict[int, list[ToolCall]] = {}
+        for i in range(len(messages) - 1, -1, -1):
+            msg = messages[i]
+            if msg.type == "tool":
+                answered.add(msg.tool_call_id)
+            elif msg.type == "ai" and msg.tool_calls:
+                missing = [tool_call for tool_call in msg.tool_calls if tool_call["id"] not in answered]
+                if missing:
+                    dangling[i] = missing
+
+        if not dangling:
             return None
 
+        # Dangling calls at the end of the history (followed only by their other
+        # results) are patched by appending; anywhere else the patches must be
+        # inserted mid-history, which needs the whole list rewritten.
+        first = min(dangling)
+        if all(msg.type == "tool" for msg in messages[first + 1 :]):
+            return {"messages": [_cancelled_tool_message(tool_call) for tool_call in dangling[first]]}
+
         patched_messages = []
-        # Iterate over the messages and add any dangling tool calls
         for i, msg in enumerate(messages):
             patched_messages.append(msg)
-            if msg.type == "ai" and msg.tool_calls:
-                for tool_call in msg.tool_calls:
-                    corresponding_tool_msg = next(
-                        (msg for msg in messages[i:] if msg.type == "tool" and msg.tool_call_id == tool_call["id"]),
-                        None,
-                    )
-                    if corresponding_tool_msg is None:
-                        # We have a dangling tool call which needs a ToolMessage
-                        tool_msg = (
-                            f"Tool call {tool_call['name']} with id {tool_call['id']} was "
-                            "cancelled - another message came in before it could be completed."
-                        )
-                        patched_messages.append(
-                            ToolMessage(
-                                content=tool_msg,
-                                name=tool_call["name"],
-                                tool_call_id=tool_call["id"],
-                            )
-                        )
-
+            patched_messages.extend(_cancelled_tool_message(tool_call) for tool_call in dangling.get(i, ()))
         return {"messages": Overwrite(patched_messages)}
@@ -0,0 +1,143 @@
+"""Cached, stable-ordered system prompt fragments.
+
+Several middleware append a section to the system message on every model call
+(filesystem and subagent instructions, memory, skills, ...). Provider prompt
+caching (e.g. `AnthropicPromptCachingMiddleware`) only hits when the start of
+the prompt is byte-identical to the previous call, so the sections should be
+cheap to rebuild and a section that changes should not shift the ones that don't.
+
+`PromptFragmentCache` handles both. Each fragment is rendered once per distinct
+input key, and fragments marked `volatile` (content that can change between
+turns, like memory files) always come after the stable ones, whatever order the
+middleware run in.
+
+```python
+from deepagents.middleware.prompt_fragments import PROMPT_FRAGMENTS
+
+text = PROMPT_FRAGMENTS.render("memory", tuple(contents.items()), lambda: format_memory(contents))
+system_message = PROMPT_FRAGMENTS.append(request.system_message, text, volatile=True)
+```
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from langchain_core.messages import SystemMessage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+_SEPARATOR = "\n\n"
+
+
+@dataclass
+class PromptFragmentStats:
+    """Snapshot of a `PromptFragmentCache`'s effectiveness."""
+
+    hits: int
+    """Fragments served from the cache without rendering."""
+
+    misses: int
+    """Fragments that had to be rendered."""
+
+
+class PromptFragmentCache:
+    """Renders system prompt fragments once per input and keeps their order cache-friendly."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_entries: Rendered fragments (and known volatile texts) to keep.
+        """
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._rendered: OrderedDict[tuple[str, Hashable], str] = OrderedDict()
+        self._volatile_texts: OrderedDict[str, None] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def render(self, name: str, key: Hashable, render: Callable[[], str]) -> str:
+        """Return the fragment `name` for `key`, calling `render` only on a cache miss.
+
+        Args:
+            name: Fragment name, e.g. `"memory"`.
+            key: Hashable summary of everything the fragment's text depends on.
+            render: Builds the fragment's text.
+
+        Returns:
+            The rendered fragment.
+        """
+        cache_key = (name, key)
+        with self._lock:
+            text = self._rendered.get(cache_key)
+            if text is not None:
+                self._rendered.move_to_end(cache_key)
+                self._hits += 1
+                return text
+        text = render()
+        with self._lock:
+            self._misses += 1
+            self._rendered[cache_key] = text
+            if len(self._rendered) > self._max_entries:
+                self._rendered.popitem(last=False)
+        return text
+
+    def append(
+        self,
+        system_message: SystemMessage | None,
+        text: str,
+        *,
+        volatile: bool = False,
+    ) -> SystemMessage:
+        """Add a fragment to a system message.
+
+        Stable fragments are inserted before the first volatile fragment already in
+        the message; volatile ones are appended at the end.
+
+        Args:
+            system_message: Existing system message or `None`.
+            text: The fragment, usually from `render`.
+            volatile: Whether the fragment can change between turns of a conversation.
+
+        Returns:
+            New `SystemMessage` containing the fragment.
+        """
+        blocks: list[dict[str, str]] = [dict(block) for block in system_message.content_blocks] if system_message else []
+        with self._lock:
+            if volatile:
+                self._volatile_texts[text] = None
+                self._volatile_texts.move_to_end(text)
+                if len(self._volatile_texts) > self._max_entries:
+                    self._volatile_texts.popitem(last=False)
+                position = len(blocks)
+            else:
+                position = next(
+                    (
+                        i
+                        for i, block in enumerate(blocks)
+                        if block.get("type") == "text" and block.get("text", "").removeprefix(_SEPARATOR) in self._volatile_texts
+                    ),
+                    len(blocks),
+                )
+
+        if position == 0 and blocks:
+            # The volatile block that was first now follows the new one
+            blocks[0]["text"] = _SEPARATOR + blocks[0]["text"]
+        blocks.insert(position, {"type": "text", "text": _SEPARATOR + text if position else text})
+        return SystemMessage(content=blocks)
+
+    def stats(self) -> PromptFragmentStats:
+        """Return the cache's hit and miss counts."""
+        with self._lock:
+            return PromptFragmentStats(hits=self._hits, misses=self._misses)
+
+
+PROMPT_FRAGMENTS = PromptFragmentCache()
+"""Cache shared by the built-in middleware, so they agree on which fragments are volatile."""
+
+__all__ = ["PROMPT_FRAGMENTS", "PromptFragmentCache", "PromptFragmentStats"]
@@ -86,20 +86,39 @@ middleware = SkillsMiddleware(
     ],
 )
 ```
+
+## Caching
+
+Parsed `SkillMetadata` is cached by what serves the file (store namespace,
+filesystem root or sandbox id, after `CompositeBackend` routing), the SKILL.md
+path and the backend's `file_etags` (size and mtime, or the store timestamp),
+so a new thread only lists each source and downloads the SKILL.md files that
+changed. Sources are loaded concurrently by `abefore_agent`. By default the cache lives in the process; pass a
+`SkillMetadataCache` backed by a LangGraph `BaseStore` to share it across processes:
+
+```python
+SkillsMiddleware(backend=backend, sources=sources, metadata_cache=SkillMetadataCache(store=store))
+```
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
 from pathlib import PurePosixPath
-from typing import TYPE_CHECKING, Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import yaml
 from langchain.agents.middleware.types import PrivateStateAttr
 
 if TYPE_CHECKING:
-    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol
+    from langgraph.store.base import BaseStore
+
+    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol, FileDownloadResponse, FileInfo
 
 from collections.abc import Awaitable, Callable
 from typing import NotRequired, TypedDict
@@ -113,8 +132,13 @@ from langchain.agents.middleware.types import (
 from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import ToolRuntime
 from langgraph.runtime import Runtime
+from langgraph.store.base import GetOp, PutOp
 
-from deepagents.middleware._utils import append_to_system_message
+from deepagents.backends.composite import CompositeBackend
+from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.protocol import SandboxBackendProtocol
+from deepagents.backends.store import StoreBackend
+from deepagents.middleware.prompt_fragments import PROMPT_FRAGMENTS
 
 logger = logging.getLogger(__name__)
 
@@ -281,11 +305,218 @@ def _parse_skill_metadata(
     )
 
 
-def _list_skills(backend: BackendProtocol, source_path: str) -> list[SkillMetadata]:
+class SkillMetadataCache:
+    """Cache of parsed SKILL.md metadata, keyed by backend, file path and version tag.
+
+    Entries are looked up by what serves the SKILL.md, its path and the backend's
+    `file_etags` for it, so a changed file simply misses the cache. Files whose
+    backend reports no tag or has no stable identity are never cached. Entries are kept in memory and, if a
+    `store` is given, written through to it so other processes can reuse them. The store holds one entry per
+    file, overwritten when the file changes, so it does not grow with every edit.
+    """
+
+    def __init__(
+        self,
+        store: BaseStore | None = None,
+        *,
+        namespace: tuple[str, ...] = ("deepagents", "skill_metadata"),
+        max_entries: int = 4096,
+    ) -> None:
+        """Create a cache.
+
+        Args:
+            store: Optional store shared with other processes.
+            namespace: Store namespace for the entries.
+            max_entries: Entries to keep in memory.
+        """
+        self._store = store
+        self._namespace = namespace
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, SkillMetadata | None] = OrderedDict()
+
+    @staticmethod
+    def key(backend_id: str, path: str, etag: str) -> str:
+        """Return the cache key of a SKILL.md file at a version.
+
+        Args:
+            backend_id: What serves the file, from `_backend_identity`.
+            path: SKILL.md path.
+            etag: The backend's `file_etags` entry for the file.
+
+        Returns:
+            `"<file>:<version>"`, where the part before the colon names the file and
+            is its key in the store.
+        """
+        file_key = hashlib.sha256(f"{backend_id}\0{path}".encode()).hexdigest()
+        return f"{file_key}:{hashlib.sha256(etag.encode()).hexdigest()}"
+
+    @staticmethod
+    def _store_key(key: str) -> str:
+        """Return the store key of a cache key: the file part, shared by all of its versions."""
+        return key.partition(":")[0]
+
+    def _get_local(self, keys: list[str]) -> tuple[dict[str, SkillMetadata | None], list[str]]:
+        """Split `keys` into in-memory hits and misses."""
+        hits: dict[str, SkillMetadata | None] = {}
+        misses: list[str] = []
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    hits[key] = self._entries[key]
+                else:
+                    misses.append(key)
+        return hits, misses
+
+    def _put_local(self, entries: dict[str, SkillMetadata | None]) -> None:
+        with self._lock:
+            for key, metadata in entries.items():
+                self._entries[key] = metadata
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _merge_store_items(self, hits: dict[str, SkillMetadata | None], keys: list[str], items: list[Any]) -> None:
+        """Add entries found in the store to `hits` and to memory, ignoring other versions of the file."""
+        found = {key: item.value.get("metadata") for key, item in zip(keys, items, strict=True) if item is not None and item.value.get("key") == key}
+        self._put_local(found)
+        hits.update(found)
+
+    def get_many(self, keys: list[str]) -> dict[str, SkillMetadata | None]:
+        """Return the cached entries among `keys`; `None` values are files that failed to parse."""
+        hits, misses = self._get_local(keys)
+        if misses and self._store is not None:
+            self._merge_store_items(hits, misses, self._store.batch([GetOp(self._namespace, self._store_key(key)) for key in misses]))
+        return hits
+
+    async def aget_many(self, keys: list[str]) -> dict[str, SkillMetadata | None]:
+        """Async version of `get_many`."""
+        hits, misses = self._get_local(keys)
+        if misses and self._store is not None:
+            self._merge_store_items(hits, misses, await self._store.abatch([GetOp(self._namespace, self._store_key(key)) for key in misses]))
+        return hits
+
+    def _put_ops(self, entries: dict[str, SkillMetadata | None]) -> list[PutOp]:
+        """Store operations that replace each file's entry with its latest version."""
+        return [PutOp(self._namespace, self._store_key(key), {"key": key, "metadata": metadata}) for key, metadata in entries.items()]
+
+    def put_many(self, entries: dict[str, SkillMetadata | None]) -> None:
+        """Cache parsed metadata (or `None` for files that failed to parse)."""
+        if not entries:
+            return
+        self._put_local(entries)
+        if self._store is not None:
+            self._store.batch(self._put_ops(entries))
+
+    async def aput_many(self, entries: dict[str, SkillMetadata | None]) -> None:
+        """Async version of `put_many`."""
+        if not entries:
+            return
+        self._put_local(entries)
+        if self._store is not None:
+            await self._store.abatch(self._put_ops(entries))
+
+
+_SKILL_METADATA_CACHE = SkillMetadataCache()
+"""Process-wide cache used when `SkillsMiddleware` is not given one."""
+
+
+def _backend_identity(backend: BackendProtocol, path: str) -> str | None:
+    """Return a stable name for what serves `path`, or `None` if its files must not be cached.
+
+    Cache entries may be shared across processes through a store, so the name is
+    built from what the backend serves rather than the instance: a
+    `CompositeBackend` resolves the path to the backend it routes to, a
+    `StoreBackend` is named by its namespace, a `FilesystemBackend` by its root
+    directory and a sandbox by its id. Files of other backends are not cached.
+    """
+    if isinstance(backend, CompositeBackend):
+        routed, routed_path = backend._get_backend_and_key(path)
+        identity = _backend_identity(routed, routed_path)
+        return None if identity is None else f"{identity}\0{routed_path}"
+    if isinstance(backend, StoreBackend):
+        return "store:" + "/".join(backend._get_namespace())
+    if isinstance(backend, FilesystemBackend):
+        return f"filesystem:{backend.cwd}:{'virtual' if backend.virtual_mode else 'absolute'}"
+    if isinstance(backend, SandboxBackendProtocol):
+        return f"sandbox:{backend.id}"
+    return None
+
+
+def _cache_keys(backend: BackendProtocol, paths: list[str], etags: list[str | None]) -> list[str | None]:
+    """Return the cache key of each SKILL.md file, or `None` for files that are not cached."""
+    keys: list[str | None] = []
+    for path, etag in zip(paths, etags, strict=True):
+        backend_id = None if etag is None else _backend_identity(backend, path)
+        keys.append(None if backend_id is None or etag is None else SkillMetadataCache.key(backend_id, path, etag))
+    return keys
+
+
+def _skill_md_paths(items: list[FileInfo]) -> list[tuple[str, str]]:
+    """Return `(skill_dir_path, skill_md_path)` for every directory in a source listing."""
+    # Construct SKILL.md paths using PurePosixPath for safe, standardized path operations
+    return [(item["path"], str(PurePosixPath(item["path"]) / "SKILL.md")) for item in items if item.get("is_dir")]
+
+
+def _parse_downloaded_skill(skill_dir_path: str, skill_md_path: str, response: FileDownloadResponse) -> SkillMetadata | None:
+    """Parse a downloaded SKILL.md, or return None if it is missing or invalid."""
+    if response.content is None:
+        logger.warning("Downloaded skill file %s has no content", skill_md_path)
+        return None
+
+    try:
+        content = response.content.decode("utf-8")
+    except UnicodeDecodeError as e:
+        logger.warning("Error decoding %s: %s", skill_md_path, e)
+        return None
+
+    # Extract directory name from path using PurePosixPath
+    return _parse_skill_metadata(
+        content=content,
+        skill_path=skill_md_path,
+        directory_name=PurePosixPath(skill_dir_path).name,
+    )
+
+
+def _cache_lookup(
+    skill_md_paths: list[tuple[str, str]],
+    keys: list[str | None],
+    hits: dict[str, SkillMetadata | None],
+) -> tuple[list[tuple[int, str, str, str | None]], dict[int, SkillMetadata | None]]:
+    """Split skills into the `(position, dir, SKILL.md, key)` to download and the cached metadata by position."""
+    cached: dict[int, SkillMetadata | None] = {}
+    stale: list[tuple[int, str, str, str | None]] = []
+    for i, ((skill_dir_path, skill_md_path), key) in enumerate(zip(skill_md_paths, keys, strict=True)):
+        if key is not None and key in hits:
+            cached[i] = hits[key]
+        else:
+            stale.append((i, skill_dir_path, skill_md_path, key))
+    return stale, cached
+
+
+def _parse_downloads(
+    stale: list[tuple[int, str, str, str | None]],
+    responses: list[FileDownloadResponse],
+    cached: dict[int, SkillMetadata | None],
+) -> dict[str, SkillMetadata | None]:
+    """Parse downloaded SKILL.md files into `cached`; return the new cache entries."""
+    new_entries: dict[str, SkillMetadata | None] = {}
+    for (i, skill_dir_path, skill_md_path, key), response in zip(stale, responses, strict=True):
+        if response.error:
+            # Skill doesn't have a SKILL.md, skip it
+            continue
+        cached[i] = _parse_downloaded_skill(skill_dir_path, skill_md_path, response)
+        if key is not None:
+            new_entries[key] = cached[i]
+    return new_entries
+
+
+def _list_skills(backend: BackendProtocol, source_path: str, cache: SkillMetadataCache | None = None) -> list[SkillMetadata]:
     """List all skills from a backend source.
 
-    Scans backend for subdirectories containing SKILL.md files, downloads their content,
-    parses YAML frontmatter, and returns skill metadata.
+    Scans backend for subdirectories containing SKILL.md files, downloads the ones
+    not found in `cache`, parses YAML frontmatter, and returns skill metadata.
 
     Expected structure:
         source_path/
@@ -296,71 +527,32 @@ def _list_skills(backend: BackendProtocol, source_path: str) -> list[SkillMetada
     Args:
         backend: Backend instance to use for file operations
         source_path: Path to the skills directory in the backend
+        cache: Parsed metadata cache; defaults to the process-wide one
 
     Returns:
         List of skill metadata from successfully parsed SKILL.md files
     """
-    base_path = source_path
-
-    skills: list[SkillMetadata] = []
-    items = backend.ls_info(base_path)
-    # Find all skill directories (directories containing SKILL.md)
-    skill_dirs = []
-    for item in items:
-        if not item.get("is_dir"):
-            continue
-        skill_dirs.append(item["path"])
-
-    if not skill_dirs:
+    cache = cache or _SKILL_METADATA_CACHE
+    skill_md_paths = _skill_md_paths(backend.ls_info(source_path))
+    if not skill_md_paths:
         return []
 
-    # For each skill directory, check if SKILL.md exists and download it
-    skill_md_paths = []
-    for skill_dir_path in skill_dirs:
-        # Construct SKILL.md path using PurePosixPath for safe, standardized path operations
-        skill_dir = PurePosixPath(skill_dir_path)
-        skill_md_path = str(skill_dir / "SKILL.md")
-        skill_md_paths.append((skill_dir_path, skill_md_path))
-
-    paths_to_download = [skill_md_path for _, skill_md_path in skill_md_paths]
-    responses = backend.download_files(paths_to_download)
-
-    # Parse each downloaded SKILL.md
-    for (skill_dir_path, skill_md_path), response in zip(skill_md_paths, responses, strict=True):
-        if response.error:
-            # Skill doesn't have a SKILL.md, skip it
-            continue
-
-        if response.content is None:
-            logger.warning("Downloaded skill file %s has no content", skill_md_path)
-            continue
-
-        try:
-            content = response.content.decode("utf-8")
-        except UnicodeDecodeError as e:
-            logger.warning("Error decoding %s: %s", skill_md_path, e)
-            continue
-
-        # Extract directory name from path using PurePosixPath
-        directory_name = PurePosixPath(skill_dir_path).name
+    paths = [skill_md_path for _, skill_md_path in skill_md_paths]
+    keys = _cache_keys(backend, paths, backend.file_etags(paths))
+    hits = cache.get_many([key for key in keys if key is not None])
+    stale, cached = _cache_lookup(skill_md_paths, keys, hits)
+    if stale:
+        responses = backend.download_files([skill_md_path for _, _, skill_md_path, _ in stale])
+        cache.put_many(_parse_downloads(stale, responses, cached))
 
-        # Parse metadata
-        skill_metadata = _parse_skill_metadata(
-            content=content,
-            skill_path=skill_md_path,
-            directory_name=directory_name,
-        )
-        if skill_metadata:
-            skills.append(skill_metadata)
-
-    return skills
+    return [metadata for _, metadata in sorted(cached.items()) if metadata]
 
 
-async def _alist_skills(backend: BackendProtocol, source_path: str) -> list[SkillMetadata]:
+async def _alist_skills(backend: BackendProtocol, source_path: str, cache: SkillMetadataCache | None = None) -> list[SkillMetadata]:
     """List all skills from a backend source (async version).
 
-    Scans backend for subdirectories containing SKILL.md files, downloads their content,
-    parses YAML frontmatter, and returns skill metadata.
+    Scans backend for subdirectories containing SKILL.md files, downloads the ones
+    not found in `cache`, parses YAML frontmatter, and returns skill metadata.
 
     Expected structure:
         source_path/
@@ -371,64 +563,25 @@ async def _alist_skills(backend: BackendProtocol, source_path: str) -> list[Skil
     Args:
         backend: Backend instance to use for file operations
         source_path: Path to the skills directory in the backend
+        cache: Parsed metadata cache; defaults to the process-wide one
 
     Returns:
         List of skill metadata from successfully parsed SKILL.md files
     """
-    base_path = source_path
-
-    skills: list[SkillMetadata] = []
-    items = await backend.als_info(base_path)
-    # Find all skill directories (directories containing SKILL.md)
-    skill_dirs = []
-    for item in items:
-        if not item.get("is_dir"):
-            continue
-        skill_dirs.append(item["path"])
-
-    if not skill_dirs:
+    cache = cache or _SKILL_METADATA_CACHE
+    skill_md_paths = _skill_md_paths(await backend.als_info(source_path))
+    if not skill_md_paths:
         return []
 
-    # For each skill directory, check if SKILL.md exists and download it
-    skill_md_paths = []
-    for skill_dir_path in skill_dirs:
-        # Construct SKILL.md path using PurePosixPath for safe, standardized path operations
-        skill_dir = PurePosixPath(skill_dir_path)
-        skill_md_path = str(skill_dir / "SKILL.md")
-        skill_md_paths.append((skill_dir_path, skill_md_path))
+    paths = [skill_md_path for _, skill_md_path in skill_md_paths]
+    keys = _cache_keys(backend, paths, await backend.afile_etags(paths))
+    hits = await cache.aget_many([key for key in keys if key is not None])
+    stale, cached = _cache_lookup(skill_md_paths, keys, hits)
+    if stale:
+        responses = await backend.adownload_files([skill_md_path for _, _, skill_md_path, _ in stale])
+        await cache.aput_many(_parse_downloads(stale, responses, cached))
 
-    paths_to_download = [skill_md_path for _, skill_md_path in skill_md_paths]
-    responses = await backend.adownload_files(paths_to_download)
-
-    # Parse each downloaded SKILL.md
-    for (skill_dir_path, skill_md_path), response in zip(skill_md_paths, responses, strict=True):
-        if response.error:
-            # Skill doesn't have a SKILL.md, skip it
-            continue
-
-        if response.content is None:
-            logger.warning("Downloaded skill file %s has no content", skill_md_path)
-            continue
-
-        try:
-            content = response.content.decode("utf-8")
-        except UnicodeDecodeError as e:
-            logger.warning("Error decoding %s: %s", skill_md_path, e)
-            continue
-
-        # Extract directory name from path using PurePosixPath
-        directory_name = PurePosixPath(skill_dir_path).name
-
-        # Parse metadata
-        skill_metadata = _parse_skill_metadata(
-            content=content,
-            skill_path=skill_md_path,
-            directory_name=directory_name,
-        )
-        if skill_metadata:
-            skills.append(skill_metadata)
-
-    return skills
+    return [metadata for _, metadata in sorted(cached.items()) if metadata]
 
 
 SKILLS_SYSTEM_PROMPT = """
@@ -498,20 +651,31 @@ class SkillsMiddleware(AgentMiddleware):
     Args:
         backend: Backend instance for file operations
         sources: List of skill source paths. Source names are derived from the last path component.
+        metadata_cache: Cache of parsed skill metadata. Defaults to a process-wide cache.
     """
 
     state_schema = SkillsState
 
-    def __init__(self, *, backend: BACKEND_TYPES, sources: list[str]) -> None:
+    def __init__(
+        self,
+        *,
+        backend: BACKEND_TYPES,
+        sources: list[str],
+        metadata_cache: SkillMetadataCache | None = None,
+    ) -> None:
         """Initialize the skills middleware.
 
         Args:
             backend: Backend instance or factory function that takes runtime and returns a backend.
                      Use a factory for StateBackend: `lambda rt: StateBackend(rt)`
             sources: List of skill source paths (e.g., ["/skills/user/", "/skills/project/"]).
+            metadata_cache: Cache of parsed skill metadata. Pass a `SkillMetadataCache`
+                     with a `store` to share it across processes. Defaults to a
+                     process-wide cache.
         """
         self._backend = backend
         self.sources = sources
+        self._metadata_cache = metadata_cache or _SKILL_METADATA_CACHE
         self.system_prompt_template = SKILLS_SYSTEM_PROMPT
 
     def _get_backend(self, state: SkillsState, runtime: Runtime, config: RunnableConfig) -> BackendProtocol:
@@ -576,15 +740,19 @@ class SkillsMiddleware(AgentMiddleware):
             New model request with skills documentation injected into system message
         """
         skills_metadata = request.state.get("skills_metadata", [])
-        skills_locations = self._format_skills_locations()
-        skills_list = self._format_skills_list(skills_metadata)
-
-        skills_section = self.system_prompt_template.format(
-            skills_locations=skills_locations,
-            skills_list=skills_list,
+        skills_key = tuple((s["name"], s["description"], s["path"], tuple(s["allowed_tools"] or ())) for s in skills_metadata)
+        skills_section = PROMPT_FRAGMENTS.render(
+            "skills",
+            (self.system_prompt_template, tuple(self.sources), skills_key),
+            lambda: self.system_prompt_template.format(
+                skills_locations=self._format_skills_locations(),
+                skills_list=self._format_skills_list(skills_metadata),
+            ),
         )
 
-        new_system_message = append_to_system_message(request.system_message, skills_section)
+        # The skills list is read from state and may differ between threads, so the
+        # section goes after the ones that are the same for every request
+        new_system_message = PROMPT_FRAGMENTS.append(request.system_message, skills_section, volatile=True)
 
         return request.override(system_message=new_system_message)
 
@@ -616,7 +784,7 @@ class SkillsMiddleware(AgentMiddleware):
         # Load skills from each source in order
         # Later sources override earlier ones (last one wins)
         for source_path in self.sources:
-            source_skills = _list_skills(backend, source_path)
+            source_skills = _list_skills(backend, source_path, self._metadata_cache)
             for skill in source_skills:
                 all_skills[skill["name"]] = skill
 
@@ -648,10 +816,10 @@ class SkillsMiddleware(AgentMiddleware):
         backend = self._get_backend(state, runtime, config)
         all_skills: dict[str, SkillMetadata] = {}
 
-        # Load skills from each source in order
+        # Load all sources concurrently, then merge in order
         # Later sources override earlier ones (last one wins)
-        for source_path in self.sources:
-            source_skills = await _alist_skills(backend, source_path)
+        results = await asyncio.gather(*(_alist_skills(backend, source_path, self._metadata_cache) for source_path in self.sources))
+        for source_skills in results:
             for skill in source_skills:
                 all_skills[skill["name"]] = skill
 
@@ -693,4 +861,4 @@ class SkillsMiddleware(AgentMiddleware):
         return await handler(modified_request)
 
 
-__all__ = ["SkillMetadata", "SkillsMiddleware"]
+__all__ = ["SkillMetadata", "SkillMetadataCache", "SkillsMiddleware"]
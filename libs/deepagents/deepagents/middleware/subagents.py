@@ -16,7 +16,7 @@ from langchain_core.tools import StructuredTool
 from langgraph.types import Command
 
 from deepagents.backends.protocol import BackendFactory, BackendProtocol
-from deepagents.middleware._utils import append_to_system_message
+from deepagents.middleware.prompt_fragments import PROMPT_FRAGMENTS
 
 
 class SubAgent(TypedDict):
@@ -676,7 +676,7 @@ class SubAgentMiddleware(AgentMiddleware):
     ) -> ModelResponse:
         """Update the system message to include instructions on using subagents."""
         if self.system_prompt is not None:
-            new_system_message = append_to_system_message(request.system_message, self.system_prompt)
+            new_system_message = PROMPT_FRAGMENTS.append(request.system_message, self.system_prompt)
             return handler(request.override(system_message=new_system_message))
         return handler(request)
 
@@ -687,6 +687,6 @@ class SubAgentMiddleware(AgentMiddleware):
     ) -> ModelResponse:
         """(async) Update the system message to include instructions on using subagents."""
         if self.system_prompt is not None:
-            new_system_message = append_to_system_message(request.system_message, self.system_prompt)
+            new_system_message = PROMPT_FRAGMENTS.append(request.system_message, self.system_prompt)
             return await handler(request.override(system_message=new_system_message))
         return await handler(request)
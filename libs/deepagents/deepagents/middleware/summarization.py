@@ -28,15 +28,25 @@ Offloaded messages are stored as markdown at `/conversation_history/{thread_id}.
 
 Each summarization event appends a new section to this file, creating a running log
 of all evicted messages.
+
+With `history_format="jsonl"`, messages are instead stored one JSON record per line at
+`/conversation_history/{thread_id}.jsonl` (with a small `{thread_id}.index.jsonl`
+and a `{thread_id}.search.jsonl` of search terms beside it). The agent gets a
+`read_history` tool that fetches individual messages by index range, tool call id, or
+time window, and a `search_history` tool that ranks them by keyword relevance.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+import threading
 import uuid
 import warnings
+from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Annotated, Any, Literal, cast
 
 from langchain.agents.middleware.summarization import (
     _DEFAULT_MESSAGES_TO_KEEP,
@@ -49,20 +59,86 @@ from langchain.agents.middleware.summarization import (
 from langchain.tools import ToolRuntime
 from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, RemoveMessage, get_buffer_string
 from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.tools import BaseTool, StructuredTool
 from langgraph.config import get_config
 from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from typing_extensions import TypedDict, override
 
+from deepagents.backends.executor import BackendExecutor
+from deepagents.middleware._history import (
+    HistoryIndexEntry,
+    HistoryRecord,
+    HistorySearchIndex,
+    encode_history,
+    encode_index_entry,
+    history_index_path,
+    history_read_ranges,
+    history_search_path,
+    history_unchanged_since,
+    index_history_records,
+    next_history_index,
+    parse_history_index,
+    parse_history_records,
+    parse_numbered_lines,
+    render_history,
+    render_search_hits,
+    select_history_ranges,
+)
+
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from langchain.agents.middleware.types import AgentState
     from langchain.chat_models import BaseChatModel
     from langchain_core.runnables.config import RunnableConfig
     from langgraph.runtime import Runtime
 
-    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol
+    from deepagents.backends.protocol import BACKEND_TYPES, BackendProtocol, WriteResult
 
 logger = logging.getLogger(__name__)
 
+_MAX_TRUNCATION_MARKS = 1024
+"""Conversations whose truncation high-water mark is remembered at once."""
+
+_MAX_SPECULATIVE_SUMMARIES = 64
+"""Conversations that may have a background summary pending at once."""
+
+_READ_HISTORY_LIMIT = 50
+"""Most messages `read_history` returns per call."""
+
+_SEARCH_HISTORY_MAX_K = 20
+"""Most hits `search_history` returns per call."""
+
+_MAX_SEARCH_INDEXES = 64
+"""Conversations whose history search index is kept in memory at once."""
+
+_SEARCH_READ_CHUNK = 2000
+"""Lines of the history or search postings file read per backend call."""
+
+_SEARCH_HIT_GAP = 32
+"""Search hits at most this many lines apart are fetched with a single history read."""
+
+
+def _is_truncated_read(output: str) -> bool:
+    """Return whether `read()` refused a range because the backend would have truncated its output."""
+    return output.startswith("Error:") and "truncated" in output
+
+
+READ_HISTORY_TOOL_DESCRIPTION = """Reads messages from earlier in this conversation that were summarized away.
+
+Messages are numbered from 0 in the order they were offloaded. Select them by one of:
+- `start` / `end`: an index range (end exclusive)
+- `tool_call_id`: the tool call and its result
+- `since` / `until`: ISO 8601 timestamps bounding when the messages were summarized
+
+Call with no arguments for an overview of what is stored. At most 50 messages are returned per call."""
+
+SEARCH_HISTORY_TOOL_DESCRIPTION = """Searches messages from earlier in this conversation that were summarized away.
+
+Ranks offloaded messages by keyword relevance (BM25) and returns a short snippet of each of the top `k`,
+with its message index. Use `read_history` with that index to see a full message.
+Prefer this over reading the history file when looking for a specific detail, such as an error message or file name."""
+
 
 class TruncateArgsSettings(TypedDict, total=False):
     """Settings for truncating large tool arguments in old messages.
@@ -127,6 +203,118 @@ def _compute_summarization_defaults(model: BaseChatModel) -> SummarizationDefaul
     }
 
 
+def _message_fingerprint(msg: AnyMessage) -> int:
+    """Hash a message's content and tool calls to validate truncation high-water marks.
+
+    String tool-call arguments contribute only their length, so fingerprinting a
+    message with a large `write_file` payload stays cheap while still changing
+    when that argument is truncated.
+    """
+    content = msg.content if isinstance(msg.content, str) else repr(msg.content)
+    tool_calls: tuple[Any, ...] = ()
+    if isinstance(msg, AIMessage) and msg.tool_calls:
+        tool_calls = tuple(
+            (tc.get("id"), tc["name"], tuple((k, len(v)) if isinstance(v, str) else (k, repr(v)) for k, v in tc["args"].items()))
+            for tc in msg.tool_calls
+        )
+    return hash((msg.type, content, tool_calls, msg.name, getattr(msg, "tool_call_id", None)))
+
+
+class _TokenCountCache:
+    """Memoized per-message counts for the approximate token counter.
+
+    `count_tokens_approximately` rounds per message, so the count of a list is
+    the sum of its messages' counts (then scaled by reported usage, which is
+    reproduced in `total`). Counts are keyed by message id and a hash of what
+    the counter reads (type, role, name, content, tool calls and tool call id), and only the
+    integer counts are kept, so the cache never holds messages alive and a
+    message edited in place is counted again.
+    """
+
+    def __init__(self, counter: TokenCounter, *, max_entries: int = 20_000) -> None:
+        self._counter = counter
+        self._max_entries = max_entries
+        self._counts: dict[tuple[str | None, int], int] = {}
+
+    @staticmethod
+    def _key(msg: AnyMessage) -> tuple[str | None, int]:
+        # Strings are kept as they are: a str caches its hash, so unchanged content
+        # and tool call args are not rehashed every turn. Fields are read from
+        # `__dict__` because pydantic's fallback for missing attributes is slow.
+        fields = msg.__dict__
+        content = fields["content"]
+        parts: list[Any] = [
+            msg.id,
+            msg.type,
+            fields.get("role"),
+            fields.get("name"),
+            fields.get("tool_call_id"),
+            content if isinstance(content, str) else repr(content),
+        ]
+        for call in fields.get("tool_calls") or ():
+            args = call.get("args", {})
+            parts.extend((call.get("id"), call.get("name"), tuple(args)))
+            parts.extend(v if isinstance(v, str) else repr(v) for v in args.values())
+        return msg.id, hash(tuple(parts))
+
+    def count(self, msg: AnyMessage) -> int:
+        """Return the unscaled token count of a single message."""
+        key = self._key(msg)
+        tokens = self._counts.get(key)
+        if tokens is not None:
+            return tokens
+        tokens = self._counter([msg])
+        if len(self._counts) >= self._max_entries:
+            del self._counts[next(iter(self._counts))]
+        self._counts[key] = tokens
+        return tokens
+
+    def total(self, messages: list[AnyMessage]) -> int:
+        """Return the same total as `count_tokens_approximately(..., use_usage_metadata_scaling=True)`."""
+        total = 0
+        approx_at_last_ai = 0
+        last_ai_total_tokens: int | None = None
+        provider: str | None = None
+        mixed_providers = False
+        for msg in messages:
+            total += self.count(msg)
+            if isinstance(msg, AIMessage):
+                msg_provider = msg.response_metadata.get("model_provider")
+                if provider is None:
+                    provider = msg_provider
+                elif msg_provider != provider:
+                    mixed_providers = True
+                if msg.usage_metadata and isinstance(reported := msg.usage_metadata.get("total_tokens"), int):
+                    last_ai_total_tokens = reported
+                    approx_at_last_ai = total
+
+        if len(messages) > 1 and not mixed_providers and provider is not None and last_ai_total_tokens is not None and approx_at_last_ai > 0:
+            return math.ceil(total * min(1.25, max(1.0, last_ai_total_tokens / approx_at_last_ai)))
+        return total
+
+
+@dataclass
+class _SpeculativeSummary:
+    """A summary generated in the background before `trigger` was reached."""
+
+    message_ids: tuple[str | None, ...]
+    """Ids of the messages being summarized, oldest first."""
+
+    result: Future[str] | asyncio.Task[str]
+    """The pending summary: a worker-thread future (sync) or an event-loop task (async)."""
+
+    def matches(self, messages: list[AnyMessage], cutoff_index: int) -> bool:
+        """Check that the summarized messages are still the start of the partition to summarize."""
+        count = len(self.message_ids)
+        return 0 < count <= cutoff_index and all(msg.id == msg_id for msg, msg_id in zip(messages, self.message_ids, strict=False))
+
+
+def _discard_task_exception(task: asyncio.Task[str]) -> None:
+    """Mark a background summary's failure as retrieved; the caller falls back to summarizing inline."""
+    if not task.cancelled() and (exc := task.exception()) is not None:
+        logger.debug("Background summarization failed: %s", exc)
+
+
 class SummarizationMiddleware(BaseSummarizationMiddleware):
     """Summarization middleware with backend for conversation history offloading."""
 
@@ -142,6 +330,8 @@ class SummarizationMiddleware(BaseSummarizationMiddleware):
         trim_tokens_to_summarize: int | None = _DEFAULT_TRIM_TOKEN_LIMIT,
         history_path_prefix: str = "/conversation_history",
         truncate_args_settings: TruncateArgsSettings | None = None,
+        speculative_trigger: float | None = None,
+        history_format: Literal["markdown", "jsonl"] = "markdown",
         **deprecated_kwargs: Any,
     ) -> None:
         """Initialize summarization middleware with backend support.
@@ -173,6 +363,29 @@ class SummarizationMiddleware(BaseSummarizationMiddleware):
                     # Truncate when 50% of context window reached, ignoring messages in last 10% of window
                     {"trigger": ("fraction", 0.5), "keep": ("fraction", 0.1), "max_length": 2000, "truncation_text": "...(truncated)"}
             history_path_prefix: Path prefix for storing conversation history.
+            speculative_trigger: Fraction of `trigger` at which to start summarizing in the background.
+
+                Once the context reaches this share of every threshold in a `trigger`
+                clause (e.g. `0.8` with `trigger=("tokens", 100000)` starts at 80k
+                tokens), the messages that would be summarized are sent to the
+                summarization model on a worker thread (or an event-loop task when run
+                asynchronously). When `trigger` is reached and those messages are still
+                the oldest part of the history, the summary is adopted instead of
+                blocking the turn on a new model call; the messages that arrived since
+                are kept verbatim. If `None`, summarization only happens inline.
+
+            history_format: How offloaded messages are stored.
+
+                `"markdown"` appends a transcript section per summarization to
+                `{thread_id}.md`. `"jsonl"` writes one JSON record per message to
+                `{thread_id}.jsonl` plus a small `{thread_id}.index.jsonl` and
+                per-message search terms in `{thread_id}.search.jsonl`. The agent gets
+                a `read_history` tool that fetches messages by index range, tool call
+                id, or time window without reading the whole file, and a
+                `search_history` tool that ranks them by keyword relevance.
+
+        Raises:
+            ValueError: If `speculative_trigger` is not between 0 and 1 (exclusive).
 
         Example:
             ```python
@@ -198,6 +411,26 @@ class SummarizationMiddleware(BaseSummarizationMiddleware):
         )
         self._backend = backend
         self._history_path_prefix = history_path_prefix
+        self._history_format = history_format
+        self.tools = [self._create_read_history_tool(), self._create_search_history_tool()] if history_format == "jsonl" else []
+        # Per history file: BM25 index over the messages offloaded so far
+        self._search_indexes: dict[str, HistorySearchIndex] = {}
+        self._search_indexes_lock = threading.Lock()
+
+        # The default counter is additive per message, so counts can be memoized
+        # and totals kept as sums; custom counters are always called directly.
+        self._token_cache = _TokenCountCache(self._partial_token_counter) if token_counter is count_tokens_approximately else None
+        # Per conversation (keyed by first message id): how many leading messages
+        # `_truncate_args` has found clean, and the fingerprint of the last one.
+        self._truncation_marks: dict[str | None, tuple[int, int]] = {}
+
+        if speculative_trigger is not None and not 0 < speculative_trigger < 1:
+            msg = f"speculative_trigger must be between 0 and 1, got {speculative_trigger}"
+            raise ValueError(msg)
+        self._speculative_trigger = speculative_trigger
+        # Per conversation (keyed by first message id): the background summary in flight
+        self._speculative_summaries: dict[str | None, _SpeculativeSummary] = {}
+        self._speculation_executor = BackendExecutor(max_workers=2, name="deepagents-summarizer") if speculative_trigger is not None else None
 
         # Parse truncate_args_settings
         if truncate_args_settings is None:
@@ -273,10 +506,12 @@ class SummarizationMiddleware(BaseSummarizationMiddleware):
         Returns a single file per thread that gets appended to over time.
 
         Returns:
-            Path string like `'/conversation_history/{thread_id}.md'`
+            Path string like `'/conversation_history/{thread_id}.md'`, or
+            `'/conversation_history/{thread_id}.jsonl'` for JSONL history.
         """
         thread_id = self._get_thread_id()
-        return f"{self._history_path_prefix}/{thread_id}.md"
+        extension = "jsonl" if self._history_format == "jsonl" else "md"
+        return f"{self._history_path_prefix}/{thread_id}.{extension}"
 
     def _is_summary_message(self, msg: AnyMessage) -> bool:
         """Check if a message is a previous summarization message.
@@ -323,10 +558,11 @@ class SummarizationMiddleware(BaseSummarizationMiddleware):
             List containing the summary `HumanMessage`.
         """
         if file_path is not None:
+            history_hint = " Use the `read_history` tool to fetch specific messages from it." if self._history_format == "jsonl" else ""
             content = f"""\
 You are in the middle of a conversation that has been summarized.
 
-The full conversation history has been saved to {file_path} should you need to refer back to it for details.
+The full conversation history has been saved to {file_path} should you need to refer back to it for details.{history_hint}
 
 A condensed summary follows:
 
@@ -343,6 +579,183 @@ A condensed summary follows:
             )
         ]
 
+    def _count_tokens(self, messages: list[AnyMessage]) -> int:
+        """Count tokens in messages, reusing memoized per-message counts when possible."""
+        if self._token_cache is None:
+            return self.token_counter(messages)
+        return self._token_cache.total(messages)
+
+    def _count_message_tokens(self, msg: AnyMessage) -> int:
+        """Count tokens in a single message, without usage-metadata scaling."""
+        if self._token_cache is None:
+            return self.token_counter([msg])
+        return self._token_cache.count(msg)
+
+    def _truncation_start(self, messages: list[AnyMessage]) -> int:
+        """Return the index of the first message `_truncate_args` has not processed yet.
+
+        The high-water mark is trusted only if the message it ends at is unchanged,
+        so a rewritten or different history is processed from the start.
+        """
+        if not messages:
+            return 0
+        mark = self._truncation_marks.get(messages[0].id)
+        if mark is None:
+            return 0
+        count, fingerprint = mark
+        if count > len(messages) or _message_fingerprint(messages[count - 1]) != fingerprint:
+            return 0
+        return count
+
+    def _record_truncation_mark(self, messages: list[AnyMessage], count: int) -> None:
+        """Remember that the first `count` messages need no truncation."""
+        if count <= 0:
+            return
+        if len(self._truncation_marks) >= _MAX_TRUNCATION_MARKS:
+            del self._truncation_marks[next(iter(self._truncation_marks))]
+        self._truncation_marks[messages[0].id] = (count, _message_fingerprint(messages[count - 1]))
+
+    def _should_speculate(self, messages: list[AnyMessage], total_tokens: int) -> bool:
+        """Check if the context has reached `speculative_trigger` of any `trigger` clause.
+
+        Mirrors `_should_summarize` with every threshold scaled down, using only the
+        approximate token count.
+        """
+        if self._speculative_trigger is None or not messages or messages[0].id in self._speculative_summaries:
+            return False
+        ratio = self._speculative_trigger
+        for clause in self._trigger_clauses:
+            clause_met = True
+            for kind, value in clause.items():
+                if kind == "fraction":
+                    max_input_tokens = self._get_profile_limits()
+                    threshold = max(int(max_input_tokens * value), 1) if max_input_tokens is not None else None
+                else:
+                    threshold = value
+                measured = len(messages) if kind == "messages" else total_tokens
+                if threshold is None or measured < threshold * ratio:
+                    clause_met = False
+                    break
+            if clause_met:
+                return True
+        return False
+
+    def _start_speculation(self, messages: list[AnyMessage], total_tokens: int) -> list[AnyMessage] | None:
+        """Reserve a background summary slot and return the messages it should summarize.
+
+        Returns:
+            The oldest messages that summarization would evict now, or `None` if no
+            background summary should be started.
+        """
+        if not self._should_speculate(messages, total_tokens):
+            return None
+        cutoff_index = self._determine_cutoff_index(messages)
+        if cutoff_index <= 0:
+            return None
+        if len(self._speculative_summaries) >= _MAX_SPECULATIVE_SUMMARIES:
+            stale = self._speculative_summaries.pop(next(iter(self._speculative_summaries)))
+            stale.result.cancel()
+        return messages[:cutoff_index]
+
+    def _maybe_speculate(self, messages: list[AnyMessage], total_tokens: int) -> None:
+        """Start summarizing in a worker thread if the context is close to `trigger`."""
+        messages_to_summarize = self._start_speculation(messages, total_tokens)
+        if messages_to_summarize is None or self._speculation_executor is None:
+            return
+        self._speculative_summaries[messages[0].id] = _SpeculativeSummary(
+            message_ids=tuple(msg.id for msg in messages_to_summarize),
+            result=self._speculation_executor.submit(self._create_summary, messages_to_summarize),
+        )
+
+    def _amaybe_speculate(self, messages: list[AnyMessage], total_tokens: int) -> None:
+        """Start summarizing in an event-loop task if the context is close to `trigger`."""
+        messages_to_summarize = self._start_speculation(messages, total_tokens)
+        if messages_to_summarize is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._acreate_summary(messages_to_summarize))
+        task.add_done_callback(_discard_task_exception)
+        self._speculative_summaries[messages[0].id] = _SpeculativeSummary(
+            message_ids=tuple(msg.id for msg in messages_to_summarize),
+            result=task,
+        )
+
+    def _pop_speculation(self, messages: list[AnyMessage], cutoff_index: int) -> _SpeculativeSummary | None:
+        """Remove this conversation's background summary and return it if it can still be adopted."""
+        speculation = self._speculative_summaries.pop(messages[0].id, None) if messages else None
+        if speculation is None:
+            return None
+        if not speculation.matches(messages, cutoff_index):
+            speculation.result.cancel()
+            return None
+        return speculation
+
+    def _fitting_speculation(self, messages: list[AnyMessage], speculation: _SpeculativeSummary, summary: str) -> tuple[int, str] | None:
+        """Return `(cutoff_index, summary)` if the background summary brings the context under `trigger`.
+
+        A background summary covers the messages that were evictable when it started.
+        If many arrived since, keeping them all verbatim can leave the context above
+        the trigger, and the summary is discarded in favour of an inline one.
+        """
+        cutoff_index = len(speculation.message_ids)
+        remaining = [HumanMessage(content=summary), *messages[cutoff_index:]]
+        if self._should_summarize(remaining, self._count_tokens(remaining)):
+            return None
+        return cutoff_index, summary
+
+    def _adopt_speculation(self, messages: list[AnyMessage], cutoff_index: int) -> tuple[int, str] | None:
+        """Return the cutoff and text of a usable background summary, waiting for it if needed.
+
+        Returns:
+            `(cutoff_index, summary)` for the background summary, or `None` if there is
+            none, it covers different messages, it failed or was cancelled, or it
+            would leave the context above `trigger`.
+        """
+        speculation = self._pop_speculation(messages, cutoff_index)
+        if speculation is None:
+            return None
+        result = speculation.result
+        # An event-loop task can only be awaited from its own loop
+        if isinstance(result, asyncio.Task) and not result.done():
+            result.cancel()
+            return None
+        # Cancelled, e.g. because the event loop that ran it was shut down
+        if result.cancelled():
+            return None
+        try:
+            summary = result.result()
+        except (Exception, asyncio.CancelledError):  # noqa: BLE001
+            logger.debug("Background summarization failed; summarizing inline", exc_info=True)
+            return None
+        return self._fitting_speculation(messages, speculation, summary)
+
+    async def _aadopt_speculation(self, messages: list[AnyMessage], cutoff_index: int) -> tuple[int, str] | None:
+        """Async version of `_adopt_speculation`."""
+        speculation = self._pop_speculation(messages, cutoff_index)
+        if speculation is None:
+            return None
+        result = speculation.result
+        if isinstance(result, asyncio.Task) and not result.done() and result.get_loop() is not asyncio.get_running_loop():
+            result.cancel()
+            return None
+        if result.cancelled():
+            return None
+        pending = result if isinstance(result, asyncio.Task) else asyncio.wrap_future(result)
+        if not pending.done():
+            # `asyncio.wait` neither raises the summary's own cancellation into this
+            # turn nor hides the cancellation of this turn
+            try:
+                await asyncio.wait({pending})
+            except asyncio.CancelledError:
+                pending.cancel()
+                raise
+        if pending.cancelled():
+            return None
+        if (error := pending.exception()) is not None:
+            logger.debug("Background summarization failed; summarizing inline", exc_info=error)
+            return None
+        summary = pending.result()
+        return self._fitting_speculation(messages, speculation, summary)
+
     def _should_truncate_args(self, messages: list[AnyMessage], total_tokens: int) -> bool:
         """Check if argument truncation should be triggered.
 
@@ -414,7 +827,7 @@ A condensed summary follows:
             # Keep recent messages up to token limit
             tokens_kept = 0
             for i in range(len(messages) - 1, -1, -1):
-                msg_tokens = self.token_counter([messages[i]])
+                msg_tokens = self._count_message_tokens(messages[i])
                 if tokens_kept + msg_tokens > target_token_count:
                     return i + 1
                 tokens_kept += msg_tokens
@@ -460,7 +873,7 @@ A condensed summary follows:
             Tuple of (truncated_messages, modified). If modified is False,
             truncated_messages is the same as input messages.
         """
-        total_tokens = self.token_counter(messages)
+        total_tokens = self._count_tokens(messages)
         if not self._should_truncate_args(messages, total_tokens):
             return messages, False
 
@@ -468,11 +881,16 @@ A condensed summary follows:
         if cutoff_index >= len(messages):
             return messages, False
 
-        # Process messages before the cutoff
-        truncated_messages = []
+        # Messages before the high-water mark were found clean by an earlier pass,
+        # so only the ones that have crossed the cutoff since are examined
+        start_index = self._truncation_start(messages)
+        truncated_messages = messages[:start_index]
         modified = False
+        # The mark only advances over messages that arrived clean: ones truncated
+        # now are confirmed next turn, once the truncated copies are in state
+        clean_through = max(start_index, cutoff_index)
 
-        for i, msg in enumerate(messages):
+        for i, msg in enumerate(messages[start_index:], start_index):
             if i < cutoff_index and isinstance(msg, AIMessage) and msg.tool_calls:
                 # Check if this AIMessage has tool calls we need to truncate
                 truncated_tool_calls = []
@@ -493,11 +911,13 @@ A condensed summary follows:
                     truncated_msg.tool_calls = truncated_tool_calls
                     truncated_messages.append(truncated_msg)
                     modified = True
+                    clean_through = min(clean_through, i)
                 else:
                     truncated_messages.append(msg)
             else:
                 truncated_messages.append(msg)
 
+        self._record_truncation_mark(messages, clean_through)
         return truncated_messages, modified
 
     def _offload_to_backend(
@@ -526,29 +946,15 @@ A condensed summary follows:
         filtered_messages = self._filter_summary_messages(messages)
 
         timestamp = datetime.now(UTC).isoformat()
-        new_section = f"## Summarized at {timestamp}\n\n{get_buffer_string(filtered_messages)}\n\n"
 
-        # Read existing content (if any) and append
-        # Note: We use download_files() instead of read() because read() returns
-        # line-numbered content (for LLM consumption), but edit() expects raw content.
-        existing_content = ""
+        # Append only the new section; backends with native appends never
+        # re-read or rewrite the history accumulated so far.
         try:
-            responses = backend.download_files([path])
-            if responses and responses[0].content is not None and responses[0].error is None:
-                existing_content = responses[0].content.decode("utf-8")
-        except Exception as e:  # noqa: BLE001
-            # File likely doesn't exist yet, but log for observability
-            logger.debug(
-                "Exception reading existing history from %s (treating as new file): %s: %s",
-                path,
-                type(e).__name__,
-                e,
-            )
-
-        combined_content = existing_content + new_section
-
-        try:
-            result = backend.edit(path, existing_content, combined_content) if existing_content else backend.write(path, combined_content)
+            if self._history_format == "jsonl":
+                result = self._append_history_records(backend, path, filtered_messages, timestamp)
+            else:
+                new_section = f"## Summarized at {timestamp}\n\n{get_buffer_string(filtered_messages)}\n\n"
+                result = backend.append(path, new_section)
             if result is None or result.error:
                 error_msg = result.error if result else "backend returned None"
                 logger.warning(
@@ -597,31 +1003,15 @@ A condensed summary follows:
         filtered_messages = self._filter_summary_messages(messages)
 
         timestamp = datetime.now(UTC).isoformat()
-        new_section = f"## Summarized at {timestamp}\n\n{get_buffer_string(filtered_messages)}\n\n"
-
-        # Read existing content (if any) and append
-        # Note: We use adownload_files() instead of aread() because read() returns
-        # line-numbered content (for LLM consumption), but edit() expects raw content.
-        existing_content = ""
-        try:
-            responses = await backend.adownload_files([path])
-            if responses and responses[0].content is not None and responses[0].error is None:
-                existing_content = responses[0].content.decode("utf-8")
-        except Exception as e:  # noqa: BLE001
-            # File likely doesn't exist yet, but log for observability
-            logger.debug(
-                "Exception reading existing history from %s (treating as new file): %s: %s",
-                path,
-                type(e).__name__,
-                e,
-            )
-
-        combined_content = existing_content + new_section
 
+        # Append only the new section; backends with native appends never
+        # re-read or rewrite the history accumulated so far.
         try:
-            result = (
-                await backend.aedit(path, existing_content, combined_content) if existing_content else await backend.awrite(path, combined_content)
-            )
+            if self._history_format == "jsonl":
+                result = await self._aappend_history_records(backend, path, filtered_messages, timestamp)
+            else:
+                new_section = f"## Summarized at {timestamp}\n\n{get_buffer_string(filtered_messages)}\n\n"
+                result = await backend.aappend(path, new_section)
             if result is None or result.error:
                 error_msg = result.error if result else "backend returned None"
                 logger.warning(
@@ -644,6 +1034,263 @@ A condensed summary follows:
             logger.debug("Offloaded %d messages to %s", len(filtered_messages), path)
             return path
 
+    def _append_history_records(
+        self,
+        backend: BackendProtocol,
+        path: str,
+        messages: list[AnyMessage],
+        timestamp: str,
+    ) -> WriteResult:
+        """Append messages as JSONL records and search postings, then record them in the history index.
+
+        An offload that failed after appending its records leaves lines past the
+        last index entry. Each index entry stores the history's etag, so the history
+        is only read back (and those lines indexed first) when it changed after the
+        last entry was written, keeping every message's index equal to its line number.
+        """
+        index_path = history_index_path(path)
+        entries = parse_history_index(backend.download_files([index_path])[0].content)
+        end = next_history_index(entries)
+        orphans: list[HistoryRecord] = []
+        if not history_unchanged_since(entries, backend.file_etags([path])[0]):
+            while True:
+                output = backend.read(path, offset=end, limit=_SEARCH_READ_CHUNK)
+                lines = parse_numbered_lines(output)
+                orphans.extend(parse_history_records(output))
+                end = max(lines, default=end)
+                if len(lines) < _SEARCH_READ_CHUNK:
+                    break
+        appends, entry = self._plan_history_appends(path, messages, timestamp, next_history_index(entries), end, orphans)
+        for target, content in appends:
+            result = backend.append(target, content)
+            if result is None or result.error:
+                return result
+        etag = backend.file_etags([path])[0]
+        if etag is not None:
+            entry["history_etag"] = etag
+        # The index entry goes last: it is what numbers the next offload
+        return backend.append(index_path, encode_index_entry(entry))
+
+    async def _aappend_history_records(
+        self,
+        backend: BackendProtocol,
+        path: str,
+        messages: list[AnyMessage],
+        timestamp: str,
+    ) -> WriteResult:
+        """Append messages as JSONL records and search postings, then record them in the history index (async)."""
+        index_path = history_index_path(path)
+        entries = parse_history_index((await backend.adownload_files([index_path]))[0].content)
+        end = next_history_index(entries)
+        orphans: list[HistoryRecord] = []
+        if not history_unchanged_since(entries, (await backend.afile_etags([path]))[0]):
+            while True:
+                output = await backend.aread(path, offset=end, limit=_SEARCH_READ_CHUNK)
+                lines = parse_numbered_lines(output)
+                orphans.extend(parse_history_records(output))
+                end = max(lines, default=end)
+                if len(lines) < _SEARCH_READ_CHUNK:
+                    break
+        appends, entry = self._plan_history_appends(path, messages, timestamp, next_history_index(entries), end, orphans)
+        for target, content in appends:
+            result = await backend.aappend(target, content)
+            if result is None or result.error:
+                return result
+        etag = (await backend.afile_etags([path]))[0]
+        if etag is not None:
+            entry["history_etag"] = etag
+        # The index entry goes last: it is what numbers the next offload
+        return await backend.aappend(index_path, encode_index_entry(entry))
+
+    @staticmethod
+    def _plan_history_appends(
+        path: str,
+        messages: list[AnyMessage],
+        timestamp: str,
+        start: int,
+        end: int,
+        orphans: list[HistoryRecord],
+    ) -> tuple[list[tuple[str, str]], HistoryIndexEntry]:
+        """Return the appends that store `messages` at line `end`, and the index entry to write after them.
+
+        Lines `start` to `end` were left unindexed by an interrupted offload; their
+        postings and index entry are appended first.
+        """
+        search_path = history_search_path(path)
+        appends: list[tuple[str, str]] = []
+        if end > start:
+            postings, orphan_entry = index_history_records(orphans, start, end - start, orphans[0]["timestamp"] if orphans else timestamp)
+            appends += [(search_path, postings), (history_index_path(path), encode_index_entry(orphan_entry))]
+        records, postings, entry = encode_history(messages, end, timestamp)
+        appends += [(path, records), (search_path, postings)]
+        return appends, entry
+
+    def _get_tool_backend(self, runtime: ToolRuntime) -> BackendProtocol:
+        """Resolve the backend from inside a tool call."""
+        if callable(self._backend):
+            return self._backend(runtime)
+        return self._backend
+
+    def _create_read_history_tool(self) -> BaseTool:
+        """Create the read_history tool for JSONL history."""
+
+        def overview(index: list[HistoryIndexEntry], path: str) -> str:
+            if not index:
+                return f"No messages have been offloaded to {path} yet."
+            events = "\n".join(f"- messages {e['start']}-{e['start'] + e['count'] - 1}, summarized at {e['timestamp']}" for e in index)
+            return f"{next_history_index(index)} messages stored in {path}:\n{events}"
+
+        def render(records: list[HistoryRecord], *, truncated: bool) -> str:
+            if not records:
+                return "No messages match."
+            result = render_history(records)
+            if truncated:
+                result += f"\n\n[Showing the first {_READ_HISTORY_LIMIT} matching messages; narrow the query to see more.]"
+            return result
+
+        def sync_read_history(
+            runtime: ToolRuntime,
+            start: Annotated[int | None, "Index of the first message to return."] = None,
+            end: Annotated[int | None, "Index after the last message to return."] = None,
+            tool_call_id: Annotated[str | None, "Return the tool call with this id and its result."] = None,
+            since: Annotated[str | None, "Only messages summarized at or after this ISO 8601 time."] = None,
+            until: Annotated[str | None, "Only messages summarized at or before this ISO 8601 time."] = None,
+        ) -> str:
+            """Synchronous wrapper for read_history tool."""
+            backend = self._get_tool_backend(runtime)
+            path = self._get_history_path()
+            index = parse_history_index(backend.download_files([history_index_path(path)])[0].content)
+            if all(arg is None for arg in (start, end, tool_call_id, since, until)):
+                return overview(index, path)
+            try:
+                ranges = select_history_ranges(index, start=start, end=end, tool_call_id=tool_call_id, since=since, until=until)
+            except ValueError as e:
+                return f"Error: {e}"
+            records: list[HistoryRecord] = []
+            for offset, count in ranges:
+                remaining = _READ_HISTORY_LIMIT - len(records)
+                if remaining <= 0:
+                    break
+                records.extend(parse_history_records(backend.read(path, offset=offset, limit=min(count, remaining))))
+            return render(records, truncated=sum(count for _, count in ranges) > _READ_HISTORY_LIMIT)
+
+        async def async_read_history(
+            runtime: ToolRuntime,
+            start: Annotated[int | None, "Index of the first message to return."] = None,
+            end: Annotated[int | None, "Index after the last message to return."] = None,
+            tool_call_id: Annotated[str | None, "Return the tool call with this id and its result."] = None,
+            since: Annotated[str | None, "Only messages summarized at or after this ISO 8601 time."] = None,
+            until: Annotated[str | None, "Only messages summarized at or before this ISO 8601 time."] = None,
+        ) -> str:
+            """Asynchronous wrapper for read_history tool."""
+            backend = self._get_tool_backend(runtime)
+            path = self._get_history_path()
+            index = parse_history_index((await backend.adownload_files([history_index_path(path)]))[0].content)
+            if all(arg is None for arg in (start, end, tool_call_id, since, until)):
+                return overview(index, path)
+            try:
+                ranges = select_history_ranges(index, start=start, end=end, tool_call_id=tool_call_id, since=since, until=until)
+            except ValueError as e:
+                return f"Error: {e}"
+            records: list[HistoryRecord] = []
+            for offset, count in ranges:
+                remaining = _READ_HISTORY_LIMIT - len(records)
+                if remaining <= 0:
+                    break
+                records.extend(parse_history_records(await backend.aread(path, offset=offset, limit=min(count, remaining))))
+            return render(records, truncated=sum(count for _, count in ranges) > _READ_HISTORY_LIMIT)
+
+        return StructuredTool.from_function(
+            name="read_history",
+            description=READ_HISTORY_TOOL_DESCRIPTION,
+            func=sync_read_history,
+            coroutine=async_read_history,
+        )
+
+    def _get_search_index(self, path: str) -> HistorySearchIndex:
+        """Return the cached search index for a history file, creating it if needed."""
+        with self._search_indexes_lock:
+            search_index = self._search_indexes.get(path)
+            if search_index is None:
+                if len(self._search_indexes) >= _MAX_SEARCH_INDEXES:
+                    del self._search_indexes[next(iter(self._search_indexes))]
+                search_index = self._search_indexes[path] = HistorySearchIndex()
+            return search_index
+
+    def _create_search_history_tool(self) -> BaseTool:
+        """Create the search_history tool for JSONL history."""
+
+        def sync_search_history(
+            query: Annotated[str, "Keywords to look for, e.g. an error message, file name, or command."],
+            runtime: ToolRuntime,
+            k: Annotated[int, "Number of results to return."] = 5,
+        ) -> str:
+            """Synchronous wrapper for search_history tool."""
+            backend = self._get_tool_backend(runtime)
+            path = self._get_history_path()
+            # Only the postings appended since the last search are read
+            search_index = self._get_search_index(path)
+            search_path = history_search_path(path)
+            limit = _SEARCH_READ_CHUNK
+            while True:
+                output = backend.read(search_path, offset=search_index.lines_read, limit=limit)
+                consumed, cut = search_index.update(output)
+                if (cut or _is_truncated_read(output)) and limit > 1:
+                    # The backend cut the read short; retry the rest in smaller ranges
+                    limit //= 2
+                elif consumed < limit:
+                    break
+            hits = search_index.search(query, max(1, min(k, _SEARCH_HISTORY_MAX_K)))
+            if not hits:
+                return f"No offloaded messages match {query!r}."
+            records: dict[int, HistoryRecord] = {}
+            for offset, count in history_read_ranges([index for index, _ in hits], _SEARCH_HIT_GAP):
+                output = backend.read(path, offset=offset, limit=count)
+                if _is_truncated_read(output) and count > 1:
+                    outputs = [backend.read(path, offset=index, limit=1) for index, _ in hits if offset <= index < offset + count]
+                    output = "\n".join(outputs)
+                records.update((record["index"], record) for record in parse_history_records(output))
+            return render_search_hits([records[index] for index, _ in hits if index in records], dict(hits), query)
+
+        async def async_search_history(
+            query: Annotated[str, "Keywords to look for, e.g. an error message, file name, or command."],
+            runtime: ToolRuntime,
+            k: Annotated[int, "Number of results to return."] = 5,
+        ) -> str:
+            """Asynchronous wrapper for search_history tool."""
+            backend = self._get_tool_backend(runtime)
+            path = self._get_history_path()
+            # Only the postings appended since the last search are read
+            search_index = self._get_search_index(path)
+            search_path = history_search_path(path)
+            limit = _SEARCH_READ_CHUNK
+            while True:
+                output = await backend.aread(search_path, offset=search_index.lines_read, limit=limit)
+                consumed, cut = search_index.update(output)
+                if (cut or _is_truncated_read(output)) and limit > 1:
+                    # The backend cut the read short; retry the rest in smaller ranges
+                    limit //= 2
+                elif consumed < limit:
+                    break
+            hits = search_index.search(query, max(1, min(k, _SEARCH_HISTORY_MAX_K)))
+            if not hits:
+                return f"No offloaded messages match {query!r}."
+            records: dict[int, HistoryRecord] = {}
+            for offset, count in history_read_ranges([index for index, _ in hits], _SEARCH_HIT_GAP):
+                output = await backend.aread(path, offset=offset, limit=count)
+                if _is_truncated_read(output) and count > 1:
+                    outputs = [await backend.aread(path, offset=index, limit=1) for index, _ in hits if offset <= index < offset + count]
+                    output = "\n".join(outputs)
+                records.update((record["index"], record) for record in parse_history_records(output))
+            return render_search_hits([records[index] for index, _ in hits if index in records], dict(hits), query)
+
+        return StructuredTool.from_function(
+            name="search_history",
+            description=SEARCH_HISTORY_TOOL_DESCRIPTION,
+            func=sync_search_history,
+            coroutine=async_search_history,
+        )
+
     @override
     def before_model(
         self,
@@ -671,20 +1318,23 @@ A condensed summary follows:
         truncated_messages, args_were_truncated = self._truncate_args(messages)
 
         # Step 2: Check if summarization should happen
-        total_tokens = self.token_counter(truncated_messages)
+        total_tokens = self._count_tokens(truncated_messages)
         should_summarize = self._should_summarize(truncated_messages, total_tokens)
 
-        # If only truncation happened (no summarization)
-        if args_were_truncated and not should_summarize:
-            return {
-                "messages": [
-                    RemoveMessage(id=REMOVE_ALL_MESSAGES),
-                    *truncated_messages,
-                ]
-            }
-
-        # If no truncation and no summarization
         if not should_summarize:
+            # Close to the trigger: get a head start on the summary
+            self._maybe_speculate(truncated_messages, total_tokens)
+
+            # If only truncation happened (no summarization)
+            if args_were_truncated:
+                return {
+                    "messages": [
+                        RemoveMessage(id=REMOVE_ALL_MESSAGES),
+                        *truncated_messages,
+                    ]
+                }
+
+            # If no truncation and no summarization
             return None
 
         # Step 3: Perform summarization
@@ -700,6 +1350,12 @@ A condensed summary follows:
                 }
             return None
 
+        # A background summary of the oldest messages replaces the model call;
+        # anything that arrived after it started is kept verbatim
+        speculation = self._adopt_speculation(truncated_messages, cutoff_index)
+        if speculation is not None:
+            cutoff_index, summary = speculation
+
         messages_to_summarize, preserved_messages = self._partition_messages(truncated_messages, cutoff_index)
 
         # Offload to backend first - abort summarization if this fails to prevent data loss
@@ -712,7 +1368,8 @@ A condensed summary follows:
             )
 
         # Generate summary
-        summary = self._create_summary(messages_to_summarize)
+        if speculation is None:
+            summary = self._create_summary(messages_to_summarize)
 
         # Build summary message with file path reference
         new_messages = self._build_new_messages_with_path(summary, file_path)
@@ -755,20 +1412,23 @@ A condensed summary follows:
         truncated_messages, args_were_truncated = self._truncate_args(messages)
 
         # Step 2: Check if summarization should happen
-        total_tokens = self.token_counter(truncated_messages)
+        total_tokens = self._count_tokens(truncated_messages)
         should_summarize = self._should_summarize(truncated_messages, total_tokens)
 
-        # If only truncation happened (no summarization)
-        if args_were_truncated and not should_summarize:
-            return {
-                "messages": [
-                    RemoveMessage(id=REMOVE_ALL_MESSAGES),
-                    *truncated_messages,
-                ]
-            }
-
-        # If no truncation and no summarization
         if not should_summarize:
+            # Close to the trigger: get a head start on the summary
+            self._amaybe_speculate(truncated_messages, total_tokens)
+
+            # If only truncation happened (no summarization)
+            if args_were_truncated:
+                return {
+                    "messages": [
+                        RemoveMessage(id=REMOVE_ALL_MESSAGES),
+                        *truncated_messages,
+                    ]
+                }
+
+            # If no truncation and no summarization
             return None
 
         # Step 3: Perform summarization
@@ -784,6 +1444,12 @@ A condensed summary follows:
                 }
             return None
 
+        # A background summary of the oldest messages replaces the model call;
+        # anything that arrived after it started is kept verbatim
+        speculation = await self._aadopt_speculation(truncated_messages, cutoff_index)
+        if speculation is not None:
+            cutoff_index, summary = speculation
+
         messages_to_summarize, preserved_messages = self._partition_messages(truncated_messages, cutoff_index)
 
         # Offload to backend first - abort summarization if this fails to prevent data loss
@@ -796,7 +1462,8 @@ A condensed summary follows:
             )
 
         # Generate summary
-        summary = await self._acreate_summary(messages_to_summarize)
+        if speculation is None:
+            summary = await self._acreate_summary(messages_to_summarize)
 
         # Build summary message with file path reference
         new_messages = self._build_new_messages_with_path(summary, file_path)
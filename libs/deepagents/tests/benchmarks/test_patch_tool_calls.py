@@ -0,0 +1,63 @@
+"""Compare `PatchToolCallsMiddleware.before_agent` with the previous quadratic scan.
+
+Run with `make benchmark`. The previous implementation searched the rest of the
+history for every tool call and always rebuilt the whole message list.
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, ToolMessage
+from langgraph.types import Overwrite
+
+from deepagents.middleware.patch_tool_calls import PatchToolCallsMiddleware
+
+pytestmark = pytest.mark.benchmark
+
+
+def _quadratic_before_agent(state: dict[str, Any]) -> dict[str, Any]:
+    """The implementation before the single-pass rewrite, kept as a baseline."""
+    messages = state["messages"]
+    patched_messages = []
+    for i, msg in enumerate(messages):
+        patched_messages.append(msg)
+        if msg.type == "ai" and msg.tool_calls:
+            for tool_call in msg.tool_calls:
+                corresponding_tool_msg = next(
+                    (msg for msg in messages[i:] if msg.type == "tool" and msg.tool_call_id == tool_call["id"]),
+                    None,
+                )
+                if corresponding_tool_msg is None:
+                    patched_messages.append(ToolMessage(content="cancelled", name=tool_call["name"], tool_call_id=tool_call["id"]))
+    return {"messages": Overwrite(patched_messages)}
+
+
+def _history(count: int) -> list[AnyMessage]:
+    messages: list[AnyMessage] = [HumanMessage(content="start", id="h")]
+    for i in range((count - 1) // 2):
+        messages.append(AIMessage(content="", id=f"a{i}", tool_calls=[{"id": f"tc{i}", "name": "ls", "args": {"path": "/"}}]))
+        messages.append(ToolMessage(content="[]", tool_call_id=f"tc{i}", id=f"t{i}"))
+    return messages
+
+
+def _timed(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize("count", [1_000, 5_000])
+def test_before_agent(count: int) -> None:
+    state = {"messages": _history(count)}
+    middleware = PatchToolCallsMiddleware()
+    assert middleware.before_agent(state, None) is None
+
+    quadratic = _timed(lambda: _quadratic_before_agent(state))
+    single_pass = _timed(lambda: middleware.before_agent(state, None))
+    print(f"\n{count:,} messages: quadratic {quadratic * 1000:8.2f}ms  single pass {single_pass * 1000:8.2f}ms")  # noqa: T201
+    assert single_pass < quadratic
@@ -0,0 +1,85 @@
+"""Compare `SqliteBackend` with `StoreBackend(InMemoryStore)` on large file trees.
+
+Run with `make benchmark`, which passes `-s` so the timings are printed.
+`StoreBackend` pages through the whole namespace for every ls/glob/grep, which
+grows quadratically with the file count, so by default it is only measured at
+10k files and the 1M-file case is skipped. Set
+`DEEPAGENTS_BENCHMARK_LARGE=1` to run every size against both backends (this
+takes hours and several GB of memory).
+"""
+
+import os
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from langchain.tools import ToolRuntime
+from langgraph.store.memory import InMemoryStore
+
+from deepagents.backends.sqlite import SqliteBackend
+from deepagents.backends.store import StoreBackend
+
+if TYPE_CHECKING:
+    from deepagents.backends.protocol import BackendProtocol
+
+pytestmark = pytest.mark.benchmark
+
+_LARGE = os.environ.get("DEEPAGENTS_BENCHMARK_LARGE") == "1"
+_STORE_MAX_FILES = 10_000
+_BATCH = 10_000
+_NEEDLE = "needle_42"
+
+
+def _files(count: int) -> Iterator[list[tuple[str, bytes]]]:
+    """Yield batches of `/d{i % 100}/f{i}.py` files; every 1000th one holds the needle."""
+    for start in range(0, count, _BATCH):
+        batch = []
+        for i in range(start, min(start + _BATCH, count)):
+            body = f"def f{i}():\n    return {i}\n"
+            if i % 1000 == 0:
+                body += f"# {_NEEDLE}\n"
+            batch.append((f"/d{i % 100}/f{i}.py", body.encode()))
+        yield batch
+
+
+def _timed(fn: Callable[[], object]) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _store_backend() -> StoreBackend:
+    rt = ToolRuntime(
+        state={"messages": [], "files": {}}, context=None, tool_call_id="t1", store=InMemoryStore(), stream_writer=lambda _: None, config={}
+    )
+    return StoreBackend(rt, namespace=lambda _ctx: ("bench",))
+
+
+@pytest.mark.parametrize(
+    "count",
+    [
+        10_000,
+        100_000,
+        pytest.param(1_000_000, marks=pytest.mark.skipif(not _LARGE, reason="set DEEPAGENTS_BENCHMARK_LARGE=1")),
+    ],
+)
+def test_sqlite_vs_store(count: int, tmp_path: Path) -> None:
+    sqlite = SqliteBackend(tmp_path / "files.db")
+    backends: dict[str, BackendProtocol] = {"sqlite": sqlite}
+    if _LARGE or count <= _STORE_MAX_FILES:
+        backends["store"] = _store_backend()
+    report = [f"\n{count:,} files"]
+    try:
+        for name, backend in backends.items():
+            upload, _ = _timed(lambda b=backend: [b.upload_files(batch) for batch in _files(count)])
+            ls, infos = _timed(lambda b=backend: b.ls_info("/d7"))
+            glob, found = _timed(lambda b=backend: b.glob_info("*.py", "/d7"))
+            grep, matches = _timed(lambda b=backend: b.grep_raw(_NEEDLE, "/"))
+            assert len(infos) == len(found) == count // 100
+            assert len(matches) == (count + 999) // 1000
+            report.append(f"  {name:<7} upload {upload:8.2f}s  ls {ls:7.3f}s  glob {glob:7.3f}s  grep {grep:7.3f}s")
+    finally:
+        sqlite.close()
+    print("\n".join(report))  # noqa: T201
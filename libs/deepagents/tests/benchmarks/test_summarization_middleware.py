@@ -0,0 +1,66 @@
+"""Measure per-turn CPU time of `SummarizationMiddleware.before_model` on a long history.
+
+Run with `make benchmark`. The default token counter is memoized per message; the
+baseline wraps the same counter in a lambda, which bypasses the cache, so every
+turn recounts the whole history the way the middleware used to.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from langchain.agents.middleware.summarization import TokenCounter
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from deepagents.middleware.summarization import SummarizationMiddleware
+
+pytestmark = pytest.mark.benchmark
+
+_TURNS = 300
+_MEASURED_TURNS = 50
+
+
+def _turn(i: int) -> list[AnyMessage]:
+    return [
+        AIMessage(
+            content=f"step {i}",
+            id=f"a{i}",
+            tool_calls=[{"id": f"tc{i}", "name": "write_file", "args": {"file_path": f"/f{i}.py", "content": f"x = {i}\n" * 400}}],
+        ),
+        ToolMessage(content=f"line {i}\n" * 500, tool_call_id=f"tc{i}", id=f"t{i}"),
+    ]
+
+
+def _middleware(token_counter: TokenCounter) -> SummarizationMiddleware:
+    model = MagicMock()
+    model.profile = None
+    return SummarizationMiddleware(
+        model=model,
+        backend=MagicMock(),
+        trigger=("tokens", 10**9),
+        token_counter=token_counter,
+        truncate_args_settings={"trigger": ("messages", 100), "keep": ("messages", 20), "max_length": 500},
+    )
+
+
+def _per_turn_seconds(middleware: SummarizationMiddleware) -> float:
+    messages: list[AnyMessage] = [HumanMessage(content="start", id="h0")]
+    runtime = MagicMock()
+    elapsed = 0.0
+    for i in range(_TURNS):
+        messages.extend(_turn(i))
+        start = time.perf_counter()
+        result = middleware.before_model({"messages": messages}, runtime)
+        if i >= _TURNS - _MEASURED_TURNS:
+            elapsed += time.perf_counter() - start
+        if result is not None:
+            messages = result["messages"][1:]
+    return elapsed / _MEASURED_TURNS
+
+
+def test_before_model_per_turn() -> None:
+    uncached = _per_turn_seconds(_middleware(lambda msgs: count_tokens_approximately(msgs)))
+    cached = _per_turn_seconds(_middleware(count_tokens_approximately))
+    print(f"\n{2 * _TURNS + 1} messages: uncached {uncached * 1000:7.2f}ms/turn  cached {cached * 1000:7.2f}ms/turn")  # noqa: T201
+    assert cached < uncached
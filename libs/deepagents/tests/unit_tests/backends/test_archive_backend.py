@@ -0,0 +1,111 @@
+import io
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from langchain.tools import ToolRuntime
+
+from deepagents.backends.archive import ArchiveBackend
+from deepagents.backends.overlay import OverlayBackend
+from deepagents.backends.state import StateBackend
+
+FILES = {
+    "project/README.md": b"hello archive\n",
+    "project/src/app.py": b"print('hello')\nx = 1\n",
+    "project/src/pkg/util.py": b"def util():\n    return 'hello'\n",
+    "project/data.bin": b"\x00\xff\x00hello",
+}
+
+
+def make_zip(path: Path) -> Path:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("project/", b"")
+        for name, data in FILES.items():
+            zf.writestr(name, data)
+    return path
+
+
+def make_tar(path: Path, mode: str = "w") -> Path:
+    with tarfile.open(path, mode) as tf:
+        for name, data in FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1_700_000_000
+            tf.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo("project/link.py")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "src/app.py"
+        tf.addfile(link)
+    return path
+
+
+@pytest.fixture(params=["zip", "tar"])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[ArchiveBackend]:
+    make = make_zip if request.param == "zip" else make_tar
+    archive = make(tmp_path / f"project.{request.param}")
+    be = ArchiveBackend(archive, strip_components=1)
+    yield be
+    be.close()
+
+
+def test_ls_info_lists_direct_children(backend: ArchiveBackend) -> None:
+    assert [fi["path"] for fi in backend.ls_info("/")] == ["/README.md", "/data.bin", "/src/"]
+    assert [fi["path"] for fi in backend.ls_info("/src/")] == ["/src/app.py", "/src/pkg/"]
+    readme = backend.ls_info("/")[0]
+    assert readme["size"] == len(FILES["project/README.md"])
+    assert not readme["is_dir"]
+    assert backend.ls_info("/missing") == []
+
+
+def test_read(backend: ArchiveBackend) -> None:
+    assert "print('hello')" in backend.read("/src/app.py")
+    assert "x = 1" not in backend.read("/src/app.py", limit=1)
+    assert "not found" in backend.read("/nope.txt")
+    assert "not a UTF-8 text file" in backend.read("/data.bin")
+
+
+def test_grep_and_glob(backend: ArchiveBackend) -> None:
+    matches = backend.grep_raw("hello", "/")
+    assert [(m["path"], m["line"]) for m in matches] == [("/README.md", 1), ("/src/app.py", 1), ("/src/pkg/util.py", 2)]
+    assert [m["path"] for m in backend.grep_raw("hello", "/src", glob="util.py")] == ["/src/pkg/util.py"]
+
+    assert sorted(fi["path"] for fi in backend.glob_info("**/*.py")) == ["/src/app.py", "/src/pkg/util.py"]
+    assert [fi["path"] for fi in backend.glob_info("*.md")] == ["/README.md"]
+
+
+def test_download_and_read_only(backend: ArchiveBackend) -> None:
+    responses = backend.download_files(["/data.bin", "/src", "/missing"])
+    assert responses[0].content == FILES["project/data.bin"]
+    assert responses[1].error == "is_directory"
+    assert responses[2].error == "file_not_found"
+
+    assert "read-only" in backend.write("/new.txt", "x").error
+    assert "read-only" in backend.edit("/README.md", "hello", "bye").error
+    assert backend.upload_files([("/new.txt", b"x")])[0].error == "permission_denied"
+
+
+def test_skips_links(tmp_path: Path) -> None:
+    be = ArchiveBackend(make_tar(tmp_path / "project.tar"), strip_components=1)
+    assert be.download_files(["/link.py"])[0].error == "file_not_found"
+
+
+def test_rejects_compressed_tar_and_non_archives(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="gzip-compressed"):
+        ArchiveBackend(make_tar(tmp_path / "project.tar.gz", "w:gz"))
+    plain = tmp_path / "plain.txt"
+    plain.write_text("not an archive" * 100)
+    with pytest.raises(ValueError, match="not a zip or tar"):
+        ArchiveBackend(plain)
+
+
+def test_serves_as_overlay_lower_layer(tmp_path: Path) -> None:
+    rt = ToolRuntime(state={"messages": [], "files": {}}, context=None, tool_call_id="t1", store=None, stream_writer=lambda _: None, config={})
+    overlay = OverlayBackend(lower=ArchiveBackend(make_zip(tmp_path / "p.zip"), strip_components=1), upper=StateBackend(rt))
+
+    result = overlay.edit("/src/app.py", "x = 1", "x = 2")
+    rt.state["files"].update(result.files_update)
+
+    assert "x = 2" in overlay.read("/src/app.py")
+    assert "+x = 2" in overlay.export_diff()
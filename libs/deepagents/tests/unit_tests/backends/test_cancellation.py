@@ -0,0 +1,112 @@
+"""Tests for cooperative cancellation of blocking backend work."""
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from deepagents.backends.cancellation import (
+    CancellationToken,
+    _context_with_token,
+    current_cancel_token,
+    iterate_cancellable,
+    run_cancellable,
+)
+from deepagents.backends.filesystem import FilesystemBackend
+
+
+def test_token_runs_callbacks_once() -> None:
+    token = CancellationToken()
+    calls: list[str] = []
+    token.register(lambda: calls.append("a"))
+    unregister = token.register(lambda: calls.append("b"))
+    unregister()
+
+    token.cancel()
+    token.cancel()
+
+    assert token.cancelled
+    assert calls == ["a"]
+
+
+def test_token_runs_late_callbacks_immediately() -> None:
+    token = CancellationToken()
+    token.cancel()
+    calls: list[str] = []
+
+    token.register(lambda: calls.append("late"))
+
+    assert calls == ["late"]
+
+
+def test_token_survives_failing_callback() -> None:
+    token = CancellationToken()
+    calls: list[str] = []
+
+    def fail() -> None:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    token.register(fail)
+    token.register(lambda: calls.append("ok"))
+    token.cancel()
+
+    assert calls == ["ok"]
+
+
+async def test_run_cancellable_exposes_token_only_to_the_worker() -> None:
+    seen = await run_cancellable(current_cancel_token)
+
+    assert isinstance(seen, CancellationToken)
+    assert not seen.cancelled
+    assert current_cancel_token() is None
+
+
+async def test_run_cancellable_fires_token_on_cancel() -> None:
+    started = threading.Event()
+    stopped = threading.Event()
+    extra: list[str] = []
+
+    def blocking() -> None:
+        token = current_cancel_token()
+        assert token is not None
+        token.register(stopped.set)
+        started.set()
+        stopped.wait(5)
+
+    task = asyncio.create_task(run_cancellable(blocking, on_cancel=lambda: extra.append("on_cancel")))
+    await asyncio.to_thread(started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert stopped.is_set()
+    assert extra == ["on_cancel"]
+
+
+async def test_iterate_cancellable_shares_one_token() -> None:
+    def produce() -> Iterator[CancellationToken | None]:
+        token = current_cancel_token()
+        yield token
+        yield current_cancel_token()
+
+    first, second = [item async for item in iterate_cancellable(produce())]
+
+    assert first is not None
+    assert first is second
+
+
+def test_filesystem_search_stops_once_cancelled(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("needle\n")
+    backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    assert backend.grep_raw("needle", "/")
+    assert backend.glob_info("*.txt")
+
+    token = CancellationToken()
+    token.cancel()
+    context = _context_with_token(token)
+
+    assert context.run(backend.grep_raw, "needle", "/") == []
+    assert context.run(backend.glob_info, "*.txt") == []
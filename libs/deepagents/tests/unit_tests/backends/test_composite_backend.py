@@ -1112,3 +1112,17 @@ def test_composite_glob_info_nested_path_in_route() -> None:
     result_paths = sorted([fi["path"] for fi in results])
 
     assert result_paths == ["/archive/2024/feb.log", "/archive/2024/jan.log"]
+
+
+async def test_composite_backend_file_etags_routes_by_prefix(tmp_path: Path) -> None:
+    fs = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    state = StateBackend(make_runtime("t9"))
+    comp = CompositeBackend(default=fs, routes={"/scratch/": state})
+    comp.write("/hello.txt", "hello")
+
+    etags = comp.file_etags(["/scratch/notes.md", "/hello.txt", "/missing.txt"])
+
+    # StateBackend keeps the default (unknown) tags
+    assert etags == [None, *fs.file_etags(["/hello.txt"]), None]
+    assert etags[1] is not None
+    assert await comp.afile_etags(["/hello.txt"]) == [etags[1]]
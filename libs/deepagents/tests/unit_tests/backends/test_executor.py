@@ -0,0 +1,157 @@
+"""Tests for running backend calls on a dedicated bounded executor."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from deepagents.backends.executor import BackendExecutor
+from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.local_shell import LocalShellBackend
+from deepagents.backends.protocol import BackendProtocol, ExecuteResponse, FileDownloadResponse, FileInfo, FileUploadResponse
+from deepagents.backends.sandbox import BaseSandbox
+
+
+class GatedBackend(BackendProtocol):
+    """Backend whose `ls_info` blocks until `release` is set."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.threads: set[str] = set()
+
+    def ls_info(self, path: str) -> list[FileInfo]:
+        self.threads.add(threading.current_thread().name)
+        self.release.wait(5)
+        return [{"path": path}]
+
+
+class FastBackend(BackendProtocol):
+    def ls_info(self, path: str) -> list[FileInfo]:
+        return [{"path": path}]
+
+
+def test_rejects_non_positive_max_workers() -> None:
+    with pytest.raises(ValueError, match="max_workers"):
+        BackendExecutor(max_workers=0)
+
+
+def test_stats_track_queue_depth_and_wait_time() -> None:
+    release = threading.Event()
+    with BackendExecutor(max_workers=2) as executor:
+        futures = [executor.submit(release.wait, 5) for _ in range(5)]
+        for _ in range(100):
+            if executor.stats().running == 2:
+                break
+            threading.Event().wait(0.01)
+
+        busy = executor.stats()
+        assert busy.max_workers == 2
+        assert busy.running == 2
+        assert busy.queued == 3
+
+        release.set()
+        for future in futures:
+            future.result()
+
+    done = executor.stats()
+    assert done.running == 0
+    assert done.queued == 0
+    assert done.completed == 5
+    assert done.max_wait_time > 0
+    assert 0 < done.mean_wait_time <= done.max_wait_time
+
+
+def test_cancelled_queued_calls_leave_the_queue() -> None:
+    release = threading.Event()
+    with BackendExecutor(max_workers=1) as executor:
+        running = executor.submit(release.wait, 5)
+        queued = executor.submit(release.wait, 5)
+        assert queued.cancel()
+        assert executor.stats().queued == 0
+        release.set()
+        running.result()
+
+
+async def test_async_methods_run_on_the_backend_executor() -> None:
+    backend = GatedBackend()
+    backend.release.set()
+    with BackendExecutor(max_workers=1, name="gated") as executor:
+        backend.executor = executor
+        assert await backend.als_info("/") == [{"path": "/"}]
+        assert executor.stats().completed == 1
+    assert all(name.startswith("gated") for name in backend.threads)
+
+
+def _fast_call_during_slow_burst(*, isolate: bool) -> bool:
+    """Return whether a fast backend answers while a slow backend's burst is in flight."""
+
+    async def scenario() -> bool:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+        slow, fast = GatedBackend(), FastBackend()
+        if isolate:
+            slow.executor = BackendExecutor(max_workers=2, name="slow")
+        burst = [asyncio.create_task(slow.als_info(f"/{i}")) for i in range(8)]
+        await asyncio.sleep(0.05)
+        try:
+            await asyncio.wait_for(fast.als_info("/"), timeout=0.5)
+        except TimeoutError:
+            answered = False
+        else:
+            answered = True
+        finally:
+            slow.release.set()
+            await asyncio.gather(*burst)
+        if slow.executor is not None:
+            assert slow.executor.stats().max_wait_time > 0
+            slow.executor.shutdown()
+        return answered
+
+    return asyncio.run(scenario())
+
+
+def test_slow_backend_starves_shared_default_pool() -> None:
+    assert not _fast_call_during_slow_burst(isolate=False)
+
+
+def test_dedicated_executor_isolates_slow_backend() -> None:
+    assert _fast_call_during_slow_burst(isolate=True)
+
+
+async def test_executor_keyword_on_builtin_backends(tmp_path: Path) -> None:
+    with BackendExecutor(max_workers=1, name="fs") as executor:
+        backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True, executor=executor)
+        assert backend.executor is executor
+        await backend.awrite("/a.txt", "hi")
+        assert executor.stats().completed == 1
+
+        shell = LocalShellBackend(root_dir=tmp_path, executor=executor)
+        assert shell.executor is executor
+        assert (await shell.aexecute("echo hi")).output == "hi\n"
+        assert executor.stats().completed == 2
+
+    assert FilesystemBackend(root_dir=tmp_path).executor is None
+
+
+def test_executor_keyword_on_base_sandbox() -> None:
+    class Sandbox(BaseSandbox):
+        def __init__(self, executor: BackendExecutor | None = None) -> None:
+            super().__init__(executor=executor)
+
+        @property
+        def id(self) -> str:
+            return "sandbox"
+
+        def execute(self, command: str) -> ExecuteResponse:
+            return ExecuteResponse(output=command)
+
+        def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+            return []
+
+        def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+            return []
+
+    with BackendExecutor(max_workers=1) as executor:
+        assert Sandbox(executor).executor is executor
+    assert Sandbox().executor is None
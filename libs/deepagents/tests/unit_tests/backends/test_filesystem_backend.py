@@ -523,3 +523,32 @@ def test_grep_literal_search_with_special_chars(tmp_path: Path, pattern: str, ex
     matches = be.grep_raw(pattern, path="/")
     assert isinstance(matches, list)
     assert any(expected_file in m["path"] for m in matches), f"Pattern '{pattern}' not found in {expected_file}"
+
+
+def test_filesystem_append(tmp_path: Path) -> None:
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+
+    assert be.append("/logs/history.md", "one\n").path == "/logs/history.md"
+    assert be.append("/logs/history.md", "two\n").error is None
+    assert (tmp_path / "logs" / "history.md").read_text() == "one\ntwo\n"
+
+    # Appending never writes through a snapshot's hard link
+    be.snapshot("before")
+    be.append("/logs/history.md", "three\n")
+    be.restore("before")
+    assert (tmp_path / "logs" / "history.md").read_text() == "one\ntwo\n"
+
+
+def test_filesystem_file_etags(tmp_path: Path) -> None:
+    be = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=True)
+    be.write("/notes.md", "one")
+    (tmp_path / "dir").mkdir()
+
+    before, missing, directory = be.file_etags(["/notes.md", "/missing.md", "/dir"])
+    assert before is not None
+    assert missing is None
+    assert directory is None
+    assert be.file_etags(["/notes.md"]) == [before]
+
+    be.append("/notes.md", "two")
+    assert be.file_etags(["/notes.md"]) != [before]
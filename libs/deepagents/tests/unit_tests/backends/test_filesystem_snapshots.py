@@ -0,0 +1,164 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from deepagents.backends import snapshot as snapshot_module
+from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.local_shell import LocalShellBackend
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    root = tmp_path / "ws"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "app.py").write_text("print('v1')\n")
+    (root / "README.md").write_text("readme\n")
+    return root
+
+
+def test_restore_undoes_edits_creations_and_deletions(workspace: Path) -> None:
+    be = FilesystemBackend(root_dir=workspace, virtual_mode=True)
+    snap = be.snapshot()
+
+    assert be.edit("/src/app.py", "v1", "v2").error is None
+    assert be.write("/src/new.py", "x = 1\n").error is None
+    (workspace / "README.md").unlink()
+    (workspace / "build").mkdir()
+    (workspace / "build" / "out.o").write_bytes(b"\0")
+
+    be.restore(snap)
+
+    assert (workspace / "src" / "app.py").read_text() == "print('v1')\n"
+    assert (workspace / "README.md").read_text() == "readme\n"
+    assert not (workspace / "src" / "new.py").exists()
+    assert not (workspace / "build").exists()
+    assert be.list_snapshots() == [snap]
+
+
+def test_backend_writes_do_not_leak_into_snapshot(workspace: Path) -> None:
+    be = FilesystemBackend(root_dir=workspace, virtual_mode=True)
+    first = be.snapshot("cp-1")
+
+    be.edit("/src/app.py", "v1", "v2")
+    be.upload_files([("/README.md", b"uploaded\n")])
+    second = be.snapshot("cp-2")
+    be.edit("/src/app.py", "v2", "v3")
+
+    be.restore(first)
+    assert (workspace / "src" / "app.py").read_text() == "print('v1')\n"
+    assert (workspace / "README.md").read_text() == "readme\n"
+
+    be.restore(second)
+    assert (workspace / "src" / "app.py").read_text() == "print('v2')\n"
+    assert (workspace / "README.md").read_text() == "uploaded\n"
+
+
+def test_restore_leaves_unchanged_files_alone(workspace: Path) -> None:
+    be = FilesystemBackend(root_dir=workspace, virtual_mode=True)
+    snap = be.snapshot()
+    inode = (workspace / "README.md").stat().st_ino
+
+    be.edit("/src/app.py", "v1", "v2")
+    be.restore(snap)
+
+    assert (workspace / "README.md").stat().st_ino == inode
+
+
+def test_snapshots_are_excluded_from_snapshots(workspace: Path) -> None:
+    be = FilesystemBackend(root_dir=workspace, virtual_mode=True)
+    be.snapshot("a")
+    be.snapshot("b")
+
+    store = workspace / ".deepagents" / "snapshots"
+    assert not (store / "b" / ".deepagents" / "snapshots").exists()
+
+    be.restore("a")
+    assert (store / "b").is_dir()
+    assert be.list_snapshots() == ["a", "b"]
+
+    be.delete_snapshot("a")
+    assert be.list_snapshots() == ["b"]
+
+
+def test_in_place_writes_through_execute_do_not_change_the_snapshot(workspace: Path) -> None:
+    be = LocalShellBackend(root_dir=workspace, virtual_mode=True)
+    snap = be.snapshot()
+    stat = (workspace / "src" / "app.py").stat()
+
+    # Same size and mtime as the snapshot, different content.
+    assert be.execute("printf \"print('v2')\\n\" > src/app.py && echo more >> README.md").exit_code == 0
+    os.utime(workspace / "src" / "app.py", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert (workspace / ".deepagents" / "snapshots" / snap / "README.md").read_text() == "readme\n"
+
+    be.restore(snap)
+
+    assert (workspace / "src" / "app.py").read_text() == "print('v1')\n"
+    assert (workspace / "README.md").read_text() == "readme\n"
+
+
+def test_snapshot_dir_outside_root(workspace: Path) -> None:
+    be = FilesystemBackend(root_dir=workspace, virtual_mode=True, snapshot_dir=workspace.parent / "snaps")
+    snap = be.snapshot()
+
+    (workspace / "src" / "app.py").write_text("changed in place\n")
+    be.restore(snap)
+
+    assert (workspace / "src" / "app.py").read_text() == "print('v1')\n"
+    assert (workspace.parent / "snaps" / snap / "README.md").exists()
+    assert not (workspace / ".deepagents").exists()
+
+
+@pytest.mark.parametrize("search", ["ripgrep", "python"])
+def test_snapshot_store_is_hidden_from_listing_and_search(workspace: Path, monkeypatch: pytest.MonkeyPatch, search: str) -> None:
+    be = FilesystemBackend(root_dir=workspace, virtual_mode=True)
+    if search == "python":
+        monkeypatch.setattr(be, "_ripgrep_search", lambda *_args: None)
+    elif shutil.which("rg") is None:
+        pytest.skip("ripgrep is not installed")
+    be.snapshot("cp")
+
+    assert [m["path"] for m in be.grep_raw("v1", "/")] == ["/src/app.py"]
+    assert [m["path"] for m in be.grep_raw("v1", "/.deepagents")] == []
+    assert [fi["path"] for fi in be.glob_info("**/*.py")] == ["/src/app.py"]
+    assert [fi["path"] for fi in be.glob_info("**/*.md")] == ["/README.md"]
+    assert [fi["path"] for fi in be.ls_info("/.deepagents")] == []
+    assert be.ls_info("/.deepagents/snapshots") == []
+
+
+def test_rejects_unknown_or_duplicate_snapshot_ids(workspace: Path) -> None:
+    be = FilesystemBackend(root_dir=workspace, virtual_mode=True)
+    be.snapshot("cp")
+
+    with pytest.raises(ValueError, match="already exists"):
+        be.snapshot("cp")
+    with pytest.raises(ValueError, match="not found"):
+        be.restore("missing")
+    with pytest.raises(ValueError, match="Invalid"):
+        be.restore("../cp")
+
+
+def test_unchanged_files_are_neither_copied_nor_read(workspace: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(snapshot_module, "_RACY_WINDOW_NS", -(10**18))
+    be = FilesystemBackend(root_dir=workspace, virtual_mode=True)
+    store = workspace / ".deepagents" / "snapshots"
+    first = be.snapshot("cp-1")
+    (workspace / "src" / "app.py").write_text("print('v2')\n")
+    second = be.snapshot("cp-2")
+
+    assert (store / second / "README.md").samefile(store / first / "README.md")
+    assert not (store / second / "src" / "app.py").samefile(store / first / "src" / "app.py")
+
+    compared: list[str] = []
+    same_content = snapshot_module._same_content
+    monkeypatch.setattr(snapshot_module, "_same_content", lambda saved, live: compared.append(live.name) or same_content(saved, live))
+    be.restore(first)
+
+    assert compared == ["app.py"]
+    assert (workspace / "src" / "app.py").read_text() == "print('v1')\n"
+    assert (store / first / "src" / "app.py").read_text() == "print('v1')\n"
+
+    be.delete_snapshot(first)
+    assert (store / second / "README.md").read_text() == "readme\n"
+    assert not (store / f".{first}.manifest.json").exists()
@@ -0,0 +1,143 @@
+import gc
+import shutil
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from deepagents.backends import git as git_backend
+from deepagents.backends.git import GitBackend
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="requires git")
+
+
+def git(repo: Path, *args: str) -> None:
+    cmd = ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args]
+    subprocess.run(cmd, check=True, capture_output=True)  # noqa: S603
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    git(tmp_path, "init", "-q")
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "README.md").write_text("hello repo\n")
+    (tmp_path / "src" / "app.py").write_text("print('hello')\nx = 1\n")
+    (tmp_path / "src" / "pkg" / "util.py").write_text("def util():\n    return 'hello'\n")
+    (tmp_path / "logo.bin").write_bytes(b"\x00\xffhello")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "first")
+    git(tmp_path, "tag", "v1")
+    return tmp_path
+
+
+@pytest.fixture
+def backend(repo: Path) -> Iterator[GitBackend]:
+    be = GitBackend(repo, ref="v1")
+    yield be
+    be.close()
+
+
+def test_serves_the_commit_not_the_worktree(repo: Path, backend: GitBackend) -> None:
+    (repo / "README.md").write_text("changed after commit\n")
+    (repo / "src" / "app.py").unlink()
+    (repo / "untracked.txt").write_text("nope\n")
+
+    assert "hello repo" in backend.read("/README.md")
+    assert "print('hello')" in backend.read("/src/app.py")
+    assert "not found" in backend.read("/untracked.txt")
+
+
+def test_ls_info(backend: GitBackend) -> None:
+    assert [fi["path"] for fi in backend.ls_info("/")] == ["/README.md", "/logo.bin", "/src/"]
+    infos = backend.ls_info("/src")
+    assert [fi["path"] for fi in infos] == ["/src/app.py", "/src/pkg/"]
+    assert infos[0]["size"] == len("print('hello')\nx = 1\n")
+    assert backend.ls_info("/missing") == []
+    assert backend.ls_info("/README.md") == []
+
+
+def test_read_offsets_and_errors(backend: GitBackend) -> None:
+    assert "x = 1" not in backend.read("/src/app.py", limit=1)
+    assert "exceeds file length" in backend.read("/src/app.py", offset=10)
+    assert "not a UTF-8 text file" in backend.read("/logo.bin")
+    assert "not found" in backend.read("/src")
+
+
+def test_grep_uses_commit_contents(repo: Path, backend: GitBackend) -> None:
+    (repo / "README.md").write_text("hello from the worktree\n")
+
+    matches = backend.grep_raw("hello", "/")
+    assert [(m["path"], m["line"], m["text"]) for m in matches] == [
+        ("/README.md", 1, "hello repo"),
+        ("/src/app.py", 1, "print('hello')"),
+        ("/src/pkg/util.py", 2, "    return 'hello'"),
+    ]
+    assert [m["path"] for m in backend.grep_raw("hello", "/src", glob="*.py")] == ["/src/app.py", "/src/pkg/util.py"]
+    assert [m["path"] for m in backend.grep_raw("hello", "/src/pkg")] == ["/src/pkg/util.py"]
+    assert backend.grep_raw("absent", "/") == []
+
+
+def test_glob_info(backend: GitBackend) -> None:
+    assert [fi["path"] for fi in backend.glob_info("**/*.py")] == ["/src/app.py", "/src/pkg/util.py"]
+    assert [fi["path"] for fi in backend.glob_info("*.py", "/src")] == ["/src/app.py"]
+
+
+def test_download_and_read_only(backend: GitBackend) -> None:
+    responses = backend.download_files(["/logo.bin", "/src", "/missing"])
+    assert responses[0].content == b"\x00\xffhello"
+    assert responses[1].error == "is_directory"
+    assert responses[2].error == "file_not_found"
+    assert "read-only" in backend.write("/new.txt", "x").error
+    assert "read-only" in backend.edit("/README.md", "hello", "bye").error
+    assert backend.upload_files([("/new.txt", b"x")])[0].error == "permission_denied"
+
+
+def test_ref_is_pinned_at_creation(repo: Path) -> None:
+    be = GitBackend(repo)
+    (repo / "README.md").write_text("second\n")
+    git(repo, "commit", "-q", "-am", "second")
+
+    latest = GitBackend(repo)
+    try:
+        assert "hello repo" in be.read("/README.md")
+        assert "second" in latest.read("/README.md")
+    finally:
+        be.close()
+        latest.close()
+
+
+def test_rejects_unknown_ref(repo: Path) -> None:
+    with pytest.raises(ValueError, match="Needed a single revision|unknown revision|fatal"):
+        GitBackend(repo, ref="does-not-exist")
+
+
+def test_helper_processes_stop_on_exit_and_when_collected(repo: Path) -> None:
+    with GitBackend(repo) as be:
+        assert "hello repo" in be.read("/README.md")
+        proc = be._objects._proc
+        assert proc is not None
+        assert proc.poll() is None
+    assert proc.wait(timeout=5) is not None
+
+    be = GitBackend(repo)
+    be.read("/README.md")
+    proc = be._objects._proc
+    assert proc is not None
+    del be
+    gc.collect()
+    assert proc.wait(timeout=5) is not None
+
+
+def test_grep_timeout_is_reported_as_an_error(backend: GitBackend, monkeypatch: pytest.MonkeyPatch) -> None:
+    class SlowPopen(subprocess.Popen):
+        def communicate(self, input=None, timeout=None):  # noqa: A002, ANN001, ANN202
+            if timeout is not None:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            return super().communicate(input)
+
+    monkeypatch.setattr(git_backend.subprocess, "Popen", SlowPopen)
+
+    result = backend.grep_raw("hello", "/")
+    assert isinstance(result, str)
+    assert "timed out" in result
@@ -1,12 +1,18 @@
 """Unit tests for LocalShellBackend."""
 
+import asyncio
+import subprocess
 import tempfile
+import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from deepagents.backends import local_shell
 from deepagents.backends.local_shell import LocalShellBackend
-from deepagents.backends.protocol import ExecuteResponse
+from deepagents.backends.protocol import ExecuteChunk, ExecuteMetrics, ExecuteResponse
 
 
 def test_local_shell_backend_initialization() -> None:
@@ -96,6 +102,162 @@ def test_local_shell_backend_execute_output_truncation() -> None:
         assert len(result.output) <= 150  # Some buffer for truncation message
 
 
+def test_local_shell_backend_truncation_keeps_head_and_tail() -> None:
+    """Test that truncated output keeps both the beginning and the end."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, max_output_bytes=100, inherit_env=True)
+
+        result = backend.execute("seq 1 100000")
+
+        assert result.truncated is True
+        assert result.output.startswith("1\n2\n3\n")
+        assert result.output.rstrip().endswith("99999\n100000")
+
+
+def test_local_shell_backend_execute_stream_yields_chunks() -> None:
+    """Test that execute_stream yields chunks as they arrive, then the response."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True)
+
+        start = time.monotonic()
+        stream = backend.execute_stream("echo first; sleep 0.5; echo second; echo oops >&2")
+        arrivals = [(time.monotonic() - start, item) for item in stream]
+
+        final = arrivals[-1][1]
+        assert isinstance(final, ExecuteResponse)
+        assert final.exit_code == 0
+        assert final.output == backend.execute("echo first; echo second; echo oops >&2").output
+
+        chunks = [item for _, item in arrivals[:-1]]
+        assert all(isinstance(chunk, ExecuteChunk) for chunk in chunks)
+        assert chunks[0].output == "first\n"
+        # The first chunk is delivered before the command finishes
+        assert arrivals[0][0] < 0.4
+        assert any(chunk.stream == "stderr" and "oops" in chunk.output for chunk in chunks)
+
+
+def test_local_shell_backend_kill_on_output_limit() -> None:
+    """Test that runaway output kills the command when kill_on_output_limit is set."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(
+            root_dir=tmpdir,
+            max_output_bytes=1000,
+            kill_on_output_limit=True,
+            timeout=10.0,
+            inherit_env=True,
+        )
+
+        result = backend.execute("yes")
+
+        assert result.truncated is True
+        assert result.exit_code != 0
+        assert result.exit_code != 124
+        assert "Command killed after exceeding" in result.output
+
+
+def test_local_shell_backend_closing_stream_kills_command() -> None:
+    """Test that abandoning the stream terminates the running command."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True)
+
+        start = time.monotonic()
+        stream = backend.execute_stream("echo started; sleep 30")
+        first = next(stream)
+        stream.close()
+
+        assert isinstance(first, ExecuteChunk)
+        assert first.output == "started\n"
+        assert time.monotonic() - start < 5
+
+
+def test_local_shell_backend_persistent_session_keeps_state() -> None:
+    """Test that cwd, exports and shell variables persist in session mode."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "sub").mkdir()
+        backend = LocalShellBackend(root_dir=tmpdir, persistent_session=True, inherit_env=True)
+        try:
+            assert backend.execute("cd sub && export GREETING=hi; NAME=world").exit_code == 0
+
+            result = backend.execute('pwd; echo "$GREETING $NAME"')
+
+            assert result.exit_code == 0
+            assert result.output == f"{Path(tmpdir).resolve() / 'sub'}\nhi world\n"
+        finally:
+            backend.close()
+
+
+def test_local_shell_backend_persistent_session_exit_codes_and_stderr() -> None:
+    """Test that each session command reports its own exit code and output."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, persistent_session=True, inherit_env=True)
+        try:
+            result = backend.execute("echo out; echo err >&2; exit_status=3; (exit $exit_status)")
+            assert result.exit_code == 3
+            assert result.output.startswith("out\n")
+            assert "[stderr] err" in result.output
+
+            result = backend.execute("printf 'no newline'")
+            assert result.exit_code == 0
+            assert result.output == "no newline"
+
+            # Syntax errors don't take the session down
+            assert backend.execute("if then").exit_code == 2
+            assert backend.execute("echo still here").output == "still here\n"
+        finally:
+            backend.close()
+
+
+def test_local_shell_backend_persistent_session_timeout_interrupts_command_only() -> None:
+    """Test that a timeout interrupts the running command but keeps the session."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, persistent_session=True, timeout=1.0, inherit_env=True)
+        try:
+            backend.execute("export MARK=kept")
+
+            start = time.monotonic()
+            result = backend.execute("sleep 10; echo unreachable")
+
+            assert result.exit_code == 124
+            assert "timed out" in result.output
+            assert time.monotonic() - start < 5
+            assert backend.execute("echo $MARK").output == "kept\n"
+        finally:
+            backend.close()
+
+
+def test_local_shell_backend_persistent_session_timeout_restart_metrics_match_output() -> None:
+    """Test that the restart note is counted in the metrics of a timed out command."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, persistent_session=True, timeout=0.5, inherit_env=True)
+        try:
+            result = backend.execute("trap '' INT; sleep 5")
+
+            assert result.exit_code == 124
+            assert "Shell session restarted" in result.output
+            assert result.metrics is not None
+            assert result.metrics.returned_bytes == len(result.output.encode("utf-8"))
+        finally:
+            backend.close()
+
+
+def test_local_shell_backend_persistent_session_restarts_after_exit() -> None:
+    """Test that the session restarts automatically when the shell exits."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, persistent_session=True, inherit_env=True)
+        try:
+            backend.execute("export MARK=lost")
+
+            result = backend.execute("exit 7")
+            assert result.exit_code == 7
+            assert "Shell session restarted" in result.output
+
+            result = backend.execute('echo "mark=$MARK"; pwd')
+            assert result.exit_code == 0
+            assert result.output == f"mark=\n{Path(tmpdir).resolve()}\n"
+        finally:
+            backend.close()
+
+
 def test_local_shell_backend_filesystem_operations() -> None:
     """Test that filesystem operations work (inherited from FilesystemBackend)."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -277,6 +439,18 @@ async def test_local_shell_backend_async_execute() -> None:
         assert "async test" in result.output
 
 
+async def test_local_shell_backend_async_execute_stream() -> None:
+    """Test async execute_stream method."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True)
+
+        items = [item async for item in backend.aexecute_stream("echo 'async stream'")]
+
+        assert items[0] == ExecuteChunk(output="async stream\n", stream="stdout")
+        assert isinstance(items[-1], ExecuteResponse)
+        assert items[-1].exit_code == 0
+
+
 async def test_local_shell_backend_async_filesystem_operations() -> None:
     """Test async filesystem operations."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -297,3 +471,248 @@ async def test_local_shell_backend_async_filesystem_operations() -> None:
         # Verify
         content = await backend.aread("/async_test.txt")
         assert "modified content" in content
+
+
+def _wait_for_job(backend: LocalShellBackend, job_id: str, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while backend.poll_job(job_id).running and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_local_shell_backend_job_lifecycle() -> None:
+    """Test start/poll/tail of a background job that exits on its own."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True)
+
+        started = backend.start_job("echo first; echo second >&2; sleep 0.2; exit 3")
+        assert started.error is None
+        assert started.running
+        assert started.job_id.startswith("job-")
+
+        _wait_for_job(backend, started.job_id)
+
+        status = backend.tail_job(started.job_id)
+        assert not status.running
+        assert status.exit_code == 3
+        assert status.output == "first\nsecond"
+        assert backend.tail_job(started.job_id, lines=1).output == "second"
+
+
+def test_local_shell_backend_job_tail_is_bounded() -> None:
+    """Test tail_job reads at most max_output_bytes of a large log."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True, max_output_bytes=1000)
+
+        started = backend.start_job("seq 1 100000")
+        _wait_for_job(backend, started.job_id)
+
+        status = backend.tail_job(started.job_id, lines=100_000)
+        assert status.exit_code == 0
+        assert len(status.output) <= 1000
+        assert status.output.endswith("99999\n100000")
+
+
+def test_local_shell_backend_kill_job_kills_children() -> None:
+    """Test kill_job stops the job's whole process tree."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True)
+        marker = Path(tmpdir) / "marker"
+
+        started = backend.start_job(f"(sleep 0.5; touch {marker}) & sleep 30")
+        status = backend.kill_job(started.job_id)
+
+        assert not status.running
+        assert status.exit_code is not None
+        time.sleep(0.8)
+        assert not marker.exists()
+
+
+def test_local_shell_backend_prunes_finished_jobs_and_removes_logs_on_close(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test old finished jobs are dropped with their logs, and close() removes the log directory."""
+    monkeypatch.setattr(local_shell, "_MAX_FINISHED_JOBS", 2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True)
+        job_ids = []
+        for i in range(3):
+            started = backend.start_job(f"echo {i}")
+            _wait_for_job(backend, started.job_id)
+            job_ids.append(started.job_id)
+        running = backend.start_job("sleep 30")
+        jobs_dir = backend._jobs_dir
+        assert jobs_dir is not None
+
+        assert backend.poll_job(job_ids[0]).error is not None
+        assert backend.poll_job(job_ids[1]).error is not None
+        assert backend.tail_job(job_ids[2]).output == "2"
+        assert backend.poll_job(running.job_id).running
+        assert sorted(path.stem for path in jobs_dir.iterdir()) == sorted([job_ids[2], running.job_id])
+
+        backend.close()
+
+        assert not jobs_dir.exists()
+        assert backend.poll_job(running.job_id).error is not None
+
+
+def test_local_shell_backend_unknown_job() -> None:
+    """Test job methods report unknown job ids as errors."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir)
+
+        assert backend.poll_job("job-missing").error == "Error: Job 'job-missing' not found"
+        assert backend.kill_job("job-missing").error is not None
+        assert backend.start_job("").error is not None
+
+
+async def test_local_shell_backend_async_jobs() -> None:
+    """Test async job methods."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True)
+
+        started = await backend.astart_job("sleep 30")
+        assert (await backend.apoll_job(started.job_id)).running
+
+        killed = await backend.akill_job(started.job_id)
+        assert not killed.running
+        assert (await backend.atail_job(started.job_id)).output == ""
+
+
+def test_local_shell_backend_execute_metrics() -> None:
+    """Test execute attaches resource usage and reports it to the callback."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        reported: list[tuple[str, ExecuteMetrics]] = []
+        backend = LocalShellBackend(
+            root_dir=tmpdir,
+            inherit_env=True,
+            max_output_bytes=100,
+            metrics_callback=lambda command, metrics: reported.append((command, metrics)),
+        )
+
+        result = backend.execute("python3 -c \"print('x' * 1000)\"")
+
+        metrics = result.metrics
+        assert metrics is not None
+        assert reported == [("python3 -c \"print('x' * 1000)\"", metrics)]
+        assert metrics.wall_time > 0
+        assert metrics.user_time is not None
+        assert metrics.system_time is not None
+        assert metrics.max_rss_bytes is not None
+        assert metrics.max_rss_bytes > 0
+        assert metrics.output_bytes == 1001
+        assert metrics.returned_bytes == len(result.output.encode())
+        assert metrics.returned_bytes < metrics.output_bytes
+
+
+def test_local_shell_backend_timeout_metrics() -> None:
+    """Test timed out commands still report wall time and output produced."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True, timeout=0.3)
+
+        result = backend.execute("echo started; sleep 5")
+
+        assert result.exit_code == 124
+        assert result.metrics is not None
+        assert result.metrics.wall_time >= 0.3
+        assert result.metrics.output_bytes == len(b"started\n")
+        assert result.metrics.user_time is None
+
+
+def test_local_shell_backend_cpu_time_limit() -> None:
+    """Test cpu_time_limit kills a command that spins past its CPU budget."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True, cpu_time_limit=1, timeout=10)
+
+        result = backend.execute("python3 -c 'while True: pass'")
+
+        assert result.exit_code != 0
+        assert "1 second CPU time limit" in result.output
+        assert result.metrics is not None
+        assert result.metrics.wall_time < 5
+
+
+def test_local_shell_backend_memory_limit() -> None:
+    """Test memory_limit_bytes makes large allocations fail."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True, memory_limit_bytes=256 * 1024 * 1024)
+
+        result = backend.execute("python3 -c 'bytearray(1024 * 1024 * 1024)'")
+
+        assert result.exit_code != 0
+        assert "MemoryError" in result.output
+
+
+def test_local_shell_backend_limits_are_set_by_the_shell() -> None:
+    """Test limits are applied by the command's shell, not a `preexec_fn`."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = LocalShellBackend(root_dir=tmpdir, inherit_env=True, cpu_time_limit=7, memory_limit_bytes=512 * 1024 * 1024)
+
+        with patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+            result = backend.execute("ulimit -S -t; ulimit -H -t; ulimit -v")
+
+        assert result.output.split() == ["7", "8", str(512 * 1024)]
+        assert popen.call_args.kwargs.get("preexec_fn") is None
+
+
+def test_local_shell_backend_limits_reject_persistent_session() -> None:
+    """Test resource limits cannot be combined with a persistent session."""
+    with pytest.raises(ValueError, match="persistent_session"):
+        LocalShellBackend(persistent_session=True, cpu_time_limit=5)
+
+
+def _process_running(pid: int) -> bool:
+    """Whether `pid` exists and is not a zombie (i.e. could still use CPU)."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return False
+    return stat.rpartition(")")[2].split()[0] not in {"Z", "X"}
+
+
+async def _start_busy_command(aexecute: Callable[[str], Awaitable[ExecuteResponse]], tmp_path: Path) -> tuple[asyncio.Task, int]:
+    """Run a CPU-bound grandchild through `aexecute` and return its task and pid."""
+    pid_file = tmp_path / "busy.pid"
+    task = asyncio.create_task(aexecute(f"sh -c 'echo $$ > {pid_file}; while :; do :; done'"))
+    deadline = time.monotonic() + 5
+    while not pid_file.exists() or not pid_file.read_text().strip():
+        assert time.monotonic() < deadline, "command did not start"
+        await asyncio.sleep(0.01)
+    return task, int(pid_file.read_text())
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="requires /proc")
+async def test_local_shell_backend_cancel_kills_process_tree(tmp_path: Path) -> None:
+    """Test cancelling aexecute() stops the command's whole tree within 100 ms."""
+    backend = LocalShellBackend(root_dir=str(tmp_path), inherit_env=True)
+    task, pid = await _start_busy_command(backend.aexecute, tmp_path)
+    assert _process_running(pid)
+
+    task.cancel()
+    cancelled_at = time.monotonic()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    for _ in range(200):
+        if not _process_running(pid):
+            break
+        await asyncio.sleep(0.005)
+
+    assert not _process_running(pid)
+    assert time.monotonic() - cancelled_at < 0.1
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="requires /proc")
+async def test_local_shell_backend_cancel_interrupts_session_command(tmp_path: Path) -> None:
+    """Test cancellation interrupts a session command but keeps the session's state."""
+    backend = LocalShellBackend(root_dir=str(tmp_path), inherit_env=True, persistent_session=True)
+    (tmp_path / "sub").mkdir()
+    await backend.aexecute("cd sub && export KEPT=yes")
+    task = asyncio.create_task(backend.aexecute("sleep 30"))
+    await asyncio.sleep(0.2)
+
+    task.cancel()
+    started = time.monotonic()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    result = await backend.aexecute('echo "$KEPT $(pwd)"')
+    assert time.monotonic() - started < 5
+    assert result.output.strip() == f"yes {tmp_path.resolve() / 'sub'}"
+    backend.close()
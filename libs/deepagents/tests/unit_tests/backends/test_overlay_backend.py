@@ -0,0 +1,168 @@
+from pathlib import Path
+
+import pytest
+from langchain.tools import ToolRuntime
+from langgraph.store.memory import InMemoryStore
+
+from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.overlay import OverlayBackend
+from deepagents.backends.protocol import EditResult, FileDownloadResponse, WriteResult
+from deepagents.backends.state import StateBackend
+from deepagents.backends.store import StoreBackend
+
+
+def make_runtime() -> ToolRuntime:
+    return ToolRuntime(
+        state={"messages": [], "files": {}},
+        context=None,
+        tool_call_id="t1",
+        store=InMemoryStore(),
+        stream_writer=lambda _: None,
+        config={},
+    )
+
+
+@pytest.fixture
+def base(tmp_path: Path) -> Path:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print('hello')\n")
+    (tmp_path / "README.md").write_text("readme\nhello docs\n")
+    return tmp_path
+
+
+def make_overlay(base: Path) -> tuple[OverlayBackend, ToolRuntime]:
+    rt = make_runtime()
+    lower = FilesystemBackend(root_dir=str(base), virtual_mode=True)
+    return OverlayBackend(lower=lower, upper=StateBackend(rt)), rt
+
+
+def apply(rt: ToolRuntime, result: WriteResult | EditResult) -> None:
+    assert result.error is None
+    rt.state["files"].update(result.files_update)
+
+
+def test_reads_fall_through_to_lower(base: Path) -> None:
+    overlay, _ = make_overlay(base)
+
+    assert "print('hello')" in overlay.read("/src/app.py")
+    paths = [fi["path"] for fi in overlay.ls_info("/")]
+    assert "/README.md" in paths
+    assert "/src/" in paths
+
+
+class CountingStateBackend(StateBackend):
+    def __init__(self, runtime: ToolRuntime) -> None:
+        super().__init__(runtime)
+        self.calls: list[str] = []
+
+    def read(self, file_path: str, offset: int = 0, limit: int = 2000) -> str:
+        self.calls.append("read")
+        return super().read(file_path, offset, limit)
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        self.calls.append("download")
+        return super().download_files(paths)
+
+
+def test_read_of_upper_file_downloads_it_once(base: Path) -> None:
+    rt = make_runtime()
+    upper = CountingStateBackend(rt)
+    overlay = OverlayBackend(lower=FilesystemBackend(root_dir=str(base), virtual_mode=True), upper=upper)
+    apply(rt, overlay.edit("/src/app.py", "hello", "overlay"))
+    upper.calls.clear()
+
+    assert overlay.read("/src/app.py", 0, 1) == StateBackend(rt).read("/src/app.py", 0, 1)
+    assert upper.calls == ["download"]
+
+
+def test_edit_copies_up_without_touching_lower(base: Path) -> None:
+    overlay, rt = make_overlay(base)
+
+    result = overlay.edit("/src/app.py", "hello", "overlay")
+    assert result.occurrences == 1
+    apply(rt, result)
+
+    assert "print('overlay')" in overlay.read("/src/app.py")
+    assert (base / "src" / "app.py").read_text() == "print('hello')\n"
+
+    apply(rt, overlay.edit("/src/app.py", "overlay", "again"))
+    assert "print('again')" in overlay.read("/src/app.py")
+
+
+def test_write_refuses_lower_files_and_creates_new_ones(base: Path) -> None:
+    overlay, rt = make_overlay(base)
+
+    assert "already exists" in overlay.write("/README.md", "x").error
+
+    apply(rt, overlay.write("/src/new.py", "hello new\n"))
+    assert not (base / "src" / "new.py").exists()
+    assert [fi["path"] for fi in overlay.glob_info("**/*.py")] == ["/src/app.py", "/src/new.py"]
+
+
+def test_delete_writes_whiteout(base: Path) -> None:
+    overlay, rt = make_overlay(base)
+
+    apply(rt, overlay.delete("/README.md"))
+
+    assert "not found" in overlay.read("/README.md")
+    assert "/README.md" not in [fi["path"] for fi in overlay.ls_info("/")]
+    assert overlay.glob_info("*.md") == []
+    assert overlay.download_files(["/README.md"])[0].error == "file_not_found"
+    assert "not found" in overlay.edit("/README.md", "readme", "x").error
+    assert "not found" in overlay.delete("/README.md").error
+    assert (base / "README.md").exists()
+
+    apply(rt, overlay.write("/README.md", "recreated"))
+    assert "recreated" in overlay.read("/README.md")
+
+
+def test_delete_copied_up_file(base: Path) -> None:
+    overlay, rt = make_overlay(base)
+    apply(rt, overlay.edit("/src/app.py", "hello", "bye"))
+
+    apply(rt, overlay.delete("/src/app.py"))
+
+    assert "not found" in overlay.read("/src/app.py")
+    assert "not found" in overlay.delete("/missing.txt").error
+
+
+def test_grep_merges_layers(base: Path) -> None:
+    overlay, rt = make_overlay(base)
+    apply(rt, overlay.edit("/src/app.py", "hello", "bye"))
+    apply(rt, overlay.write("/notes.txt", "hello notes"))
+    apply(rt, overlay.delete("/README.md"))
+
+    matches = overlay.grep_raw("hello", "/")
+
+    assert [m["path"] for m in matches] == ["/notes.txt"]
+
+
+def test_export_diff(base: Path) -> None:
+    overlay, rt = make_overlay(base)
+    apply(rt, overlay.edit("/src/app.py", "hello", "bye"))
+    apply(rt, overlay.write("/notes.txt", "new\n"))
+    apply(rt, overlay.delete("/README.md"))
+    apply(rt, overlay.write("/scratch.txt", "scratch"))
+    apply(rt, overlay.delete("/scratch.txt"))
+
+    diff = overlay.export_diff()
+
+    assert "--- /dev/null\n+++ b/notes.txt\n" in diff
+    assert "--- a/README.md\n+++ /dev/null\n" in diff
+    assert "-print('hello')\n+print('bye')\n" in diff
+    assert "scratch.txt" not in diff
+
+
+def test_store_upper_keeps_agents_isolated(base: Path) -> None:
+    rt = make_runtime()
+    lower = FilesystemBackend(root_dir=str(base), virtual_mode=True)
+    first = OverlayBackend(lower=lower, upper=StoreBackend(rt, namespace=lambda _ctx: ("agent-1",)))
+    second = OverlayBackend(lower=lower, upper=StoreBackend(rt, namespace=lambda _ctx: ("agent-2",)))
+
+    assert first.edit("/README.md", "readme", "first").error is None
+    assert first.delete("/src/app.py").error is None
+
+    assert "first" in first.read("/README.md")
+    assert "not found" in first.read("/src/app.py")
+    assert "readme" in second.read("/README.md")
+    assert "print('hello')" in second.read("/src/app.py")
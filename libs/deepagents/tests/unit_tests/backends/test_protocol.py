@@ -6,7 +6,7 @@ instead of silently returning None.
 
 import pytest
 
-from deepagents.backends.protocol import BackendProtocol, SandboxBackendProtocol
+from deepagents.backends.protocol import BackendProtocol, EditResult, FileDownloadResponse, SandboxBackendProtocol, WriteResult
 
 
 class BareBackend(BackendProtocol):
@@ -118,3 +118,81 @@ class TestAsyncMethodsPropagateNotImplemented:
     async def test_aexecute(self, sandbox_backend: BareSandboxBackend) -> None:
         with pytest.raises(NotImplementedError):
             await sandbox_backend.aexecute("ls")
+
+
+class DictBackend(BackendProtocol):
+    """Backend with only write/edit/download, to exercise the default append."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, str] = {}
+
+    def write(self, file_path: str, content: str) -> WriteResult:
+        if file_path in self.files:
+            return WriteResult(error="exists")
+        self.files[file_path] = content
+        return WriteResult(path=file_path)
+
+    def edit(self, file_path: str, old_string: str, new_string: str, replace_all: bool = False) -> EditResult:  # noqa: FBT001, FBT002
+        self.files[file_path] = self.files[file_path].replace(old_string, new_string)
+        return EditResult(path=file_path, occurrences=1)
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        return [
+            FileDownloadResponse(path=p, content=self.files[p].encode()) if p in self.files else FileDownloadResponse(path=p, error="file_not_found")
+            for p in paths
+        ]
+
+
+class TestDefaultAppend:
+    """The default append rewrites the file through download/edit/write."""
+
+    def test_append_creates_then_extends(self) -> None:
+        backend = DictBackend()
+        assert backend.append("/log.md", "one\n").path == "/log.md"
+        assert backend.append("/log.md", "two\n").error is None
+        assert backend.files["/log.md"] == "one\ntwo\n"
+
+    @pytest.mark.asyncio
+    async def test_aappend(self) -> None:
+        backend = DictBackend()
+        await backend.aappend("/log.md", "one\n")
+        await backend.aappend("/log.md", "two\n")
+        assert backend.files["/log.md"] == "one\ntwo\n"
+
+    @pytest.mark.asyncio
+    async def test_aappend_composes_async_methods(self) -> None:
+        calls: list[str] = []
+
+        class AsyncDictBackend(DictBackend):
+            async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+                calls.append("adownload_files")
+                return self.download_files(paths)
+
+            async def awrite(self, file_path: str, content: str) -> WriteResult:
+                calls.append("awrite")
+                return self.write(file_path, content)
+
+            async def aedit(self, file_path: str, old_string: str, new_string: str, replace_all: bool = False) -> EditResult:  # noqa: FBT001, FBT002
+                calls.append("aedit")
+                return self.edit(file_path, old_string, new_string, replace_all)
+
+        backend = AsyncDictBackend()
+        await backend.aappend("/log.md", "one\n")
+        await backend.aappend("/log.md", "two\n")
+        assert backend.files["/log.md"] == "one\ntwo\n"
+        assert calls == ["adownload_files", "awrite", "adownload_files", "aedit"]
+
+    @pytest.mark.asyncio
+    async def test_aappend_prefers_native_sync_append(self) -> None:
+        class NativeAppendBackend(DictBackend):
+            def append(self, file_path: str, content: str) -> WriteResult:
+                self.files[file_path] = self.files.get(file_path, "") + content
+                return WriteResult(path=file_path)
+
+            async def adownload_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+                raise AssertionError
+
+        backend = NativeAppendBackend()
+        await backend.aappend("/log.md", "one\n")
+        await backend.aappend("/log.md", "two\n")
+        assert backend.files["/log.md"] == "one\ntwo\n"
@@ -8,8 +8,16 @@ The heredoc templates introduced in PR #872 contain {e} in exception handlers
 that need to be escaped as {{e}} for Python's .format() method.
 """
 
+import asyncio
 import base64
 import json
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
 
 from deepagents.backends.protocol import (
     ExecuteResponse,
@@ -18,6 +26,7 @@ from deepagents.backends.protocol import (
 )
 from deepagents.backends.sandbox import (
     _EDIT_COMMAND_TEMPLATE,
+    _EXEC_ROOT,
     _GLOB_COMMAND_TEMPLATE,
     _READ_COMMAND_TEMPLATE,
     _WRITE_COMMAND_TEMPLATE,
@@ -174,3 +183,302 @@ def test_sandbox_grep_literal_search() -> None:
     # Verify the command uses grep -rHnF for literal search (combined flags)
     assert sandbox.last_command is not None
     assert "grep -rHnF" in sandbox.last_command
+
+
+def test_sandbox_grep_parses_null_separated_paths_with_colons() -> None:
+    """Test that the grep fallback splits on the NUL byte, not the first colon."""
+    sandbox = MockSandbox()
+
+    def mock_execute(command: str) -> ExecuteResponse:
+        sandbox.last_command = command
+        if command.startswith("grep"):
+            return ExecuteResponse(output="/test/a:b/file.py\x003:x = {'k': 1}\n", exit_code=0)
+        return ExecuteResponse(output="", exit_code=0)
+
+    sandbox.execute = mock_execute
+
+    matches = sandbox.grep_raw("x", path="/test")
+
+    assert matches == [{"path": "/test/a:b/file.py", "line": 3, "text": "x = {'k': 1}"}]
+    assert "-Z" in sandbox.last_command or "Z " in sandbox.last_command
+
+
+def test_sandbox_read_and_grep_reject_truncated_output() -> None:
+    """Truncated execute() output is reported as an error, never as the whole file or match list."""
+    sandbox = MockSandbox()
+    sandbox.execute = lambda _command: ExecuteResponse(output="     1\tx\n\n... Output truncated ...", exit_code=0, truncated=True)
+
+    assert sandbox.read("/big.txt").startswith("Error: The sandbox truncated")
+    assert isinstance(sandbox.grep_raw("x", path="/"), str)
+
+
+def test_sandbox_grep_quotes_glob_and_excludes_vendored_dirs() -> None:
+    """Test that the glob is shell-quoted and vendored directories are skipped."""
+    sandbox = MockSandbox()
+    sandbox._rg_available = False
+
+    sandbox.grep_raw("needle", path="/test", glob="*.py'; rm -rf / #")
+
+    assert sandbox.last_command is not None
+    assert "--include='*.py'\"'\"'; rm -rf / #'" in sandbox.last_command
+    assert "--exclude-dir=node_modules" in sandbox.last_command
+    assert "--exclude-dir=.git" in sandbox.last_command
+
+
+def test_sandbox_grep_uses_ripgrep_json_when_available() -> None:
+    """Test that rg is probed once per sandbox and its JSON output is parsed."""
+    sandbox = MockSandbox()
+    commands: list[str] = []
+    rg_output = "\n".join(
+        json.dumps(event)
+        for event in [
+            {"type": "begin", "data": {"path": {"text": "/test/a:b.py"}}},
+            {
+                "type": "match",
+                "data": {"path": {"text": "/test/a:b.py"}, "lines": {"text": "def foo():\n"}, "line_number": 2},
+            },
+            {
+                "type": "match",
+                "data": {
+                    "path": {"bytes": base64.b64encode(b"/test/bin\xff.py").decode("ascii")},
+                    "lines": {"text": "foo = 1\n"},
+                    "line_number": 7,
+                },
+            },
+            {"type": "end", "data": {"path": {"text": "/test/a:b.py"}}},
+            {"type": "summary", "data": {}},
+        ]
+    )
+
+    def mock_execute(command: str) -> ExecuteResponse:
+        commands.append(command)
+        if command.startswith("command -v rg"):
+            return ExecuteResponse(output="__DEEPAGENTS_RG__\n", exit_code=0)
+        return ExecuteResponse(output=rg_output, exit_code=0)
+
+    sandbox.execute = mock_execute
+
+    first = sandbox.grep_raw("foo", path="/test", glob="*.py")
+    second = sandbox.grep_raw("foo", path="/test")
+
+    assert first == second
+    assert first == [
+        {"path": "/test/a:b.py", "line": 2, "text": "def foo():"},
+        {"path": "/test/bin�.py", "line": 7, "text": "foo = 1"},
+    ]
+    probes = [c for c in commands if c.startswith("command -v rg")]
+    assert len(probes) == 1
+    assert commands[1].startswith("rg --json -F")
+    assert "--glob '*.py'" in commands[1]
+
+
+class SubprocessSandbox(MockSandbox):
+    """BaseSandbox whose execute() runs commands through the local /bin/sh."""
+
+    def execute(self, command: str) -> ExecuteResponse:
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10, check=False)  # noqa: S602
+        return ExecuteResponse(output=result.stdout + result.stderr, exit_code=result.returncode)
+
+
+def test_sandbox_grep_caps_total_matches_on_both_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that rg and the grep fallback both stop at 1000 matches across all files."""
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / name).write_text("needle\n" * 600)
+    # Stand-in rg that emits 600 match events per file, like `rg --json`
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake_rg = bin_dir / "rg"
+    fake_rg.write_text(
+        "#!/usr/bin/env python3\n"
+        "import json\n"
+        "for name in ('a.txt', 'b.txt', 'c.txt'):\n"
+        "    print(json.dumps({'type': 'begin', 'data': {'path': {'text': name}}}, separators=(',', ':')))\n"
+        "    for i in range(1, 601):\n"
+        "        event = {'type': 'match', 'data': {'path': {'text': name}, 'lines': {'text': 'needle'}, 'line_number': i}}\n"
+        "        print(json.dumps(event, separators=(',', ':')))\n"
+    )
+    fake_rg.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    rg_sandbox = SubprocessSandbox()
+    rg_sandbox._rg_available = True
+    grep_sandbox = SubprocessSandbox()
+    grep_sandbox._rg_available = False
+
+    rg_matches = rg_sandbox.grep_raw("needle", path=str(tmp_path), glob="*.txt")
+    grep_matches = grep_sandbox.grep_raw("needle", path=str(tmp_path), glob="*.txt")
+
+    assert isinstance(rg_matches, list)
+    assert isinstance(grep_matches, list)
+    assert len(rg_matches) == len(grep_matches) == 1000
+    assert {m["path"] for m in rg_matches} == {"a.txt", "b.txt"}
+
+
+def test_sandbox_grep_fallback_works_without_null_separator_support(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the grep fallback drops -Z when the sandbox's grep rejects it."""
+    (tmp_path / "code.py").write_text("x = 1\nneedle = 2\n")
+    real_grep = shutil.which("grep")
+    assert real_grep is not None
+    # Stand-in grep that, like BusyBox builds without -Z, fails on the flag
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake_grep = bin_dir / "grep"
+    fake_grep.write_text(f'#!/bin/sh\nfor a in "$@"; do case "$a" in -*Z*) exit 2;; esac; done\nexec {real_grep} "$@"\n')
+    fake_grep.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    sandbox = SubprocessSandbox()
+    sandbox._rg_available = False
+
+    assert sandbox.grep_raw("needle", path=str(tmp_path)) == [{"path": str(tmp_path / "code.py"), "line": 2, "text": "needle = 2"}]
+
+
+def test_sandbox_append_through_shell(tmp_path: Path) -> None:
+    """Test append creates parent directories and appends with `>>`."""
+    sandbox = SubprocessSandbox()
+    target = tmp_path / "it's nested" / "history.md"
+
+    assert sandbox.append(str(target), "one\n").error is None
+    assert sandbox.append(str(target), "two 'quoted' $HOME\n").error is None
+
+    assert target.read_text() == "one\ntwo 'quoted' $HOME\n"
+
+
+def test_sandbox_job_lifecycle_through_shell() -> None:
+    """Test the nohup-based job scripts against a real shell."""
+    sandbox = SubprocessSandbox()
+
+    started = sandbox.start_job('echo "it\'s running"; sleep 0.2; exit 4')
+    assert started.error is None
+    assert started.running
+
+    deadline = time.monotonic() + 5
+    while sandbox.poll_job(started.job_id).running and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    status = sandbox.tail_job(started.job_id)
+    assert status.exit_code == 4
+    assert status.output == "it's running"
+
+
+def test_sandbox_kill_job_through_shell() -> None:
+    """Test kill_job stops a running job and records it as killed."""
+    sandbox = SubprocessSandbox()
+
+    started = sandbox.start_job("sleep 30")
+    assert sandbox.poll_job(started.job_id).running
+
+    status = sandbox.kill_job(started.job_id)
+    assert not status.running
+    assert status.exit_code == 137
+
+
+def test_sandbox_job_rejects_malformed_ids() -> None:
+    """Test job ids are validated before being interpolated into commands."""
+    sandbox = MockSandbox()
+
+    for job_id in ("../../etc", "job-1; rm -rf /", ""):
+        assert sandbox.poll_job(job_id).error is not None
+        assert sandbox.kill_job(job_id).error is not None
+    assert sandbox.last_command is None
+
+
+def test_sandbox_execute_with_metrics_through_shell() -> None:
+    """Test the metrics runner reports usage and strips its report from the output."""
+    sandbox = SubprocessSandbox()
+
+    result = sandbox.execute_with_metrics("echo out; echo err >&2; exit 3")
+
+    assert result.exit_code == 3
+    assert result.output == "out\nerr\n"
+    assert result.metrics is not None
+    assert result.metrics.output_bytes == 8
+    assert result.metrics.returned_bytes == 8
+    assert result.metrics.user_time is not None
+    assert result.metrics.max_rss_bytes is not None
+
+
+def test_sandbox_execute_with_metrics_applies_cpu_limit() -> None:
+    """Test cpu_time_limit is enforced by the runner inside the sandbox."""
+    sandbox = SubprocessSandbox()
+
+    result = sandbox.execute_with_metrics("python3 -c 'while True: pass'", cpu_time_limit=1)
+
+    assert result.exit_code != 0
+    assert result.metrics is not None
+    assert result.metrics.user_time >= 0.5
+
+
+def test_sandbox_execute_with_metrics_without_report() -> None:
+    """Test output without a metrics report is returned unchanged."""
+    sandbox = MockSandbox()
+
+    result = sandbox.execute_with_metrics("echo hi", memory_limit_bytes=1024)
+
+    assert result.output == "1"
+    assert result.metrics is None
+    assert "RLIMIT_AS" in sandbox.last_command
+    assert "sh -c 'echo hi'" in sandbox.last_command
+
+
+async def test_sandbox_aexecute_preserves_output_and_exit_code() -> None:
+    """Test the pid-tracking prelude is invisible to the command."""
+    sandbox = SubprocessSandbox()
+
+    result = await sandbox.aexecute("echo hi; exit 3")
+
+    assert result.output == "hi\n"
+    assert result.exit_code == 3
+
+
+async def test_sandbox_aexecute_runs_command_verbatim_and_removes_pid_file() -> None:
+    """Test the command is not rewritten and its pid file is gone once it finishes."""
+    sandbox = SubprocessSandbox()
+    exec_root = Path(_EXEC_ROOT)
+    before = set(exec_root.glob("*.pid")) if exec_root.exists() else set()
+    command = "cat <<'EOF'\nline\nEOF\necho done # trailing comment"
+
+    result = await sandbox.aexecute(command)
+
+    assert result.output == "line\ndone\n"
+    assert result.exit_code == 0
+    assert set(exec_root.glob("*.pid")) == before
+
+
+async def test_sandbox_aexecute_runs_command_in_the_foreground() -> None:
+    """Test the command is not run as a background job, which would ignore SIGINT."""
+    sandbox = SubprocessSandbox()
+
+    result = await sandbox.aexecute("python3 -c 'import signal; print(signal.getsignal(signal.SIGINT) is signal.SIG_IGN)'")
+
+    assert result.output == "False\n"
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="requires /proc")
+async def test_sandbox_aexecute_cancel_kills_remote_tree(tmp_path: Path) -> None:
+    """Test cancelling aexecute() sends a kill for the command's process tree."""
+    sandbox = SubprocessSandbox()
+    pid_file = tmp_path / "busy.pid"
+    task = asyncio.create_task(sandbox.aexecute(f"sh -c 'echo $$ > {pid_file}; while :; do :; done'"))
+    deadline = time.monotonic() + 5
+    while not pid_file.exists() or not pid_file.read_text().strip():
+        assert time.monotonic() < deadline, "command did not start"
+        await asyncio.sleep(0.01)
+    pid = int(pid_file.read_text())
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    def running() -> bool:
+        try:
+            stat = Path(f"/proc/{pid}/stat").read_text()
+        except OSError:
+            return False
+        return stat.rpartition(")")[2].split()[0] not in {"Z", "X"}
+
+    for _ in range(200):
+        if not running():
+            break
+        await asyncio.sleep(0.01)
+    assert not running()
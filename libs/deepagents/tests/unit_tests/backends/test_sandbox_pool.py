@@ -0,0 +1,214 @@
+"""Tests for PooledSandboxProvider using an in-process fake provider."""
+
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from deepagents.backends.protocol import ExecuteResponse, FileDownloadResponse, FileUploadResponse
+from deepagents.backends.sandbox import BaseSandbox, SandboxListResponse, SandboxNotFoundError, SandboxProvider
+from deepagents.backends.sandbox_pool import PooledSandboxProvider
+
+
+class FakeSandbox(BaseSandbox):
+    def __init__(self, sandbox_id: str) -> None:
+        self._id = sandbox_id
+        self.healthy = True
+        self.commands: list[str] = []
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    def execute(self, command: str) -> ExecuteResponse:
+        self.commands.append(command)
+        return ExecuteResponse(output="", exit_code=0 if self.healthy else 1)
+
+    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+        return [FileUploadResponse(path=path) for path, _ in files]
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        return [FileDownloadResponse(path=path, error="file_not_found") for path in paths]
+
+
+class FakeProvider(SandboxProvider[dict]):
+    def __init__(self, *, create_delay: float = 0.0, fail: bool = False) -> None:
+        self.create_delay = create_delay
+        self.fail = fail
+        self.sandboxes: dict[str, FakeSandbox] = {}
+        self.created_kwargs: list[dict[str, Any]] = []
+        self.deleted: list[str] = []
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def list(self, *, cursor: str | None = None, **kwargs: Any) -> SandboxListResponse[dict]:
+        return {"items": [{"sandbox_id": sid} for sid in self.sandboxes], "cursor": None}
+
+    def get_or_create(self, *, sandbox_id: str | None = None, **kwargs: Any) -> FakeSandbox:
+        if sandbox_id is not None:
+            if sandbox_id not in self.sandboxes:
+                raise SandboxNotFoundError(sandbox_id)
+            return self.sandboxes[sandbox_id]
+        time.sleep(self.create_delay)
+        if self.fail:
+            msg = "quota exceeded"
+            raise RuntimeError(msg)
+        with self._lock:
+            self._counter += 1
+            sandbox = FakeSandbox(f"sb-{self._counter}")
+            self.sandboxes[sandbox.id] = sandbox
+            self.created_kwargs.append(kwargs)
+        return sandbox
+
+    def delete(self, *, sandbox_id: str, **kwargs: Any) -> None:
+        self.sandboxes.pop(sandbox_id, None)
+        self.deleted.append(sandbox_id)
+
+
+def test_pool_prewarms_and_hands_out_instantly() -> None:
+    provider = FakeProvider(create_delay=0.2)
+    setup_calls: list[str] = []
+    with PooledSandboxProvider(provider, size=2, setup=lambda sb: setup_calls.append(sb.id)) as pool:
+        assert pool.wait_for_refill(timeout=5)
+        assert pool.idle_count == 2
+
+        started = time.monotonic()
+        sandbox = pool.get_or_create()
+        assert time.monotonic() - started < 0.1
+
+        assert sandbox.id in setup_calls
+        assert pool.wait_for_refill(timeout=5)
+        assert pool.idle_count == 2
+        assert len(provider.sandboxes) == 3
+
+
+def test_pool_falls_back_to_direct_creation_when_empty() -> None:
+    provider = FakeProvider()
+    with PooledSandboxProvider(provider, size=1, prewarm=False) as pool:
+        sandbox = pool.get_or_create()
+
+        assert sandbox.id in provider.sandboxes
+        assert pool.wait_for_refill(timeout=5)
+        assert pool.idle_count == 1
+
+
+def test_pool_discards_unhealthy_and_stale_sandboxes() -> None:
+    provider = FakeProvider()
+    with PooledSandboxProvider(provider, size=2) as pool:
+        assert pool.wait_for_refill(timeout=5)
+        first, second = (warm.sandbox for warm in pool._idle)
+        first.healthy = False
+
+        sandbox = pool.get_or_create()
+
+        assert sandbox is second
+        assert pool.wait_for_refill(timeout=5)
+        assert first.id in provider.deleted
+
+    provider = FakeProvider()
+    with PooledSandboxProvider(provider, size=1, max_idle_seconds=0.05) as pool:
+        assert pool.wait_for_refill(timeout=5)
+        (stale,) = (warm.sandbox for warm in pool._idle)
+        time.sleep(0.1)
+
+        sandbox = pool.get_or_create()
+
+        assert sandbox is not stale
+        assert pool.wait_for_refill(timeout=5)
+        assert stale.id in provider.deleted
+
+
+def test_pool_deletes_idle_sandboxes_in_the_background() -> None:
+    provider = FakeProvider()
+    with PooledSandboxProvider(provider, size=1, max_idle_seconds=0.05) as pool:
+        assert pool.wait_for_refill(timeout=5)
+        (idle,) = (warm.sandbox for warm in pool._idle)
+
+        deadline = time.monotonic() + 5
+        while idle.id not in provider.deleted:
+            assert time.monotonic() < deadline, "idle sandbox was never deleted"
+            time.sleep(0.01)
+        assert pool.idle_count == 0
+
+
+def test_pool_take_does_not_wait_for_deletes() -> None:
+    provider = FakeProvider()
+    release = threading.Event()
+    delete = provider.delete
+
+    def slow_delete(*, sandbox_id: str, **kwargs: Any) -> None:
+        release.wait(5)
+        delete(sandbox_id=sandbox_id, **kwargs)
+
+    provider.delete = slow_delete  # type: ignore[method-assign]
+    with PooledSandboxProvider(provider, size=2) as pool:
+        assert pool.wait_for_refill(timeout=5)
+        first, second = (warm.sandbox for warm in pool._idle)
+        first.healthy = False
+
+        started = time.monotonic()
+        assert pool.get_or_create() is second
+        assert time.monotonic() - started < 1
+        assert first.id not in provider.deleted
+
+        release.set()
+        assert pool.wait_for_refill(timeout=5)
+        assert first.id in provider.deleted
+
+
+def test_pool_passes_through_reconnects_and_custom_kwargs() -> None:
+    provider = FakeProvider()
+    with PooledSandboxProvider(provider, size=1, create_kwargs={"template": "py"}) as pool:
+        assert pool.wait_for_refill(timeout=5)
+        existing = provider.get_or_create()
+
+        assert pool.get_or_create(sandbox_id=existing.id) is existing
+        custom = pool.get_or_create(template="node")
+
+        assert {"template": "node"} in provider.created_kwargs
+        assert custom.id not in {warm.sandbox.id for warm in pool._idle}
+        assert provider.created_kwargs[0] == {"template": "py"}
+
+
+def test_pool_close_deletes_idle_sandboxes() -> None:
+    provider = FakeProvider()
+    pool = PooledSandboxProvider(provider, size=2)
+    assert pool.wait_for_refill(timeout=5)
+    handed_out = pool.get_or_create()
+    assert pool.wait_for_refill(timeout=5)
+
+    pool.close()
+
+    assert pool.idle_count == 0
+    assert list(provider.sandboxes) == [handed_out.id]
+
+
+def test_pool_records_background_creation_errors() -> None:
+    provider = FakeProvider(fail=True)
+    with PooledSandboxProvider(provider, size=1) as pool:
+        assert pool.wait_for_refill(timeout=5)
+
+        assert pool.idle_count == 0
+        assert isinstance(pool.last_error, RuntimeError)
+        with pytest.raises(RuntimeError, match="quota exceeded"):
+            pool.get_or_create()
+
+
+def test_pool_rejects_negative_size() -> None:
+    with pytest.raises(ValueError, match="non-negative"):
+        PooledSandboxProvider(FakeProvider(), size=-1)
+
+
+async def test_pool_async_get_or_create() -> None:
+    provider = FakeProvider()
+    with PooledSandboxProvider(provider, size=1) as pool:
+        assert pool.wait_for_refill(timeout=5)
+        warm = pool._idle[0].sandbox
+
+        assert await pool.aget_or_create() is warm
+
+        cold = await pool.aget_or_create()
+        assert cold is not warm
+        await pool.adelete(sandbox_id=cold.id)
+        assert cold.id in provider.deleted
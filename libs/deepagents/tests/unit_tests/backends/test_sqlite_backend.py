@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from deepagents.backends.sqlite import SqliteBackend
+
+
+@pytest.fixture(params=["memory", "file"])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[SqliteBackend]:
+    be = SqliteBackend(None if request.param == "memory" else tmp_path / "files.db")
+    be.upload_files(
+        [
+            ("/README.md", b"hello sqlite\n"),
+            ("/src/app.py", b"print('hello')\nx = 1\n"),
+            ("/src/pkg/util.py", b"def util():\n    return 'Hello'\n"),
+            ("/srcfile.txt", b"not in src\n"),
+            ("/data.bin", b"\x00\xff\x00hello"),
+        ]
+    )
+    yield be
+    be.close()
+
+
+def test_ls_info_lists_direct_children(backend: SqliteBackend) -> None:
+    assert [fi["path"] for fi in backend.ls_info("/")] == ["/README.md", "/data.bin", "/src/", "/srcfile.txt"]
+    infos = backend.ls_info("/src")
+    assert [(fi["path"], fi["is_dir"]) for fi in infos] == [("/src/app.py", False), ("/src/pkg/", True)]
+    assert infos[0]["size"] == len("print('hello')\nx = 1\n")
+    assert backend.ls_info("/missing") == []
+
+
+def test_write_read_edit(backend: SqliteBackend) -> None:
+    assert backend.write("/notes/a.txt", "one\ntwo\n").path == "/notes/a.txt"
+    assert "already exists" in backend.write("/notes/a.txt", "again").error
+    assert "two" not in backend.read("/notes/a.txt", limit=1)
+
+    result = backend.edit("/notes/a.txt", "two", "three")
+    assert result.occurrences == 1
+    assert result.files_update is None
+    assert "three" in backend.read("/notes/a.txt")
+    assert "not found" in backend.edit("/missing.txt", "a", "b").error
+    assert "not found" in backend.read("/missing.txt")
+    assert "not a UTF-8 text file" in backend.read("/data.bin")
+
+
+def test_grep_uses_index_and_tracks_edits(backend: SqliteBackend) -> None:
+    matches = backend.grep_raw("hello", "/")
+    assert [(m["path"], m["line"], m["text"]) for m in matches] == [("/README.md", 1, "hello sqlite"), ("/src/app.py", 1, "print('hello')")]
+    assert [m["path"] for m in backend.grep_raw("ello", "/src")] == ["/src/app.py", "/src/pkg/util.py"]
+    assert [m["path"] for m in backend.grep_raw("Hello", "/src", glob="util.py")] == ["/src/pkg/util.py"]
+    assert [m["path"] for m in backend.grep_raw("x", "/src/app.py")] == ["/src/app.py"]
+    assert backend.grep_raw('"quoted" AND', "/") == []
+
+    backend.edit("/README.md", "hello sqlite", "goodbye")
+    assert [m["path"] for m in backend.grep_raw("hello", "/")] == ["/src/app.py"]
+    assert [m["path"] for m in backend.grep_raw("goodbye", "/")] == ["/README.md"]
+
+
+def test_glob_info(backend: SqliteBackend) -> None:
+    assert sorted(fi["path"] for fi in backend.glob_info("**/*.py")) == ["/src/app.py", "/src/pkg/util.py"]
+    assert [fi["path"] for fi in backend.glob_info("*.py", "/src")] == ["/src/app.py"]
+
+
+def test_upload_and_download(backend: SqliteBackend) -> None:
+    responses = backend.upload_files([("/README.md", b"replaced\n"), ("relative.txt", b"x")])
+    assert [r.error for r in responses] == [None, "invalid_path"]
+    assert [m["path"] for m in backend.grep_raw("replaced", "/")] == ["/README.md"]
+
+    downloads = backend.download_files(["/README.md", "/data.bin", "/src", "/missing"])
+    assert downloads[0].content == b"replaced\n"
+    assert downloads[1].content == b"\x00\xff\x00hello"
+    assert [d.error for d in downloads[2:]] == ["is_directory", "file_not_found"]
+
+
+def test_persists_across_instances(tmp_path: Path) -> None:
+    first = SqliteBackend(tmp_path / "files.db")
+    first.write("/keep.txt", "kept")
+    first.close()
+
+    second = SqliteBackend(tmp_path / "files.db")
+    try:
+        assert "kept" in second.read("/keep.txt")
+        assert [m["path"] for m in second.grep_raw("kept")] == ["/keep.txt"]
+    finally:
+        second.close()
+
+
+def test_reads_from_other_threads(backend: SqliteBackend) -> None:
+    results: list[str] = []
+    thread = threading.Thread(target=lambda: results.append(backend.read("/README.md")))
+    thread.start()
+    thread.join()
+    assert "hello sqlite" in results[0]
+
+
+async def test_async_writes_share_one_writer_thread(backend: SqliteBackend) -> None:
+    results = await asyncio.gather(*(backend.awrite(f"/many/{i}.txt", f"file {i}") for i in range(20)))
+    assert all(r.error is None for r in results)
+    assert len(await backend.als_info("/many")) == 20
+    assert (await backend.aedit("/many/3.txt", "file", "edited")).occurrences == 1
+    assert [m["path"] for m in await backend.agrep_raw("edited", "/many")] == ["/many/3.txt"]
+    assert backend._writer.stats().completed == 21
+
+
+def test_append(backend: SqliteBackend) -> None:
+    assert backend.append("/log.md", "one\n").path == "/log.md"
+    backend.append("/log.md", "two\n")
+    assert backend.download_files(["/log.md"])[0].content == b"one\ntwo\n"
+    assert backend.ls_info("/")[2]["size"] == len("one\ntwo\n")
+    assert [m["line"] for m in backend.grep_raw("two", "/log.md")] == [2]
+    assert "not a UTF-8 text file" in backend.append("/data.bin", "x").error
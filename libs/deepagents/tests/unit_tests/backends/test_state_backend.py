@@ -325,3 +325,16 @@ def test_state_backend_grep_with_path_variations(path: str, expected_count: int,
     assert len(matches) == expected_count
     match_paths = {m["path"] for m in matches}
     assert match_paths == set(expected_paths)
+
+
+def test_state_backend_append() -> None:
+    rt = make_runtime()
+    be = StateBackend(rt)
+
+    res = be.append("/log.md", "first\npart")
+    rt.state["files"].update(res.files_update)
+    res = be.append("/log.md", "ial\nsecond\n")
+    rt.state["files"].update(res.files_update)
+
+    assert rt.state["files"]["/log.md"]["content"] == ["first", "partial", "second", ""]
+    assert be.download_files(["/log.md"])[0].content == b"first\npartial\nsecond\n"
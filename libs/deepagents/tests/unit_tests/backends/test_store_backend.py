@@ -433,3 +433,60 @@ def test_store_backend_rejects_wildcard_namespace() -> None:
 
     with pytest.raises(ValueError, match="disallowed characters"):
         be.write("/test.txt", "content")
+
+
+def test_store_backend_append_stores_chunks() -> None:
+    rt = make_runtime()
+    be = StoreBackend(rt, namespace=lambda _ctx: ("filesystem",))
+
+    assert be.append("/history/t1.md", "## one\n").path == "/history/t1.md"
+    be.append("/history/t1.md", "## two\n")
+    flagged = rt.store.get(("filesystem",), "/history/t1.md")
+    be.append("/history/t1.md", "## three\n")
+
+    # The file item keeps only its first content and is not re-put by later
+    # appends; each append is its own chunk item next to a counter item
+    item = rt.store.get(("filesystem",), "/history/t1.md")
+    assert item.value["content"] == ["## one", ""]
+    assert item.updated_at == flagged.updated_at
+    extra = rt.store.search(("filesystem", "__append_chunks__"))
+    assert sorted(i.key for i in extra) == ["/history/t1.md#0", "/history/t1.md#1", "/history/t1.md#count"]
+
+    assert be.download_files(["/history/t1.md"])[0].content == b"## one\n## two\n## three\n"
+    assert "## three" in be.read("/history/t1.md")
+    assert [m["line"] for m in be.grep_raw("##", "/history")] == [1, 2, 3]
+    assert [i["path"] for i in be.ls_info("/history")] == ["/history/t1.md"]
+    assert [i["path"] for i in be.glob_info("**/*.md")] == ["/history/t1.md"]
+
+    # Editing compacts the chunks back into the file
+    assert be.edit("/history/t1.md", "## two", "## 2").occurrences == 1
+    assert rt.store.search(("filesystem", "__append_chunks__")) == []
+    assert be.download_files(["/history/t1.md"])[0].content == b"## one\n## 2\n## three\n"
+
+
+def test_store_backend_upload_drops_appended_chunks() -> None:
+    be = StoreBackend(make_runtime(), namespace=lambda _ctx: ("filesystem",))
+    be.write("/log.md", "one\n")
+    be.append("/log.md", "two\n")
+
+    be.upload_files([("/log.md", b"fresh\n")])
+    assert be.download_files(["/log.md"])[0].content == b"fresh\n"
+    assert [i["path"] for i in be.glob_info("*.md")] == ["/log.md"]
+    assert [m["text"] for m in be.grep_raw("two", "/")] == []
+
+    be.append("/log.md", "more\n")
+    assert be.download_files(["/log.md"])[0].content == b"fresh\nmore\n"
+
+
+async def test_store_backend_file_etags() -> None:
+    be = StoreBackend(make_runtime(), namespace=lambda _: ("files",))
+    be.write("/notes.md", "one")
+
+    before, missing = be.file_etags(["/notes.md", "/missing.md"])
+    assert before is not None
+    assert missing is None
+    assert await be.afile_etags(["/notes.md"]) == [before]
+
+    # Appends only add a chunk item, which still changes the tag
+    be.append("/notes.md", "two")
+    assert be.file_etags(["/notes.md"]) != [before]
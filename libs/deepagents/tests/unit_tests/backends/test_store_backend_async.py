@@ -313,3 +313,16 @@ async def test_store_backend_aintercept_large_tool_result_async():
     stored_content = await rt.store.aget(("filesystem",), "/large_tool_results/test_async_789")
     assert stored_content is not None
     assert stored_content.value["content"] == [large_content]
+
+
+async def test_store_backend_async_append():
+    """Test aappend creates the file, then adds chunks that reads fold back in."""
+    rt = make_runtime()
+    be = StoreBackend(rt, namespace=lambda _ctx: ("filesystem",))
+
+    await be.aappend("/log.md", "a\n")
+    await be.aappend("/log.md", "b\n")
+
+    assert "b" in await be.aread("/log.md")
+    assert (await be.aedit("/log.md", "b", "c")).occurrences == 1
+    assert be.download_files(["/log.md"])[0].content == b"a\nc\n"
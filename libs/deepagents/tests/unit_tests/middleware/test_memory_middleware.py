@@ -4,21 +4,30 @@ This module tests the memory middleware using end-to-end tests with fake chat mo
 and temporary directories with the FilesystemBackend in normal (non-virtual) mode.
 """
 
+import re
 from datetime import UTC, datetime
 from pathlib import Path
 from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
 
+import pytest
 from langchain.agents import create_agent
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain.agents.middleware.types import ModelRequest
+from langchain.tools import ToolRuntime
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.store.memory import InMemoryStore
 
+from deepagents.backends.composite import CompositeBackend
 from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.protocol import FileDownloadResponse
 from deepagents.backends.state import StateBackend
 from deepagents.backends.store import StoreBackend
 from deepagents.graph import create_deep_agent
-from deepagents.middleware.memory import MemoryMiddleware
+from deepagents.middleware._memory_sections import split_memory_sections
+from deepagents.middleware.memory import _MEMORY_CACHE, MEMORY_SYSTEM_PROMPT, MemoryMiddleware, _backend_cache_key
 from tests.unit_tests.chat_model import GenericFakeChatModel
 
 
@@ -286,7 +295,7 @@ def test_load_memory_handles_missing_file(tmp_path: Path) -> None:
 
 
 def test_before_agent_skips_if_already_loaded(tmp_path: Path) -> None:
-    """Test that before_agent doesn't reload if already in state."""
+    """Test that before_agent returns no update if the files did not change."""
     backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
 
     user_path = str(tmp_path / "user" / "AGENTS.md")
@@ -297,13 +306,131 @@ def test_before_agent_skips_if_already_loaded(tmp_path: Path) -> None:
     middleware = MemoryMiddleware(backend=backend, sources=sources)
 
     # Pre-populate state
-    state = {"memory_contents": {user_path: "Already loaded content"}}
+    state = {"memory_contents": {user_path: user_content}}
     result = middleware.before_agent(state, None, {})  # type: ignore
 
     # Should return None (no update needed)
     assert result is None
 
 
+class CountingFilesystemBackend(FilesystemBackend):
+    """Filesystem backend that records the paths of every download_files call."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.downloads: list[list[str]] = []
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        self.downloads.append(list(paths))
+        return super().download_files(paths)
+
+
+def test_before_agent_downloads_all_sources_in_one_call(tmp_path: Path) -> None:
+    backend = CountingFilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    user_path = str(tmp_path / "user" / "AGENTS.md")
+    project_path = str(tmp_path / "project" / "AGENTS.md")
+    missing_path = str(tmp_path / "missing" / "AGENTS.md")
+    backend.upload_files([(user_path, b"user memory"), (project_path, b"project memory")])
+
+    middleware = MemoryMiddleware(backend=backend, sources=[user_path, missing_path, project_path])
+    result = middleware.before_agent({}, None, {})  # type: ignore
+
+    assert result == {"memory_contents": {user_path: "user memory", project_path: "project memory"}}
+    assert backend.downloads == [[user_path, missing_path, project_path]]
+
+
+def test_before_agent_reuses_cached_files_across_threads(tmp_path: Path) -> None:
+    backend = CountingFilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    user_path = str(tmp_path / "user" / "AGENTS.md")
+    backend.upload_files([(user_path, b"user memory")])
+    middleware = MemoryMiddleware(backend=backend, sources=[user_path])
+
+    first = middleware.before_agent({}, None, {})  # type: ignore
+    second = middleware.before_agent({}, None, {})  # type: ignore
+    # Another middleware instance over the same backend shares the cache
+    third = MemoryMiddleware(backend=backend, sources=[user_path]).before_agent({}, None, {})  # type: ignore
+
+    assert first == second == third == {"memory_contents": {user_path: "user memory"}}
+    assert len(backend.downloads) == 1
+
+
+def test_before_agent_picks_up_changed_files_in_running_thread(tmp_path: Path) -> None:
+    backend = CountingFilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    memory_file = tmp_path / "user" / "AGENTS.md"
+    backend.upload_files([(str(memory_file), b"old memory")])
+    middleware = MemoryMiddleware(backend=backend, sources=[str(memory_file)])
+    state = middleware.before_agent({}, None, {})  # type: ignore
+    assert state is not None
+
+    # Edited outside the agent: the new size and mtime invalidate the cache entry
+    memory_file.write_text("new memory, longer")
+    result = middleware.before_agent(state, None, {})  # type: ignore
+
+    assert result == {"memory_contents": {str(memory_file): "new memory, longer"}}
+    assert len(backend.downloads) == 2
+
+
+def test_memory_write_tool_call_invalidates_cache(tmp_path: Path) -> None:
+    backend = CountingFilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    user_path = str(tmp_path / "user" / "AGENTS.md")
+    other_path = str(tmp_path / "notes.md")
+    backend.upload_files([(user_path, b"user memory")])
+    middleware = MemoryMiddleware(backend=backend, sources=[user_path])
+    middleware.before_agent({}, None, {})  # type: ignore
+
+    def call(name: str, file_path: str) -> None:
+        request = SimpleNamespace(tool_call={"name": name, "args": {"file_path": file_path}, "id": "tc1"})
+        assert middleware.wrap_tool_call(request, lambda _: "done") == "done"  # type: ignore[arg-type]
+
+    call("write_file", other_path)
+    call("read_file", user_path)
+    middleware.before_agent({}, None, {})  # type: ignore
+    assert len(backend.downloads) == 1
+
+    call("edit_file", user_path)
+    middleware.before_agent({}, None, {})  # type: ignore
+    assert len(backend.downloads) == 2
+
+
+def test_store_backend_memory_is_cached_per_namespace() -> None:
+    middleware = MemoryMiddleware(backend=lambda rt: StoreBackend(rt, namespace=lambda _: ("memories",)), sources=["/memory/AGENTS.md"])
+    store = InMemoryStore()
+    runtime = SimpleNamespace(context=None, store=store, stream_writer=lambda _: None)
+    store.put(("memories",), "/memory/AGENTS.md", create_store_memory_item("first"))
+
+    result_1 = middleware.before_agent({}, runtime, {})  # type: ignore
+    store.put(("memories",), "/memory/AGENTS.md", create_store_memory_item("second"))
+    result_2 = middleware.before_agent(result_1, runtime, {})  # type: ignore
+
+    assert result_1 == {"memory_contents": {"/memory/AGENTS.md": "first"}}
+    assert result_2 == {"memory_contents": {"/memory/AGENTS.md": "second"}}
+
+
+def test_composite_factory_memory_is_cached_by_routed_backend() -> None:
+    middleware = MemoryMiddleware(
+        backend=lambda rt: CompositeBackend(default=StateBackend(rt), routes={"/memories/": StoreBackend(rt)}),
+        sources=["/memories/AGENTS.md"],
+    )
+    store = InMemoryStore()
+    store.put(("filesystem",), "/AGENTS.md", create_store_memory_item("routed memory"))
+    runtime = SimpleNamespace(context=None, store=store, stream_writer=lambda _: None, state={})
+
+    with patch.object(StoreBackend, "download_files", autospec=True, side_effect=StoreBackend.download_files) as download:
+        first = middleware.before_agent({}, runtime, {})  # type: ignore
+        second = middleware.before_agent(first, runtime, {})  # type: ignore
+
+    assert first == {"memory_contents": {"/memories/AGENTS.md": "routed memory"}}
+    assert second is None
+    assert download.call_count == 1
+    # The cache holds the store and namespace, never a backend or its runtime
+    assert (((store, ("filesystem",)), "/AGENTS.md"), "/memories/AGENTS.md") in _MEMORY_CACHE._entries
+
+
+def test_state_backend_memory_is_not_cached() -> None:
+    backend = StateBackend(SimpleNamespace(state={}))  # type: ignore[arg-type]
+    assert _backend_cache_key(CompositeBackend(default=backend, routes={}), "/AGENTS.md") is None
+
+
 def test_load_memory_with_empty_sources(tmp_path: Path) -> None:
     """Test middleware with empty sources list."""
     backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
@@ -846,3 +973,113 @@ def test_memory_middleware_order_matters(tmp_path: Path) -> None:
     assert first_pos > 0
     assert second_pos > 0
     assert first_pos < second_pos
+
+
+LARGE_MEMORY = (
+    """Always answer in English.
+
+## Preferences
+- Prefer short answers
+
+## Database
+- The production database is Postgres 16 on db.internal
+
+## Deployment
+"""
+    + "- Deploy with the blue/green pipeline\n" * 40
+    + """
+## Frontend
+"""
+    + "- React components live in web/src\n" * 40
+)
+
+
+def _memory_prompt(middleware: MemoryMiddleware, contents: dict[str, str], question: str) -> str:
+    request = ModelRequest(
+        model=GenericFakeChatModel(messages=iter([])),
+        messages=[HumanMessage(content=question)],
+        system_message=SystemMessage(content="Base"),
+        state={"messages": [], "memory_contents": contents},  # type: ignore[typeddict-unknown-key]
+    )
+    return middleware.modify_request(request).system_message.text  # type: ignore[union-attr]
+
+
+def test_split_memory_sections_ignores_headings_in_code_fences() -> None:
+    content = "Intro\n\n# One\ntext\n```bash\n# not a heading\n```\n## Two ##\nmore\n"
+
+    sections = split_memory_sections("/AGENTS.md", content)
+
+    assert [section.title for section in sections] == ["", "One", "Two"]
+    assert "# not a heading" in sections[1].text
+    assert sections[2].text == "## Two ##\nmore"
+
+
+def test_ranked_memory_injects_pinned_and_relevant_sections() -> None:
+    middleware = MemoryMiddleware(backend=None, sources=["/AGENTS.md"], max_memory_tokens=100, pinned_sections=["preferences"])  # type: ignore[arg-type]
+
+    prompt = _memory_prompt(middleware, {"/AGENTS.md": LARGE_MEMORY}, "Which database do we use in production?")
+
+    assert "Always answer in English." in prompt
+    assert "Prefer short answers" in prompt
+    assert "Postgres 16" in prompt
+    assert "blue/green" not in prompt
+    assert "React components" not in prompt
+    assert "2 more memory sections are not shown" in prompt
+    assert [tool.name for tool in middleware.tools] == ["recall_memory"]
+
+
+def test_ranked_memory_injects_everything_within_budget() -> None:
+    contents = {"/AGENTS.md": LARGE_MEMORY}
+    ranked = MemoryMiddleware(backend=None, sources=["/AGENTS.md"], max_memory_tokens=10_000)  # type: ignore[arg-type]
+    full = MemoryMiddleware(backend=None, sources=["/AGENTS.md"])  # type: ignore[arg-type]
+
+    assert _memory_prompt(ranked, contents, "database") == _memory_prompt(full, contents, "database")
+    assert full.tools == []
+
+
+def test_ranked_memory_bounds_heading_less_files() -> None:
+    content = "".join(f"- Note {i}: the build cache lives in /tmp/cache-{i}\n" for i in range(2000))
+    content += "- The staging database is MySQL 8 on staging.internal\n"
+    middleware = MemoryMiddleware(backend=None, sources=["/AGENTS.md"], max_memory_tokens=200)  # type: ignore[arg-type]
+
+    prompt = _memory_prompt(middleware, {"/AGENTS.md": content}, "Which database does staging use?")
+
+    assert len(prompt) < len(MEMORY_SYSTEM_PROMPT) + 200 * 4 + 200
+    assert "MySQL 8 on staging.internal" in prompt
+    hidden = re.search(r"\((\d+) more memory sections are not shown", prompt)
+    assert hidden is not None
+    assert int(hidden.group(1)) > 1900
+
+
+def test_pinned_memory_counts_against_the_budget() -> None:
+    content = "Intro\n\n## Style\n" + "- Use tabs\n" * 500 + "\n## Database\n- Postgres 16\n"
+    middleware = MemoryMiddleware(backend=None, sources=["/AGENTS.md"], max_memory_tokens=50, pinned_sections=["style"])  # type: ignore[arg-type]
+
+    prompt = _memory_prompt(middleware, {"/AGENTS.md": content}, "database")
+
+    assert "Use tabs" not in prompt
+    assert "Intro" in prompt
+    assert "Postgres 16" in prompt
+
+
+def test_recall_memory_tool_searches_all_sections() -> None:
+    middleware = MemoryMiddleware(backend=None, sources=["/AGENTS.md"], max_memory_tokens=100)  # type: ignore[arg-type]
+    runtime = ToolRuntime(
+        state={"memory_contents": {"/AGENTS.md": LARGE_MEMORY}},
+        context=None,
+        tool_call_id="t1",
+        store=None,
+        stream_writer=lambda _: None,
+        config={},
+    )
+    recall_memory = middleware.tools[0]
+
+    result = recall_memory.invoke({"query": "react frontend", "k": 1, "runtime": runtime})
+    assert result.startswith("/AGENTS.md\n## Frontend")
+    assert "Postgres" not in result
+    assert recall_memory.invoke({"query": "kubernetes", "runtime": runtime}) == "No memory sections match 'kubernetes'."
+
+
+def test_max_memory_tokens_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="max_memory_tokens must be positive"):
+        MemoryMiddleware(backend=None, sources=[], max_memory_tokens=0)  # type: ignore[arg-type]
@@ -123,7 +123,7 @@ async def test_load_memory_handles_missing_file_async(tmp_path: Path) -> None:
 
 
 async def test_before_agent_skips_if_already_loaded_async(tmp_path: Path) -> None:
-    """Test that abefore_agent doesn't reload if already in state."""
+    """Test that abefore_agent returns no update if the files did not change."""
     backend = FilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
 
     user_path = str(tmp_path / "user" / "AGENTS.md")
@@ -134,12 +134,17 @@ async def test_before_agent_skips_if_already_loaded_async(tmp_path: Path) -> Non
     middleware = MemoryMiddleware(backend=backend, sources=sources)
 
     # Pre-populate state
-    state = {"memory_contents": {user_path: "Already loaded content"}}
+    state = {"memory_contents": {user_path: user_content}}
     result = await middleware.abefore_agent(state, None, {})  # type: ignore
 
     # Should return None (no update needed)
     assert result is None
 
+    # An edit outside the agent reaches the running thread on its next turn
+    (tmp_path / "user" / "AGENTS.md").write_text("- Edited content")
+    result = await middleware.abefore_agent(state, None, {})  # type: ignore
+    assert result == {"memory_contents": {user_path: "- Edited content"}}
+
 
 async def test_load_memory_with_empty_sources_async(tmp_path: Path) -> None:
     """Test middleware with empty sources list (async)."""
@@ -0,0 +1,59 @@
+"""Unit tests for the system prompt fragment cache."""
+
+from langchain_core.messages import SystemMessage
+
+from deepagents.middleware.prompt_fragments import PromptFragmentCache
+
+
+def test_render_calls_render_fn_once_per_key() -> None:
+    cache = PromptFragmentCache()
+    calls: list[str] = []
+
+    def render() -> str:
+        calls.append("x")
+        return "fragment"
+
+    assert cache.render("memory", ("a",), render) == "fragment"
+    assert cache.render("memory", ("a",), render) == "fragment"
+    assert cache.render("memory", ("b",), render) == "fragment"
+
+    assert len(calls) == 2
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 2
+
+
+def test_render_evicts_least_recently_used() -> None:
+    cache = PromptFragmentCache(max_entries=2)
+    cache.render("f", 1, lambda: "one")
+    cache.render("f", 2, lambda: "two")
+    cache.render("f", 1, lambda: "one")
+    cache.render("f", 3, lambda: "three")
+
+    assert cache.render("f", 1, lambda: "rerendered") == "one"
+    assert cache.render("f", 2, lambda: "rerendered") == "rerendered"
+
+
+def test_append_matches_plain_concatenation_for_stable_fragments() -> None:
+    cache = PromptFragmentCache()
+    message = cache.append(SystemMessage(content="Base"), "Files")
+    message = cache.append(message, "Tasks")
+
+    assert message.text == "Base\n\nFiles\n\nTasks"
+    assert cache.append(None, "Files").text == "Files"
+
+
+def test_stable_fragment_is_inserted_before_volatile_ones() -> None:
+    cache = PromptFragmentCache()
+    message = cache.append(SystemMessage(content="Base"), "Memory v1", volatile=True)
+    message = cache.append(message, "Files")
+
+    assert message.text == "Base\n\nFiles\n\nMemory v1"
+
+
+def test_stable_fragment_goes_first_when_only_volatile_content_exists() -> None:
+    cache = PromptFragmentCache()
+    message = cache.append(None, "Memory", volatile=True)
+    message = cache.append(message, "Files")
+
+    assert message.text == "Files\n\nMemory"
@@ -4,9 +4,12 @@ This module tests the skills middleware and helper functions using temporary
 directories and the FilesystemBackend in normal (non-virtual) mode.
 """
 
+import os
 from datetime import UTC, datetime
 from pathlib import Path
 from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
 
 from langchain.agents import create_agent
 from langchain.tools import ToolRuntime
@@ -15,7 +18,9 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.store.memory import InMemoryStore
 
+from deepagents.backends.composite import CompositeBackend
 from deepagents.backends.filesystem import FilesystemBackend
+from deepagents.backends.protocol import FileDownloadResponse
 from deepagents.backends.state import StateBackend
 from deepagents.backends.store import StoreBackend
 from deepagents.graph import create_deep_agent
@@ -23,7 +28,9 @@ from deepagents.middleware.skills import (
     MAX_SKILL_DESCRIPTION_LENGTH,
     MAX_SKILL_FILE_SIZE,
     SkillMetadata,
+    SkillMetadataCache,
     SkillsMiddleware,
+    _cache_keys,
     _list_skills,
     _parse_skill_metadata,
     _validate_skill_name,
@@ -457,6 +464,134 @@ def test_list_skills_from_backend_with_helper_files(tmp_path: Path) -> None:
     ]
 
 
+class CountingFilesystemBackend(FilesystemBackend):
+    """Filesystem backend that records the paths of every download_files call."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.downloads: list[list[str]] = []
+
+    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+        self.downloads.append(list(paths))
+        return super().download_files(paths)
+
+
+def test_list_skills_only_downloads_changed_skill_files(tmp_path: Path) -> None:
+    backend = CountingFilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    skills_dir = tmp_path / "skills"
+    alpha_path = str(skills_dir / "alpha" / "SKILL.md")
+    beta_path = str(skills_dir / "beta" / "SKILL.md")
+    backend.upload_files(
+        [
+            (alpha_path, make_skill_content("alpha", "First").encode()),
+            (beta_path, make_skill_content("beta", "Second").encode()),
+        ]
+    )
+    cache = SkillMetadataCache()
+
+    first = _list_skills(backend, str(skills_dir), cache)
+    assert _list_skills(backend, str(skills_dir), cache) == first
+    assert backend.downloads == [[alpha_path, beta_path]]
+
+    Path(beta_path).write_text(make_skill_content("beta", "Second, revised"))
+    skills = _list_skills(backend, str(skills_dir), cache)
+
+    assert backend.downloads[1:] == [[beta_path]]
+    assert [(skill["name"], skill["description"]) for skill in skills] == [("alpha", "First"), ("beta", "Second, revised")]
+
+
+def test_list_skills_caches_invalid_skill_files(tmp_path: Path) -> None:
+    backend = CountingFilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    skills_dir = tmp_path / "skills"
+    backend.upload_files([(str(skills_dir / "broken" / "SKILL.md"), b"no frontmatter")])
+    cache = SkillMetadataCache()
+
+    assert _list_skills(backend, str(skills_dir), cache) == []
+    assert _list_skills(backend, str(skills_dir), cache) == []
+    assert len(backend.downloads) == 1
+
+
+async def test_skill_metadata_cache_is_shared_through_store(tmp_path: Path) -> None:
+    backend = CountingFilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    skills_dir = tmp_path / "skills"
+    backend.upload_files([(str(skills_dir / "alpha" / "SKILL.md"), make_skill_content("alpha", "First").encode())])
+    store = InMemoryStore()
+
+    first = await SkillsMiddleware(backend=backend, sources=[str(skills_dir)], metadata_cache=SkillMetadataCache(store=store)).abefore_agent(
+        {},  # type: ignore[arg-type]
+        None,  # type: ignore[arg-type]
+        {},
+    )
+    # A fresh in-memory cache, as in another process, finds the entries in the store
+    second = SkillsMiddleware(backend=backend, sources=[str(skills_dir)], metadata_cache=SkillMetadataCache(store=store)).before_agent(
+        {},  # type: ignore[arg-type]
+        None,  # type: ignore[arg-type]
+        {},
+    )
+
+    assert first == second
+    assert first is not None
+    assert [skill["name"] for skill in first["skills_metadata"]] == ["alpha"]
+    assert len(backend.downloads) == 1
+
+
+def test_skill_metadata_cache_overwrites_store_entry_when_file_changes(tmp_path: Path) -> None:
+    backend = CountingFilesystemBackend(root_dir=str(tmp_path), virtual_mode=False)
+    skills_dir = tmp_path / "skills"
+    skill_path = skills_dir / "alpha" / "SKILL.md"
+    backend.upload_files([(str(skill_path), make_skill_content("alpha", "First").encode())])
+    store = InMemoryStore()
+
+    for version in range(3):
+        skill_path.write_text(make_skill_content("alpha", f"Version {version}"))
+        os.utime(skill_path, ns=(version * 10**9, version * 10**9))
+        _list_skills(backend, str(skills_dir), SkillMetadataCache(store=store))
+
+    items = store.search(("deepagents", "skill_metadata"))
+    assert len(items) == 1
+    assert items[0].value["metadata"]["description"] == "Version 2"
+    # A stale version in the store is a miss, not a wrong hit
+    skill_path.write_text(make_skill_content("alpha", "Version 1"))
+    os.utime(skill_path, ns=(10**9, 10**9))
+    assert [skill["description"] for skill in _list_skills(backend, str(skills_dir), SkillMetadataCache(store=store))] == ["Version 1"]
+    assert len(backend.downloads) == 4
+
+
+def test_skill_metadata_cache_keys_include_backend_identity() -> None:
+    runtime = SimpleNamespace(context=None, store=InMemoryStore(), stream_writer=lambda _: None, state={})
+    team = StoreBackend(runtime, namespace=lambda _: ("team",))  # type: ignore[arg-type]
+    other = StoreBackend(runtime, namespace=lambda _: ("other",))  # type: ignore[arg-type]
+    composite = CompositeBackend(default=StateBackend(runtime), routes={"/skills/": team})  # type: ignore[arg-type]
+
+    # Same path and etag in different namespaces never share an entry
+    assert _cache_keys(team, ["/a/SKILL.md"], ["1"]) != _cache_keys(other, ["/a/SKILL.md"], ["1"])
+    # Routed paths are keyed by the routed backend; state-backed files are not cached
+    keys = _cache_keys(composite, ["/skills/a/SKILL.md", "/a/SKILL.md", "/skills/b/SKILL.md"], ["1", "1", None])
+    assert keys[0] is not None
+    assert keys[0] != _cache_keys(team, ["/skills/a/SKILL.md"], ["1"])[0]
+    assert keys[1:] == [None, None]
+
+
+def test_skills_cached_across_turns_with_composite_backend_factory() -> None:
+    store = InMemoryStore()
+    store.put(("filesystem",), "/alpha/SKILL.md", create_store_skill_item(make_skill_content("alpha", "First")))
+    runtime = SimpleNamespace(context=None, store=store, stream_writer=lambda _: None, state={})
+    middleware = SkillsMiddleware(
+        backend=lambda rt: CompositeBackend(default=StateBackend(rt), routes={"/skills/": StoreBackend(rt)}),
+        sources=["/skills/"],
+        metadata_cache=SkillMetadataCache(),
+    )
+
+    with patch.object(StoreBackend, "download_files", autospec=True, side_effect=StoreBackend.download_files) as download:
+        first = middleware.before_agent({}, runtime, {})  # type: ignore[arg-type]
+        second = middleware.before_agent({}, runtime, {})  # type: ignore[arg-type]
+
+    assert first == second
+    assert first is not None
+    assert [skill["name"] for skill in first["skills_metadata"]] == ["alpha"]
+    assert download.call_count == 1
+
+
 def test_format_skills_locations_single_registry() -> None:
     """Test _format_skills_locations with a single source."""
     sources = ["/skills/user/"]
@@ -1,14 +1,20 @@
 """Unit tests for `SummarizationMiddleware` with backend offloading."""
 
-from collections.abc import Generator
+import asyncio
+import json
+from collections.abc import Callable, Generator
 from contextlib import contextmanager
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain.tools import ToolRuntime
+from langchain_core.messages import AIMessage, AnyMessage, BaseMessage, HumanMessage, ToolMessage
 
+from deepagents.backends.filesystem import FilesystemBackend
 from deepagents.backends.protocol import BackendProtocol, EditResult, FileDownloadResponse, WriteResult
+from deepagents.middleware._history import HistorySearchIndex
 from deepagents.middleware.summarization import SummarizationMiddleware
 
 if TYPE_CHECKING:
@@ -324,6 +330,25 @@ class TestOffloadingBasic:
         expected_section_count = 2  # One existing + one new summarization section
         assert new_string.count("## Summarized at") == expected_section_count
 
+    def test_offload_uses_native_append(self, tmp_path: Path) -> None:
+        """Test that repeated summarizations append sections without rewriting the file."""
+        backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+        middleware = SummarizationMiddleware(
+            model=make_mock_model(),
+            backend=backend,
+            trigger=("messages", 5),
+            keep=("messages", 2),
+        )
+        state = cast("AgentState[Any]", {"messages": make_conversation_messages(num_old=6, num_recent=2)})
+
+        with mock_get_config(), patch.object(backend, "edit", side_effect=AssertionError("history must not be rewritten")):
+            middleware.before_model(state, make_mock_runtime())
+            middleware.before_model(state, make_mock_runtime())
+
+        content = (tmp_path / "conversation_history" / "test-thread-123.md").read_text()
+        expected_section_count = 2
+        assert content.count("## Summarized at") == expected_section_count
+
     def test_typical_tool_heavy_conversation(self) -> None:
         """Test with a realistic tool-heavy conversation pattern.
 
@@ -1813,3 +1838,513 @@ async def test_truncate_async_works() -> None:
 
     first_ai_msg = cleaned_messages[0]
     assert first_ai_msg.tool_calls[0]["args"]["content"] == "x" * 20 + "...(argument truncated)"
+
+
+# -----------------------------------------------------------------------------
+# Token count cache and truncation high-water mark
+# -----------------------------------------------------------------------------
+
+
+def make_tool_turn(i: int, content: str) -> list[AnyMessage]:
+    return [
+        AIMessage(
+            content="",
+            id=f"a{i}",
+            tool_calls=[{"id": f"tc{i}", "name": "write_file", "args": {"file_path": f"/f{i}.txt", "content": content}}],
+            usage_metadata={"input_tokens": 40 * i, "output_tokens": 10, "total_tokens": 40 * i + 10},
+            response_metadata={"model_provider": "openai"},
+        ),
+        ToolMessage(content=f"wrote /f{i}.txt", tool_call_id=f"tc{i}", id=f"t{i}"),
+    ]
+
+
+def test_token_cache_matches_default_counter() -> None:
+    middleware = SummarizationMiddleware(model=make_mock_model(), backend=MockBackend(), trigger=("messages", 1000))
+    messages: list[AnyMessage] = [HumanMessage(content="start", id="h0")]
+    for i in range(1, 6):
+        messages.extend(make_tool_turn(i, "y" * (100 * i)))
+
+    assert middleware._count_tokens(messages) == middleware.token_counter(messages)
+    assert middleware._count_tokens(messages[:1]) == middleware.token_counter(messages[:1])
+
+
+def test_token_cache_counts_each_message_once() -> None:
+    middleware = SummarizationMiddleware(model=make_mock_model(), backend=MockBackend(), trigger=("messages", 1000))
+    counted: list[AnyMessage] = []
+    counter = middleware._token_cache._counter
+    middleware._token_cache._counter = lambda msgs: counted.extend(msgs) or counter(msgs)
+
+    messages = [HumanMessage(content="hello", id="h1"), *make_tool_turn(1, "z" * 50)]
+    first = middleware._count_tokens(messages)
+    assert middleware._count_tokens(messages) == first
+    assert len(counted) == len(messages)
+
+    # A replaced message is counted again
+    changed = messages[1].model_copy()
+    changed.tool_calls = [{**changed.tool_calls[0], "args": {"file_path": "/f1.txt", "content": "short"}}]
+    messages[1] = changed
+    middleware._count_tokens(messages)
+    assert len(counted) == len(messages) + 1
+
+    # So is a message whose content is changed in place, and no message is kept alive
+    messages[0].content = "hello again"
+    middleware._count_tokens(messages)
+    assert len(counted) == len(messages) + 2
+    assert all(isinstance(tokens, int) for tokens in middleware._token_cache._counts.values())
+
+
+def test_custom_token_counter_is_not_cached() -> None:
+    middleware = SummarizationMiddleware(model=make_mock_model(), backend=MockBackend(), token_counter=lambda msgs: len(msgs))
+    assert middleware._token_cache is None
+    assert middleware._count_tokens([HumanMessage(content="a"), HumanMessage(content="b")]) == 2
+
+
+def test_truncation_only_examines_messages_past_high_water_mark() -> None:
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=MockBackend(),
+        trigger=("messages", 1000),
+        truncate_args_settings={"trigger": ("messages", 4), "keep": ("messages", 2), "max_length": 100},
+    )
+    messages: list[AnyMessage] = [HumanMessage(content="start", id="h0")]
+    for i in range(1, 4):
+        messages.extend(make_tool_turn(i, "x" * 200))
+
+    def next_turn(state_messages: list[AnyMessage], i: int) -> list[str]:
+        state_messages = [*state_messages, *make_tool_turn(i, "x" * 200)]
+        with patch.object(middleware, "_truncate_tool_call", wraps=middleware._truncate_tool_call) as truncate_call:
+            result = middleware.before_model({"messages": state_messages}, make_mock_runtime())
+        assert result is not None
+        messages[:] = result["messages"][1:]
+        return [c.args[0]["id"] for c in truncate_call.call_args_list]
+
+    # Truncated calls are confirmed clean on the next pass, then never examined again
+    assert next_turn(messages, 4) == ["tc1", "tc2", "tc3"]
+    assert next_turn(messages, 5) == ["tc1", "tc2", "tc3", "tc4"]
+    assert next_turn(messages, 6) == ["tc4", "tc5"]
+    assert next_turn(messages, 7) == ["tc5", "tc6"]
+
+    truncated = [m for m in messages if isinstance(m, AIMessage)]
+    assert all(m.tool_calls[0]["args"]["content"].endswith("...(argument truncated)") for m in truncated[:6])
+    assert truncated[6].tool_calls[0]["args"]["content"] == "x" * 200
+
+
+def test_truncation_mark_ignored_for_rewritten_history() -> None:
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=MockBackend(),
+        trigger=("messages", 1000),
+        truncate_args_settings={"trigger": ("messages", 4), "keep": ("messages", 2), "max_length": 100},
+    )
+    messages: list[AnyMessage] = [HumanMessage(content="start", id="h0")]
+    for i in range(1, 4):
+        messages.extend(make_tool_turn(i, "x" * 200))
+
+    first = middleware.before_model({"messages": messages}, make_mock_runtime())
+    # The same untruncated history again (e.g. a retried run) is truncated again
+    second = middleware.before_model({"messages": messages}, make_mock_runtime())
+    assert first is not None
+    assert second is not None
+    assert [m.tool_calls for m in first["messages"][1:] if isinstance(m, AIMessage)] == [
+        m.tool_calls for m in second["messages"][1:] if isinstance(m, AIMessage)
+    ]
+
+
+def make_speculative_middleware(summarize: Callable[[list[AnyMessage]], str]) -> SummarizationMiddleware:
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=MockBackend(),
+        trigger=("messages", 10),
+        keep=("messages", 2),
+        speculative_trigger=0.8,
+    )
+    middleware._create_summary = summarize  # type: ignore[method-assign]
+    return middleware
+
+
+def make_history(count: int, prefix: str = "m") -> list[AnyMessage]:
+    return [HumanMessage(content=f"message {i}", id=f"{prefix}{i}") for i in range(count)]
+
+
+def test_speculative_trigger_validation() -> None:
+    for value in (0, 1, 1.5):
+        with pytest.raises(ValueError, match="speculative_trigger"):
+            SummarizationMiddleware(model=make_mock_model(), backend=MockBackend(), speculative_trigger=value)
+
+
+def test_speculative_summary_adopted_when_trigger_fires() -> None:
+    summarized: list[list[str | None]] = []
+
+    def summarize(messages: list[AnyMessage]) -> str:
+        summarized.append([m.id for m in messages])
+        return "background summary"
+
+    middleware = make_speculative_middleware(summarize)
+    messages = make_history(7)
+    with mock_get_config():
+        # Below the watermark: nothing happens
+        assert middleware.before_model({"messages": messages}, make_mock_runtime()) is None
+        assert summarized == []
+
+        messages = make_history(8)
+        assert middleware.before_model({"messages": messages}, make_mock_runtime()) is None
+        middleware._speculative_summaries["m0"].result.result()
+        assert summarized == [[f"m{i}" for i in range(6)]]
+
+        result = middleware.before_model({"messages": make_history(10)}, make_mock_runtime())
+
+    # No second model call; messages that arrived after the summary started are kept
+    assert len(summarized) == 1
+    assert result is not None
+    new_messages = result["messages"][1:]
+    assert "background summary" in new_messages[0].content
+    assert [m.id for m in new_messages[1:]] == ["m6", "m7", "m8", "m9"]
+    assert middleware._speculative_summaries == {}
+
+
+def test_speculative_summary_discarded_when_history_changes() -> None:
+    summarized: list[list[str | None]] = []
+
+    def summarize(messages: list[AnyMessage]) -> str:
+        summarized.append([m.id for m in messages])
+        return f"summary {len(summarized)}"
+
+    middleware = make_speculative_middleware(summarize)
+    with mock_get_config():
+        middleware.before_model({"messages": make_history(8)}, make_mock_runtime())
+        middleware._speculative_summaries["m0"].result.result()
+
+        # Same first message, different history after it
+        rewritten = [make_history(1)[0], *make_history(9, prefix="r")]
+        result = middleware.before_model({"messages": rewritten}, make_mock_runtime())
+
+    assert summarized[1] == ["m0", *(f"r{i}" for i in range(7))]
+    assert result is not None
+    assert "summary 2" in result["messages"][1].content
+    assert [m.id for m in result["messages"][2:]] == ["r7", "r8"]
+
+
+def test_failed_speculative_summary_falls_back_inline() -> None:
+    calls: list[int] = []
+
+    def summarize(messages: list[AnyMessage]) -> str:
+        calls.append(len(messages))
+        if len(calls) == 1:
+            msg = "summarizer unavailable"
+            raise RuntimeError(msg)
+        return "inline summary"
+
+    middleware = make_speculative_middleware(summarize)
+    with mock_get_config():
+        middleware.before_model({"messages": make_history(8)}, make_mock_runtime())
+        result = middleware.before_model({"messages": make_history(10)}, make_mock_runtime())
+
+    assert calls == [6, 8]
+    assert result is not None
+    assert "inline summary" in result["messages"][1].content
+
+
+def test_stale_speculative_summary_that_leaves_context_over_trigger_is_discarded() -> None:
+    calls: list[int] = []
+
+    def summarize(messages: list[AnyMessage]) -> str:
+        calls.append(len(messages))
+        return f"summary {len(calls)}"
+
+    middleware = make_speculative_middleware(summarize)
+    with mock_get_config():
+        middleware.before_model({"messages": make_history(8)}, make_mock_runtime())
+        middleware._speculative_summaries["m0"].result.result()
+        # Far more arrived since: keeping m6..m19 verbatim would stay over the trigger
+        result = middleware.before_model({"messages": make_history(20)}, make_mock_runtime())
+
+    assert calls == [6, 18]
+    assert result is not None
+    assert "summary 2" in result["messages"][1].content
+    assert [m.id for m in result["messages"][2:]] == ["m18", "m19"]
+
+
+def test_speculative_task_cancelled_with_its_event_loop_falls_back_inline() -> None:
+    calls: list[int] = []
+    middleware = make_speculative_middleware(MagicMock())
+
+    async def asummarize(messages: list[AnyMessage]) -> str:
+        calls.append(len(messages))
+        if len(calls) == 1:
+            await asyncio.sleep(60)
+        return "inline summary"
+
+    middleware._acreate_summary = asummarize  # type: ignore[method-assign]
+    with mock_get_config():
+        # asyncio.run cancels the pending background summary when its loop shuts down
+        assert asyncio.run(middleware.abefore_model({"messages": make_history(8)}, make_mock_runtime())) is None
+        assert middleware._speculative_summaries["m0"].result.cancelled()
+        result = asyncio.run(middleware.abefore_model({"messages": make_history(10)}, make_mock_runtime()))
+
+    assert calls == [6, 8]
+    assert result is not None
+    assert "inline summary" in result["messages"][1].content
+
+
+async def test_async_speculative_summary_adopted_when_trigger_fires() -> None:
+    summarized: list[int] = []
+    middleware = make_speculative_middleware(MagicMock())
+
+    async def asummarize(messages: list[AnyMessage]) -> str:
+        summarized.append(len(messages))
+        return "background summary"
+
+    middleware._acreate_summary = asummarize  # type: ignore[method-assign]
+    with mock_get_config():
+        assert await middleware.abefore_model({"messages": make_history(8)}, make_mock_runtime()) is None
+        result = await middleware.abefore_model({"messages": make_history(10)}, make_mock_runtime())
+
+    assert summarized == [6]
+    assert result is not None
+    assert "background summary" in result["messages"][1].content
+    assert [m.id for m in result["messages"][2:]] == ["m6", "m7", "m8", "m9"]
+
+
+def test_jsonl_history_and_read_history_tool(tmp_path: Path) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=backend,
+        trigger=("messages", 6),
+        keep=("messages", 2),
+        history_format="jsonl",
+    )
+    assert [t.name for t in middleware.tools] == ["read_history", "search_history"]
+    rt = ToolRuntime(state={}, context=None, tool_call_id="t1", store=None, stream_writer=lambda _: None, config={})
+
+    def read_history(args: dict[str, Any]) -> str:
+        return middleware.tools[0].invoke({**args, "runtime": rt})
+
+    first = [HumanMessage(content="start", id="h0"), *make_tool_turn(1, "a" * 6000), *make_tool_turn(2, "b"), HumanMessage(content="next", id="h1")]
+    with mock_get_config():
+        result = middleware.before_model({"messages": first}, make_mock_runtime())
+        assert result is not None
+        assert "read_history" in result["messages"][1].content
+        second = [*result["messages"][1:], *make_tool_turn(3, "c"), HumanMessage(content="more", id="h2")]
+        assert middleware.before_model({"messages": second}, make_mock_runtime()) is not None
+
+        lines = (tmp_path / "conversation_history" / "test-thread-123.jsonl").read_text().splitlines()
+        assert [json.loads(line)["index"] for line in lines] == list(range(len(lines)))
+        overview = read_history({})
+        assert f"{len(lines)} messages stored" in overview
+        assert overview.count("summarized at") == 2
+
+        by_range = read_history({"start": 1, "end": 3})
+        assert "[1] AI" in by_range
+        assert "a" * 6000 in by_range
+        assert "[2] Tool" in by_range
+        assert "[3]" not in by_range
+
+        by_tool_call = read_history({"tool_call_id": "tc2"})
+        assert "-> write_file (tc2)" in by_tool_call
+        assert "[4] Tool" in by_tool_call
+        assert "(tc1)" not in by_tool_call
+
+        assert read_history({"since": "2000-01-01T00:00:00"}).startswith("[0] Human")
+        assert read_history({"until": "2000-01-01T00:00:00"}) == "No messages match."
+        assert read_history({"since": "yesterday"}).startswith("Error:")
+
+
+def test_jsonl_history_recovers_from_interrupted_offload(tmp_path: Path) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=backend,
+        trigger=("messages", 6),
+        keep=("messages", 2),
+        history_format="jsonl",
+    )
+    rt = ToolRuntime(state={}, context=None, tool_call_id="t1", store=None, stream_writer=lambda _: None, config={})
+    append = backend.append
+
+    def fail_index(path: str, content: str) -> WriteResult:
+        if path.endswith(".index.jsonl"):
+            return WriteResult(error="disk full")
+        return append(path, content)
+
+    first = [HumanMessage(content="start", id="h0"), *make_tool_turn(1, "a"), *make_tool_turn(2, "b"), HumanMessage(content="next", id="h1")]
+    with mock_get_config():
+        with patch.object(backend, "append", side_effect=fail_index):
+            result = middleware.before_model({"messages": first}, make_mock_runtime())
+        assert result is not None
+        second = [*result["messages"][1:], *make_tool_turn(3, "c"), HumanMessage(content="more", id="h2")]
+        assert middleware.before_model({"messages": second}, make_mock_runtime()) is not None
+
+        lines = (tmp_path / "conversation_history" / "test-thread-123.jsonl").read_text().splitlines()
+        assert [json.loads(line)["index"] for line in lines] == list(range(len(lines)))
+        assert f"{len(lines)} messages stored" in middleware.tools[0].invoke({"runtime": rt})
+        assert "[2] Tool" in middleware.tools[0].invoke({"tool_call_id": "tc1", "runtime": rt})
+        assert middleware.tools[1].invoke({"query": "start", "runtime": rt}).startswith("[0] Human")
+
+
+def test_jsonl_history_appends_without_reading_history_back(tmp_path: Path) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=backend,
+        trigger=("messages", 6),
+        keep=("messages", 2),
+        history_format="jsonl",
+    )
+    history = tmp_path / "conversation_history" / "test-thread-123.jsonl"
+    first = [HumanMessage(content="start", id="h0"), *make_tool_turn(1, "a"), *make_tool_turn(2, "b"), HumanMessage(content="next", id="h1")]
+
+    with mock_get_config():
+        result = middleware.before_model({"messages": first}, make_mock_runtime())
+        assert result is not None
+        second = [*result["messages"][1:], *make_tool_turn(3, "c"), HumanMessage(content="more", id="h2")]
+        with patch.object(backend, "read", wraps=backend.read) as read:
+            result = middleware.before_model({"messages": second}, make_mock_runtime())
+        assert result is not None
+        assert read.call_count == 0
+
+        # A record appended behind the index changes the etag, so the next offload indexes it first.
+        with history.open("a") as f:
+            f.write(
+                json.dumps(
+                    {"index": len(history.read_text().splitlines()), "role": "human", "content": "orphan", "timestamp": "2026-01-01T00:00:00+00:00"}
+                )
+                + "\n"
+            )
+        third = [*result["messages"][1:], *make_tool_turn(4, "d"), HumanMessage(content="last", id="h3")]
+        assert middleware.before_model({"messages": third}, make_mock_runtime()) is not None
+
+        lines = history.read_text().splitlines()
+        assert [json.loads(line)["index"] for line in lines] == list(range(len(lines)))
+        orphan = next(json.loads(line)["index"] for line in lines if json.loads(line)["content"] == "orphan")
+        rt = ToolRuntime(state={}, context=None, tool_call_id="t1", store=None, stream_writer=lambda _: None, config={})
+        assert middleware.tools[1].invoke({"query": "orphan", "runtime": rt}).startswith(f"[{orphan}] Human")
+
+
+async def test_async_jsonl_history_and_read_history_tool(tmp_path: Path) -> None:
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=FilesystemBackend(root_dir=tmp_path, virtual_mode=True),
+        trigger=("messages", 6),
+        keep=("messages", 2),
+        history_format="jsonl",
+    )
+    middleware._acreate_summary = AsyncMock(return_value="summary")  # type: ignore[method-assign]
+    rt = ToolRuntime(state={}, context=None, tool_call_id="t1", store=None, stream_writer=lambda _: None, config={})
+    messages = [HumanMessage(content="start", id="h0"), *make_tool_turn(1, "a"), *make_tool_turn(2, "b"), HumanMessage(content="next", id="h1")]
+
+    with mock_get_config():
+        assert await middleware.abefore_model({"messages": messages}, make_mock_runtime()) is not None
+        result = await middleware.tools[0].ainvoke({"tool_call_id": "tc1", "runtime": rt})
+
+    assert "[1] AI" in result
+    assert "[2] Tool" in result
+
+
+def test_search_history_ranks_offloaded_messages(tmp_path: Path) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=backend,
+        trigger=("messages", 6),
+        keep=("messages", 2),
+        history_format="jsonl",
+    )
+    rt = ToolRuntime(state={}, context=None, tool_call_id="t1", store=None, stream_writer=lambda _: None, config={})
+    search_history = {t.name: t for t in middleware.tools}["search_history"]
+
+    def turn(i: int, output: str) -> list[AnyMessage]:
+        return [
+            AIMessage(content="", id=f"a{i}", tool_calls=[{"id": f"tc{i}", "name": "execute", "args": {"command": f"step {i}"}}]),
+            ToolMessage(content=output, tool_call_id=f"tc{i}", id=f"t{i}", name="execute"),
+        ]
+
+    first = [
+        HumanMessage(content="run the build", id="h0"),
+        *turn(1, "ImportError: no module named yaml"),
+        *turn(2, "ok " * 50),
+        HumanMessage(content="go on", id="h1"),
+    ]
+    with mock_get_config():
+        result = middleware.before_model({"messages": first}, make_mock_runtime())
+        assert result is not None
+        hits = search_history.invoke({"query": "yaml import error", "runtime": rt})
+        assert hits.startswith("[2] Tool")
+        assert "ImportError: no module named yaml" in hits
+        assert middleware._search_indexes["/conversation_history/test-thread-123.jsonl"].lines_read == 3
+
+        # The next offload is picked up incrementally
+        second = [*result["messages"][1:], *turn(3, "ok"), HumanMessage(content="fix it", id="h2")]
+        assert middleware.before_model({"messages": second}, make_mock_runtime()) is not None
+        with patch.object(backend, "read", wraps=backend.read) as read:
+            hits = search_history.invoke({"query": "ok", "runtime": rt, "k": 1})
+        assert read.call_args_list[0].kwargs["offset"] == 3
+        # The long "ok" output of turn 2 was offloaded second
+        assert hits.startswith("[4] Tool")
+        assert "\n" not in hits
+        assert search_history.invoke({"query": "kubernetes", "runtime": rt}) == "No offloaded messages match 'kubernetes'."
+
+
+def test_search_history_fetches_hits_with_few_range_reads(tmp_path: Path) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=backend,
+        trigger=("messages", 6),
+        keep=("messages", 2),
+        history_format="jsonl",
+    )
+    rt = ToolRuntime(state={}, context=None, tool_call_id="t1", store=None, stream_writer=lambda _: None, config={})
+    search_history = {t.name: t for t in middleware.tools}["search_history"]
+    messages = [HumanMessage(content=f"deploy note {i}", id=f"h{i}") for i in range(12)]
+
+    with mock_get_config():
+        assert middleware.before_model({"messages": messages}, make_mock_runtime()) is not None
+        with patch.object(backend, "read", wraps=backend.read) as read:
+            hits = search_history.invoke({"query": "deploy", "runtime": rt, "k": 8})
+
+    history_reads = [c for c in read.call_args_list if c.args[0].endswith("test-thread-123.jsonl")]
+    assert len(history_reads) == 1
+    assert len(hits.splitlines()) == 8
+
+
+def test_search_history_reads_smaller_ranges_when_the_backend_truncates(tmp_path: Path) -> None:
+    backend = FilesystemBackend(root_dir=tmp_path, virtual_mode=True)
+    middleware = SummarizationMiddleware(
+        model=make_mock_model(),
+        backend=backend,
+        trigger=("messages", 6),
+        keep=("messages", 2),
+        history_format="jsonl",
+    )
+    rt = ToolRuntime(state={}, context=None, tool_call_id="t1", store=None, stream_writer=lambda _: None, config={})
+    search_history = {t.name: t for t in middleware.tools}["search_history"]
+    messages = [HumanMessage(content=f"deploy note {i}", id=f"h{i}") for i in range(12)]
+    read = backend.read
+
+    def truncating_read(file_path: str, offset: int = 0, limit: int = 2000) -> str:
+        if limit > 3:
+            return f"Error: The sandbox truncated the content of '{file_path}'. Read it in smaller ranges with offset and limit."
+        return read(file_path, offset=offset, limit=limit)
+
+    with mock_get_config():
+        assert middleware.before_model({"messages": messages}, make_mock_runtime()) is not None
+        with patch.object(backend, "read", side_effect=truncating_read):
+            hits = search_history.invoke({"query": "deploy", "runtime": rt, "k": 20})
+
+    assert middleware._search_indexes["/conversation_history/test-thread-123.jsonl"].lines_read == 10
+    assert len(hits.splitlines()) == 10
+
+
+def test_history_search_index_never_skips_postings_after_a_cut_read() -> None:
+    postings = [json.dumps({"index": i, "terms": {f"term{i}": 1}}) for i in range(4)]
+    search_index = HistorySearchIndex()
+
+    # Lines 3 and 4 are missing and the last line was cut mid-record
+    assert search_index.update(f"1\t{postings[0]}\n2\t{postings[1]}\n5\t{postings[3][:10]}") == (2, True)
+    assert search_index.lines_read == 2
+    assert search_index.update(f"3\t{postings[2]}\n4\t{postings[3][:10]}") == (1, False)
+    assert search_index.update(f"4\t{postings[3]}") == (1, False)
+    assert [index for index, _ in search_index.search("term0 term1 term2 term3", 10)] == [0, 1, 2, 3]
+    # Lines another caller already consumed are ignored
+    assert search_index.update(f"4\t{postings[3]}") == (0, False)
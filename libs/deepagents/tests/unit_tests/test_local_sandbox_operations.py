@@ -888,6 +888,20 @@ class TestLocalSandboxOperations:
 
     # ==================== glob_info() tests ====================
 
+    def test_file_etags(self, sandbox: LocalSubprocessSandbox) -> None:
+        """Test that file_etags tags regular files and changes when they are written."""
+        base_dir = "/tmp/test_sandbox_ops/etags"
+        sandbox.write(f"{base_dir}/notes.md", "one")
+
+        before, missing, directory = sandbox.file_etags([f"{base_dir}/notes.md", f"{base_dir}/missing.md", base_dir])
+
+        assert before is not None
+        assert missing is None
+        assert directory is None
+        sandbox.append(f"{base_dir}/notes.md", "two")
+        assert sandbox.file_etags([f"{base_dir}/notes.md"]) != [before]
+        assert sandbox.file_etags([]) == []
+
     def test_glob_basic_pattern(self, sandbox: LocalSubprocessSandbox) -> None:
         """Test glob with basic wildcard pattern."""
         base_dir = "/tmp/test_sandbox_ops/glob_test"
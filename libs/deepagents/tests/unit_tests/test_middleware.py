@@ -13,7 +13,7 @@ from langgraph.store.memory import InMemoryStore
 from langgraph.types import Command, Overwrite
 
 from deepagents.backends import CompositeBackend, StateBackend, StoreBackend
-from deepagents.backends.protocol import ExecuteResponse, SandboxBackendProtocol
+from deepagents.backends.protocol import ExecuteResponse, JobStatus, SandboxBackendProtocol
 from deepagents.backends.utils import create_file_data, truncate_if_too_long, update_file_data
 from deepagents.middleware.filesystem import (
     FileData,
@@ -84,27 +84,27 @@ class TestFilesystemMiddleware:
         middleware = FilesystemMiddleware()
         assert callable(middleware.backend)
         assert middleware._custom_system_prompt is None
-        assert len(middleware.tools) == 7  # All tools including execute
+        assert len(middleware.tools) == 11  # All tools including execute and background jobs
 
     def test_init_with_composite_backend(self):
         backend_factory = lambda rt: build_composite_state_backend(rt, routes={"/memories/": (lambda r: StoreBackend(r))})
         middleware = FilesystemMiddleware(backend=backend_factory)
         assert callable(middleware.backend)
         assert middleware._custom_system_prompt is None
-        assert len(middleware.tools) == 7  # All tools including execute
+        assert len(middleware.tools) == 11  # All tools including execute and background jobs
 
     def test_init_custom_system_prompt_default(self):
         middleware = FilesystemMiddleware(system_prompt="Custom system prompt")
         assert callable(middleware.backend)
         assert middleware._custom_system_prompt == "Custom system prompt"
-        assert len(middleware.tools) == 7  # All tools including execute
+        assert len(middleware.tools) == 11  # All tools including execute and background jobs
 
     def test_init_custom_system_prompt_with_composite(self):
         backend_factory = lambda rt: build_composite_state_backend(rt, routes={"/memories/": (lambda r: StoreBackend(r))})
         middleware = FilesystemMiddleware(backend=backend_factory, system_prompt="Custom system prompt")
         assert callable(middleware.backend)
         assert middleware._custom_system_prompt == "Custom system prompt"
-        assert len(middleware.tools) == 7  # All tools including execute
+        assert len(middleware.tools) == 11  # All tools including execute and background jobs
 
     def test_init_custom_tool_descriptions_default(self):
         middleware = FilesystemMiddleware(custom_tool_descriptions={"ls": "Custom ls tool description"})
@@ -1315,6 +1315,94 @@ class TestFilesystemMiddleware:
         comp_without_sandbox = CompositeBackend(default=state_backend, routes={})
         assert not _supports_execution(comp_without_sandbox)
 
+    def test_supports_jobs_requires_job_methods(self):
+        """Test _supports_jobs only accepts sandboxes that implement start_job."""
+        from deepagents.middleware.filesystem import _supports_jobs
+
+        class ExecOnlySandbox(SandboxBackendProtocol, StateBackend):
+            def execute(self, command: str) -> ExecuteResponse:
+                return ExecuteResponse(output="", exit_code=0)
+
+            @property
+            def id(self) -> str:
+                return "exec-only"
+
+        class JobSandbox(ExecOnlySandbox):
+            def start_job(self, command: str) -> JobStatus:
+                return JobStatus(job_id="job-00000001", running=True)
+
+        rt = ToolRuntime(
+            state=FilesystemState(messages=[], files={}),
+            context=None,
+            tool_call_id="test",
+            store=InMemoryStore(),
+            stream_writer=lambda _: None,
+            config={},
+        )
+
+        assert not _supports_jobs(StateBackend(rt))
+        assert not _supports_jobs(ExecOnlySandbox(rt))
+        assert _supports_jobs(JobSandbox(rt))
+        assert _supports_jobs(CompositeBackend(default=JobSandbox(rt), routes={}))
+        assert not _supports_jobs(CompositeBackend(default=ExecOnlySandbox(rt), routes={}))
+
+    def test_job_tools_format_status(self):
+        """Test the job tools call the backend and format JobStatus for the model."""
+
+        class JobSandbox(SandboxBackendProtocol, StateBackend):
+            def execute(self, command: str) -> ExecuteResponse:
+                return ExecuteResponse(output="", exit_code=0)
+
+            @property
+            def id(self) -> str:
+                return "job-sandbox"
+
+            def start_job(self, command: str) -> JobStatus:
+                return JobStatus(job_id="job-00000001", running=True)
+
+            def poll_job(self, job_id: str) -> JobStatus:
+                return JobStatus(job_id=job_id, running=True)
+
+            def tail_job(self, job_id: str, lines: int = 50) -> JobStatus:
+                return JobStatus(job_id=job_id, exit_code=2, output=f"last {lines} lines")
+
+            def kill_job(self, job_id: str) -> JobStatus:
+                return JobStatus(job_id=job_id, error=f"Error: Job '{job_id}' not found")
+
+        rt = ToolRuntime(
+            state=FilesystemState(messages=[], files={}),
+            context=None,
+            tool_call_id="test_jobs",
+            store=InMemoryStore(),
+            stream_writer=lambda _: None,
+            config={},
+        )
+        middleware = FilesystemMiddleware(backend=JobSandbox(rt))
+        tools = {tool.name: tool for tool in middleware.tools}
+
+        assert "Started background job job-00000001" in tools["start_job"].invoke({"command": "sleep 60", "runtime": rt})
+        assert tools["poll_job"].invoke({"job_id": "job-00000001", "runtime": rt}) == "Job job-00000001 is running."
+        tail = tools["tail_job"].invoke({"job_id": "job-00000001", "lines": 5, "runtime": rt})
+        assert tail == "Job job-00000001 has finished with exit code 2.\n\nlast 5 lines"
+        assert tools["kill_job"].invoke({"job_id": "job-nope", "runtime": rt}) == "Error: Job 'job-nope' not found"
+
+    def test_job_tools_return_error_when_backend_doesnt_support(self):
+        """Test job tools return a friendly error on backends without job support."""
+        rt = ToolRuntime(
+            state=FilesystemState(messages=[], files={}),
+            context=None,
+            tool_call_id="test_jobs",
+            store=InMemoryStore(),
+            stream_writer=lambda _: None,
+            config={},
+        )
+        middleware = FilesystemMiddleware()
+        start_job_tool = next(tool for tool in middleware.tools if tool.name == "start_job")
+
+        result = start_job_tool.invoke({"command": "sleep 60", "runtime": rt})
+
+        assert "Error: Background jobs not available" in result
+
     def test_intercept_truncates_content_sample_lines(self):
         """Test that content sample shows head and tail with truncation notice and lines limited to 1000 chars."""
         from langgraph.types import Command
@@ -1428,15 +1516,8 @@ class TestPatchToolCallsMiddleware:
         ]
         middleware = PatchToolCallsMiddleware()
         state_update = middleware.before_agent({"messages": input_messages}, None)
-        assert state_update is not None
-        assert isinstance(state_update["messages"], Overwrite)
-        patched_messages = state_update["messages"].value
-        assert len(patched_messages) == 2
-        assert patched_messages[0].type == "system"
-        assert patched_messages[0].content == "You are a helpful assistant."
-        assert patched_messages[1].type == "human"
-        assert patched_messages[1].content == "Hello, how are you?"
-        assert patched_messages[1].id == "2"
+        # Nothing to patch: the messages channel is left untouched
+        assert state_update is None
 
     def test_missing_tool_call(self) -> None:
         input_messages = [
@@ -1484,23 +1565,7 @@ class TestPatchToolCallsMiddleware:
         ]
         middleware = PatchToolCallsMiddleware()
         state_update = middleware.before_agent({"messages": input_messages}, None)
-        assert state_update is not None
-        assert isinstance(state_update["messages"], Overwrite)
-        patched_messages = state_update["messages"].value
-        assert len(patched_messages) == 5
-        assert patched_messages[0].type == "system"
-        assert patched_messages[0].content == "You are a helpful assistant."
-        assert patched_messages[1].type == "human"
-        assert patched_messages[1].content == "Hello, how are you?"
-        assert patched_messages[2].type == "ai"
-        assert len(patched_messages[2].tool_calls) == 1
-        assert patched_messages[2].tool_calls[0]["id"] == "123"
-        assert patched_messages[2].tool_calls[0]["name"] == "get_events_for_days"
-        assert patched_messages[2].tool_calls[0]["args"] == {"date_str": "2025-01-01"}
-        assert patched_messages[3].type == "tool"
-        assert patched_messages[3].tool_call_id == "123"
-        assert patched_messages[4].type == "human"
-        assert patched_messages[4].content == "What is the weather in Tokyo?"
+        assert state_update is None
 
     def test_two_missing_tool_calls(self) -> None:
         input_messages = [
@@ -1550,6 +1615,37 @@ class TestPatchToolCallsMiddleware:
         assert patched_messages[7].type == "human"
         assert patched_messages[7].content == "What is the weather in Tokyo?"
 
+    def test_dangling_tool_calls_at_end_are_appended(self) -> None:
+        input_messages = [
+            HumanMessage(content="Hello, how are you?", id="1"),
+            AIMessage(
+                content="",
+                tool_calls=[
+                    ToolCall(id="123", name="get_events_for_days", args={"date_str": "2025-01-01"}),
+                    ToolCall(id="456", name="get_weather", args={"city": "Tokyo"}),
+                ],
+                id="2",
+            ),
+            ToolMessage(content="I have no events for that date.", tool_call_id="123", id="3"),
+        ]
+        middleware = PatchToolCallsMiddleware()
+        state_update = middleware.before_agent({"messages": input_messages}, None)
+        assert state_update is not None
+        # Only the missing result is added; the rest of the history is not rewritten
+        assert not isinstance(state_update["messages"], Overwrite)
+        assert [(m.type, m.tool_call_id, m.name) for m in state_update["messages"]] == [("tool", "456", "get_weather")]
+
+    def test_tool_message_before_call_does_not_answer_it(self) -> None:
+        input_messages = [
+            ToolMessage(content="stale", tool_call_id="123", id="1"),
+            AIMessage(content="", tool_calls=[ToolCall(id="123", name="get_events_for_days", args={})], id="2"),
+            HumanMessage(content="Never mind", id="3"),
+        ]
+        middleware = PatchToolCallsMiddleware()
+        state_update = middleware.before_agent({"messages": input_messages}, None)
+        assert state_update is not None
+        assert [m.type for m in state_update["messages"].value] == ["tool", "ai", "tool", "human"]
+
 
 class TestTruncation:
     def test_truncate_list_result_no_truncation(self):